@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Analysis Stages for CodeMindMap Analyzer
+
+This module declares the stages of a project analysis and the output
+sections they produce, together with the dependencies between stages.
+Callers ask for output sections; only the stages those sections need
+(directly or transitively) are run.
+
+StageExecutor runs a set of stages as a DAG: each stage starts as soon as
+the stages it depends on have finished, I/O-bound stages on a thread pool
+and CPU-bound stages on a process pool. Every stage is measured (wall time,
+CPU time, peak RSS growth, files processed) and can be profiled with cProfile.
+"""
+
+import cProfile
+import logging
+import sys
+import time
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor,
+                                wait)
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+# Optional dependency (not available on Windows)
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    resource = None
+    HAS_RESOURCE = False
+
+from performance_optimizer import worker_context
+
+logger = logging.getLogger(__name__)
+
+# Output sections that can be requested from ProjectAnalyzer.analyze_project
+OUTPUT_SECTIONS = (
+    "tech_stack",
+    "categorized_tech_stack",
+    "code_graph_json",
+    "module_graph",
+    "call_graph",
+    "module_cards",
+    "folder_structure",
+    "framework_patterns",
+)
+
+# Sections produced when the caller does not ask for specific ones
+DEFAULT_SECTIONS = ("tech_stack", "categorized_tech_stack", "code_graph_json")
+
+# Stage name -> stages whose results it reads. Every output section is a stage.
+STAGE_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "modules": (),  # parse and score every Python file
+    "dependencies": ("modules",),  # resolve imports between modules
+    "tech_stack": (),
+    "framework_patterns": ("tech_stack",),
+    "module_graph": ("modules", "dependencies"),
+    "call_graph": ("modules",),
+    "module_cards": ("modules", "dependencies"),
+    "folder_structure": ("modules",),
+    "code_graph_json": ("modules",),
+    "complexity_stats": ("modules",),
+    "categorized_tech_stack": ("tech_stack", "complexity_stats"),
+}
+
+# Stage name -> progress message reported when the stage finishes
+STAGE_DESCRIPTIONS: Dict[str, str] = {
+    "modules": "Analyzing complexity",
+    "dependencies": "Resolving dependencies",
+    "tech_stack": "Parsing dependencies",
+    "framework_patterns": "Detecting frameworks",
+    "module_graph": "Building module graph",
+    "call_graph": "Building call graph",
+    "module_cards": "Generating module cards",
+    "folder_structure": "Analyzing folder structure",
+    "code_graph_json": "Building enhanced code graph",
+    "complexity_stats": "Calculating complexity statistics",
+    "categorized_tech_stack": "Categorizing technologies",
+}
+
+# Stages reading files through the shared SourceStore when run in the analyzer
+# process; once they have finished, its sources and trees can be released
+SOURCE_STORE_STAGES = frozenset({"modules", "tech_stack", "framework_patterns", "call_graph", "code_graph_json"})
+
+
+def resolve_sections(sections: Optional[Union[str, Iterable[str]]] = None) -> Tuple[str, ...]:
+    """Validate requested sections and put them in canonical order.
+    
+    Args:
+        sections: Requested section names (a list or a comma-separated string),
+            "all" for every section, or None for DEFAULT_SECTIONS
+    
+    Returns:
+        Tuple of section names in OUTPUT_SECTIONS order
+    
+    Raises:
+        ValueError: If an unknown section is requested
+    """
+    if sections is None:
+        return DEFAULT_SECTIONS
+    if isinstance(sections, str):
+        sections = sections.split(",")
+    
+    requested = {section.strip() for section in sections if section.strip()}
+    if "all" in requested:
+        return OUTPUT_SECTIONS
+    
+    unknown = requested.difference(OUTPUT_SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown analysis sections: {', '.join(sorted(unknown))} "
+                         f"(available: {', '.join(OUTPUT_SECTIONS)})")
+    
+    return tuple(section for section in OUTPUT_SECTIONS if section in requested)
+
+
+def required_stages(sections: Iterable[str]) -> Set[str]:
+    """Get every stage needed to produce the given sections.
+    
+    Args:
+        sections: Output section names
+    
+    Returns:
+        Set of stage names, including transitive dependencies
+    """
+    stages: Set[str] = set()
+    pending = list(sections)
+    
+    while pending:
+        stage = pending.pop()
+        if stage not in stages:
+            stages.add(stage)
+            pending.extend(STAGE_DEPENDENCIES[stage])
+    
+    return stages
+
+
+def stage_order(stages: Iterable[str]) -> List[str]:
+    """Order stages so that each comes after its dependencies.
+    
+    Args:
+        stages: Stage names (dependencies must be included)
+    
+    Returns:
+        Stage names in dependency order, ties broken by declaration order
+    """
+    wanted = set(stages)
+    ordered: List[str] = []
+    done: Set[str] = set()
+    
+    def visit(stage: str) -> None:
+        if stage in done:
+            return
+        done.add(stage)
+        for dependency in STAGE_DEPENDENCIES[stage]:
+            visit(dependency)
+        ordered.append(stage)
+    
+    for stage in STAGE_DEPENDENCIES:
+        if stage in wanted:
+            visit(stage)
+    
+    return ordered
+
+
+# Pool a stage runs on
+THREAD_STAGE = "thread"
+PROCESS_STAGE = "process"
+
+
+def get_peak_rss_mb() -> Optional[float]:
+    """Get the peak resident set size of this process in MB, if available."""
+    if not HAS_RESOURCE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_stage(func: Callable[..., Any], args: Tuple[Any, ...],
+               profile_path: Optional[str] = None) -> Tuple[Any, Dict[str, Any]]:
+    """Run a stage function in a worker and measure it there.
+    
+    Module-level so process stages can run it in a worker process.
+    
+    Args:
+        func: Stage function
+        args: Positional arguments for func
+        profile_path: Optional file the stage's cProfile stats are written to
+    
+    Returns:
+        Tuple of (stage result, measurements)
+    """
+    peak_before = get_peak_rss_mb()
+    start_time = time.perf_counter()
+    cpu_start = time.thread_time()
+    profiler = cProfile.Profile() if profile_path else None
+    
+    if profiler:
+        profiler.enable()
+    try:
+        result = func(*args)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+    
+    cpu_time = time.thread_time() - cpu_start
+    end_time = time.perf_counter()
+    peak_after = get_peak_rss_mb()
+    measurements = {
+        # perf_counter is system-wide, so times from worker processes are comparable
+        "start_time": start_time,
+        "end_time": end_time,
+        "cpu_time": cpu_time,
+        "peak_rss_delta_mb": peak_after - peak_before if peak_before is not None else None
+    }
+    return result, measurements
+
+
+@dataclass
+class Stage:
+    """A unit of work scheduled by StageExecutor."""
+    name: str
+    func: Callable[..., Any]
+    dependencies: Tuple[str, ...] = ()
+    kind: str = THREAD_STAGE
+    args: Tuple[Any, ...] = ()
+    count_files: Optional[Callable[[Any], int]] = None  # Files processed, from the stage result
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+    cpu_time: Optional[float] = None
+    peak_rss_delta_mb: Optional[float] = None
+    files_processed: Optional[int] = None
+    profile_path: Optional[str] = None
+    
+    @property
+    def duration(self) -> float:
+        """Wall time of the stage in seconds (0 if it has not finished)."""
+        if self.start_time is None or self.end_time is None:
+            return 0.0
+        return self.end_time - self.start_time
+
+
+class StageExecutor:
+    """Run stages concurrently in dependency order.
+    
+    Thread stages share memory with the caller and may read the results of
+    their dependencies from ``results``. Process stages run ``func(*args)`` in
+    a worker process, so ``func`` must be a picklable module-level function
+    and ``args`` picklable values; without a process pool they run on the
+    thread pool instead.
+    
+    CPU time is that of the thread (or worker process) running the stage, so
+    work a stage hands to its own worker processes is not included. Peak RSS
+    growth is process-wide and may include stages running at the same time.
+    """
+    
+    def __init__(self, max_threads: int = 4, max_processes: int = 0,
+                 before_stage: Optional[Callable[[str], None]] = None,
+                 after_stage: Optional[Callable[[str], None]] = None,
+                 profile_dir: Optional[Union[str, Path]] = None):
+        """Initialize the executor.
+        
+        Args:
+            max_threads: Size of the thread pool
+            max_processes: Size of the process pool (0 runs process stages on threads)
+            before_stage: Optional function called with a stage name before it is
+                submitted (on the calling thread; may raise to stop the run)
+            after_stage: Optional function called with a stage name when it finishes
+                (on the calling thread; may raise to stop the run)
+            profile_dir: Optional directory to write a cProfile stats file per stage
+                (<stage>.pstats) to; stages then run one at a time so that each
+                profile and timing covers a single stage
+        """
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.max_threads = 1 if self.profile_dir else max(1, max_threads)
+        self.max_processes = max(0, max_processes)
+        self.before_stage = before_stage
+        self.after_stage = after_stage
+        self.stages: Dict[str, Stage] = {}
+        self.results: Dict[str, Any] = {}
+        self.run_start = 0.0
+        self.wall_time = 0.0
+    
+    def add_stage(self, name: str, func: Callable[..., Any], dependencies: Iterable[str] = (),
+                  kind: str = THREAD_STAGE, args: Tuple[Any, ...] = (),
+                  count_files: Optional[Callable[[Any], int]] = None) -> None:
+        """Register a stage.
+        
+        Args:
+            name: Unique stage name; its return value is stored in results[name]
+            func: Function run as func(*args)
+            dependencies: Names of stages that must finish first
+            kind: THREAD_STAGE for I/O-bound or shared-memory work, PROCESS_STAGE for
+                CPU-bound work
+            args: Positional arguments for func
+            count_files: Optional function returning the number of files the stage
+                processed, given its result (used for throughput)
+        """
+        if name in self.stages:
+            raise ValueError(f"Stage already registered: {name}")
+        if kind not in (THREAD_STAGE, PROCESS_STAGE):
+            raise ValueError(f"Unknown stage kind: {kind}")
+        self.stages[name] = Stage(name, func, tuple(dependencies), kind, tuple(args), count_files)
+    
+    def run(self) -> Dict[str, Any]:
+        """Run every registered stage.
+        
+        Stages are submitted in registration order as soon as their dependencies
+        have finished. If a stage raises, no further stages are started, the
+        running ones are waited for, and the exception is re-raised.
+        
+        Returns:
+            Dictionary mapping stage names to their results
+        """
+        for stage in self.stages.values():
+            missing = [name for name in stage.dependencies if name not in self.stages]
+            if missing:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages: {', '.join(missing)}")
+        
+        use_processes = self.max_processes > 0 and any(
+            stage.kind == PROCESS_STAGE for stage in self.stages.values()
+        )
+        thread_pool = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="analysis-stage")
+        process_pool = (ProcessPoolExecutor(max_workers=self.max_processes, mp_context=worker_context())
+                        if use_processes else None)
+        if self.profile_dir:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+        
+        pending = list(self.stages.values())
+        running: Dict[Future, Stage] = {}
+        done: Set[str] = set()
+        run_start = self.run_start = time.perf_counter()
+        
+        try:
+            while pending or running:
+                # Submit every stage whose dependencies are satisfied, process stages
+                # first so their worker starts before the thread pool grows
+                ready = [s for s in pending if done.issuperset(s.dependencies)]
+                for stage in sorted(ready, key=lambda s: s.kind != PROCESS_STAGE):
+                    if self.before_stage:
+                        self.before_stage(stage.name)
+                    pending.remove(stage)
+                    if stage.kind == PROCESS_STAGE and process_pool is None:
+                        stage.kind = THREAD_STAGE
+                    pool = process_pool if stage.kind == PROCESS_STAGE else thread_pool
+                    if self.profile_dir:
+                        stage.profile_path = str(self.profile_dir / f"{stage.name}.pstats")
+                    running[pool.submit(_run_stage, stage.func, stage.args, stage.profile_path)] = stage
+                
+                if not running:
+                    raise ValueError("Stage dependencies contain a cycle: "
+                                     f"{', '.join(stage.name for stage in pending)}")
+                
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    result, measurements = future.result()
+                    self.results[stage.name] = result
+                    # Measured in the worker, so time spent queued for a worker is not included
+                    stage.start_time = measurements["start_time"]
+                    stage.end_time = measurements["end_time"]
+                    stage.cpu_time = measurements["cpu_time"]
+                    stage.peak_rss_delta_mb = measurements["peak_rss_delta_mb"]
+                    if stage.count_files:
+                        stage.files_processed = stage.count_files(result)
+                    done.add(stage.name)
+                    logger.debug(f"Stage {stage.name} finished in {stage.duration:.3f}s "
+                                 f"(CPU {stage.cpu_time:.3f}s)")
+                    if self.after_stage:
+                        self.after_stage(stage.name)
+        finally:
+            # Let stages already started finish before leaving (their results are dropped on error)
+            wait(running)
+            thread_pool.shutdown(wait=True)
+            if process_pool is not None:
+                process_pool.shutdown(wait=True)
+            self.wall_time = time.perf_counter() - run_start
+        
+        return self.results
+    
+    def get_critical_path(self) -> Tuple[List[str], float]:
+        """Get the chain of dependent stages with the longest total duration.
+        
+        This is the lower bound on the run's wall time however many workers are
+        available.
+        
+        Returns:
+            Tuple of (stage names along the path, summed duration in seconds)
+        """
+        best: Dict[str, Tuple[float, List[str]]] = {}
+        
+        def longest(name: str) -> Tuple[float, List[str]]:
+            if name not in best:
+                stage = self.stages[name]
+                chains = [longest(dependency) for dependency in stage.dependencies]
+                time_before, path = max(chains, key=lambda chain: chain[0], default=(0.0, []))
+                best[name] = (time_before + stage.duration, path + [name])
+            return best[name]
+        
+        if not self.stages:
+            return [], 0.0
+        total, path = max((longest(name) for name in self.stages), key=lambda chain: chain[0])
+        return path, total
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get timing statistics of the last run.
+        
+        Returns:
+            Dictionary with the wall time, the critical path and its time, and per
+            stage its kind, start offset, duration (wall time), CPU time, peak RSS
+            growth, files processed and throughput (and profile file if written)
+        """
+        path, path_time = self.get_critical_path()
+        
+        return {
+            "wall_time": round(self.wall_time, 4),
+            "critical_path": path,
+            "critical_path_time": round(path_time, 4),
+            "stages": {stage.name: self._stage_stats(stage, self.run_start) for stage in self.stages.values()}
+        }
+    
+    @staticmethod
+    def _stage_stats(stage: Stage, run_start: float) -> Dict[str, Any]:
+        """Get the statistics of one stage."""
+        stats = {
+            "kind": stage.kind,
+            "start": round(stage.start_time - run_start, 4) if stage.start_time is not None else None,
+            "duration": round(stage.duration, 4),
+            "cpu_time": round(stage.cpu_time, 4) if stage.cpu_time is not None else None,
+            "peak_rss_delta_mb": (round(stage.peak_rss_delta_mb, 2)
+                                  if stage.peak_rss_delta_mb is not None else None)
+        }
+        if stage.files_processed is not None:
+            stats["files_processed"] = stage.files_processed
+            stats["files_per_second"] = (round(stage.files_processed / stage.duration, 1)
+                                         if stage.duration > 0 else None)
+        if stage.profile_path:
+            stats["profile"] = stage.profile_path
+        return stats
@@ -10,10 +10,11 @@ import ast
 import json
 import logging
 import sys
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields, is_dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Union, Any, Tuple
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Set, Union, Any, Tuple, TextIO
 from enum import Enum
+from operator import attrgetter
 
 
 # Configure logging
@@ -23,6 +24,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Version of the JSON output schema
+SCHEMA_VERSION = "2.0.0"
+
 
 class AnalysisError(Exception):
     """Base exception for analysis errors."""
@@ -36,7 +40,71 @@ class ComplexityLevel(Enum):
     HIGH = "high"
 
 
-@dataclass
+def _intern(value: Any) -> Any:
+    """Intern a string, or the strings of a list in place."""
+    if type(value) is str:
+        return sys.intern(value)
+    if type(value) is list:
+        for index, item in enumerate(value):
+            if type(item) is str:
+                value[index] = sys.intern(item)
+    return value
+
+
+def slotted_dataclass(*interned: str) -> Callable[[type], type]:
+    """Create a dataclass with __slots__ whose given string fields are interned.
+    
+    The analysis model holds one object per function, parameter, import and
+    graph node of a project, so its classes drop the per-instance __dict__
+    (dataclass(slots=True) needs Python 3.10). Names, paths and type hints
+    repeat across modules; interned fields share one string per value,
+    whether the object is created here, sent back by a worker process or
+    loaded from the cache. Instances pickle as a tuple of their field values.
+    
+    Args:
+        *interned: Names of the str, Optional[str] and List[str] fields to intern
+    
+    Returns:
+        Class decorator used instead of @dataclass
+    """
+    def decorate(cls: type) -> type:
+        post_init = cls.__dict__.get('__post_init__')
+        
+        def intern_fields(self) -> None:
+            for name in interned:
+                setattr(self, name, _intern(getattr(self, name)))
+        
+        if interned:
+            def __post_init__(self) -> None:
+                if post_init is not None:
+                    post_init(self)
+                intern_fields(self)
+            cls.__post_init__ = __post_init__
+        
+        cls = dataclass(cls)
+        names = tuple(field.name for field in fields(cls))
+        get_state = attrgetter(*names)
+        
+        def __getstate__(self) -> Tuple:
+            return get_state(self)
+        
+        def __setstate__(self, state: Tuple) -> None:
+            for name, value in zip(names, state):
+                setattr(self, name, value)
+            intern_fields(self)
+        
+        # Field defaults live in __init__; class attributes would clash with the slots
+        namespace = {key: value for key, value in cls.__dict__.items()
+                     if key not in names and key not in ('__dict__', '__weakref__')}
+        namespace.update(__slots__=names, __getstate__=__getstate__, __setstate__=__setstate__)
+        slotted_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+        slotted_cls.__qualname__ = cls.__qualname__
+        return slotted_cls
+    
+    return decorate
+
+
+@slotted_dataclass()
 class ComplexityScore:
     """Represents complexity metrics for a code element."""
     cyclomatic: int
@@ -44,7 +112,7 @@ class ComplexityScore:
     level: ComplexityLevel = ComplexityLevel.LOW
     
     def __post_init__(self):
-        """Calculate complexity level and ensure cognitive complexity is set."""
+        """Calculate complexity level."""
         # Calculate complexity level based on cyclomatic complexity
         if self.cyclomatic <= 5:
             self.level = ComplexityLevel.LOW
@@ -52,13 +120,9 @@ class ComplexityScore:
             self.level = ComplexityLevel.MEDIUM
         else:
             self.level = ComplexityLevel.HIGH
-        
-        # Ensure cognitive complexity is set (estimate if not provided)
-        if self.cognitive == 0 and self.cyclomatic > 0:
-            self.cognitive = max(1, int(self.cyclomatic * 1.2))
 
 
-@dataclass
+@slotted_dataclass("name", "type_hint", "default_value")
 class Parameter:
     """Represents a function parameter."""
     name: str
@@ -68,7 +132,7 @@ class Parameter:
     is_kwarg: bool = False
 
 
-@dataclass
+@slotted_dataclass("name", "module", "return_type")
 class FunctionInfo:
     """Represents information about a function."""
     name: str
@@ -82,7 +146,7 @@ class FunctionInfo:
     is_async: bool = False
 
 
-@dataclass
+@slotted_dataclass("name", "module", "base_classes")
 class ClassInfo:
     """Represents information about a class."""
     name: str
@@ -93,7 +157,7 @@ class ClassInfo:
     docstring: Optional[str] = None
 
 
-@dataclass
+@slotted_dataclass("module", "names", "alias")
 class ImportInfo:
     """Represents an import statement."""
     module: str
@@ -101,9 +165,10 @@ class ImportInfo:
     alias: Optional[str] = None
     is_from_import: bool = False
     line_number: int = 0
+    level: int = 0  # Number of leading dots of a relative import
 
 
-@dataclass
+@slotted_dataclass("name", "path")
 class ModuleInfo:
     """Represents information about a Python module."""
     name: str
@@ -117,7 +182,14 @@ class ModuleInfo:
 
 
 # Import from dependency_parser at module level to avoid issues
-from dependency_parser import Library, TechStack
+from dependency_parser import DependencyParser, Library, TechStack
+from file_index import ProjectFileIndex, get_file_index
+from source_store import SourceStore, load_tree
+from stage_memo import StageMemo
+from analysis_stages import (
+    DEFAULT_SECTIONS, OUTPUT_SECTIONS, PROCESS_STAGE, SOURCE_STORE_STAGES, STAGE_DEPENDENCIES,
+    STAGE_DESCRIPTIONS, StageExecutor, required_stages, resolve_sections, stage_order
+)
 
 # Import new categorization system
 try:
@@ -196,16 +268,21 @@ class AnalysisMetadata:
     analyzed_files: int
     errors: List[Dict[str, Any]]
     warnings: List[Dict[str, Any]]
+    source_stats: Optional[Dict[str, Any]] = None  # Reads and parses performed by the SourceStore
+    incremental_stats: Optional[Dict[str, Any]] = None  # Modules reused from the previous run
+    sections: Optional[List[str]] = None  # Output sections produced (None = DEFAULT_SECTIONS)
+    stage_stats: Optional[Dict[str, Any]] = None  # Stage timings and critical path (StageExecutor)
+    file_stats: Optional[Dict[str, Any]] = None  # Slowest and quarantined files (FileGuard)
 
 
-@dataclass
+@slotted_dataclass("target", "label")
 class CallRelationship:
     """Represents a call relationship with full target path and label."""
     target: List[str]  # [folder, file, class, function]
     label: str  # "uses", "fetches", "calls", etc.
 
 
-@dataclass
+@slotted_dataclass("name", "type", "path")
 class CodeGraphNode:
     """Represents a node in the enhanced code graph structure."""
     name: str
@@ -223,20 +300,24 @@ class AnalysisResult:
     success: bool
     errors: List[Dict[str, Any]]
     warnings: List[Dict[str, Any]]
-    tech_stack: TechStack
+    tech_stack: Optional[TechStack]  # None when the tech_stack section was not requested
     code_graph_json: List[CodeGraphNode]  # Enhanced code graph structure
     metadata: AnalysisMetadata
     categorized_tech_stack: Optional[Dict[str, Any]] = None  # New categorized structure
+    extra_sections: Optional[Dict[str, Any]] = None  # Other requested sections, already JSON-compatible
+    
+    # Sections with dedicated fields; all others live in extra_sections
+    CORE_SECTIONS = ("tech_stack", "categorized_tech_stack", "code_graph_json")
     
     def to_json(self, validate: bool = True) -> str:
         """Convert analysis result to JSON string.
         
         Args:
             validate: Whether to validate the JSON against schema
-            
+        
         Returns:
             JSON string representation of the analysis result
-            
+        
         Raises:
             AnalysisError: If serialization or validation fails
         """
@@ -256,33 +337,62 @@ class AnalysisResult:
     
     def _to_dict(self) -> Dict[str, Any]:
         """Convert analysis result to dictionary with simplified structure."""
+        sections = self.metadata.sections or DEFAULT_SECTIONS
         result_dict = {
             "success": self.success,
             "errors": self.errors,
             "warnings": self.warnings,
-            "metadata": {
-                "project_path": self.metadata.project_path,
-                "analysis_time": self.metadata.analysis_time,
-                "total_files": self.metadata.total_files,
-                "analyzed_files": self.metadata.analyzed_files,
-                "timestamp": self._get_timestamp()
-            },
-            "tech_stack": {
-                "libraries": [self._library_to_dict(lib) for lib in self.tech_stack.libraries],
-                "frameworks": self.tech_stack.frameworks,
-                "python_version": self.tech_stack.python_version,
-                "package_manager": self.tech_stack.package_manager
-            },
-            "code_graph_json": [self._code_graph_node_to_dict(node) for node in self.code_graph_json] if self.code_graph_json else [],
-            "schema_version": "2.0.0"
+            "metadata": self._metadata_to_dict()
         }
         
+        if "tech_stack" in sections and self.tech_stack is not None:
+            result_dict["tech_stack"] = self._tech_stack_to_dict()
+        if "code_graph_json" in sections:
+            result_dict["code_graph_json"] = [self._code_graph_node_to_dict(node) for node in self.code_graph_json] if self.code_graph_json else []
+        result_dict["schema_version"] = SCHEMA_VERSION
+        
         # Add categorized tech stack if available
         if self.categorized_tech_stack:
             result_dict.update(self.categorized_tech_stack)
         
+        # Add other requested sections
+        if self.extra_sections:
+            result_dict.update(self.extra_sections)
+        
         return result_dict
     
+    def _metadata_to_dict(self) -> Dict[str, Any]:
+        """Convert analysis metadata to dictionary."""
+        metadata = {
+            "project_path": self.metadata.project_path,
+            "analysis_time": self.metadata.analysis_time,
+            "total_files": self.metadata.total_files,
+            "analyzed_files": self.metadata.analyzed_files,
+            "timestamp": self._get_timestamp()
+        }
+        
+        if self.metadata.source_stats:
+            metadata["source_store"] = self.metadata.source_stats
+        if self.metadata.incremental_stats:
+            metadata["incremental"] = self.metadata.incremental_stats
+        if self.metadata.sections:
+            metadata["sections"] = self.metadata.sections
+        if self.metadata.stage_stats:
+            metadata["stages"] = self.metadata.stage_stats
+        if self.metadata.file_stats:
+            metadata["files"] = self.metadata.file_stats
+        
+        return metadata
+    
+    def _tech_stack_to_dict(self) -> Dict[str, Any]:
+        """Convert tech stack to dictionary."""
+        return {
+            "libraries": [self._library_to_dict(lib) for lib in self.tech_stack.libraries],
+            "frameworks": self.tech_stack.frameworks,
+            "python_version": self.tech_stack.python_version,
+            "package_manager": self.tech_stack.package_manager
+        }
+    
     def _library_to_dict(self, library) -> Dict[str, Any]:
         """Convert Library to dictionary."""
         return {
@@ -292,13 +402,14 @@ class AnalysisResult:
             "extras": library.extras or []
         }
     
-    def _code_graph_node_to_dict(self, node: CodeGraphNode) -> Dict[str, Any]:
+    @classmethod
+    def _code_graph_node_to_dict(cls, node: CodeGraphNode) -> Dict[str, Any]:
         """Convert CodeGraphNode to dictionary."""
         result = {
             "name": node.name,
             "type": node.type,
-            "children": [self._code_graph_node_to_dict(child) for child in node.children],
-            "calls": [self._call_relationship_to_dict(call) for call in node.calls]
+            "children": [cls._code_graph_node_to_dict(child) for child in node.children],
+            "calls": [cls._call_relationship_to_dict(call) for call in node.calls]
         }
         
         if node.complexity:
@@ -316,13 +427,38 @@ class AnalysisResult:
         
         return result
     
-    def _call_relationship_to_dict(self, call: CallRelationship) -> Dict[str, Any]:
+    @classmethod
+    def _to_jsonable(cls, obj: Any) -> Any:
+        """Convert analysis objects (dataclasses, enums, sets, paths) to JSON-compatible data.
+        
+        Args:
+            obj: Object to convert
+        
+        Returns:
+            Nested dicts, lists and scalars
+        """
+        if obj is None or isinstance(obj, (str, int, float, bool)):
+            return obj
+        if isinstance(obj, Enum):
+            return obj.value
+        if hasattr(obj, 'to_dict'):
+            return cls._to_jsonable(obj.to_dict())
+        if is_dataclass(obj):
+            return {f.name: cls._to_jsonable(getattr(obj, f.name)) for f in fields(obj)}
+        if isinstance(obj, dict):
+            return {str(key): cls._to_jsonable(value) for key, value in obj.items()}
+        if isinstance(obj, (list, tuple, set, frozenset)):
+            return [cls._to_jsonable(value) for value in obj]
+        return str(obj)
+    
+    @staticmethod
+    def _call_relationship_to_dict(call: CallRelationship) -> Dict[str, Any]:
         """Convert CallRelationship to dictionary."""
         return {
             "target": call.target,
             "label": call.label
         }
-
+    
     def _get_timestamp(self) -> str:
         """Get current timestamp in ISO format."""
         from datetime import datetime
@@ -331,6 +467,10 @@ class AnalysisResult:
     @staticmethod
     def _json_serializer(obj):
         """Custom JSON serializer for non-serializable objects."""
+        if is_dataclass(obj):  # Also covers the slotted analysis model
+            return {field.name: getattr(obj, field.name) for field in fields(obj)}
+        if isinstance(obj, Enum):  # Enum members also have a __dict__
+            return obj.value
         if hasattr(obj, '__dict__'):
             return obj.__dict__
         elif hasattr(obj, 'value'):  # For Enum objects
@@ -338,25 +478,198 @@ class AnalysisResult:
         return str(obj)
 
 
+# Receives streamed analysis events as (event_name, data)
+AnalysisEventCallback = Callable[[str, Dict[str, Any]], None]
+
+
+class AnalysisStream:
+    """Emits an analysis result as a sequence of events while it is produced.
+    
+    Events are sent in order: "metadata" once the files to analyze are known,
+    one "module" event per file node and one "folder" event per folder node
+    of the code graph as each node is completed, then "tech_stack", one
+    "section" event per other requested section, and finally "summary".
+    Folder events carry the folder node without its children; module events
+    name the folder they belong to, so the full code graph can be rebuilt by
+    the consumer.
+    """
+    
+    def __init__(self, callback: AnalysisEventCallback):
+        """Initialize the stream.
+        
+        Args:
+            callback: Function called with each event name and its data
+        """
+        self.callback = callback
+        self.metadata_sent = False
+        self.nodes_sent = False
+    
+    def send_metadata(self, project_path: str, total_files: int) -> None:
+        """Send the metadata known before analysis starts.
+        
+        Args:
+            project_path: Path of the analyzed project
+            total_files: Number of Python files to analyze
+        """
+        from datetime import datetime
+        self.callback("metadata", {
+            "project_path": project_path,
+            "total_files": total_files,
+            "timestamp": datetime.now().isoformat(),
+            "schema_version": SCHEMA_VERSION
+        })
+        self.metadata_sent = True
+    
+    def send_node(self, node: CodeGraphNode, folder_name: Optional[str] = None) -> None:
+        """Send a completed code graph node.
+        
+        Args:
+            node: Completed file or folder node
+            folder_name: Name of the folder containing a file node
+        """
+        self.nodes_sent = True
+        if node.type == "folder":
+            data = AnalysisResult._code_graph_node_to_dict(
+                CodeGraphNode(name=node.name, type=node.type, children=[], calls=node.calls)
+            )
+            data["modules"] = len(node.children)
+            self.callback("folder", data)
+        else:
+            self.callback("module", {
+                "folder": folder_name,
+                "node": AnalysisResult._code_graph_node_to_dict(node)
+            })
+    
+    def finish(self, result: AnalysisResult) -> None:
+        """Send the parts of a finished result not streamed yet, then the summary.
+        
+        Args:
+            result: Completed (or cached, or failed) analysis result
+        """
+        if not self.metadata_sent:
+            self.send_metadata(result.metadata.project_path, result.metadata.total_files)
+        
+        if not self.nodes_sent:
+            for node in result.code_graph_json or []:
+                for child in node.children if node.type == "folder" else []:
+                    self.send_node(child, node.name)
+                self.send_node(node)
+        
+        tech_stack = {}
+        if result.tech_stack is not None:
+            tech_stack["tech_stack"] = result._tech_stack_to_dict()
+        if result.categorized_tech_stack:
+            tech_stack.update(result.categorized_tech_stack)
+        self.callback("tech_stack", tech_stack)
+        
+        for name, data in (result.extra_sections or {}).items():
+            self.callback("section", {"name": name, "data": data})
+        
+        self.callback("summary", {
+            "success": result.success,
+            "errors": result.errors,
+            "warnings": result.warnings,
+            "metadata": result._metadata_to_dict()
+        })
+
+
+class NDJSONEventWriter:
+    """Writes analysis events as newline-delimited JSON objects."""
+    
+    def __init__(self, output: Optional[TextIO] = None):
+        """Initialize the writer.
+        
+        Args:
+            output: Stream to write to (defaults to stdout)
+        """
+        self.output = output or sys.stdout
+    
+    def __call__(self, event: str, data: Dict[str, Any]) -> None:
+        """Write one event and flush it so the consumer sees it immediately."""
+        line = json.dumps({"event": event, "data": data}, default=AnalysisResult._json_serializer)
+        self.output.write(line + "\n")
+        self.output.flush()
+
+
+# Enhanced call events recorded independently of the function registry.
+# A definition is recorded as (func_id, None); a call as (caller_id, candidates)
+# where candidates are (registry_key, target_path, label) in priority order and
+# a registry_key of None always matches.
+EnhancedCallCandidate = Tuple[Optional[str], Tuple[str, ...], str]
+EnhancedCallEvent = Tuple[str, Optional[Tuple[EnhancedCallCandidate, ...]]]
+
+
+def resolve_enhanced_call_events(events: List[EnhancedCallEvent],
+                                 function_registry: Dict[str, Any]) -> Dict[str, List[CallRelationship]]:
+    """Replay recorded call events against the function registry.
+    
+    Args:
+        events: Events recorded by EnhancedCallExtractorVisitor
+        function_registry: Registry of all known functions
+    
+    Returns:
+        Dictionary mapping function ids to their call relationships
+    """
+    function_calls: Dict[str, List[CallRelationship]] = {}
+    
+    for func_id, candidates in events:
+        if candidates is None:
+            function_calls[func_id] = []
+            continue
+        
+        for registry_key, target_path, label in candidates:
+            if registry_key is None or registry_key in function_registry:
+                function_calls[func_id].append(CallRelationship(target=list(target_path), label=label))
+                break
+    
+    return function_calls
+
+
+def extract_enhanced_call_events(tree: ast.AST, module_name: str,
+                                 is_package: bool = False) -> List[EnhancedCallEvent]:
+    """Record the call events of a module, independently of the function registry.
+    
+    Args:
+        tree: Parsed AST of the module
+        module_name: Qualified name of the module
+        is_package: Whether the module is a package
+    
+    Returns:
+        Events to replay with resolve_enhanced_call_events
+    """
+    visitor = EnhancedCallExtractorVisitor(module_name, {}, is_package)
+    visitor.visit(tree)
+    return visitor.call_events
+
+
 class EnhancedCodeGraphBuilder:
     """Builder for enhanced code graph with hierarchical structure."""
     
-    def __init__(self, project_path: Path):
+    def __init__(self, project_path: Path, source_store: Optional[SourceStore] = None):
         """Initialize the enhanced code graph builder.
         
         Args:
             project_path: Path to the project root
+            source_store: Optional shared store used to read and parse files once per run
         """
         self.project_path = project_path
+        self.source_store = source_store
         self.function_registry: Dict[str, FunctionInfo] = {}
         self.call_relationships: Dict[str, List[CallRelationship]] = {}
+        self.module_call_events: Dict[str, List[EnhancedCallEvent]] = {}  # module path -> events
     
-    def build_code_graph(self, modules: List[ModuleInfo]) -> List[CodeGraphNode]:
+    def build_code_graph(self, modules: List[ModuleInfo],
+                         cached_call_events: Optional[Dict[str, List[EnhancedCallEvent]]] = None,
+                         node_callback: Optional[Callable[[CodeGraphNode, Optional[str]], None]] = None) -> List[CodeGraphNode]:
         """Build enhanced code graph with hierarchical structure.
         
         Args:
             modules: List of analyzed modules
-            
+            cached_call_events: Optional call events already recorded (while parsing, or by an
+                earlier run for unchanged modules), keyed by module path
+            node_callback: Optional function called with each file node and its folder
+                name, and with each folder node (and None) once its files are built
+        
         Returns:
             List of CodeGraphNode objects representing the hierarchical structure
         """
@@ -371,11 +684,11 @@ class EnhancedCodeGraphBuilder:
         logger.info(f"Registered {len(self.function_registry)} functions")
         
         # Extract call relationships with enhanced tracking
-        self._extract_enhanced_call_relationships(modules)
+        self._extract_enhanced_call_relationships(modules, cached_call_events or {})
         logger.info(f"Extracted call relationships for {len(self.call_relationships)} functions")
         
         # Build hierarchical structure
-        folder_structure = self._build_folder_structure(modules)
+        folder_structure = self._build_folder_structure(modules, node_callback)
         
         logger.info(f"Built enhanced code graph with {len(folder_structure)} top-level folders")
         return folder_structure
@@ -398,36 +711,51 @@ class EnhancedCodeGraphBuilder:
                     method_key = f"{module.name}.{class_info.name}.{method.name}"
                     self.function_registry[method_key] = method
     
-    def _extract_enhanced_call_relationships(self, modules: List[ModuleInfo]) -> None:
+    def _extract_enhanced_call_relationships(self, modules: List[ModuleInfo],
+                                             cached_call_events: Optional[Dict[str, List[EnhancedCallEvent]]] = None) -> None:
         """Extract call relationships with full path tracking and labels.
         
         Args:
             modules: List of analyzed modules
+            cached_call_events: Optional call events already recorded (while parsing, or by an
+                earlier run for unchanged modules), keyed by module path
         """
+        from module_index import is_package  # module_index imports this module
+        
+        cached_call_events = cached_call_events or {}
+        
         for module in modules:
+            # Reuse recorded call events, resolved against the current registry
+            events = cached_call_events.get(module.path)
+            if events is not None:
+                self.module_call_events[module.path] = events
+                self.call_relationships.update(resolve_enhanced_call_events(events, self.function_registry))
+                continue
+            
             try:
                 module_path = Path(module.path)
                 if module_path.exists():
-                    with open(module_path, 'r', encoding='utf-8') as f:
-                        source_code = f.read()
-                    
-                    tree = ast.parse(source_code, filename=str(module_path))
-                    visitor = EnhancedCallExtractorVisitor(module.name, self.function_registry)
+                    tree = load_tree(module_path, self.source_store)
+                    visitor = EnhancedCallExtractorVisitor(module.name, self.function_registry,
+                                                           is_package(module))
                     visitor.visit(tree)
+                    self.module_call_events[module.path] = visitor.call_events
                     
                     # Store call relationships for each function
                     for func_id, calls in visitor.function_calls.items():
                         self.call_relationships[func_id] = calls
-                        
+            
             except Exception as e:
                 logger.error(f"Failed to extract enhanced calls from {module.path}: {e}")
     
-    def _build_folder_structure(self, modules: List[ModuleInfo]) -> List[CodeGraphNode]:
+    def _build_folder_structure(self, modules: List[ModuleInfo],
+                                node_callback: Optional[Callable[[CodeGraphNode, Optional[str]], None]] = None) -> List[CodeGraphNode]:
         """Build hierarchical folder structure.
         
         Args:
             modules: List of analyzed modules
-            
+            node_callback: Optional function called with each completed node
+        
         Returns:
             List of top-level folder nodes
         """
@@ -455,7 +783,7 @@ class EnhancedCodeGraphBuilder:
                 if folder_name not in folder_map:
                     folder_map[folder_name] = []
                 folder_map[folder_name].append(module)
-                
+            
             except Exception as e:
                 logger.warning(f"Failed to process module path {module.path}: {e}")
                 # Fallback: put in root folder
@@ -467,19 +795,23 @@ class EnhancedCodeGraphBuilder:
         folder_nodes = []
         for folder_name, folder_modules in folder_map.items():
             logger.info(f"Building folder '{folder_name}' with {len(folder_modules)} modules")
-            folder_node = self._build_folder_node(folder_name, folder_modules)
+            folder_node = self._build_folder_node(folder_name, folder_modules, node_callback)
             folder_nodes.append(folder_node)
+            if node_callback:
+                node_callback(folder_node, None)
         
         logger.info(f"Created {len(folder_nodes)} folder nodes")
         return folder_nodes
     
-    def _build_folder_node(self, folder_name: str, modules: List[ModuleInfo]) -> CodeGraphNode:
+    def _build_folder_node(self, folder_name: str, modules: List[ModuleInfo],
+                           node_callback: Optional[Callable[[CodeGraphNode, Optional[str]], None]] = None) -> CodeGraphNode:
         """Build a folder node with its contained files.
         
         Args:
             folder_name: Name of the folder
             modules: List of modules in this folder
-            
+            node_callback: Optional function called with each completed file node
+        
         Returns:
             CodeGraphNode representing the folder
         """
@@ -488,6 +820,8 @@ class EnhancedCodeGraphBuilder:
         for module in modules:
             file_node = self._build_file_node(module)
             file_nodes.append(file_node)
+            if node_callback:
+                node_callback(file_node, folder_name)
         
         return CodeGraphNode(
             name=folder_name,
@@ -501,7 +835,7 @@ class EnhancedCodeGraphBuilder:
         
         Args:
             module: ModuleInfo object
-            
+        
         Returns:
             CodeGraphNode representing the file
         """
@@ -535,7 +869,7 @@ class EnhancedCodeGraphBuilder:
         Args:
             class_info: ClassInfo object
             module_name: Name of the containing module
-            
+        
         Returns:
             CodeGraphNode representing the class
         """
@@ -560,7 +894,7 @@ class EnhancedCodeGraphBuilder:
             func: FunctionInfo object
             module_name: Name of the containing module
             class_name: Name of the containing class (if any)
-            
+        
         Returns:
             CodeGraphNode representing the function
         """
@@ -586,16 +920,20 @@ class EnhancedCodeGraphBuilder:
 class EnhancedCallExtractorVisitor(ast.NodeVisitor):
     """Enhanced AST visitor to extract function calls with full path tracking."""
     
-    def __init__(self, current_module: str, function_registry: Dict[str, FunctionInfo]):
+    def __init__(self, current_module: str, function_registry: Dict[str, FunctionInfo],
+                 is_package: bool = False):
         """Initialize the enhanced call extractor visitor.
         
         Args:
             current_module: Name of the current module being analyzed
             function_registry: Registry of all known functions
+            is_package: Whether the module is a package (relative imports start from it)
         """
         self.current_module = current_module
+        self.is_package = is_package
         self.function_registry = function_registry
         self.function_calls: Dict[str, List[CallRelationship]] = {}
+        self.call_events: List[EnhancedCallEvent] = []
         self.current_function_stack: List[str] = []
         self.current_class = ""
         self.imports: Dict[str, str] = {}  # alias -> module mapping
@@ -611,10 +949,13 @@ class EnhancedCallExtractorVisitor(ast.NodeVisitor):
     
     def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
         """Visit from-import statements to track imported names."""
-        if node.module:
+        from module_index import resolve_import_from  # module_index imports this module
+        
+        module = resolve_import_from(node.module, node.level or 0, self.current_module, self.is_package)
+        if module:
             for alias in node.names:
                 imported_name = alias.asname if alias.asname else alias.name
-                self.imports[imported_name] = f"{node.module}.{alias.name}"
+                self.imports[imported_name] = f"{module}.{alias.name}"
         self.generic_visit(node)
     
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
@@ -633,6 +974,7 @@ class EnhancedCallExtractorVisitor(ast.NodeVisitor):
         
         self.current_function_stack.append(func_id)
         self.function_calls[func_id] = []
+        self.call_events.append((func_id, None))
         self.generic_visit(node)
         self.current_function_stack.pop()
     
@@ -645,6 +987,7 @@ class EnhancedCallExtractorVisitor(ast.NodeVisitor):
         
         self.current_function_stack.append(func_id)
         self.function_calls[func_id] = []
+        self.call_events.append((func_id, None))
         self.generic_visit(node)
         self.current_function_stack.pop()
     
@@ -655,94 +998,132 @@ class EnhancedCallExtractorVisitor(ast.NodeVisitor):
             return
         
         caller_id = self.current_function_stack[-1]
-        call_info = self._resolve_enhanced_call_target(node.func)
+        candidates = self._enhanced_call_candidates(node.func)
         
-        if call_info:
-            target_path, label = call_info
-            call_relationship = CallRelationship(target=target_path, label=label)
-            self.function_calls[caller_id].append(call_relationship)
+        if candidates:
+            self.call_events.append((caller_id, candidates))
+            call_info = self._resolve_candidates(candidates)
+            if call_info:
+                target_path, label = call_info
+                call_relationship = CallRelationship(target=target_path, label=label)
+                self.function_calls[caller_id].append(call_relationship)
         
         self.generic_visit(node)
     
+    def _resolve_candidates(self, candidates: Tuple[EnhancedCallCandidate, ...]) -> Optional[Tuple[List[str], str]]:
+        """Pick the first candidate whose registry key is known (or not required).
+        
+        Args:
+            candidates: Candidates in priority order
+        
+        Returns:
+            Tuple of (target_path, label) or None if not resolvable
+        """
+        for registry_key, target_path, label in candidates:
+            if registry_key is None or registry_key in self.function_registry:
+                return (list(target_path), label)
+        return None
+    
     def _resolve_enhanced_call_target(self, func_node: ast.AST) -> Optional[Tuple[List[str], str]]:
         """Resolve the target function with full path and generate label.
         
         Args:
             func_node: AST node representing the called function
-            
+        
         Returns:
             Tuple of (target_path, label) or None if not resolvable
         """
+        return self._resolve_candidates(self._enhanced_call_candidates(func_node))
+    
+    def _enhanced_call_candidates(self, func_node: ast.AST) -> Tuple[EnhancedCallCandidate, ...]:
+        """List the possible targets of a call in priority order.
+        
+        Args:
+            func_node: AST node representing the called function
+        
+        Returns:
+            Tuple of (registry_key, target_path, label) candidates
+        """
         if isinstance(func_node, ast.Name):
             func_name = func_node.id
             
             # Check if it's an imported function
             if func_name in self.imports:
                 imported_path = self.imports[func_name]
-                parts = imported_path.split('.')
-                if len(parts) >= 2:
-                    return (["", parts[0], "", parts[1]], "calls")
-            
-            # Check if it's a function in the current module
-            local_func_id = f"{self.current_module}.{func_name}"
-            if local_func_id in self.function_registry:
-                return (["", self.current_module, "", func_name], "calls")
+                module, _, name = imported_path.rpartition('.')
+                if module:
+                    return ((None, ("", module, "", name), "calls"),)
             
-            # Check if it's a method in the current class
+            # A function in the current module, then a method in the current class
+            candidates = ((f"{self.current_module}.{func_name}",
+                           ("", self.current_module, "", func_name), "calls"),)
             if self.current_class:
-                method_id = f"{self.current_module}.{self.current_class}.{func_name}"
-                if method_id in self.function_registry:
-                    return (["", self.current_module, self.current_class, func_name], "calls")
+                candidates += ((f"{self.current_module}.{self.current_class}.{func_name}",
+                                ("", self.current_module, self.current_class, func_name), "calls"),)
+            return candidates
         
         elif isinstance(func_node, ast.Attribute):
-            return self._resolve_enhanced_attribute_call(func_node)
+            return self._enhanced_attribute_candidates(func_node)
         
-        return None
+        return ()
     
-    def _resolve_enhanced_attribute_call(self, attr_node: ast.Attribute) -> Optional[Tuple[List[str], str]]:
-        """Resolve attribute-based function calls with enhanced path tracking.
+    def _enhanced_attribute_candidates(self, attr_node: ast.Attribute) -> Tuple[EnhancedCallCandidate, ...]:
+        """List the possible targets of an attribute-based call in priority order.
         
         Args:
             attr_node: Attribute AST node
-            
+        
         Returns:
-            Tuple of (target_path, label) or None if not resolvable
+            Tuple of (registry_key, target_path, label) candidates
         """
         method_name = attr_node.attr
         
-        if isinstance(attr_node.value, ast.Name):
-            obj_name = attr_node.value.id
-            
-            # Check if it's a module.function call
-            if obj_name in self.imports:
-                module_name = self.imports[obj_name]
-                potential_func_id = f"{module_name}.{method_name}"
-                if potential_func_id in self.function_registry:
-                    return (["", module_name, "", method_name], "uses")
-            
-            # Check for self.method() calls
-            if obj_name == "self" and self.current_class:
-                method_id = f"{self.current_module}.{self.current_class}.{method_name}"
-                if method_id in self.function_registry:
-                    return (["", self.current_module, self.current_class, method_name], "calls")
-            
-            # Check for cls.method() calls
-            if obj_name == "cls" and self.current_class:
-                method_id = f"{self.current_module}.{self.current_class}.{method_name}"
-                if method_id in self.function_registry:
-                    return (["", self.current_module, self.current_class, method_name], "calls")
-            
-            # Generate descriptive labels based on common patterns
-            if method_name.startswith("get_"):
-                return (["", "external", "", method_name], "fetches")
-            elif method_name.startswith("set_") or method_name.startswith("update_"):
-                return (["", "external", "", method_name], "updates")
-            elif method_name.startswith("create_") or method_name.startswith("make_"):
-                return (["", "external", "", method_name], "creates")
-            else:
-                return (["", "external", "", method_name], "uses")
+        if not isinstance(attr_node.value, ast.Name):
+            return ()
+        
+        obj_name = attr_node.value.id
+        candidates: Tuple[EnhancedCallCandidate, ...] = ()
+        
+        # Check if it's a module.function call
+        if obj_name in self.imports:
+            module_name = self.imports[obj_name]
+            candidates += ((f"{module_name}.{method_name}",
+                            ("", module_name, "", method_name), "uses"),)
+        
+        # Check for self.method() and cls.method() calls
+        if obj_name in ("self", "cls") and self.current_class:
+            candidates += ((f"{self.current_module}.{self.current_class}.{method_name}",
+                            ("", self.current_module, self.current_class, method_name), "calls"),)
+        
+        # Generate descriptive labels based on common patterns
+        if method_name.startswith("get_"):
+            label = "fetches"
+        elif method_name.startswith("set_") or method_name.startswith("update_"):
+            label = "updates"
+        elif method_name.startswith("create_") or method_name.startswith("make_"):
+            label = "creates"
+        else:
+            label = "uses"
+        candidates += ((None, ("", "external", "", method_name), label),)
         
-        return None
+        return candidates
+
+
+def parse_tech_stack(project_path: Path, file_index: ProjectFileIndex,
+                     source_store: Optional[SourceStore] = None) -> TechStack:
+    """Parse dependency files and detect the tech stack.
+    
+    Module-level so it can run as a process stage (without a source store).
+    
+    Args:
+        project_path: Root of the project
+        file_index: Index of the project files
+        source_store: Optional shared store of file contents
+    
+    Returns:
+        Detected tech stack
+    """
+    return DependencyParser(project_path, file_index, source_store).parse_dependencies()
 
 
 class ProjectAnalyzer:
@@ -781,212 +1162,352 @@ class ProjectAnalyzer:
             performance_config = PerformanceConfig()
         self.performance_optimizer = PerformanceOptimizer(performance_config)
         
+        # Categorization rules are loaded once and reused by repeated analyses
+        self._tech_stack_categorizer = None
+        
         logger.info(f"Initialized analyzer for project: {self.project_path} (cache: {use_cache})")
     
-    def analyze_project(self, force_refresh: bool = False) -> AnalysisResult:
+    def analyze_project(self, force_refresh: bool = False,
+                        event_callback: Optional[AnalysisEventCallback] = None,
+                        sections: Optional[List[str]] = None,
+                        profile_dir: Optional[Union[str, Path]] = None) -> AnalysisResult:
         """Analyze the entire Python project.
         
+        Only the stages needed for the requested output sections are run
+        (see analysis_stages).
+        
         Args:
             force_refresh: Force analysis even if cached result exists
+            event_callback: Optional function receiving the result as a stream of
+                events while it is produced (see AnalysisStream)
+            sections: Output sections to produce (defaults to DEFAULT_SECTIONS)
+            profile_dir: Optional directory to write a cProfile stats file per stage to
+                (a cached result is not used, so that every stage runs)
         
         Returns:
             AnalysisResult containing all analysis data
-            
+        
         Raises:
             AnalysisError: If analysis fails critically
         """
         import time
+        from performance_optimizer import AnalysisCancelledError
         start_time = time.time()
         
+        # An analyzer may be reused for several runs (e.g. by the analyzer server)
+        self.errors = []
+        self.warnings = []
+        stream = AnalysisStream(event_callback) if event_callback else None
+        sections = resolve_sections(sections)
+        
         logger.info("Starting project analysis...")
         
-        # Analyze project size and get performance recommendations
-        size_info, recommendations = self.performance_optimizer.optimize_for_project(self.project_path)
+        # Walk the project tree once and read/parse every file at most once;
+        # all stages below query the same index and store
+        file_index = ProjectFileIndex.build(self.project_path)
+        source_store = SourceStore()
         
         # Start performance monitoring
         self.performance_optimizer.start_monitoring()
         
         # Try to get cached result first
-        if self.use_cache and not force_refresh:
-            cached_result = self.cache_manager.get_cached_result(self.project_path)
-            if cached_result is not None:
+        if self.use_cache and not force_refresh and profile_dir is None:
+            cached_result = self.cache_manager.get_cached_result(self.project_path, file_index, sections)
+            cached_sections = (cached_result.get("metadata", {}).get("sections", DEFAULT_SECTIONS)
+                               if cached_result is not None else ())
+            if cached_result is not None and set(sections).issubset(cached_sections):
                 logger.info("Using cached analysis result")
                 self.performance_optimizer.stop_monitoring()
                 # Convert cached dict back to AnalysisResult
-                return self._dict_to_analysis_result(cached_result)
+                result = self._dict_to_analysis_result(cached_result, sections)
+                if stream:
+                    stream.finish(result)
+                return result
+        
+        # Analyze project size and log performance recommendations
+        self.performance_optimizer.optimize_for_project(self.project_path, file_index)
         
         try:
             # Find all Python files
-            python_files = self._discover_python_files()
+            python_files = self._discover_python_files(file_index)
             logger.info(f"Found {len(python_files)} Python files")
             
             # Filter files by size for performance
             python_files = self.performance_optimizer.filter_files_by_size(python_files)
             logger.info(f"Processing {len(python_files)} Python files after size filtering")
             
-            # Parse modules using AST parser with progress reporting
-            from ast_parser import ModuleDiscovery
-            from complexity_analyzer import ComplexityAnalyzer
+            if stream:
+                stream.send_metadata(str(self.project_path), len(python_files))
+            
+            # Run only the stages the requested sections depend on
+            stages = required_stages(sections)
+            logger.info(f"Requested sections: {', '.join(sections)}; "
+                        f"running stages: {', '.join(stage_order(stages))}")
             
-            module_discovery = ModuleDiscovery(self.project_path)
+            from complexity_analyzer import ComplexityAnalyzer
+            complexity_analyzer = ComplexityAnalyzer(source_store)
             
             # Set up progress reporting
-            self.performance_optimizer.progress_reporter.set_total_steps(len(python_files) + 5)  # +5 for other steps
-            self.performance_optimizer.progress_reporter.update_progress("Starting module discovery")
+            self.performance_optimizer.progress_reporter.set_total_steps(len(python_files) + len(stages))
+            
+            progress_reporter = self.performance_optimizer.progress_reporter
+            parallel_processor = self.performance_optimizer.parallel_processor
+            use_processes = parallel_processor.should_process_parallel(len(python_files))
+            
+            # Sources and trees are released as soon as the last stage reading
+            # them has finished, not kept alive until the whole run is done
+            store_readers = set(stages & SOURCE_STORE_STAGES)
+            source_stats = None
+            
+            def release_sources() -> None:
+                nonlocal source_stats
+                if source_stats is None:
+                    source_stats = source_store.get_stats()
+                    source_store.clear()
+            
+            def after_stage(name: str) -> None:
+                progress_reporter.update_progress(STAGE_DESCRIPTIONS[name])
+                store_readers.discard(name)
+                if not store_readers:
+                    release_sources()
+            
+            # Stages run as a DAG: each starts once the stages it reads have finished
+            executor = StageExecutor(
+                max_threads=len(stages),
+                max_processes=1 if use_processes else 0,
+                before_stage=lambda name: progress_reporter.check_cancelled(),
+                after_stage=after_stage,
+                profile_dir=profile_dir
+            )
+            results = executor.results
             
-            modules = module_discovery.discover_modules(python_files)
+            # Stages that do not work module by module reuse their previous result
+            # while the files they read are unchanged
+            stage_memo = file_hashes = None
+            if self.use_cache:
+                stage_memo = StageMemo(self.cache_manager, self.project_path, refresh=force_refresh)
+                file_hashes = self.cache_manager._get_project_file_hashes(self.project_path, file_index)
             
-            # Enhance complexity analysis using radon
-            self.performance_optimizer.progress_reporter.update_progress("Analyzing complexity")
-            complexity_analyzer = ComplexityAnalyzer()
-            enhanced_modules = []
-            for i, module in enumerate(modules):
-                enhanced_module = complexity_analyzer.enhance_module_complexity(module)
-                enhanced_modules.append(enhanced_module)
-                
-                # Periodic memory cleanup for large projects
-                if i % 100 == 0 and i > 0:
-                    self.performance_optimizer.cleanup_memory()
-            
-            # Resolve module dependencies
-            self.performance_optimizer.progress_reporter.update_progress("Resolving dependencies")
-            dependencies = module_discovery.resolve_dependencies(enhanced_modules)
-            
-            # Build module graph
-            self.performance_optimizer.progress_reporter.update_progress("Building module graph")
-            module_graph = self._build_module_graph(enhanced_modules, dependencies)
-            
-            # Parse dependencies and detect tech stack
-            self.performance_optimizer.progress_reporter.update_progress("Parsing dependencies")
-            from dependency_parser import DependencyParser
-            dependency_parser = DependencyParser(self.project_path)
-            tech_stack = dependency_parser.parse_dependencies()
-            
-            # Detect framework patterns
-            self.performance_optimizer.progress_reporter.update_progress("Detecting frameworks")
-            from framework_detector import FrameworkDetector
-            framework_detector = FrameworkDetector(self.project_path, tech_stack.frameworks)
-            framework_patterns = framework_detector.detect_patterns()
-            
-            # Add framework detection errors and warnings
-            self.errors.extend(framework_detector.errors)
-            self.warnings.extend(framework_detector.warnings)
-            
-            # Build call graph
-            self.performance_optimizer.progress_reporter.update_progress("Building call graph")
-            from call_graph import CallGraphBuilder
-            call_graph_builder = CallGraphBuilder()
-            call_graph = call_graph_builder.build_call_graph(enhanced_modules)
-            
-            # Generate enhanced module cards
-            self.performance_optimizer.progress_reporter.update_progress("Generating module cards")
-            from module_card_generator import ModuleCardGenerator
-            card_generator = ModuleCardGenerator(self.project_path)
-            module_cards = card_generator.generate_module_cards(enhanced_modules, dependencies)
+            def hashed(rel_paths: List[str]) -> List[List[str]]:
+                return [[rel_path, file_hashes.get(rel_path, "")] for rel_path in rel_paths]
             
-            # Analyze folder structure
-            self.performance_optimizer.progress_reporter.update_progress("Analyzing folder structure")
-            from folder_structure_analyzer import FolderStructureAnalyzer
-            folder_analyzer = FolderStructureAnalyzer(self.project_path)
-            folder_structure = folder_analyzer.analyze_folder_structure(enhanced_modules)
+            incremental_plan = None
+            known_call_sites = known_call_events = None
+            call_graph_builder = code_graph_builder = None
+            from ast_parser import ModuleDiscovery
+            module_discovery = ModuleDiscovery(self.project_path, source_store)
+            
+            # Files are timed, and files that exceeded the per-file limits in earlier
+            # runs get a fallback module instead of stalling the run again
+            from file_guard import FileGuard
+            config = self.performance_optimizer.config
+            file_guard = FileGuard(
+                self.project_path,
+                self.cache_manager.get_quarantined_files(self.project_path)
+                if self.use_cache and not force_refresh else None,
+                time_limit=config.file_time_limit,
+                memory_limit_mb=config.file_memory_limit_mb,
+                with_calls=bool(stages & {"call_graph", "code_graph_json"})
+            )
             
-            # Build enhanced code graph structure
-            self.performance_optimizer.progress_reporter.update_progress("Building enhanced code graph")
-            try:
-                code_graph_builder = EnhancedCodeGraphBuilder(self.project_path)
-                code_graph_json = code_graph_builder.build_code_graph(enhanced_modules)
+            def parse_modules() -> List[ModuleInfo]:
+                # Parse modules using AST parser with progress reporting
+                nonlocal incremental_plan, known_call_sites, known_call_events
+                enhanced_modules = []
                 
-                if not code_graph_json:
-                    logger.warning("Enhanced code graph builder returned empty result")
-                    code_graph_json = []
-                    
-            except Exception as e:
-                logger.error(f"Enhanced code graph building failed: {e}")
-                self._add_warning("code_graph_building", f"Enhanced code graph building failed: {e}")
-                code_graph_json = []
-            
-            # Calculate complexity statistics
-            complexity_stats = complexity_analyzer.calculate_project_complexity_stats(enhanced_modules)
-            
-            # Generate categorized tech stack using new Python-driven system
-            categorized_tech_stack = None
-            if CATEGORIZATION_AVAILABLE:
+                # Reuse modules of files unchanged since the previous run
+                if self.use_cache and not force_refresh:
+                    incremental_plan = self.incremental_analyzer.plan_incremental_run(
+                        self.project_path, python_files, file_index
+                    )
+                files_to_parse = incremental_plan.files_to_parse if incremental_plan else python_files
+                
+                def before_file(index: int) -> None:
+                    progress_reporter.check_cancelled()
+                        
+                    # Periodic memory cleanup for large projects
+                    if index % 100 == 0 and index > 0:
+                        self.performance_optimizer.cleanup_memory()
+                
+                # Parsing and complexity scoring are CPU-bound: the guard runs both in
+                # worker processes (under the per-file limits) when enough files changed,
+                # and records the calls of each module for the graph stages
+                enhanced_modules = file_guard.analyze_files(files_to_parse, module_discovery.ast_parser,
+                                                            complexity_analyzer, parallel_processor, before_file)
+                known_call_sites = dict(file_guard.call_sites)
+                known_call_events = dict(file_guard.call_events)
+                
+                if incremental_plan:
+                    enhanced_modules = self._merge_incremental_modules(python_files, enhanced_modules,
+                                                                       incremental_plan)
+                    for path, record in incremental_plan.reused.items():
+                        if record.call_sites is not None:
+                            known_call_sites[path] = record.call_sites
+                        if record.call_events is not None:
+                            known_call_events[path] = record.call_events
+                
+                # Quarantined files (including fallback modules reused from the cache)
+                # are never parsed in this process, not even for their calls
+                for module in enhanced_modules:
+                    if file_guard.is_quarantined(module.path):
+                        known_call_sites.setdefault(module.path, [])
+                        known_call_events.setdefault(module.path, [])
+                return enhanced_modules
+            
+            def detect_framework_patterns():
+                from framework_detector import FrameworkDetector
+                framework_detector = FrameworkDetector(self.project_path, results["tech_stack"].frameworks,
+                                                       source_store, file_index)
+                
+                def detect():
+                    return (framework_detector.detect_patterns(), framework_detector.errors,
+                            framework_detector.warnings)
+                
+                if stage_memo:
+                    inputs = [sorted(framework_detector.detected_frameworks),
+                              hashed(framework_detector.input_files())]
+                    framework_patterns, errors, warnings = stage_memo.memoize("framework_patterns", inputs, detect)
+                else:
+                    framework_patterns, errors, warnings = detect()
+                
+                # Add framework detection errors and warnings
+                self.errors.extend(errors)
+                self.warnings.extend(warnings)
+                return framework_patterns
+            
+            def build_call_graph():
+                nonlocal call_graph_builder
+                from call_graph import CallGraphBuilder
+                call_graph_builder = CallGraphBuilder(source_store)
+                return call_graph_builder.build_call_graph(results["modules"], known_call_sites)
+            
+            def generate_module_cards():
+                from module_card_generator import ModuleCardGenerator
+                card_generator = ModuleCardGenerator(self.project_path)
+                return card_generator.generate_module_cards(results["modules"], results["dependencies"])
+            
+            def analyze_folder_structure():
+                from folder_structure_analyzer import FolderStructureAnalyzer
+                folder_analyzer = FolderStructureAnalyzer(self.project_path, file_index)
+                if stage_memo:
+                    return stage_memo.memoize("folder_structure", folder_analyzer.memo_inputs(results["modules"]),
+                                              lambda: folder_analyzer.analyze_folder_structure(results["modules"]))
+                return folder_analyzer.analyze_folder_structure(results["modules"])
+            
+            def build_code_graph() -> List[Dict[str, Any]]:
+                # Build enhanced code graph structure
+                nonlocal code_graph_builder
+                code_graph_builder = EnhancedCodeGraphBuilder(self.project_path, source_store)
                 try:
-                    self.performance_optimizer.progress_reporter.update_progress("Categorizing technologies")
-                    logger.info("Starting Python-driven tech stack categorization...")
-                    
-                    # Initialize categorization system
-                    rules_engine = CategoryRulesEngine()
-                    categorizer = TechStackCategorizer(rules_engine)
-                    
-                    # Prepare technology data for categorization
-                    technologies = []
-                    seen_technologies = set()  # Track technologies to avoid duplicates
-                    
-                    # Add libraries from tech stack
-                    for library in tech_stack.libraries:
-                        tech_name = library.name.lower()
-                        if tech_name not in seen_technologies:
-                            technologies.append({
-                                "name": library.name,
-                                "version": library.version,
-                                "source": library.source,
-                                "confidence": 1.0
-                            })
-                            seen_technologies.add(tech_name)
-                    
-                    # Add frameworks (only if not already added as library)
-                    for framework in tech_stack.frameworks:
-                        tech_name = framework.lower()
-                        if tech_name not in seen_technologies:
-                            technologies.append({
-                                "name": framework,
-                                "source": "framework_detection",
-                                "confidence": 0.9
-                            })
-                            seen_technologies.add(tech_name)
-                    
-                    # Add Python version as a technology
-                    if tech_stack.python_version:
-                        technologies.append({
-                            "name": "python",
-                            "version": tech_stack.python_version,
-                            "source": "version_detection",
-                            "confidence": 1.0
-                        })
-                    
-                    # Add package manager
-                    technologies.append({
-                        "name": tech_stack.package_manager,
-                        "source": "package_manager_detection",
-                        "confidence": 1.0
-                    })
-                    
-                    # Perform categorization
-                    analysis_data = {
-                        "project_path": str(self.project_path),
-                        "modules": len(enhanced_modules),
-                        "complexity_stats": complexity_stats
-                    }
-                    
-                    categorized_result = categorizer.categorize_technologies(technologies, analysis_data)
-                    categorized_tech_stack = categorizer.generate_output_json(categorized_result)
-                    
-                    # Validate the output
-                    validation_result = categorizer.validate_output(categorized_tech_stack)
-                    if not validation_result["valid"]:
-                        logger.warning(f"Categorization validation failed: {validation_result['errors']}")
-                        for warning in validation_result["warnings"]:
-                            self._add_warning("categorization_validation", warning)
-                    else:
-                        logger.info(f"Categorization completed successfully: {validation_result['statistics']}")
+                    code_graph_json = code_graph_builder.build_code_graph(
+                        results["modules"], known_call_events, stream.send_node if stream else None
+                    )
                     
+                    if not code_graph_json:
+                        logger.warning("Enhanced code graph builder returned empty result")
+                        code_graph_json = []
+                
                 except Exception as e:
-                    logger.error(f"Tech stack categorization failed: {e}")
-                    self._add_warning("categorization_failure", f"Tech stack categorization failed: {e}")
-                    categorized_tech_stack = None
-            else:
-                logger.info("Python-driven categorization system not available, skipping...")
+                    logger.error(f"Enhanced code graph building failed: {e}")
+                    self._add_warning("code_graph_building", f"Enhanced code graph building failed: {e}")
+                    code_graph_json = []
+                return code_graph_json
+            
+            def categorize_tech_stack():
+                # Generate categorized tech stack using new Python-driven system
+                if not CATEGORIZATION_AVAILABLE:
+                    logger.info("Python-driven categorization system not available, skipping...")
+                    return None
+                return self._categorize_tech_stack(results["tech_stack"], len(results["modules"]),
+                                                   results["complexity_stats"], stage_memo)
+            
+            stage_functions = {
+                "dependencies": lambda: module_discovery.resolve_dependencies(results["modules"]),
+                "module_graph": lambda: self._build_module_graph(results["modules"], results["dependencies"]),
+                "framework_patterns": detect_framework_patterns,
+                "call_graph": build_call_graph,
+                "module_cards": generate_module_cards,
+                "folder_structure": analyze_folder_structure,
+                "code_graph_json": build_code_graph,
+                "complexity_stats": lambda: complexity_analyzer.calculate_project_complexity_stats(results["modules"]),
+                "categorized_tech_stack": categorize_tech_stack,
+            }
+            
+            def count_parsed_files(modules: List[ModuleInfo]) -> int:
+                return len(incremental_plan.files_to_parse) if incremental_plan else len(python_files)
+            
+            def count_modules(result: Any) -> int:
+                return len(results["modules"])
+            
+            tech_stack_memo = None
+            if stage_memo and "tech_stack" in stages:
+                # The tech stack depends on the dependency files, a few scanned
+                # modules and the interpreter version the parser reports
+                tech_stack_inputs = [sys.version,
+                                     hashed(DependencyParser(self.project_path, file_index).input_files())]
+                tech_stack_memo = stage_memo.lookup("tech_stack", tech_stack_inputs)
+            
+            for name in stage_order(stages):
+                if name == "modules":
+                    executor.add_stage(name, parse_modules, count_files=count_parsed_files)
+                elif name == "tech_stack" and tech_stack_memo and tech_stack_memo[1]:
+                    memoized_tech_stack = tech_stack_memo[2]
+                    executor.add_stage(name, lambda: memoized_tech_stack, STAGE_DEPENDENCIES[name])
+                elif name == "tech_stack" and use_processes:
+                    # Reading and parsing dependency files overlaps with module parsing
+                    # in its own process; only the picklable file index is sent along
+                    executor.add_stage(name, parse_tech_stack, STAGE_DEPENDENCIES[name], PROCESS_STAGE,
+                                       (self.project_path, file_index))
+                elif name == "tech_stack":
+                    executor.add_stage(name, parse_tech_stack, STAGE_DEPENDENCIES[name],
+                                       args=(self.project_path, file_index, source_store))
+                else:
+                    # Stages reading the parsed modules process one module per file
+                    reads_modules = "modules" in STAGE_DEPENDENCIES[name]
+                    executor.add_stage(name, stage_functions[name], STAGE_DEPENDENCIES[name],
+                                       count_files=count_modules if reads_modules else None)
+            
+            executor.run()
+            stage_stats = executor.get_stats()
+            if tech_stack_memo and not tech_stack_memo[1]:
+                stage_memo.store(tech_stack_memo[0], results["tech_stack"])
+            if stage_memo:
+                stage_stats["memoized"] = sorted(stage_memo.hits)
+            logger.info(f"Stages finished in {stage_stats['wall_time']:.2f}s, critical path "
+                        f"{' -> '.join(stage_stats['critical_path'])} ({stage_stats['critical_path_time']:.2f}s)")
+            
+            enhanced_modules = results.get("modules", [])
+            tech_stack = results.get("tech_stack")
+            code_graph_json = results.get("code_graph_json", [])
+            complexity_stats = results.get("complexity_stats")
+            categorized_tech_stack = results.get("categorized_tech_stack")
+            
+            # Optional sections are converted once here so cached results carry them as-is
+            extra_sections = {}
+            for name in ("module_graph", "call_graph", "module_cards", "folder_structure", "framework_patterns"):
+                if name in sections:
+                    extra_sections[name] = AnalysisResult._to_jsonable(results[name])
+            
+            # Release shared sources and trees before the final cleanup
+            release_sources()
+            
+            # Keep per-module results so the next run only re-parses changed files
+            incremental_stats = None
+            if incremental_plan:
+                incremental_stats = {
+                    "reused_modules": len(incremental_plan.reused),
+                    "parsed_files": len(incremental_plan.files_to_parse),
+                    "changed_files": sorted(incremental_plan.changed_files)
+                }
+            file_stats = file_guard.get_stats() if "modules" in stages else None
+            if self.use_cache and "modules" in stages:
+                quarantine = file_guard.get_quarantine(python_files, retried=force_refresh)
+                if quarantine != self.cache_manager.get_quarantined_files(self.project_path):
+                    self.cache_manager.set_quarantined_files(self.project_path, quarantine)
+                file_hashes = (incremental_plan.file_hashes if incremental_plan
+                               else self.cache_manager._get_project_file_hashes(self.project_path, file_index))
+                self._save_module_records(enhanced_modules, file_hashes, call_graph_builder,
+                                          code_graph_builder, incremental_plan.reused if incremental_plan else None)
             
             # Final memory cleanup
             self.performance_optimizer.cleanup_memory()
@@ -1001,7 +1522,12 @@ class ProjectAnalyzer:
                 total_files=len(python_files),
                 analyzed_files=len(enhanced_modules),
                 errors=self.errors.copy(),
-                warnings=self.warnings.copy()
+                warnings=self.warnings.copy(),
+                source_stats=source_stats,
+                incremental_stats=incremental_stats,
+                sections=list(sections),
+                stage_stats=stage_stats,
+                file_stats=file_stats
             )
             
             result = AnalysisResult(
@@ -1011,7 +1537,8 @@ class ProjectAnalyzer:
                 tech_stack=tech_stack,
                 code_graph_json=code_graph_json,
                 metadata=metadata,
-                categorized_tech_stack=categorized_tech_stack
+                categorized_tech_stack=categorized_tech_stack,
+                extra_sections=extra_sections
             )
             
             # Stop performance monitoring
@@ -1019,21 +1546,31 @@ class ProjectAnalyzer:
             self.performance_optimizer.progress_reporter.finish()
             
             logger.info(f"Analysis completed in {analysis_time:.2f} seconds")
-            logger.info(f"Analyzed {len(enhanced_modules)} modules with {len(module_graph.edges)} dependencies")
-            logger.info(f"Complexity stats: {complexity_stats['total_functions']} functions, "
-                       f"avg complexity: {complexity_stats['average_complexity']:.1f}")
+            logger.info(f"Analyzed {len(enhanced_modules)} modules")
+            if complexity_stats:
+                logger.info(f"Complexity stats: {complexity_stats['total_functions']} functions, "
+                           f"avg complexity: {complexity_stats['average_complexity']:.1f}")
             logger.info(f"Performance stats: {performance_stats}")
+            logger.info(f"Source store stats: {source_stats}")
+            
+            if stream:
+                stream.finish(result)
             
             # Cache the result if caching is enabled
             if self.use_cache:
                 try:
                     result_dict = result._to_dict()
-                    self.cache_manager.cache_result(self.project_path, result_dict)
+                    self.cache_manager.cache_result(self.project_path, result_dict, file_index)
                 except Exception as e:
                     logger.warning(f"Failed to cache analysis result: {e}")
             
             return result
-            
+        
+        except AnalysisCancelledError:
+            logger.info("Analysis cancelled")
+            self.performance_optimizer.stop_monitoring()
+            raise
+        
         except Exception as e:
             logger.error(f"Analysis failed: {e}")
             self._add_error("analysis_failure", str(e))
@@ -1059,7 +1596,7 @@ class ProjectAnalyzer:
             from framework_detector import FrameworkPatterns
             empty_framework_patterns = FrameworkPatterns()
             
-            return AnalysisResult(
+            result = AnalysisResult(
                 success=False,
                 errors=self.errors.copy(),
                 warnings=self.warnings.copy(),
@@ -1067,24 +1604,131 @@ class ProjectAnalyzer:
                 code_graph_json=[],
                 metadata=metadata
             )
+            if stream:
+                stream.finish(result)
+            return result
+    
+    def _categorize_tech_stack(self, tech_stack: 'TechStack', module_count: int,
+                               complexity_stats: Dict[str, Any],
+                               stage_memo: Optional[StageMemo] = None) -> Optional[Dict[str, Any]]:
+        """Categorize detected technologies with the Python-driven categorization system.
+        
+        Args:
+            tech_stack: Detected tech stack
+            module_count: Number of analyzed modules
+            complexity_stats: Project complexity statistics
+            stage_memo: Optional memo reusing the categorization of the same
+                technologies under the same classification rules
+        
+        Returns:
+            Categorized tech stack output, or None if categorization failed
+        """
+        try:
+            logger.info("Starting Python-driven tech stack categorization...")
+            
+            categorizer = self._get_tech_stack_categorizer()
+            
+            # Prepare technology data for categorization
+            technologies = []
+            seen_technologies = set()  # Track technologies to avoid duplicates
+            
+            # Add libraries from tech stack
+            for library in tech_stack.libraries:
+                tech_name = library.name.lower()
+                if tech_name not in seen_technologies:
+                    technologies.append({
+                        "name": library.name,
+                        "version": library.version,
+                        "source": library.source,
+                        "confidence": 1.0
+                    })
+                    seen_technologies.add(tech_name)
+            
+            # Add frameworks (only if not already added as library)
+            for framework in tech_stack.frameworks:
+                tech_name = framework.lower()
+                if tech_name not in seen_technologies:
+                    technologies.append({
+                        "name": framework,
+                        "source": "framework_detection",
+                        "confidence": 0.9
+                    })
+                    seen_technologies.add(tech_name)
+            
+            # Add Python version as a technology
+            if tech_stack.python_version:
+                technologies.append({
+                    "name": "python",
+                    "version": tech_stack.python_version,
+                    "source": "version_detection",
+                    "confidence": 1.0
+                })
+            
+            # Add package manager
+            technologies.append({
+                "name": tech_stack.package_manager,
+                "source": "package_manager_detection",
+                "confidence": 1.0
+            })
+            
+            # Perform categorization
+            analysis_data = {
+                "project_path": str(self.project_path),
+                "modules": module_count,
+                "complexity_stats": complexity_stats
+            }
+            
+            def categorize():
+                categorized_result = categorizer.categorize_technologies(technologies, analysis_data)
+                return categorizer.generate_output_json(categorized_result)
+            
+            if stage_memo:
+                inputs = [technologies, categorizer.rules_engine.fingerprint]
+                categorized_tech_stack = stage_memo.memoize("categorized_tech_stack", inputs, categorize)
+            else:
+                categorized_tech_stack = categorize()
+            
+            # Validate the output
+            validation_result = categorizer.validate_output(categorized_tech_stack)
+            if not validation_result["valid"]:
+                logger.warning(f"Categorization validation failed: {validation_result['errors']}")
+                for warning in validation_result["warnings"]:
+                    self._add_warning("categorization_validation", warning)
+            else:
+                logger.info(f"Categorization completed successfully: {validation_result['statistics']}")
+            
+            return categorized_tech_stack
+        
+        except Exception as e:
+            logger.error(f"Tech stack categorization failed: {e}")
+            self._add_warning("categorization_failure", f"Tech stack categorization failed: {e}")
+            return None
+    
+    def _get_tech_stack_categorizer(self) -> 'TechStackCategorizer':
+        """Get the tech stack categorizer, loading classification rules on first use.
+        
+        Returns:
+            TechStackCategorizer shared by every analysis run of this analyzer
+        """
+        if self._tech_stack_categorizer is None:
+            self._tech_stack_categorizer = TechStackCategorizer(CategoryRulesEngine())
+        return self._tech_stack_categorizer
     
-    def _discover_python_files(self) -> List[Path]:
+    def _discover_python_files(self, file_index: Optional[ProjectFileIndex] = None) -> List[Path]:
         """Discover all Python files in the project.
         
+        Args:
+            file_index: Optional shared ProjectFileIndex (built if not provided)
+        
         Returns:
             List of Python file paths
         """
         python_files = []
         
         try:
-            # Recursively find all .py files
-            for py_file in self.project_path.rglob("*.py"):
-                # Skip common directories that shouldn't be analyzed
-                if any(part.startswith('.') or part in ['__pycache__', 'node_modules', 'venv', 'env'] 
-                       for part in py_file.parts):
-                    continue
-                python_files.append(py_file)
-                
+            file_index = get_file_index(self.project_path, file_index)
+            python_files = [record.path for record in file_index.python_files()]
+        
         except Exception as e:
             self._add_error("file_discovery", f"Failed to discover Python files: {e}")
         
@@ -1107,7 +1751,7 @@ class ProjectAnalyzer:
             error["file"] = file_path
         if line:
             error["line"] = line
-            
+        
         self.errors.append(error)
         logger.error(f"Analysis error ({error_type}): {message}")
     
@@ -1125,17 +1769,87 @@ class ProjectAnalyzer:
         }
         if file_path:
             warning["file"] = file_path
-            
+        
         self.warnings.append(warning)
         logger.warning(f"Analysis warning ({warning_type}): {message}")
     
+    def _merge_incremental_modules(self, python_files: List[Path], parsed_modules: List[ModuleInfo],
+                                   incremental_plan: Any) -> List[ModuleInfo]:
+        """Combine reused and freshly parsed modules in file discovery order.
+        
+        Args:
+            python_files: All Python files analyzed in this run
+            parsed_modules: Modules parsed in this run
+            incremental_plan: IncrementalPlan with the reused module records
+        
+        Returns:
+            List of modules ordered like a full analysis would order them
+        """
+        parsed_by_path = {module.path: module for module in parsed_modules}
+        modules = []
+        
+        for file_path in python_files:
+            path = str(file_path)
+            record = incremental_plan.reused.get(path)
+            module = record.module if record is not None else parsed_by_path.get(path)
+            if module is not None:
+                modules.append(module)
+        
+        return modules
+    
+    def _save_module_records(self, modules: List[ModuleInfo], file_hashes: Dict[str, str],
+                             call_graph_builder: Any, code_graph_builder: Any,
+                             reused: Optional[Dict[str, Any]] = None) -> None:
+        """Save per-module results for incremental re-analysis.
+        
+        Call sites or call events that were not recorded in this run are
+        carried over from the reused record, or stored as None so that the
+        next run that needs them parses the file again.
+        
+        Args:
+            modules: Analyzed modules
+            file_hashes: File hashes the modules were built from
+            call_graph_builder: CallGraphBuilder used in this run (None if the call graph was skipped)
+            code_graph_builder: EnhancedCodeGraphBuilder used in this run (None if the code graph was skipped)
+            reused: Records reused in this run, keyed by module path
+        """
+        from cache_manager import ModuleRecord
+        
+        reused = reused or {}
+        
+        records = {}
+        for module in modules:
+            try:
+                rel_path = Path(module.path).relative_to(self.project_path).as_posix()
+            except ValueError:
+                continue
+            
+            file_hash = file_hashes.get(rel_path)
+            if not file_hash:
+                continue
+            
+            previous = reused.get(module.path)
+            call_sites = call_events = None
+            if call_graph_builder is not None:
+                call_sites = call_graph_builder.module_call_sites.get(module.path)
+            elif previous is not None:
+                call_sites = previous.call_sites
+            if code_graph_builder is not None:
+                call_events = code_graph_builder.module_call_events.get(module.path)
+            elif previous is not None:
+                call_events = previous.call_events
+            
+            records[rel_path] = ModuleRecord(file_hash, module, call_sites, call_events)
+        
+        self.incremental_analyzer.save_module_records(self.project_path, records)
+    
     def _build_module_graph(self, modules: List[ModuleInfo], dependencies: Dict[str, Set[str]]) -> ModuleGraph:
         """Build module dependency graph.
         
         Args:
             modules: List of parsed modules
             dependencies: Dictionary of module dependencies
-            
+        
         Returns:
             ModuleGraph object
         """
@@ -1169,12 +1883,14 @@ class ProjectAnalyzer:
         
         return ModuleGraph(nodes=nodes, edges=edges)
     
-    def _dict_to_analysis_result(self, data: Dict[str, Any]) -> AnalysisResult:
+    def _dict_to_analysis_result(self, data: Dict[str, Any],
+                                 sections: Optional[Tuple[str, ...]] = None) -> AnalysisResult:
         """Convert dictionary back to AnalysisResult object.
         
         Args:
             data: Dictionary representation of analysis result
-            
+            sections: Sections to keep (defaults to the sections stored in the result)
+        
         Returns:
             AnalysisResult object
         """
@@ -1207,9 +1923,16 @@ class ProjectAnalyzer:
             total_files=metadata_data.get("total_files", 0),
             analyzed_files=metadata_data.get("analyzed_files", 0),
             errors=data.get("errors", []),
-            warnings=data.get("warnings", [])
+            warnings=data.get("warnings", []),
+            sections=list(sections or metadata_data.get("sections", DEFAULT_SECTIONS))
         )
         
+        categorized_tech_stack = None
+        if "categorized_tech_stack" in metadata.sections and data.get("categorized_tech_stack"):
+            categorized_tech_stack = {"categorized_tech_stack": data["categorized_tech_stack"]}
+        extra_sections = {name: data[name] for name in metadata.sections
+                          if name in data and name not in AnalysisResult.CORE_SECTIONS}
+        
         # Reconstruct code_graph_json from cached data
         code_graph_data = data.get("code_graph_json", [])
         code_graph_json = []
@@ -1227,7 +1950,9 @@ class ProjectAnalyzer:
             warnings=data.get("warnings", []),
             tech_stack=tech_stack,
             code_graph_json=code_graph_json,
-            metadata=metadata
+            metadata=metadata,
+            categorized_tech_stack=categorized_tech_stack,
+            extra_sections=extra_sections
         )
     
     def _reconstruct_code_graph_nodes(self, nodes_data: List[Dict[str, Any]]) -> List[CodeGraphNode]:
@@ -1235,7 +1960,7 @@ class ProjectAnalyzer:
         
         Args:
             nodes_data: List of dictionary representations of CodeGraphNode objects
-            
+        
         Returns:
             List of reconstructed CodeGraphNode objects
         """
@@ -1279,13 +2004,58 @@ class ProjectAnalyzer:
                 )
                 
                 nodes.append(node)
-                
+            
             except Exception as e:
                 logger.warning(f"Failed to reconstruct code graph node: {e}")
                 continue
         
         return nodes
-
+    
+    def write_cached_json(self, output: BinaryIO,
+                          sections: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Write the cached result for the project's current files as JSON, if there is one.
+        
+        The fast path for repeated analyses: the cached sections are copied to
+        output as stored, without rebuilding an AnalysisResult and serializing
+        it again. The JSON is compact but otherwise matches to_json() of the
+        result analyze_project would return from the cache; only the metadata
+        is rewritten (with the current timestamp).
+        
+        Args:
+            output: Binary stream to write to
+            sections: Output sections to write (defaults to DEFAULT_SECTIONS)
+        
+        Returns:
+            The success, errors, warnings and metadata written, or None if no
+            cached result covers the requested sections (nothing is written)
+        """
+        if not self.use_cache:
+            return None
+        
+        from datetime import datetime
+        sections = resolve_sections(sections)
+        
+        def prepare(base: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            metadata = base.get("metadata", {})
+            if not set(sections).issubset(metadata.get("sections", DEFAULT_SECTIONS)):
+                return None
+            # Same metadata as _dict_to_analysis_result(...).to_json() produces
+            return {
+                "metadata": {
+                    "project_path": metadata.get("project_path", ""),
+                    "analysis_time": metadata.get("analysis_time", 0.0),
+                    "total_files": metadata.get("total_files", 0),
+                    "analyzed_files": metadata.get("analyzed_files", 0),
+                    "timestamp": datetime.now().isoformat(),
+                    "sections": list(sections)
+                },
+                "schema_version": SCHEMA_VERSION
+            }
+        
+        file_index = ProjectFileIndex.build(self.project_path)
+        return self.cache_manager.write_cached_result(self.project_path, output.write, file_index,
+                                                      sections, prepare)
+    
     def clear_cache(self):
         """Clear analysis cache."""
         if self.cache_manager:
@@ -1312,12 +2082,71 @@ class ProjectAnalyzer:
             return self.cache_manager.get_cache_stats()
         return None
     
+    def get_cache_report(self) -> Optional[Dict[str, Any]]:
+        """Summarize this project's recent cache lookups.
+        
+        Returns:
+            Hits, misses and invalidations with their reasons, time saved and
+            the files invalidating results most often, or None if cache not enabled
+        """
+        if self.cache_manager:
+            return self.cache_manager.get_cache_report(self.project_path)
+        return None
+    
+    def export_cache(self, bundle_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+        """Write this project's cached module artifacts to a bundle file.
+        
+        Args:
+            bundle_path: Bundle file to write
+        
+        Returns:
+            Export statistics or None if cache not enabled
+        
+        Raises:
+            BundleError: If the project has no cached module artifacts
+        """
+        if self.cache_manager:
+            return self.cache_manager.export_bundle(self.project_path, Path(bundle_path))
+        return None
+    
+    def import_cache(self, bundle_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+        """Seed the cache with the module artifacts of a bundle file.
+        
+        Args:
+            bundle_path: Bundle file written by export_cache (e.g. on CI)
+        
+        Returns:
+            Import statistics or None if cache not enabled
+        
+        Raises:
+            BundleError: If the bundle cannot be imported
+        """
+        if self.cache_manager:
+            return self.cache_manager.import_bundle(Path(bundle_path))
+        return None
+    
+    def warm_cache(self, sections: Optional[List[str]] = None,
+                   open_files: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+        """Precompute the results a workspace is likely to ask for first (see CacheWarmer).
+        
+        Args:
+            sections: Output sections of the project analysis (defaults to DEFAULT_SECTIONS)
+            open_files: Paths of the files open in the editor
+        
+        Returns:
+            Warm-up statistics or None if cache not enabled
+        """
+        if self.cache_manager:
+            from cache_warmer import CacheWarmer
+            return CacheWarmer(self).warm(sections, open_files)
+        return None
+    
     def analyze_current_file(self, file_path: Union[str, Path]) -> Optional['FileAnalysisResult']:
         """Analyze a single Python file for current file analysis.
         
         Args:
             file_path: Path to the Python file to analyze
-            
+        
         Returns:
             FileAnalysisResult object or None if analysis fails
         """
@@ -1332,7 +2161,7 @@ class ProjectAnalyzer:
             
             # Parse the file using AST parser
             from ast_parser import ASTParser
-            ast_parser = ASTParser()
+            ast_parser = ASTParser(project_path=self.project_path)
             module_info = ast_parser.parse_file(file_path)
             
             if not module_info:
@@ -1413,7 +2242,7 @@ class ProjectAnalyzer:
             
             logger.info(f"Successfully analyzed file: {file_path}")
             return result
-            
+        
         except Exception as e:
             logger.error(f"Failed to analyze current file {file_path}: {e}")
             return None
@@ -1429,26 +2258,59 @@ def main():
     parser.add_argument("--force-refresh", action="store_true", help="Force refresh even if cache exists")
     parser.add_argument("--clear-cache", action="store_true", help="Clear cache and exit")
     parser.add_argument("--cache-stats", action="store_true", help="Show cache statistics and exit")
+    parser.add_argument("--cache-report", action="store_true",
+                        help="Summarize the project's recent cache hits, misses and invalidations and exit")
+    parser.add_argument("--export-cache", metavar="FILE",
+                        help="Write the project's cached module artifacts to a bundle file and exit")
+    parser.add_argument("--import-cache", metavar="FILE",
+                        help="Seed the cache from a bundle file written by --export-cache and exit")
+    parser.add_argument("--warm", action="store_true",
+                        help="Precompute the cache at low priority (e.g. when a workspace opens) and exit")
+    parser.add_argument("--open-file", action="append", default=[], metavar="FILE",
+                        help="File open in the editor whose analysis --warm precomputes (repeatable)")
+    parser.add_argument("--cache-dir", help="Cache directory (default: ~/.codemindmap_cache)")
     parser.add_argument("--max-workers", type=int, help="Maximum number of parallel workers")
     parser.add_argument("--max-memory", type=int, default=1024, help="Maximum memory usage in MB")
     parser.add_argument("--max-file-size", type=int, default=10, help="Skip files larger than this (MB)")
-    parser.add_argument("--no-parallel", action="store_true", help="Disable parallel processing")
+    parser.add_argument("--file-time-limit", type=int, default=20,
+                        help="CPU seconds a worker may spend on one file before it is quarantined (0 = no limit)")
+    parser.add_argument("--file-memory-limit", type=int, default=1024,
+                        help="Memory in MB a worker may allocate for one file before it is quarantined "
+                             "(0 = no limit)")
+    parser.add_argument("--no-parallel", action="store_true",
+                        help="Disable parallel processing (files are then timed but not limited, and "
+                             "offending files are only quarantined for later runs)")
     parser.add_argument("--no-monitoring", action="store_true", help="Disable memory monitoring")
+    parser.add_argument("--sections",
+                        help="Comma-separated output sections to compute, or 'all' "
+                             f"(available: {', '.join(OUTPUT_SECTIONS)}; default: {', '.join(DEFAULT_SECTIONS)})")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream results as newline-delimited JSON events instead of one JSON document")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="Write a cProfile stats file per analysis stage (<stage>.pstats) to DIR")
     
     args = parser.parse_args()
     
     try:
         # Create performance configuration
         from performance_optimizer import PerformanceConfig
+        from cache_warmer import WARMUP_MAX_WORKERS, lower_priority
+        if args.warm:
+            # Warming runs in the background: yield the CPU and use few workers
+            lower_priority()
         perf_config = PerformanceConfig(
-            max_workers=args.max_workers,
+            max_workers=args.max_workers or (WARMUP_MAX_WORKERS if args.warm else None),
             max_memory_mb=args.max_memory,
             max_file_size_mb=args.max_file_size,
+            file_time_limit=args.file_time_limit,
+            file_memory_limit_mb=args.file_memory_limit,
             enable_parallel=not args.no_parallel,
             enable_memory_monitoring=not args.no_monitoring
         )
         
-        analyzer = ProjectAnalyzer(args.project_path, use_cache=not args.no_cache, performance_config=perf_config)
+        analyzer = ProjectAnalyzer(args.project_path, use_cache=not args.no_cache,
+                                   cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+                                   performance_config=perf_config)
         
         # Handle cache-only operations
         if args.clear_cache:
@@ -1464,15 +2326,47 @@ def main():
                 print("Cache not enabled")
             sys.exit(0)
         
-        # Perform analysis
-        result = analyzer.analyze_project(force_refresh=args.force_refresh)
+        if args.cache_report:
+            report = analyzer.get_cache_report()
+            print(json.dumps(report, indent=2) if report is not None else "Cache not enabled")
+            sys.exit(0)
         
-        # Output JSON result
-        print(result.to_json())
+        for bundle_path, operation in ((args.export_cache, analyzer.export_cache),
+                                       (args.import_cache, analyzer.import_cache)):
+            if bundle_path:
+                stats = operation(bundle_path)
+                print(json.dumps(stats, indent=2) if stats is not None else "Cache not enabled")
+                sys.exit(0)
+        
+        sections = resolve_sections(args.sections) if args.sections else None
+        if args.warm:
+            stats = analyzer.warm_cache(sections, args.open_file)
+            print(json.dumps(stats, indent=2) if stats is not None else "Cache not enabled")
+            sys.exit(0)
+        
+        # Perform analysis, streaming events as they are produced if requested
+        if args.stream:
+            result = analyzer.analyze_project(force_refresh=args.force_refresh,
+                                              event_callback=NDJSONEventWriter(sys.stdout),
+                                              sections=sections, profile_dir=args.profile)
+        else:
+            # A cached result is copied to stdout as stored, without rebuilding it
+            if not args.force_refresh and not args.profile:
+                cached = analyzer.write_cached_json(sys.stdout.buffer, sections)
+                if cached is not None:
+                    sys.stdout.buffer.write(b"\n")
+                    sys.stdout.flush()
+                    sys.exit(0 if cached.get("success", True) else 1)
+            
+            result = analyzer.analyze_project(force_refresh=args.force_refresh, sections=sections,
+                                              profile_dir=args.profile)
+            
+            # Output JSON result
+            print(result.to_json())
         
         # Exit with appropriate code
         sys.exit(0 if result.success else 1)
-        
+    
     except Exception as e:
         logger.error(f"Fatal error: {e}")
         error_result = {
@@ -1480,7 +2374,10 @@ def main():
             "errors": [{"type": "fatal_error", "message": str(e)}],
             "warnings": []
         }
-        print(json.dumps(error_result, indent=2))
+        if args.stream:
+            NDJSONEventWriter(sys.stdout)("summary", error_result)
+        else:
+            print(json.dumps(error_result, indent=2))
         sys.exit(1)
 
 
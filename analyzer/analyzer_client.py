@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Analyzer Client for DoraCodeLens
+
+Minimal client for the analyzer server (analyzer_server.py). It starts the
+server as a subprocess and exchanges newline-delimited JSON-RPC messages
+with it. It is used by the server tests and can be run from the command
+line to exercise a running server by hand, e.g.:
+    
+    python analyzer_client.py analyzeProject '{"project_path": "."}' --repeat 3
+"""
+
+import argparse
+import itertools
+import json
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+SERVER_SCRIPT = Path(__file__).parent / "analyzer_server.py"
+
+
+class AnalyzerClientError(Exception):
+    """Error response returned by the analyzer server."""
+    
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(f"{message} (code {code})")
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class AnalyzerClient:
+    """Client that runs the analyzer server in a subprocess."""
+    
+    def __init__(self, server_args: Optional[List[str]] = None, python_executable: Optional[str] = None,
+                 stderr: Any = None,
+                 notification_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None):
+        """Initialize the client.
+        
+        Args:
+            server_args: Extra command line arguments for the server
+            python_executable: Python interpreter used to run the server (defaults to the current one)
+            stderr: Destination of the server's log output (defaults to this process's stderr)
+            notification_callback: Optional function called with the method and params of
+                each notification sent by the server (called on the reader thread)
+        """
+        self.server_args = server_args or []
+        self.python_executable = python_executable or sys.executable
+        self.stderr = stderr
+        self.notification_callback = notification_callback
+        self.process: Optional[subprocess.Popen] = None
+        
+        self._ids = itertools.count(1)
+        self._pending: Dict[Any, Future] = {}
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._reader: Optional[threading.Thread] = None
+    
+    def start(self) -> 'AnalyzerClient':
+        """Start the server subprocess.
+        
+        Returns:
+            The client itself
+        """
+        self.process = subprocess.Popen(
+            [self.python_executable, str(SERVER_SCRIPT)] + self.server_args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self.stderr,
+            cwd=str(SERVER_SCRIPT.parent),
+            text=True,
+            bufsize=1
+        )
+        self._reader = threading.Thread(target=self._read_responses, name="analyzer-client-reader",
+                                        daemon=True)
+        self._reader.start()
+        return self
+    
+    def send_request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Future:
+        """Send a request without waiting for its response.
+        
+        Args:
+            method: Method name
+            params: Method parameters
+        
+        Returns:
+            Future resolved with the result, or failed with AnalyzerClientError
+        """
+        request_id = next(self._ids)
+        future = Future()
+        future.request_id = request_id
+        with self._pending_lock:
+            self._pending[request_id] = future
+        
+        self._write({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}})
+        return future
+    
+    def request(self, method: str, params: Optional[Dict[str, Any]] = None,
+                timeout: Optional[float] = None) -> Any:
+        """Send a request and wait for its result.
+        
+        Args:
+            method: Method name
+            params: Method parameters
+            timeout: Seconds to wait for the response
+        
+        Returns:
+            Result of the request
+        
+        Raises:
+            AnalyzerClientError: If the server returned an error
+        """
+        return self.send_request(method, params).result(timeout)
+    
+    def notify(self, method: str, params: Optional[Dict[str, Any]] = None) -> None:
+        """Send a notification, which receives no response."""
+        self._write({"jsonrpc": "2.0", "method": method, "params": params or {}})
+    
+    def cancel(self, future: Future) -> None:
+        """Ask the server to cancel a request sent with send_request."""
+        self.notify("$/cancelRequest", {"id": future.request_id})
+    
+    def close(self, timeout: float = 30.0) -> Optional[int]:
+        """Shut the server down and wait for it to exit.
+        
+        Args:
+            timeout: Seconds to wait for the server
+        
+        Returns:
+            Exit code of the server process
+        """
+        if self.process is None:
+            return None
+        
+        if self.process.poll() is None:
+            try:
+                self.request("shutdown", timeout=timeout)
+            except Exception:
+                pass
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            try:
+                self.process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        
+        if self._reader is not None:
+            self._reader.join(timeout)
+        return self.process.returncode
+    
+    def __enter__(self) -> 'AnalyzerClient':
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _write(self, message: Dict[str, Any]) -> None:
+        """Write one message to the server."""
+        with self._write_lock:
+            self.process.stdin.write(json.dumps(message) + "\n")
+            self.process.stdin.flush()
+    
+    def _read_responses(self) -> None:
+        """Resolve pending futures from server responses until the server exits."""
+        for line in self.process.stdout:
+            if not line.strip():
+                continue
+            message = json.loads(line)
+            if "id" not in message:
+                if self.notification_callback:
+                    self.notification_callback(message.get("method"), message.get("params"))
+                continue
+            
+            with self._pending_lock:
+                future = self._pending.pop(message.get("id"), None)
+            if future is None:
+                continue
+            
+            if "error" in message:
+                error = message["error"]
+                future.set_exception(AnalyzerClientError(error["code"], error["message"], error.get("data")))
+            else:
+                future.set_result(message.get("result"))
+        
+        # Server exited: fail whatever is still waiting
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(AnalyzerClientError(-32603, "Server exited"))
+
+
+def main():
+    """Send one request to a fresh server and print the result and timings."""
+    parser = argparse.ArgumentParser(description='Send a request to the DoraCodeLens analyzer server')
+    parser.add_argument('method', help='Method name, e.g. analyzeProject')
+    parser.add_argument('params', nargs='?', default='{}', help='Method parameters as a JSON object')
+    parser.add_argument('--repeat', type=int, default=1, help='Send the request this many times')
+    parser.add_argument('--quiet', action='store_true', help='Only print timings')
+    
+    args = parser.parse_args()
+    params = json.loads(args.params)
+    
+    with AnalyzerClient() as client:
+        for i in range(args.repeat):
+            start_time = time.time()
+            try:
+                result = client.request(args.method, params)
+            except AnalyzerClientError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+            print(f"Request {i + 1}: {(time.time() - start_time) * 1000:.1f} ms", file=sys.stderr)
+        
+        if not args.quiet:
+            print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
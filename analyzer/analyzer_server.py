@@ -0,0 +1,634 @@
+#!/usr/bin/env python3
+"""
+Analyzer Server for DoraCodeLens
+
+This module runs the analyzers as one long-lived process that speaks
+JSON-RPC 2.0 over stdin/stdout. Each message is a single JSON object on
+its own line. Keeping the process alive avoids paying interpreter startup,
+module imports and classification rule loading for every analysis, and
+lets per-project analyzers keep their cache metadata in memory between
+requests.
+
+Analysis requests run concurrently on a thread pool. Requests for the same
+project are serialized, since a ProjectAnalyzer is not thread-safe. A
+running request can be cancelled with `cancelRequest` (or the LSP-style
+`$/cancelRequest` notification); project analysis stops at its next
+progress step, other analyses are only cancelled while still queued.
+`shutdown` waits for running requests on its own thread, so `cancelRequest`
+and `exit` are still handled while the server drains.
+
+Methods:
+    initialize, ping, status, shutdown, exit, cancelRequest
+    analyzeProject        {project_path, force_refresh?, use_cache?, stream?, sections?}
+    analyzeCurrentFile    {file_path, project_path?}
+    warmProject           {project_path, open_files?, sections?}
+    analyzeDatabaseSchema {project_path}
+    analyzeGitRepository  {repo_path, start_date?, end_date?}
+    getCacheStats         {project_path?}
+    clearCache            {project_path?}
+
+With `stream: true`, analyzeProject sends its result as `analysisEvent`
+notifications ({id, event, data}, see analyzer.AnalysisStream) while the
+analysis runs, and responds with only the success flag. Otherwise a cached
+result is copied into the response as stored, without decoding it.
+
+`warmProject` (sent when a workspace opens) pre-analyzes the project and the
+open and recently changed files in a background process at low priority; an
+analyzeProject request for a project being warmed waits for the warm-up and
+is then answered from the cache.
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TextIO, Tuple
+
+from analyzer import AnalysisResult, ProjectAnalyzer
+from analysis_stages import resolve_sections
+from cache_warmer import WARMUP_MAX_WORKERS
+from performance_optimizer import AnalysisCancelledError, PerformanceConfig
+
+logger = logging.getLogger(__name__)
+
+SERVER_NAME = "doracodelens-analyzer"
+SERVER_VERSION = "1.0.0"
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+# LSP code for a request cancelled by the client
+REQUEST_CANCELLED = -32800
+
+# Interval at which a request waiting for a warm-up checks for cancellation
+WARMUP_POLL_INTERVAL = 0.1  # seconds
+
+
+class RequestError(Exception):
+    """Error reported to the client as a JSON-RPC error response."""
+    
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class RawJSON:
+    """Handler result that is already serialized as JSON and sent as-is."""
+    
+    def __init__(self, text: str):
+        self.text = text
+
+
+@dataclass
+class ActiveRequest:
+    """A request that is queued or running on the server."""
+    id: Any
+    method: str
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    started_at: float = field(default_factory=time.time)
+
+
+class AnalyzerServer:
+    """JSON-RPC server exposing the project, current file, database schema and git analyzers."""
+    
+    def __init__(self, input_stream: Optional[TextIO] = None, output_stream: Optional[TextIO] = None,
+                 max_concurrent_requests: int = 4, cache_dir: Optional[Path] = None,
+                 performance_config: Optional[PerformanceConfig] = None):
+        """Initialize the server.
+        
+        Args:
+            input_stream: Stream requests are read from (defaults to stdin)
+            output_stream: Stream responses are written to (defaults to stdout)
+            max_concurrent_requests: Number of requests processed at the same time
+            cache_dir: Cache directory used by project analyzers (optional)
+            performance_config: Performance configuration for project analyzers (optional)
+        """
+        self.input_stream = input_stream or sys.stdin
+        self.output_stream = output_stream or sys.stdout
+        self.max_concurrent_requests = max_concurrent_requests
+        self.cache_dir = cache_dir
+        self.performance_config = performance_config
+        
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_requests,
+                                            thread_name_prefix="analyzer-request")
+        self._write_lock = threading.Lock()
+        self._requests_lock = threading.Lock()
+        self._requests: Dict[Any, ActiveRequest] = {}
+        
+        # Warm state kept across requests
+        self._state_lock = threading.Lock()
+        self._project_analyzers: Dict[Tuple[str, bool], ProjectAnalyzer] = {}
+        self._project_locks: Dict[str, threading.Lock] = {}
+        self._warmups: Dict[str, subprocess.Popen] = {}  # Warm-up processes by project path
+        
+        self._running = False
+        self._shutting_down = False
+        self._shutdown_thread: Optional[threading.Thread] = None
+        self.started_at = time.time()
+        self.requests_served = 0
+        
+        # method name -> (handler, runs on the request thread pool)
+        self._methods: Dict[str, Tuple[Callable[[Dict[str, Any], ActiveRequest], Any], bool]] = {
+            "initialize": (self._handle_initialize, False),
+            "ping": (self._handle_ping, False),
+            "status": (self._handle_status, False),
+            "shutdown": (self._handle_shutdown, False),
+            "exit": (self._handle_exit, False),
+            "cancelRequest": (self._handle_cancel_request, False),
+            "warmProject": (self._handle_warm_project, False),
+            "$/cancelRequest": (self._handle_cancel_request, False),
+            "analyzeProject": (self._handle_analyze_project, True),
+            "analyzeCurrentFile": (self._handle_analyze_current_file, True),
+            "analyzeDatabaseSchema": (self._handle_analyze_database_schema, True),
+            "analyzeGitRepository": (self._handle_analyze_git_repository, True),
+            "getCacheStats": (self._handle_get_cache_stats, True),
+            "clearCache": (self._handle_clear_cache, True),
+        }
+    
+    def serve_forever(self) -> None:
+        """Read and dispatch requests until exit, shutdown or end of input."""
+        self._running = True
+        logger.info(f"{SERVER_NAME} {SERVER_VERSION} listening on stdio (pid {os.getpid()})")
+        
+        try:
+            while self._running:
+                line = self.input_stream.readline()
+                if not line:
+                    logger.info("Input closed, stopping server")
+                    break
+                if line.strip():
+                    self.handle_message(line)
+        finally:
+            self._running = False
+            if self._shutdown_thread is None:
+                self._cancel_all()
+            else:
+                # A requested shutdown still lets running requests finish (unless exit cancelled them)
+                self._shutdown_thread.join()
+            self._executor.shutdown(wait=True)
+    
+    def handle_message(self, line: str) -> None:
+        """Parse and dispatch a single JSON-RPC message.
+        
+        Args:
+            line: One line of input containing a JSON object
+        """
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError as e:
+            self._send_error(None, PARSE_ERROR, f"Parse error: {e}", force=True)
+            return
+        
+        if not isinstance(message, dict) or not isinstance(message.get("method"), str):
+            request_id = message.get("id") if isinstance(message, dict) else None
+            self._send_error(request_id, INVALID_REQUEST, "Invalid request", force=True)
+            return
+        
+        request_id = message.get("id")
+        method = message["method"]
+        params = message.get("params") or {}
+        
+        if method not in self._methods:
+            self._send_error(request_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+            return
+        if not isinstance(params, dict):
+            self._send_error(request_id, INVALID_PARAMS, "Params must be an object")
+            return
+        
+        handler, run_async = self._methods[method]
+        request = ActiveRequest(id=request_id, method=method)
+        
+        if method == "shutdown":
+            if self._shutdown_thread is not None:
+                self._send_error(request_id, INVALID_REQUEST, "Server is shutting down")
+                return
+            # Stop accepting analysis requests now, but wait for the running ones
+            # off the reader thread so that cancelRequest and exit are still read
+            self._shutting_down = True
+            self._shutdown_thread = threading.Thread(target=self._run_request, args=(request, handler, params),
+                                                     name="analyzer-shutdown", daemon=True)
+            self._shutdown_thread.start()
+            return
+        
+        if not run_async:
+            self._run_request(request, handler, params)
+            return
+        
+        if self._shutting_down:
+            self._send_error(request_id, INVALID_REQUEST, "Server is shutting down")
+            return
+        
+        if request_id is not None:
+            with self._requests_lock:
+                if request_id in self._requests:
+                    self._send_error(request_id, INVALID_REQUEST, f"Duplicate request id: {request_id}")
+                    return
+                self._requests[request_id] = request
+        
+        self._executor.submit(self._run_request, request, handler, params)
+    
+    def _run_request(self, request: ActiveRequest, handler: Callable[[Dict[str, Any], ActiveRequest], Any],
+                     params: Dict[str, Any]) -> None:
+        """Run a handler and send its response.
+        
+        Args:
+            request: Request being processed
+            handler: Method handler
+            params: Request parameters
+        """
+        try:
+            if request.cancel_event.is_set():
+                raise RequestError(REQUEST_CANCELLED, "Request cancelled")
+            
+            request.started_at = time.time()
+            result = handler(params, request)
+            self._send_result(request.id, result)
+        
+        except RequestError as e:
+            self._send_error(request.id, e.code, e.message, e.data)
+        except AnalysisCancelledError:
+            self._send_error(request.id, REQUEST_CANCELLED, "Request cancelled")
+        except Exception as e:
+            logger.error(f"Request {request.method} failed: {e}", exc_info=True)
+            self._send_error(request.id, INTERNAL_ERROR, str(e), {"type": type(e).__name__})
+        finally:
+            with self._requests_lock:
+                if self._requests.get(request.id) is request:
+                    del self._requests[request.id]
+                self.requests_served += 1
+            logger.debug(f"{request.method} finished in {time.time() - request.started_at:.2f}s")
+    
+    def _send(self, message: Dict[str, Any]) -> None:
+        """Write one message to the output stream.
+        
+        Args:
+            message: JSON-RPC message
+        """
+        self._write_line(json.dumps(message, default=AnalysisResult._json_serializer, separators=(',', ':')))
+    
+    def _write_line(self, data: str) -> None:
+        """Write one serialized message to the output stream."""
+        with self._write_lock:
+            self.output_stream.write(data + "\n")
+            self.output_stream.flush()
+    
+    def _send_result(self, request_id: Any, result: Any) -> None:
+        """Send a success response; notifications receive no response."""
+        if request_id is None:
+            return
+        if isinstance(result, RawJSON):
+            envelope = json.dumps({"jsonrpc": "2.0", "id": request_id}, separators=(',', ':'))
+            self._write_line(envelope[:-1] + ',"result":' + result.text + "}")
+        else:
+            self._send({"jsonrpc": "2.0", "id": request_id, "result": result})
+    
+    def _send_error(self, request_id: Any, code: int, message: str, data: Any = None,
+                    force: bool = False) -> None:
+        """Send an error response.
+        
+        Args:
+            request_id: Request id (None for notifications)
+            code: JSON-RPC error code
+            message: Error message
+            data: Optional additional error data
+            force: Respond even without a request id (parse and invalid request errors)
+        """
+        if request_id is None and not force:
+            logger.warning(f"Notification failed: {message}")
+            return
+        
+        error = {"code": code, "message": message}
+        if data is not None:
+            error["data"] = data
+        self._send({"jsonrpc": "2.0", "id": request_id, "error": error})
+    
+    def _cancel_all(self) -> None:
+        """Request cancellation of every queued or running request."""
+        with self._requests_lock:
+            for request in self._requests.values():
+                request.cancel_event.set()
+    
+    # Protocol methods
+    
+    def _handle_initialize(self, params: Dict[str, Any], request: ActiveRequest) -> Dict[str, Any]:
+        """Describe the server and its methods."""
+        return {
+            "serverInfo": {"name": SERVER_NAME, "version": SERVER_VERSION, "pid": os.getpid()},
+            "capabilities": {
+                "methods": sorted(self._methods),
+                "cancellation": True,
+                "maxConcurrentRequests": self.max_concurrent_requests
+            }
+        }
+    
+    def _handle_ping(self, params: Dict[str, Any], request: ActiveRequest) -> str:
+        """Answer a liveness check."""
+        return "pong"
+    
+    def _handle_status(self, params: Dict[str, Any], request: ActiveRequest) -> Dict[str, Any]:
+        """Report active requests and warm state."""
+        now = time.time()
+        with self._requests_lock:
+            active = [
+                {"id": r.id, "method": r.method, "elapsed": now - r.started_at,
+                 "cancelled": r.cancel_event.is_set()}
+                for r in self._requests.values()
+            ]
+            requests_served = self.requests_served
+        with self._state_lock:
+            warm_projects = sorted({path for path, _ in self._project_analyzers})
+            warming_projects = sorted(path for path, process in self._warmups.items() if process.poll() is None)
+        
+        return {
+            "uptime": now - self.started_at,
+            "requests_served": requests_served,
+            "active_requests": active,
+            "warm_projects": warm_projects,
+            "warming_projects": warming_projects
+        }
+    
+    def _handle_shutdown(self, params: Dict[str, Any], request: ActiveRequest) -> None:
+        """Wait for running requests to finish, then stop the server (runs on its own thread)."""
+        logger.info("Shutdown requested, waiting for running requests")
+        self._shutting_down = True
+        self._executor.shutdown(wait=True)
+        self._running = False
+        return None
+    
+    def _handle_exit(self, params: Dict[str, Any], request: ActiveRequest) -> None:
+        """Stop the server, cancelling running requests."""
+        self._running = False
+        self._cancel_all()
+        return None
+    
+    def _handle_cancel_request(self, params: Dict[str, Any], request: ActiveRequest) -> Dict[str, Any]:
+        """Cancel a queued or running request."""
+        target_id = self._require_param(params, "id")
+        with self._requests_lock:
+            target = self._requests.get(target_id)
+            if target is not None:
+                target.cancel_event.set()
+        
+        if target is not None:
+            logger.info(f"Cancellation requested for {target.method} ({target_id})")
+        return {"cancelled": target is not None}
+    
+    # Analysis methods
+    
+    def _handle_analyze_project(self, params: Dict[str, Any], request: ActiveRequest) -> Any:
+        """Run a full project analysis on a warm ProjectAnalyzer, or send its cached result."""
+        project_path = self._require_directory(params, "project_path")
+        use_cache = bool(params.get("use_cache", True))
+        force_refresh = bool(params.get("force_refresh", False))
+        try:
+            sections = resolve_sections(params.get("sections"))
+        except ValueError as e:
+            raise RequestError(INVALID_PARAMS, str(e))
+        
+        event_callback = None
+        if params.get("stream"):
+            def event_callback(event: str, data: Dict[str, Any]) -> None:
+                self._send({"jsonrpc": "2.0", "method": "analysisEvent",
+                            "params": {"id": request.id, "event": event, "data": data}})
+        
+        if use_cache and not force_refresh:
+            # The warm-up is likely to finish sooner than a second analysis started now
+            self._wait_for_warmup(project_path, request)
+        
+        with self._get_project_lock(project_path):
+            analyzer = self._get_project_analyzer(project_path, use_cache)
+            if event_callback is None and not force_refresh:
+                output = io.BytesIO()
+                if analyzer.write_cached_json(output, sections) is not None:
+                    return RawJSON(output.getvalue().decode())
+            
+            progress_reporter = analyzer.performance_optimizer.progress_reporter
+            progress_reporter.cancel_event = request.cancel_event
+            try:
+                result = analyzer.analyze_project(force_refresh=force_refresh, event_callback=event_callback,
+                                                  sections=sections)
+            finally:
+                progress_reporter.cancel_event = None
+        
+        if event_callback:
+            return {"success": result.success, "streamed": True}
+        return result._to_dict()
+    
+    def _handle_analyze_current_file(self, params: Dict[str, Any], request: ActiveRequest) -> Dict[str, Any]:
+        """Analyze a single Python file, reusing the cached result of unchanged content."""
+        from cache_manager import CacheManager
+        from current_file_analyzer import CurrentFileAnalyzer
+        
+        file_path = Path(self._require_param(params, "file_path"))
+        project_path = params.get("project_path")
+        
+        # A cache manager of its own: warm project analyzers may be busy on other threads
+        analyzer = CurrentFileAnalyzer(Path(project_path) if project_path else None,
+                                       CacheManager(self.cache_dir))
+        return analyzer.analyze_file(file_path).to_dict()
+    
+    def _handle_warm_project(self, params: Dict[str, Any], request: ActiveRequest) -> Dict[str, Any]:
+        """Start pre-analyzing a project in the background, unless it is being warmed already.
+        
+        The warm-up runs as `analyzer.py --warm` in its own process, which
+        lowers its own priority without slowing down the server, and fills
+        the cache directory the server reads.
+        """
+        project_path = self._require_directory(params, "project_path")
+        open_files = params.get("open_files") or []
+        if not isinstance(open_files, list):
+            raise RequestError(INVALID_PARAMS, "open_files must be a list of file paths")
+        try:
+            sections = resolve_sections(params.get("sections"))
+        except ValueError as e:
+            raise RequestError(INVALID_PARAMS, str(e))
+        
+        command = [sys.executable, str(Path(__file__).with_name("analyzer.py")), project_path,
+                   "--warm", "--sections", ",".join(sections)]
+        for file_path in open_files:
+            command += ["--open-file", str(file_path)]
+        if self.cache_dir:
+            command += ["--cache-dir", str(self.cache_dir)]
+        config = self.performance_config
+        if config and config.max_workers:
+            command += ["--max-workers", str(min(config.max_workers, WARMUP_MAX_WORKERS))]
+        if config and not config.enable_parallel:
+            command.append("--no-parallel")
+        
+        with self._state_lock:
+            process = self._warmups.get(project_path)
+            if process is not None and process.poll() is None:
+                return {"started": False, "pid": process.pid}
+            
+            process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                       stderr=subprocess.DEVNULL)
+            self._warmups[project_path] = process
+        
+        logger.info(f"Warming cache for {project_path} (pid {process.pid})")
+        return {"started": True, "pid": process.pid}
+    
+    def _handle_analyze_database_schema(self, params: Dict[str, Any], request: ActiveRequest) -> Dict[str, Any]:
+        """Analyze database models and SQL files of a project."""
+        from database_schema_analyzer import DatabaseSchemaAnalyzer
+        from run_database_schema_analysis import schema_result_to_dict
+        
+        project_path = self._require_directory(params, "project_path")
+        result = DatabaseSchemaAnalyzer().analyze_database_schema(project_path)
+        return schema_result_to_dict(result)
+    
+    def _handle_analyze_git_repository(self, params: Dict[str, Any], request: ActiveRequest) -> Dict[str, Any]:
+        """Analyze git history of a repository."""
+        from git_analyzer import DateRange, GitAnalyzer
+        
+        repo_path = self._require_directory(params, "repo_path")
+        date_range = None
+        if params.get("start_date") and params.get("end_date"):
+            try:
+                date_range = DateRange(datetime.fromisoformat(params["start_date"]),
+                                       datetime.fromisoformat(params["end_date"]))
+            except (TypeError, ValueError) as e:
+                raise RequestError(INVALID_PARAMS, f"Invalid date range: {e}")
+        
+        return GitAnalyzer(Path(repo_path)).analyze_repository(date_range).to_dict()
+    
+    def _handle_get_cache_stats(self, params: Dict[str, Any], request: ActiveRequest) -> Dict[str, Any]:
+        """Report cache statistics."""
+        return self._get_cache_manager(params).get_cache_stats()
+    
+    def _handle_clear_cache(self, params: Dict[str, Any], request: ActiveRequest) -> Dict[str, Any]:
+        """Clear cached results for one project or for all projects."""
+        cache_manager = self._get_cache_manager(params)
+        project_path = params.get("project_path")
+        
+        if project_path:
+            with self._get_project_lock(str(Path(project_path).resolve())):
+                cache_manager.invalidate_project_cache(Path(project_path).resolve())
+        else:
+            cache_manager.clear_cache()
+        return {"cleared": True}
+    
+    # Warm state
+    
+    def _wait_for_warmup(self, project_path: str, request: ActiveRequest) -> None:
+        """Wait until a running warm-up of a project has finished.
+        
+        Raises:
+            RequestError: If the request is cancelled while waiting
+        """
+        with self._state_lock:
+            process = self._warmups.get(project_path)
+        if process is None or process.poll() is not None:
+            return
+        
+        logger.info(f"Waiting for the cache warm-up of {project_path}")
+        while process.poll() is None:
+            if request.cancel_event.wait(WARMUP_POLL_INTERVAL):
+                raise RequestError(REQUEST_CANCELLED, "Request cancelled")
+    
+    def _get_project_lock(self, project_path: str) -> threading.Lock:
+        """Get the lock serializing analyses of one project."""
+        with self._state_lock:
+            return self._project_locks.setdefault(project_path, threading.Lock())
+    
+    def _get_project_analyzer(self, project_path: str, use_cache: bool) -> ProjectAnalyzer:
+        """Get the warm analyzer for a project, creating it on first use.
+        
+        Args:
+            project_path: Resolved project path
+            use_cache: Whether the analyzer uses the result cache
+        
+        Returns:
+            ProjectAnalyzer reused by every request for this project
+        """
+        key = (project_path, use_cache)
+        with self._state_lock:
+            analyzer = self._project_analyzers.get(key)
+            if analyzer is None:
+                analyzer = ProjectAnalyzer(project_path, use_cache=use_cache, cache_dir=self.cache_dir,
+                                           performance_config=self.performance_config)
+                self._project_analyzers[key] = analyzer
+        return analyzer
+    
+    def _get_cache_manager(self, params: Dict[str, Any]):
+        """Get the cache manager of a warm analyzer, or a standalone one."""
+        from cache_manager import CacheManager
+        
+        project_path = params.get("project_path")
+        if project_path:
+            with self._state_lock:
+                analyzer = self._project_analyzers.get((str(Path(project_path).resolve()), True))
+            if analyzer is not None:
+                return analyzer.cache_manager
+        return CacheManager(self.cache_dir)
+    
+    # Parameter helpers
+    
+    @staticmethod
+    def _require_param(params: Dict[str, Any], name: str) -> Any:
+        """Get a required parameter.
+        
+        Raises:
+            RequestError: If the parameter is missing
+        """
+        if params.get(name) is None:
+            raise RequestError(INVALID_PARAMS, f"Missing required parameter: {name}")
+        return params[name]
+    
+    @classmethod
+    def _require_directory(cls, params: Dict[str, Any], name: str) -> str:
+        """Get a required parameter naming an existing directory.
+        
+        Returns:
+            Resolved directory path
+        
+        Raises:
+            RequestError: If the parameter is missing or not a directory
+        """
+        path = Path(cls._require_param(params, name)).resolve()
+        if not path.is_dir():
+            raise RequestError(INVALID_PARAMS, f"Not a directory: {path}")
+        return str(path)
+
+
+def main():
+    """Main entry point for the analyzer server."""
+    parser = argparse.ArgumentParser(description='Serve DoraCodeLens analyzers over JSON-RPC on stdin/stdout')
+    parser.add_argument('--max-concurrent-requests', type=int, default=4,
+                        help='Number of requests processed at the same time')
+    parser.add_argument('--cache-dir', type=Path, help='Cache directory for project analysis results')
+    parser.add_argument('--max-workers', type=int, help='Maximum number of worker processes per analysis')
+    parser.add_argument('--no-parallel', action='store_true', help='Disable parallel processing')
+    
+    args = parser.parse_args()
+    
+    # Responses are the only output on stdout; stray prints from analyzers go to stderr
+    protocol_stream = sys.stdout
+    sys.stdout = sys.stderr
+    
+    performance_config = PerformanceConfig(
+        max_workers=args.max_workers,
+        enable_parallel=not args.no_parallel
+    )
+    server = AnalyzerServer(sys.stdin, protocol_stream,
+                            max_concurrent_requests=args.max_concurrent_requests,
+                            cache_dir=args.cache_dir,
+                            performance_config=performance_config)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
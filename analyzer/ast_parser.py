@@ -10,12 +10,14 @@ and import information from Python source files.
 import ast
 import logging
 from pathlib import Path
-from typing import List, Optional, Set, Dict, Any
+from typing import List, Optional, Set, Dict, Any, Tuple
 
 from analyzer import (
     FunctionInfo, ClassInfo, ImportInfo, ModuleInfo, Parameter,
     ComplexityScore, ComplexityLevel
 )
+from module_index import ModuleIndex, is_package, module_name_for_path, resolve_import_from
+from source_store import SourceStore, load_source, load_tree
 
 logger = logging.getLogger(__name__)
 
@@ -23,10 +25,17 @@ logger = logging.getLogger(__name__)
 class ASTParser:
     """Parser for Python AST to extract code structure information."""
     
-    def __init__(self):
-        """Initialize the AST parser."""
+    def __init__(self, source_store: Optional[SourceStore] = None, project_path: Optional[Path] = None):
+        """Initialize the AST parser.
+        
+        Args:
+            source_store: Optional shared store used to read and parse files once per run
+            project_path: Optional project root that qualified module names are relative to
+        """
         self.current_module = ""
         self.current_file_path = ""
+        self.source_store = source_store
+        self.project_path = project_path
     
     def parse_file(self, file_path: Path) -> Optional[ModuleInfo]:
         """Parse a Python file and extract module information.
@@ -42,24 +51,26 @@ class ASTParser:
             self.current_module = self._path_to_module_name(file_path)
             
             # Read and parse the file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
+            source_code = load_source(file_path, self.source_store)
             
             # Count lines
             line_count = len(source_code.splitlines())
             
             # Parse AST
-            tree = ast.parse(source_code, filename=str(file_path))
+            tree = load_tree(file_path, self.source_store, source_code)
             
-            # Extract information
-            functions = self._extract_functions(tree)
-            classes = self._extract_classes(tree)
-            imports = self._extract_imports(tree)
+            # Extract functions, classes, imports and complexity in one traversal
+            visitor = ModuleStructureVisitor(self)
+            visitor.visit(tree)
+            functions = visitor.functions
+            classes = visitor.classes
+            imports = visitor.imports
             docstring = self._extract_module_docstring(tree)
             
             # Calculate module complexity (sum of function complexities)
             total_complexity = sum(func.complexity.cyclomatic for func in functions)
-            module_complexity = ComplexityScore(cyclomatic=total_complexity)
+            total_cognitive = sum(func.complexity.cognitive for func in functions)
+            module_complexity = ComplexityScore(cyclomatic=total_complexity, cognitive=total_cognitive)
             
             return ModuleInfo(
                 name=self.current_module,
@@ -86,10 +97,9 @@ class ASTParser:
             file_path: Path to the Python file
             
         Returns:
-            Module name string
+            Fully qualified module name (the file stem without a project root)
         """
-        # For simplicity, just use the file stem as module name
-        return file_path.stem
+        return module_name_for_path(file_path, self.project_path)
     
     def _extract_module_docstring(self, tree: ast.AST) -> Optional[str]:
         """Extract module-level docstring.
@@ -108,86 +118,15 @@ class ASTParser:
             return tree.body[0].value.value
         return None
     
-    def _extract_functions(self, tree: ast.AST) -> List[FunctionInfo]:
-        """Extract function information from AST.
-        
-        Args:
-            tree: AST tree
-            
-        Returns:
-            List of FunctionInfo objects
-        """
-        functions = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                func_info = self._parse_function(node)
-                if func_info:
-                    functions.append(func_info)
-        
-        return functions
-    
-    def _extract_classes(self, tree: ast.AST) -> List[ClassInfo]:
-        """Extract class information from AST.
-        
-        Args:
-            tree: AST tree
-            
-        Returns:
-            List of ClassInfo objects
-        """
-        classes = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                class_info = self._parse_class(node)
-                if class_info:
-                    classes.append(class_info)
-        
-        return classes
-    
-    def _extract_imports(self, tree: ast.AST) -> List[ImportInfo]:
-        """Extract import information from AST.
-        
-        Args:
-            tree: AST tree
-            
-        Returns:
-            List of ImportInfo objects
-        """
-        imports = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    import_info = ImportInfo(
-                        module=alias.name,
-                        names=[alias.name],
-                        alias=alias.asname,
-                        is_from_import=False,
-                        line_number=node.lineno
-                    )
-                    imports.append(import_info)
-            
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:  # Skip relative imports without module
-                    names = [alias.name for alias in node.names]
-                    import_info = ImportInfo(
-                        module=node.module,
-                        names=names,
-                        alias=None,
-                        is_from_import=True,
-                        line_number=node.lineno
-                    )
-                    imports.append(import_info)
-        
-        return imports
-    
-    def _parse_function(self, node: ast.FunctionDef) -> Optional[FunctionInfo]:
+    def _parse_function(self, node: ast.FunctionDef, is_method: bool = False) -> Optional[FunctionInfo]:
         """Parse a function definition node.
         
+        The complexity is left at zero; ModuleStructureVisitor sets it once
+        it has walked the function body.
+        
         Args:
             node: AST function definition node
+            is_method: Whether the function is defined directly in a class body
             
         Returns:
             FunctionInfo object or None
@@ -196,9 +135,6 @@ class ASTParser:
             # Extract parameters
             parameters = self._extract_parameters(node.args)
             
-            # Calculate basic complexity (count control flow statements)
-            complexity = self._calculate_function_complexity(node)
-            
             # Extract docstring
             docstring = self._extract_function_docstring(node)
             
@@ -207,14 +143,11 @@ class ASTParser:
             if node.returns:
                 return_type = ast.unparse(node.returns) if hasattr(ast, 'unparse') else str(node.returns)
             
-            # Determine if it's a method (inside a class)
-            is_method = self._is_method(node)
-            
             return FunctionInfo(
                 name=node.name,
                 module=self.current_module,
                 line_number=node.lineno,
-                complexity=complexity,
+                complexity=ComplexityScore(cyclomatic=0),
                 parameters=parameters,
                 return_type=return_type,
                 docstring=docstring,
@@ -229,6 +162,8 @@ class ASTParser:
     def _parse_class(self, node: ast.ClassDef) -> Optional[ClassInfo]:
         """Parse a class definition node.
         
+        Methods are added by ModuleStructureVisitor as it reaches them.
+        
         Args:
             node: AST class definition node
             
@@ -236,15 +171,6 @@ class ASTParser:
             ClassInfo object or None
         """
         try:
-            # Extract methods
-            methods = []
-            for item in node.body:
-                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    method_info = self._parse_function(item)
-                    if method_info:
-                        method_info.is_method = True
-                        methods.append(method_info)
-            
             # Extract base classes
             base_classes = []
             for base in node.bases:
@@ -260,7 +186,7 @@ class ASTParser:
                 name=node.name,
                 module=self.current_module,
                 line_number=node.lineno,
-                methods=methods,
+                methods=[],
                 base_classes=base_classes,
                 docstring=docstring
             )
@@ -362,89 +288,6 @@ class ASTParser:
         
         return parameters
     
-    def _calculate_function_complexity(self, node: ast.FunctionDef) -> ComplexityScore:
-        """Calculate complexity score for a function including cognitive complexity.
-        
-        Args:
-            node: AST function definition node
-            
-        Returns:
-            ComplexityScore object
-        """
-        # Count control flow statements for cyclomatic complexity
-        cyclomatic = 1  # Base complexity
-        cognitive = 0  # Cognitive complexity starts at 0
-        nesting_level = 0
-        
-        def calculate_complexity_recursive(node_list, current_nesting=0):
-            nonlocal cyclomatic, cognitive
-            
-            for child in node_list:
-                # Skip nested functions to avoid double counting
-                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)) and child != node:
-                    continue
-                
-                # Cyclomatic complexity increments
-                if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor)):
-                    cyclomatic += 1
-                    cognitive += 1 + current_nesting  # Cognitive complexity increases with nesting
-                    
-                    # Recursively process nested statements with increased nesting
-                    if hasattr(child, 'body'):
-                        calculate_complexity_recursive(child.body, current_nesting + 1)
-                    if hasattr(child, 'orelse') and child.orelse:
-                        calculate_complexity_recursive(child.orelse, current_nesting + 1)
-                        
-                elif isinstance(child, ast.Try):
-                    cyclomatic += 1
-                    cognitive += 1 + current_nesting
-                    
-                    # Process try body
-                    if hasattr(child, 'body'):
-                        calculate_complexity_recursive(child.body, current_nesting + 1)
-                    
-                    # Add complexity for except handlers
-                    if hasattr(child, 'handlers'):
-                        cyclomatic += len(child.handlers)
-                        for handler in child.handlers:
-                            cognitive += 1 + current_nesting
-                            if hasattr(handler, 'body'):
-                                calculate_complexity_recursive(handler.body, current_nesting + 1)
-                    
-                    # Process finally block
-                    if hasattr(child, 'finalbody') and child.finalbody:
-                        calculate_complexity_recursive(child.finalbody, current_nesting + 1)
-                        
-                elif isinstance(child, (ast.And, ast.Or)):
-                    cyclomatic += 1
-                    cognitive += 1
-                    
-                elif isinstance(child, ast.comprehension):
-                    cyclomatic += 1
-                    cognitive += 1 + current_nesting
-                    
-                elif isinstance(child, ast.BoolOp):
-                    # Count boolean operations (and/or)
-                    additional_complexity = len(child.values) - 1
-                    cyclomatic += additional_complexity
-                    cognitive += additional_complexity
-                
-                # Continue processing child nodes
-                elif hasattr(child, 'body') and isinstance(child.body, list):
-                    calculate_complexity_recursive(child.body, current_nesting)
-                elif hasattr(child, '__dict__'):
-                    # Process other child nodes
-                    for attr_name, attr_value in child.__dict__.items():
-                        if isinstance(attr_value, list):
-                            for item in attr_value:
-                                if isinstance(item, ast.AST):
-                                    calculate_complexity_recursive([item], current_nesting)
-        
-        # Start recursive calculation
-        calculate_complexity_recursive(node.body, 0)
-        
-        return ComplexityScore(cyclomatic=cyclomatic, cognitive=cognitive)
-    
     def _extract_function_docstring(self, node: ast.FunctionDef) -> Optional[str]:
         """Extract function docstring.
         
@@ -477,30 +320,327 @@ class ASTParser:
             return node.body[0].value.value
         return None
     
-    def _is_method(self, node: ast.FunctionDef) -> bool:
-        """Determine if a function is a method (inside a class).
+
+# Statement fields holding nested statements. Outside of functions only these
+# are walked: expressions cannot define functions, classes or imports there.
+_BLOCK_FIELDS = ("body", "orelse", "handlers", "finalbody", "cases")
+
+
+class ModuleStructureVisitor:
+    """Single-pass extraction of a module's structure and function complexity.
+    
+    One depth-first traversal collects the functions (methods and nested
+    functions included, in source order), the classes with the methods
+    defined directly in their bodies and the imports, and scores each
+    function while walking its body:
+    
+    - Cyclomatic complexity counts decision points the way radon does:
+      if/elif, conditional expressions, loops and their else blocks,
+      except handlers and try-else, boolean operators, comprehension
+      clauses and match cases.
+    - Cognitive complexity follows the cognitive complexity specification:
+      if, conditional expressions, loops, except handlers, match and
+      comprehensions add one plus the nesting level; elif and else add one;
+      each sequence of like boolean operators adds one; each direct
+      recursive call (by name, or through self or cls in a method) adds one.
+      Nesting grows inside those structures and lambdas, but not inside try,
+      finally or with. Python has no goto or labelled break/continue, the
+      jumps the specification counts as breaks in flow, so plain break,
+      continue and return add nothing.
+    
+    Nested functions are scored on their own rather than as part of the
+    enclosing function. This is the analyzer's only cognitive complexity
+    implementation; score_function applies it to a single function.
+    """
+    
+    def __init__(self, parser: ASTParser):
+        """Initialize the visitor.
         
         Args:
-            node: AST function definition node
+            parser: ASTParser building the function and class records
+        """
+        self.parser = parser
+        self.functions: List[FunctionInfo] = []
+        self.classes: List[ClassInfo] = []
+        self.imports: List[ImportInfo] = []
+        # Function -> [cyclomatic, cognitive, name, is_method] (the name detects recursion)
+        self._scores: List[Tuple[FunctionInfo, List[Any]]] = []
             
+    # Node type -> the _BLOCK_FIELDS it has, filled as node types are met
+    _BLOCK_FIELDS_BY_TYPE: Dict[type, Tuple[str, ...]] = {}
+    
+    def visit(self, tree: ast.Module) -> None:
+        """Walk a module tree, filling functions, classes and imports.
+        
+        The walk uses an explicit stack, so deeply nested expressions do not
+        hit the recursion limit. Stack entries are (node, nesting level,
+        score of the enclosing function or None, class whose body holds the
+        node or None).
+        
+        Args:
+            tree: Parsed module
+        """
+        self._walk([(node, 0, None, None) for node in reversed(tree.body)])
+        
+        for function, score in self._scores:
+            function.complexity = ComplexityScore(cyclomatic=score[0], cognitive=score[1])
+    
+    def score(self, node: ast.FunctionDef, is_method: bool = False) -> List[Any]:
+        """Walk one function body and return its score.
+        
+        Args:
+            node: Function definition
+            is_method: Whether the function is defined directly in a class body
+        
         Returns:
-            True if the function is a method
+            [cyclomatic, cognitive, name, is_method]
         """
-        # Walk up the AST to see if we're inside a class
-        # This is a simplified check - in practice, we'd need to track context
-        return len(node.args.args) > 0 and node.args.args[0].arg in ['self', 'cls']
+        score = [1, 0, node.name, is_method]
+        self._walk([(child, 0, score, None) for child in reversed(node.body)])
+        return score
+    
+    def _walk(self, stack: List[Tuple]) -> None:
+        """Visit stack entries and their children depth first."""
+        pending = []
+        definitions = self._DEFINITION_HANDLERS
+        structures = self._COMPLEXITY_HANDLERS
+        block_fields = self._BLOCK_FIELDS_BY_TYPE
+        
+        while stack:
+            node, nesting, score, owner = stack.pop()
+            node_type = type(node)
+            
+            handler = definitions.get(node_type)
+            if handler is not None:
+                handler(self, node, nesting, score, owner, pending)
+            elif score is None:
+                fields = block_fields.get(node_type)
+                if fields is None:
+                    fields = block_fields[node_type] = tuple(field for field in _BLOCK_FIELDS
+                                                             if field in node_type._fields)
+                for field in fields:
+                    for child in getattr(node, field):
+                        pending.append((child, nesting, None, None))
+            else:
+                handler = structures.get(node_type)
+                if handler is not None:
+                    handler(self, node, nesting, score, pending)
+                else:
+                    for child in ast.iter_child_nodes(node):
+                        pending.append((child, nesting, score, None))
+            
+            # Children are pushed in reverse so that they are visited in source order
+            if pending:
+                stack.extend(reversed(pending))
+                pending.clear()
+    
+    @staticmethod
+    def _push_fields(node: ast.AST, nesting: int, score: List[Any], pending: List[Tuple],
+                     nested_fields: Tuple[str, ...] = ()) -> None:
+        """Queue the children of a node, one level deeper for the nested fields."""
+        for field in node._fields:
+            value = getattr(node, field, None)
+            level = nesting + 1 if field in nested_fields else nesting
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        pending.append((item, level, score, None))
+            elif isinstance(value, ast.AST):
+                pending.append((value, level, score, None))
+    
+    # Definitions (visited everywhere)
+    
+    def _visit_function(self, node: ast.FunctionDef, nesting: int, score: Optional[List[Any]],
+                        owner: Optional[ClassInfo], pending: List[Tuple]) -> None:
+        function = self.parser._parse_function(node, is_method=owner is not None)
+        function_score = [1, 0, node.name, owner is not None]
+        if function is not None:
+            self.functions.append(function)
+            self._scores.append((function, function_score))
+            if owner is not None:
+                owner.methods.append(function)
+        for child in node.body:
+            pending.append((child, 0, function_score, None))
+    
+    def _visit_class(self, node: ast.ClassDef, nesting: int, score: Optional[List[Any]],
+                     owner: Optional[ClassInfo], pending: List[Tuple]) -> None:
+        class_info = self.parser._parse_class(node)
+        if class_info is not None:
+            self.classes.append(class_info)
+        for child in node.body:
+            pending.append((child, nesting, score, class_info))
+    
+    def _visit_import(self, node: ast.Import, nesting: int, score: Optional[List[Any]],
+                      owner: Optional[ClassInfo], pending: List[Tuple]) -> None:
+        for alias in node.names:
+            self.imports.append(ImportInfo(
+                module=alias.name,
+                names=[alias.name],
+                alias=alias.asname,
+                is_from_import=False,
+                line_number=node.lineno
+            ))
+    
+    def _visit_import_from(self, node: ast.ImportFrom, nesting: int, score: Optional[List[Any]],
+                           owner: Optional[ClassInfo], pending: List[Tuple]) -> None:
+        self.imports.append(ImportInfo(
+            module=node.module or "",
+            names=[alias.name for alias in node.names],
+            alias=None,
+            is_from_import=True,
+            line_number=node.lineno,
+            level=node.level or 0
+        ))
+    
+    _DEFINITION_HANDLERS = {
+        ast.FunctionDef: _visit_function,
+        ast.AsyncFunctionDef: _visit_function,
+        ast.ClassDef: _visit_class,
+        ast.Import: _visit_import,
+        ast.ImportFrom: _visit_import_from,
+    }
+    
+    # Complexity (visited inside functions)
+    
+    def _visit_if(self, node: ast.If, nesting: int, score: List[Any], pending: List[Tuple]) -> None:
+        score[0] += 1
+        score[1] += 1 + nesting
+        while True:
+            pending.append((node.test, nesting, score, None))
+            for child in node.body:
+                pending.append((child, nesting + 1, score, None))
+            
+            orelse = node.orelse
+            if (len(orelse) == 1 and isinstance(orelse[0], ast.If)
+                    and orelse[0].col_offset == node.col_offset):
+                # elif: a branch of the same structure, not a nested one
+                node = orelse[0]
+                score[0] += 1
+                score[1] += 1
+                continue
+            
+            if orelse:
+                score[1] += 1
+                for child in orelse:
+                    pending.append((child, nesting + 1, score, None))
+            return
+    
+    def _visit_loop(self, node: ast.AST, nesting: int, score: List[Any], pending: List[Tuple]) -> None:
+        score[0] += 1 + bool(node.orelse)
+        score[1] += 1 + nesting
+        self._push_fields(node, nesting, score, pending, ("body", "orelse"))
+    
+    def _visit_try(self, node: ast.Try, nesting: int, score: List[Any], pending: List[Tuple]) -> None:
+        score[0] += len(node.handlers) + bool(node.orelse)
+        self._push_fields(node, nesting, score, pending)
+    
+    def _visit_except_handler(self, node: ast.ExceptHandler, nesting: int, score: List[Any],
+                              pending: List[Tuple]) -> None:
+        score[1] += 1 + nesting
+        self._push_fields(node, nesting, score, pending, ("body",))
+    
+    def _visit_if_exp(self, node: ast.IfExp, nesting: int, score: List[Any], pending: List[Tuple]) -> None:
+        score[0] += 1
+        score[1] += 1 + nesting
+        self._push_fields(node, nesting, score, pending, ("body", "orelse"))
+    
+    def _visit_bool_op(self, node: ast.BoolOp, nesting: int, score: List[Any], pending: List[Tuple]) -> None:
+        # Operands joined by the same operator (even across parentheses) form one sequence
+        values = []
+        operands = node.values[::-1]
+        while operands:
+            value = operands.pop()
+            if isinstance(value, ast.BoolOp) and type(value.op) is type(node.op):
+                operands.extend(reversed(value.values))
+            else:
+                values.append(value)
+        score[0] += len(values) - 1
+        score[1] += 1
+        for value in values:
+            pending.append((value, nesting, score, None))
+    
+    def _visit_comprehension(self, node: ast.comprehension, nesting: int, score: List[Any],
+                             pending: List[Tuple]) -> None:
+        score[0] += 1 + len(node.ifs)
+        score[1] += 1 + nesting
+        self._push_fields(node, nesting, score, pending)
+    
+    def _visit_match(self, node: ast.AST, nesting: int, score: List[Any], pending: List[Tuple]) -> None:
+        wildcard = any(getattr(case.pattern, "pattern", False) is None for case in node.cases)
+        score[0] += max(0, len(node.cases) - wildcard)
+        score[1] += 1 + nesting
+        pending.append((node.subject, nesting, score, None))
+        for case in node.cases:
+            if case.guard is not None:
+                pending.append((case.guard, nesting + 1, score, None))
+            for child in case.body:
+                pending.append((child, nesting + 1, score, None))
+    
+    def _visit_call(self, node: ast.Call, nesting: int, score: List[Any], pending: List[Tuple]) -> None:
+        func = node.func
+        if type(func) is ast.Name:
+            recursive = not score[3] and func.id == score[2]
+        elif type(func) is ast.Attribute and type(func.value) is ast.Name:
+            recursive = score[3] and func.attr == score[2] and func.value.id in ("self", "cls")
+        else:
+            recursive = False
+        if recursive:
+            score[1] += 1
+        self._push_fields(node, nesting, score, pending)
+    
+    def _visit_lambda(self, node: ast.Lambda, nesting: int, score: List[Any], pending: List[Tuple]) -> None:
+        self._push_fields(node, nesting, score, pending, ("body",))
+    
+    def _visit_leaf(self, node: ast.AST, nesting: int, score: List[Any], pending: List[Tuple]) -> None:
+        pass  # Names and constants hold nothing to score
+    
+    _COMPLEXITY_HANDLERS = {
+        ast.If: _visit_if,
+        ast.For: _visit_loop,
+        ast.AsyncFor: _visit_loop,
+        ast.While: _visit_loop,
+        ast.Try: _visit_try,
+        ast.ExceptHandler: _visit_except_handler,
+        ast.IfExp: _visit_if_exp,
+        ast.BoolOp: _visit_bool_op,
+        ast.comprehension: _visit_comprehension,
+        ast.Call: _visit_call,
+        ast.Lambda: _visit_lambda,
+        ast.Name: _visit_leaf,
+        ast.Constant: _visit_leaf,
+    }
+    if hasattr(ast, "Match"):  # Python 3.10+
+        _COMPLEXITY_HANDLERS[ast.Match] = _visit_match
+    if hasattr(ast, "TryStar"):  # Python 3.11+
+        _COMPLEXITY_HANDLERS[ast.TryStar] = _visit_try
+
+
+def score_function(node: ast.FunctionDef, is_method: bool = False) -> Tuple[int, int]:
+    """Score a single function with ModuleStructureVisitor's complexity rules.
+    
+    Args:
+        node: Function definition, e.g. from a tree parsed by the caller
+        is_method: Whether the function is defined directly in a class body
+    
+    Returns:
+        Tuple of (cyclomatic, cognitive) complexity
+    """
+    cyclomatic, cognitive, _, _ = ModuleStructureVisitor(ASTParser()).score(node, is_method)
+    return cyclomatic, cognitive
 
 
 class EnhancedCodeGraphBuilder:
     """Builder for enhanced hierarchical code graph structure."""
     
-    def __init__(self, project_path: Path):
+    def __init__(self, project_path: Path, source_store: Optional[SourceStore] = None):
         """Initialize the enhanced code graph builder.
         
         Args:
             project_path: Path to the project root
+            source_store: Optional shared store used to read and parse files once per run
         """
         self.project_path = project_path
+        self.source_store = source_store
         self.function_registry: Dict[str, FunctionInfo] = {}
         self.call_relationships: Dict[str, List[Dict[str, Any]]] = {}
     
@@ -547,11 +687,8 @@ class EnhancedCodeGraphBuilder:
             try:
                 module_path = Path(module.path)
                 if module_path.exists():
-                    with open(module_path, 'r', encoding='utf-8') as f:
-                        source_code = f.read()
-                    
-                    tree = ast.parse(source_code, filename=str(module_path))
-                    visitor = CallExtractorVisitor(module.name, self.function_registry)
+                    tree = load_tree(module_path, self.source_store)
+                    visitor = CallExtractorVisitor(module.name, self.function_registry, is_package(module))
                     visitor.visit(tree)
                     
                     # Store call relationships for each function
@@ -675,9 +812,11 @@ class EnhancedCodeGraphBuilder:
 class CallExtractorVisitor(ast.NodeVisitor):
     """AST visitor to extract function calls with full path tracking."""
     
-    def __init__(self, current_module: str, function_registry: Dict[str, FunctionInfo]):
+    def __init__(self, current_module: str, function_registry: Dict[str, FunctionInfo],
+                 is_package: bool = False):
         """Initialize the call extractor visitor."""
         self.current_module = current_module
+        self.is_package = is_package
         self.function_registry = function_registry
         self.function_calls: Dict[str, List[Dict[str, Any]]] = {}
         self.current_function_stack: List[str] = []
@@ -695,10 +834,11 @@ class CallExtractorVisitor(ast.NodeVisitor):
     
     def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
         """Visit from-import statements to track imported names."""
-        if node.module:
+        module = resolve_import_from(node.module, node.level or 0, self.current_module, self.is_package)
+        if module:
             for alias in node.names:
                 imported_name = alias.asname if alias.asname else alias.name
-                self.imports[imported_name] = f"{node.module}.{alias.name}"
+                self.imports[imported_name] = f"{module}.{alias.name}"
         self.generic_visit(node)
     
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
@@ -759,9 +899,9 @@ class CallExtractorVisitor(ast.NodeVisitor):
             # Check if it's an imported function
             if func_name in self.imports:
                 imported_path = self.imports[func_name]
-                parts = imported_path.split('.')
-                if len(parts) >= 2:
-                    return (["", parts[0], "", parts[1]], "calls")
+                module, _, name = imported_path.rpartition('.')
+                if module:
+                    return (["", module, "", name], "calls")
             
             # Check if it's a function in the current module
             local_func_id = f"{self.current_module}.{func_name}"
@@ -815,15 +955,17 @@ class CallExtractorVisitor(ast.NodeVisitor):
 class ModuleDiscovery:
     """Module discovery and dependency resolution."""
     
-    def __init__(self, project_path: Path):
+    def __init__(self, project_path: Path, source_store: Optional[SourceStore] = None):
         """Initialize module discovery.
         
         Args:
             project_path: Path to the project root
+            source_store: Optional shared store used to read and parse files once per run
         """
         self.project_path = project_path
-        self.ast_parser = ASTParser()
-        self.code_graph_builder = EnhancedCodeGraphBuilder(project_path)
+        self.source_store = source_store
+        self.ast_parser = ASTParser(source_store, project_path)
+        self.code_graph_builder = EnhancedCodeGraphBuilder(project_path, source_store)
     
     def discover_modules(self, python_files: List[Path]) -> List[ModuleInfo]:
         """Discover and parse all modules in the project.
@@ -850,35 +992,43 @@ class ModuleDiscovery:
         logger.info(f"Discovered {len(modules)} modules")
         return modules
     
+    def analyze_modules_parallel(self, python_files: List[Path], parallel_processor: Any) -> List[ModuleInfo]:
+        """Parse and score modules in worker processes.
+        
+        Each worker parses a file and runs complexity analysis on the same
+        tree, returning a complexity-enhanced ModuleInfo. Results keep the
+        order of ``python_files``. Trees are not sent back, so the shared
+        source store is not populated by this call.
+        
+        Args:
+            python_files: List of Python file paths
+            parallel_processor: ParallelProcessor used to run the workers
+            
+        Returns:
+            List of complexity-enhanced ModuleInfo objects
+        """
+        modules = parallel_processor.process_files_parallel(
+            python_files, analyze_module_file, initializer=init_module_worker,
+            initargs=(self.project_path,)
+        )
+        
+        logger.info(f"Discovered {len(modules)} modules in parallel")
+        return modules
+    
     def resolve_dependencies(self, modules: List[ModuleInfo]) -> Dict[str, Set[str]]:
         """Resolve module dependencies based on import statements.
         
+        Absolute and relative imports are resolved through a ModuleIndex of
+        the modules' qualified names, in time linear in the number of imports.
+        
         Args:
             modules: List of parsed modules
             
         Returns:
             Dictionary mapping module names to their dependencies
         """
-        dependencies = {}
-        module_names = {module.name for module in modules}
-        
-        for module in modules:
-            deps = set()
-            
-            for import_info in module.imports:
-                # Check if the imported module is part of our project
-                if import_info.module in module_names:
-                    deps.add(import_info.module)
-                elif import_info.is_from_import:
-                    # Check for relative imports within the project
-                    for name in import_info.names:
-                        full_name = f"{import_info.module}.{name}"
-                        if full_name in module_names:
-                            deps.add(full_name)
-            
-            dependencies[module.name] = deps
-        
-        return dependencies
+        module_index = ModuleIndex(modules)
+        return {module.name: module_index.resolve_module(module) for module in modules}
     
     def build_enhanced_code_graph(self, modules: List[ModuleInfo]) -> List[Dict[str, Any]]:
         """Build enhanced hierarchical code graph structure.
@@ -889,4 +1039,46 @@ class ModuleDiscovery:
         Returns:
             List of dictionaries representing the hierarchical code structure
         """
-        return self.code_graph_builder.build_code_graph(modules)
\ No newline at end of file
+        return self.code_graph_builder.build_code_graph(modules)
+
+
+# Per-process parser state used by analyze_module_file
+_worker_parser: Optional[ASTParser] = None
+_worker_complexity_analyzer = None
+
+
+def init_module_worker(project_path: Optional[Path] = None) -> None:
+    """Create the parser and complexity analyzer for a worker process.
+    
+    Args:
+        project_path: Optional project root that qualified module names are relative to
+    """
+    global _worker_parser, _worker_complexity_analyzer
+    from complexity_analyzer import ComplexityAnalyzer
+    
+    # The store only lives for one file at a time (see analyze_module_file)
+    source_store = SourceStore()
+    _worker_parser = ASTParser(source_store, project_path)
+    _worker_complexity_analyzer = ComplexityAnalyzer(source_store)
+
+
+def analyze_module_file(file_path: Path) -> Optional[ModuleInfo]:
+    """Parse a file and enhance its complexity, reading and parsing it once.
+    
+    Args:
+        file_path: Path to the Python file
+        
+    Returns:
+        Complexity-enhanced ModuleInfo or None if parsing fails
+    """
+    if _worker_parser is None:
+        init_module_worker()
+    
+    try:
+        module_info = _worker_parser.parse_file(file_path)
+        if module_info is None:
+            logger.warning(f"Failed to parse module: {file_path}")
+            return None
+        return _worker_complexity_analyzer.enhance_module_complexity(module_info)
+    finally:
+        _worker_parser.source_store.discard(file_path)
@@ -0,0 +1,587 @@
+#!/usr/bin/env python3
+"""
+Benchmark Harness for DoraCodeLens Analyzer
+
+Generates deterministic synthetic Python projects of a given size and runs
+ProjectAnalyzer over them (and over the bundled examples/ projects),
+recording wall time and peak memory per run and per analysis stage. Results
+can be stored as a baseline; later runs fail when they regress beyond a
+tolerance.
+
+    python benchmark.py --scales 100,1k --examples --update-baseline
+    python benchmark.py --scales 100,1k --examples          # exits 1 on regressions
+    python benchmark.py --scales none --parser 1k,5k        # per-file ASTParser timings
+    python benchmark.py --scales none --memory 20k          # size of the analysis model
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import pickle
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields, is_dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from analysis_stages import get_peak_rss_mb
+
+logger = logging.getLogger(__name__)
+
+# Named project sizes (number of modules)
+SCALES = {"100": 100, "1k": 1000, "10k": 10000, "20k": 20000, "50k": 50000}
+
+# Named sizes of the single large modules timed by --parser (functions and methods per module)
+PARSER_SIZES = {"1k": 1000, "5k": 5000}
+
+EXAMPLES_DIR = Path(__file__).parent.parent / "examples"
+DEFAULT_BASELINE = Path(__file__).parent / "benchmark_baseline.json"
+
+# Regressions smaller than these are treated as noise
+MIN_TIME_REGRESSION = 0.05  # seconds
+MIN_MEMORY_REGRESSION = 10.0  # MB
+
+# Libraries listed in the synthetic projects' requirements.txt
+SYNTHETIC_REQUIREMENTS = ["flask==2.3.0", "requests>=2.31", "sqlalchemy==2.0.0", "pytest"]
+
+
+@dataclass
+class SyntheticProjectConfig:
+    """Shape of a generated project."""
+    modules: int = 100
+    modules_per_package: int = 50
+    functions_per_module: int = 5
+    classes_per_module: int = 2
+    methods_per_class: int = 3
+    imports_per_module: int = 3
+    calls_per_function: int = 3
+    max_branches: int = 4  # Upper bound of if/for/try blocks per function body
+    seed: int = 0
+
+
+class SyntheticProjectGenerator:
+    """Generates synthetic Python projects.
+    
+    The same configuration always produces byte-identical files. Modules only
+    import modules generated before them, so the import graph is acyclic, and
+    every call targets a function or method that exists.
+    """
+    
+    def __init__(self, config: Optional[SyntheticProjectConfig] = None):
+        self.config = config or SyntheticProjectConfig()
+    
+    def generate(self, root: Path) -> List[Path]:
+        """Write the project under root.
+        
+        Args:
+            root: Project directory (created if missing)
+        
+        Returns:
+            Paths of the generated Python modules
+        """
+        config = self.config
+        rng = random.Random(config.seed)
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        (root / "requirements.txt").write_text("\n".join(SYNTHETIC_REQUIREMENTS) + "\n")
+        
+        paths = []
+        for index in range(config.modules):
+            package, module = self._module_name(index)
+            package_dir = root / package
+            if index % config.modules_per_package == 0:
+                package_dir.mkdir(exist_ok=True)
+                (package_dir / "__init__.py").write_text(f'"""Synthetic package {package}."""\n')
+            
+            path = package_dir / f"{module}.py"
+            path.write_text(self._module_source(index, rng))
+            paths.append(path)
+        
+        return paths
+    
+    def _module_name(self, index: int) -> Tuple[str, str]:
+        """Get the (package, module) names of the module with the given index."""
+        return f"pkg_{index // self.config.modules_per_package:04d}", f"mod_{index:05d}"
+    
+    def _module_source(self, index: int, rng: random.Random) -> str:
+        """Generate the source of one module."""
+        config = self.config
+        package, module = self._module_name(index)
+        
+        # Import earlier modules only, so that the import graph is acyclic
+        imported = sorted(set(rng.randrange(index) for _ in range(config.imports_per_module))) if index else []
+        lines = [f'"""Synthetic module {package}.{module}."""', "", "import os", "import json"]
+        for target in imported:
+            target_package, target_module = self._module_name(target)
+            lines.append(f"from {target_package} import {target_module}")
+        lines += ["", "", f"CONSTANT_{index} = {index}", ""]
+        
+        # Callables available to function bodies: earlier local functions and imported module functions
+        imported_calls = [f"{self._module_name(target)[1]}.function_{f}"
+                          for target in imported for f in range(config.functions_per_module)]
+        
+        for class_index in range(config.classes_per_module):
+            lines += ["", *self._class_source(class_index, rng, imported_calls)]
+        
+        for function_index in range(config.functions_per_module):
+            local_calls = [f"function_{f}" for f in range(function_index)]
+            lines += ["", "", *self._function_source(f"function_{function_index}", "value, factor=2",
+                                                     local_calls + imported_calls, rng, indent="")]
+        
+        return "\n".join(lines) + "\n"
+    
+    def _class_source(self, class_index: int, rng: random.Random, imported_calls: List[str]) -> List[str]:
+        """Generate the source lines of one class."""
+        lines = [f"class Class{class_index}:", f'    """Synthetic class {class_index}."""', "",
+                 "    def __init__(self, value):", "        self.value = value"]
+        
+        for method_index in range(self.config.methods_per_class):
+            callees = [f"self.method_{m}" for m in range(method_index)] + imported_calls
+            lines += ["", *self._function_source(f"method_{method_index}", "self, value, factor=2",
+                                                 callees, rng, indent="    ")]
+        return lines
+    
+    def _function_source(self, name: str, params: str, callees: List[str], rng: random.Random,
+                         indent: str) -> List[str]:
+        """Generate the source lines of one function or method."""
+        body = [f'"""Synthetic function {name}."""', "total = 0"]
+        
+        calls = [rng.choice(callees) for _ in range(self.config.calls_per_function)] if callees else []
+        for branch in range(rng.randint(0, self.config.max_branches)):
+            kind = rng.choice(("if", "for", "try"))
+            call = f"{calls.pop()}(value, factor)" if calls else "len(str(value))"
+            if kind == "if":
+                body += [f"if value > {branch} and factor:", f"    total += {call}",
+                         f"elif value < -{branch}:", f"    total -= {branch}"]
+            elif kind == "for":
+                body += ["for item in range(factor):", "    if item % 2:", f"        total += {call}"]
+            else:
+                body += ["try:", f"    total += {call}", "except (TypeError, ValueError):", "    total = 0"]
+        
+        # Remaining calls go in straight-line code
+        body += [f"total += {call}(value, factor)" for call in calls]
+        body.append("return total")
+        
+        return [f"{indent}def {name}({params}):"] + [f"{indent}    {line}" for line in body]
+
+
+def generate_project(root: Path, scale: str, seed: int = 0, **options: Any) -> List[Path]:
+    """Generate a synthetic project of a named scale.
+    
+    Args:
+        root: Project directory
+        scale: Key of SCALES (e.g. "1k")
+        seed: Random seed
+        **options: Further SyntheticProjectConfig fields
+    
+    Returns:
+        Paths of the generated Python modules
+    """
+    config = SyntheticProjectConfig(modules=SCALES[scale], seed=seed, **options)
+    return SyntheticProjectGenerator(config).generate(root)
+
+
+def generate_large_module(path: Path, size: str, seed: int = 0) -> Path:
+    """Generate one large module: half of its functions are top-level, half are methods.
+    
+    Args:
+        path: File to write
+        size: Key of PARSER_SIZES
+        seed: Random seed
+    
+    Returns:
+        Path of the module
+    """
+    functions = PARSER_SIZES[size]
+    config = SyntheticProjectConfig(modules=1, functions_per_module=functions // 2,
+                                    classes_per_module=functions // 20, methods_per_class=9,
+                                    max_branches=6, seed=seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(SyntheticProjectGenerator(config)._module_source(0, random.Random(seed)))
+    return path
+
+
+def run_parser_benchmark(module_path: Path, repeat: int = 5) -> Dict[str, Any]:
+    """Time ASTParser.parse_file on one module.
+    
+    Building the tree (the "parse" stage) and extracting functions, classes,
+    imports and complexity from it (the "extract" stage) are timed apart;
+    the fastest of ``repeat`` runs is kept for each.
+    
+    Args:
+        module_path: Module to parse
+        repeat: Number of runs
+    
+    Returns:
+        Dictionary shaped like run_analysis results (per-file times in seconds)
+    """
+    from ast_parser import ASTParser
+    from source_store import SourceStore
+    
+    parse_times, extract_times = [], []
+    for _ in range(repeat):
+        source_store = SourceStore()
+        start_time = time.perf_counter()
+        source_store.get_tree(module_path)
+        parse_times.append(time.perf_counter() - start_time)
+        
+        # The store hands the tree to the parser, so only extraction is timed here
+        start_time = time.perf_counter()
+        module = ASTParser(source_store).parse_file(module_path)
+        extract_times.append(time.perf_counter() - start_time)
+    
+    parse_time, extract_time = min(parse_times), min(extract_times)
+    return {
+        "success": module is not None,
+        "files": 1,
+        "analyzed_files": 1 if module is not None else 0,
+        "functions": len(module.functions) if module is not None else 0,
+        "wall_time": round(parse_time + extract_time, 4),
+        "peak_rss_mb": None,
+        "critical_path": ["parse", "extract"],
+        "stages": {
+            "parse": {"duration": round(parse_time, 4), "cpu_time": round(parse_time, 4), "peak_rss_delta_mb": None},
+            "extract": {"duration": round(extract_time, 4), "cpu_time": round(extract_time, 4),
+                        "peak_rss_delta_mb": None}
+        },
+        "runs": repeat
+    }
+
+
+def model_size(root: Any) -> int:
+    """Get the bytes held by an object graph, counting shared objects once.
+    
+    Follows the fields of dataclasses (slotted or not) and the items of
+    containers; enum members and classes are not counted.
+    
+    Args:
+        root: Object to measure
+    
+    Returns:
+        Total size in bytes
+    """
+    seen = set()
+    pending = [root]
+    total = 0
+    while pending:
+        obj = pending.pop()
+        if obj is None or isinstance(obj, (Enum, type)) or id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if is_dataclass(obj):
+            pending.extend(getattr(obj, field.name) for field in fields(obj))
+            if hasattr(obj, "__dict__"):
+                total += sys.getsizeof(obj.__dict__)
+        elif isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            pending.extend(obj)
+    return total
+
+
+def run_memory_benchmark(project_path: Path) -> Dict[str, Any]:
+    """Parse and score every module of a project and measure the resulting model.
+    
+    Modules are analyzed in this process, as the analyzer does for projects
+    too small for worker processes, and kept the way the analyzer keeps them
+    for the later stages. The model's size in memory, its pickled size (what
+    workers send back and the cache stores) and the peak RSS are recorded.
+    
+    Args:
+        project_path: Project to analyze
+    
+    Returns:
+        Dictionary shaped like run_analysis results, with "model_mb" and "pickle_mb"
+    """
+    from ast_parser import ASTParser
+    from complexity_analyzer import ComplexityAnalyzer
+    from file_guard import analyze_file
+    
+    project_path = Path(project_path)
+    python_files = sorted(project_path.rglob("*.py"))
+    parser = ASTParser(project_path=project_path)
+    complexity_analyzer = ComplexityAnalyzer()
+    
+    start_time = time.perf_counter()
+    start_cpu = time.process_time()
+    modules = [outcome.module for outcome in (analyze_file(parser, complexity_analyzer, file_path)
+                                              for file_path in python_files)
+               if outcome.module is not None]
+    duration, cpu_time = time.perf_counter() - start_time, time.process_time() - start_cpu
+    peak_rss_mb = get_peak_rss_mb()
+    
+    return {
+        "success": len(modules) == len(python_files),
+        "files": len(python_files),
+        "analyzed_files": len(modules),
+        "functions": sum(len(module.functions) for module in modules),
+        "wall_time": round(duration, 4),
+        "peak_rss_mb": round(peak_rss_mb, 1) if peak_rss_mb is not None else None,
+        "model_mb": round(model_size(modules) / 1024 / 1024, 2),
+        "pickle_mb": round(len(pickle.dumps(modules, protocol=pickle.HIGHEST_PROTOCOL)) / 1024 / 1024, 2),
+        "critical_path": ["modules"],
+        "stages": {"modules": {"duration": round(duration, 4), "cpu_time": round(cpu_time, 4),
+                               "peak_rss_delta_mb": None}}
+    }
+
+
+def _run_memory_benchmark_quietly(project_path: Path) -> Dict[str, Any]:
+    """Run run_memory_benchmark with the analyzer's logging turned off (in a worker process)."""
+    logging.getLogger().setLevel(logging.CRITICAL)
+    return run_memory_benchmark(project_path)
+
+
+def run_analysis(project_path: Path, sections: str = "all", max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """Analyze a project once, without the cache, and record timings and memory.
+    
+    Args:
+        project_path: Project to analyze
+        sections: Output sections to produce
+        max_workers: Maximum number of parse worker processes
+    
+    Returns:
+        Dictionary with the wall time, peak RSS, file counts and per-stage statistics
+    """
+    from analyzer import ProjectAnalyzer
+    from performance_optimizer import PerformanceConfig
+    
+    analyzer = ProjectAnalyzer(project_path, use_cache=False,
+                               performance_config=PerformanceConfig(max_workers=max_workers))
+    start_time = time.perf_counter()
+    result = analyzer.analyze_project(sections=sections)
+    wall_time = time.perf_counter() - start_time
+    peak_rss_mb = get_peak_rss_mb()
+    
+    metadata = result._to_dict()["metadata"]
+    stage_stats = metadata.get("stages", {})
+    return {
+        "success": result.success,
+        "files": metadata["total_files"],
+        "analyzed_files": metadata["analyzed_files"],
+        "wall_time": round(wall_time, 4),
+        "peak_rss_mb": round(peak_rss_mb, 1) if peak_rss_mb is not None else None,
+        "critical_path": stage_stats.get("critical_path", []),
+        "stages": {
+            name: {key: stats.get(key) for key in ("duration", "cpu_time", "peak_rss_delta_mb")}
+            for name, stats in stage_stats.get("stages", {}).items()
+        }
+    }
+
+
+def _run_analysis_quietly(project_path: Path, sections: str, max_workers: Optional[int]) -> Dict[str, Any]:
+    """Run run_analysis with the analyzer's progress logging turned off (in a worker process)."""
+    logging.getLogger().setLevel(logging.WARNING)
+    return run_analysis(project_path, sections, max_workers)
+
+
+def run_isolated(project_path: Path, sections: str = "all", max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """Run run_analysis in a fresh process so that peak memory covers this run only."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_run_analysis_quietly, project_path, sections, max_workers).result()
+
+
+def run_memory_isolated(project_path: Path) -> Dict[str, Any]:
+    """Run run_memory_benchmark in a fresh process so that peak memory covers this run only."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_run_memory_benchmark_quietly, project_path).result()
+
+
+def best_of(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine repeated runs, keeping the fastest run and the lowest per-stage times."""
+    best = dict(min(runs, key=lambda run: run["wall_time"]))
+    
+    stages = {}
+    for name, stats in best["stages"].items():
+        stages[name] = {}
+        for key in stats:
+            values = [run["stages"][name][key] for run in runs
+                      if run["stages"].get(name, {}).get(key) is not None]
+            stages[name][key] = min(values) if values else None
+    best["stages"] = stages
+    
+    best["peak_rss_mb"] = min((run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None),
+                              default=None)
+    best["runs"] = len(runs)
+    return best
+
+
+def check_regressions(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+                      tolerance: float = 0.25) -> List[str]:
+    """Compare benchmark results with a baseline.
+    
+    The total wall time, the peak memory, the model size (memory benchmarks
+    only) and the CPU time of each stage are compared. A figure regresses
+    when it exceeds the baseline by more than ``tolerance`` (a fraction) and
+    by more than the noise floor
+    (MIN_TIME_REGRESSION / MIN_MEMORY_REGRESSION).
+    
+    Args:
+        results: Benchmark name -> result of best_of/run_analysis
+        baseline: Stored baseline (see make_baseline)
+        tolerance: Allowed relative slowdown
+    
+    Returns:
+        Descriptions of the regressions found (empty if none)
+    """
+    regressions = []
+    
+    def compare(label: str, current: Optional[float], previous: Optional[float], floor: float, unit: str):
+        if current is None or previous is None:
+            return
+        if current > previous * (1 + tolerance) and current - previous > floor:
+            regressions.append(f"{label}: {current:.3f}{unit} vs baseline {previous:.3f}{unit} "
+                               f"(+{(current / previous - 1) * 100 if previous else float('inf'):.0f}%)")
+    
+    for name, result in results.items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if previous is None:
+            continue
+        compare(f"{name} wall time", result["wall_time"], previous.get("wall_time"), MIN_TIME_REGRESSION, "s")
+        compare(f"{name} peak memory", result.get("peak_rss_mb"), previous.get("peak_rss_mb"),
+                MIN_MEMORY_REGRESSION, "MB")
+        compare(f"{name} model size", result.get("model_mb"), previous.get("model_mb"),
+                MIN_MEMORY_REGRESSION, "MB")
+        # Stages overlap and share the GIL, so their wall times vary between runs; CPU time does not
+        for stage, stats in result["stages"].items():
+            previous_stage = previous.get("stages", {}).get(stage, {})
+            compare(f"{name} stage {stage} CPU time", stats.get("cpu_time"), previous_stage.get("cpu_time"),
+                    MIN_TIME_REGRESSION, "s")
+    
+    return regressions
+
+
+def machine_info() -> Dict[str, Any]:
+    """Describe the machine the benchmarks ran on."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": multiprocessing.cpu_count()
+    }
+
+
+def make_baseline(results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Build a baseline document from benchmark results."""
+    return {"machine": machine_info(), "benchmarks": results}
+
+
+def main():
+    """Run the benchmarks and compare them with the baseline."""
+    parser = argparse.ArgumentParser(description='Benchmark the DoraCodeLens analyzer')
+    parser.add_argument('--scales', default='100',
+                        help=f"Comma-separated synthetic project sizes ({', '.join(SCALES)}), or 'none'")
+    parser.add_argument('--examples', action='store_true', help='Also analyze the projects in examples/')
+    parser.add_argument('--parser', metavar='SIZES', default='none',
+                        help=f"Also time ASTParser.parse_file on single large modules "
+                             f"(comma-separated: {', '.join(PARSER_SIZES)})")
+    parser.add_argument('--memory', metavar='SCALES', default='none',
+                        help=f"Also measure the analysis model of synthetic projects "
+                             f"(comma-separated: {', '.join(SCALES)})")
+    parser.add_argument('--sections', default='all', help="Output sections to compute (default: all)")
+    parser.add_argument('--max-workers', type=int, help='Maximum number of parse worker processes')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per benchmark (the fastest is kept)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic project generator')
+    parser.add_argument('--keep', metavar='DIR', help='Generate synthetic projects in DIR and keep them')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline file')
+    parser.add_argument('--update-baseline', action='store_true', help='Store the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression (0.25 = 25%%)')
+    parser.add_argument('--output', help='Also write the results to this JSON file')
+    
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+    
+    scales = [] if args.scales == 'none' else [scale.strip() for scale in args.scales.split(',')]
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"Unknown scales: {', '.join(unknown)}")
+    parser_sizes = [] if args.parser == 'none' else [size.strip() for size in args.parser.split(',')]
+    unknown = [size for size in parser_sizes if size not in PARSER_SIZES]
+    if unknown:
+        parser.error(f"Unknown parser sizes: {', '.join(unknown)}")
+    memory_scales = [] if args.memory == 'none' else [scale.strip() for scale in args.memory.split(',')]
+    unknown = [scale for scale in memory_scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"Unknown memory scales: {', '.join(unknown)}")
+    
+    work_dir = Path(args.keep) if args.keep else Path(tempfile.mkdtemp(prefix="doracodelens-bench-"))
+    projects: Dict[str, Path] = {}
+    try:
+        for scale in dict.fromkeys(scales + memory_scales):
+            project_path = work_dir / f"synthetic-{scale}"
+            if not project_path.exists():
+                print(f"Generating synthetic project with {SCALES[scale]} modules...", file=sys.stderr)
+                generate_project(project_path, scale, seed=args.seed)
+            if scale in scales:
+                projects[f"synthetic-{scale}"] = project_path
+        
+        if args.examples:
+            for example in sorted(path for path in EXAMPLES_DIR.iterdir() if path.is_dir()):
+                projects[f"example-{example.name}"] = example
+        
+        results = {}
+        for name, project_path in projects.items():
+            runs = [run_isolated(project_path, args.sections, args.max_workers) for _ in range(args.repeat)]
+            results[name] = best_of(runs)
+            print(f"{name}: {results[name]['files']} files in {results[name]['wall_time']:.2f}s, "
+                  f"peak {results[name]['peak_rss_mb']} MB", file=sys.stderr)
+        
+        for size in parser_sizes:
+            module_path = generate_large_module(work_dir / f"parser-{size}.py", size, seed=args.seed)
+            results[f"parser-{size}"] = run_parser_benchmark(module_path, max(args.repeat, 5))
+            stages = results[f"parser-{size}"]["stages"]
+            print(f"parser-{size}: {results[f'parser-{size}']['functions']} functions, "
+                  f"parse {stages['parse']['duration'] * 1000:.1f}ms, "
+                  f"extract {stages['extract']['duration'] * 1000:.1f}ms", file=sys.stderr)
+        
+        for scale in memory_scales:
+            name = f"memory-{scale}"
+            results[name] = run_memory_isolated(work_dir / f"synthetic-{scale}")
+            print(f"{name}: {results[name]['analyzed_files']} modules, model {results[name]['model_mb']} MB, "
+                  f"pickled {results[name]['pickle_mb']} MB, peak {results[name]['peak_rss_mb']} MB",
+                  file=sys.stderr)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    
+    output = {"machine": machine_info(), "results": results}
+    if args.output:
+        Path(args.output).write_text(json.dumps(output, indent=2))
+    print(json.dumps(output, indent=2))
+    
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else make_baseline({})
+        baseline["machine"] = machine_info()
+        baseline["benchmarks"].update(results)
+        baseline_path.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Baseline written to {baseline_path}", file=sys.stderr)
+        return
+    
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --update-baseline to create one", file=sys.stderr)
+        return
+    
+    baseline = json.loads(baseline_path.read_text())
+    if baseline.get("machine") != machine_info():
+        print("Warning: baseline was recorded on a different machine", file=sys.stderr)
+    
+    regressions = check_regressions(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+    print("No regressions against the baseline", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Cache History for CodeMindMap Analyzer
+
+This module records how every lookup of a project's cached analysis result
+went: a hit (with the analysis time it saved), a miss (nothing cached yet,
+or the result was evicted) or an invalidation (with the files whose changes
+invalidated the result). The records of each project are appended to a
+small journal next to its manifest, trimmed to the most recent ones, and
+summarized into a report for tuning the cache size and understanding low
+hit rates, e.g. after rebases.
+"""
+
+import json
+import logging
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from content_store import StoreLock, atomic_write
+
+logger = logging.getLogger(__name__)
+
+# Lookup outcomes
+HIT = "hit"
+MISS = "miss"
+INVALIDATED = "invalidated"
+
+# Reasons of misses and invalidations
+NO_RESULT = "no_result"  # Nothing was cached for the project before
+EVICTED = "evicted"  # A result for the same files was cached, but evicted
+MISSING_SECTIONS = "missing_sections"  # The cached result lacks requested sections
+FILES_CHANGED = "files_changed"  # Files changed since the last cached result
+CORRUPT = "corrupt"  # The cached result could not be read
+
+# Records kept per project once the journal is trimmed
+HISTORY_SIZE = 200
+
+# The journal is trimmed to HISTORY_SIZE records once it grows beyond this size
+HISTORY_MAX_BYTES = 256 * 1024
+
+# Changed files listed per invalidation (all are counted)
+CHANGED_FILES_LIMIT = 20
+
+
+def lookup_record(outcome: str, timestamp: float, lookup_time: float, reason: Optional[str] = None,
+                  time_saved: Optional[float] = None,
+                  changed_files: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Build a lookup record.
+    
+    Args:
+        outcome: HIT, MISS or INVALIDATED
+        timestamp: Time of the lookup
+        lookup_time: Seconds the lookup took (hashing files included)
+        reason: Reason of a miss or invalidation
+        time_saved: Seconds a hit saved compared to analyzing again
+        changed_files: Files whose changes invalidated the result
+    
+    Returns:
+        JSON-compatible record
+    """
+    record = {"time": timestamp, "outcome": outcome, "lookup_time": round(lookup_time, 4)}
+    if reason is not None:
+        record["reason"] = reason
+    if time_saved is not None:
+        record["time_saved"] = round(max(time_saved, 0.0), 4)
+    if changed_files is not None:
+        changed_files = sorted(changed_files)
+        record["changed_count"] = len(changed_files)
+        record["changed_files"] = changed_files[:CHANGED_FILES_LIMIT]
+    return record
+
+
+class LookupHistory:
+    """Rolling journal of a project's cache lookups."""
+    
+    def __init__(self, path: Path, lock: StoreLock):
+        """Initialize the history.
+        
+        Args:
+            path: Journal file (JSON lines)
+            lock: Lock of the cache directory, shared with other processes
+        """
+        self.path = path
+        self.lock = lock
+    
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append a lookup record, trimming the journal when it is large."""
+        line = json.dumps(record, separators=(',', ':')).encode() + b"\n"
+        try:
+            with self.lock:
+                with open(self.path, 'ab') as f:
+                    f.write(line)
+                    size = f.tell()
+                if size > HISTORY_MAX_BYTES:
+                    lines = self.path.read_bytes().splitlines(keepends=True)
+                    atomic_write(self.path, b"".join(lines[-HISTORY_SIZE:]))
+        except OSError as e:
+            logger.warning(f"Failed to record cache lookup: {e}")
+    
+    def read(self) -> List[Dict[str, Any]]:
+        """Read the lookup records, oldest first."""
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            logger.warning(f"Failed to read cache history: {e}")
+            return []
+        
+        records = []
+        for line in data.splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # Partially appended by a crashed process
+        return records[-HISTORY_SIZE:]
+
+
+def summarize(records: List[Dict[str, Any]], top_files: int = 10, recent: int = 10) -> Dict[str, Any]:
+    """Summarize lookup records.
+    
+    Args:
+        records: Lookup records, oldest first
+        top_files: Number of most frequently invalidating files listed
+        recent: Number of most recent records included
+    
+    Returns:
+        Counts per outcome and reason, hit rate, time saved, the files that
+        invalidated results most often and the most recent records
+    """
+    outcomes = Counter(record["outcome"] for record in records)
+    reasons = Counter(record["reason"] for record in records if "reason" in record)
+    invalidating_files = Counter(path for record in records for path in record.get("changed_files", ()))
+    time_saved = sum(record.get("time_saved", 0.0) for record in records)
+    lookup_time = sum(record["lookup_time"] for record in records)
+    
+    return {
+        "lookups": len(records),
+        "hits": outcomes[HIT],
+        "misses": outcomes[MISS],
+        "invalidated": outcomes[INVALIDATED],
+        "hit_rate": round(outcomes[HIT] / len(records), 4) if records else 0.0,
+        "reasons": dict(reasons),
+        "time_saved": round(time_saved, 3),
+        "average_lookup_time": round(lookup_time / len(records), 4) if records else 0.0,
+        "top_invalidating_files": [[path, count] for path, count in invalidating_files.most_common(top_files)],
+        "since": records[0]["time"] if records else None,
+        "recent": records[-recent:][::-1] if recent else []
+    }
@@ -2,22 +2,71 @@
 """
 Cache Manager for CodeMindMap Analyzer
 
-This module provides file-based caching for analysis results with
-cache invalidation based on file modification times.
+This module provides content-addressed caching for analysis results and
+per-module artifacts. Cache keys are derived from file content hashes and
+the analyzer version, so entries are shared between projects and branches
+and reused whenever the same content is analyzed again. Several analyzer
+processes can use the same cache directory at once (see content_store).
 """
 
 import json
 import hashlib
 import logging
 import os
+import pickle
+import re
 import time
-from dataclasses import asdict
+import threading
+import weakref
+import zipfile
+import zlib
+from dataclasses import fields, is_dataclass
+from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Any, Union
-from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Any, Union
+
+from analysis_stages import DEFAULT_SECTIONS
+from cache_history import (
+    CORRUPT, EVICTED, FILES_CHANGED, HIT, INVALIDATED, MISS, MISSING_SECTIONS, NO_RESULT,
+    LookupHistory, lookup_record, summarize
+)
+from cache_pack import COMPRESSION_LEVEL, PackFormatError, PackReader, write_pack
+from change_detector import ChangeDetector, hash_file
+from content_store import LRU, ContentStore, atomic_write
+from file_index import ProjectFileIndex, get_file_index
+from source_store import content_hash
 
 logger = logging.getLogger(__name__)
 
+# Part of every cache key: bump when analysis output changes so that
+# artifacts of older analyzers are never reused
+ANALYZER_VERSION = "0.1.0"
+MODULE_RECORDS_VERSION = 8
+
+MANIFEST_VERSION = 1
+
+# Cache bundles: zip files of module artifacts, for seeding other caches
+BUNDLE_VERSION = 1
+BUNDLE_MANIFEST = "manifest.json"
+MODULE_KINDS = ("module", "module-partial")
+
+# Dependency files whose content is part of a project's analysis result
+DEPENDENCY_FILES = [
+    "requirements.txt", "pyproject.toml", "Pipfile", "setup.py",
+    "setup.cfg", "poetry.lock", "Pipfile.lock"
+]
+
+# Top-level keys of a cached result loaded whichever sections are requested
+RESULT_BASE_KEYS = ("success", "errors", "warnings", "metadata", "schema_version")
+
+# Files written by earlier cache formats
+LEGACY_CACHE_FILE = re.compile(r"^(cache_metadata\.json|[0-9a-f]{32}\.json|[0-9a-f]{32}\.modules\.pkl)$")
+
+
+class BundleError(Exception):
+    """Raised when a cache bundle cannot be written or imported."""
+    pass
+
 
 class CacheEntry:
     """Represents a cache entry with metadata."""
@@ -52,15 +101,47 @@ class CacheEntry:
         return entry
 
 
+class ModuleRecord:
+    """Per-module analysis state reused by incremental runs."""
+    
+    __slots__ = ("file_hash", "module", "call_sites", "call_events")
+    
+    def __init__(self, file_hash: str, module: Any, call_sites: List[Any], call_events: List[Any]):
+        self.file_hash = file_hash  # hash of the source file the module was built from
+        self.module = module  # complexity-enhanced ModuleInfo
+        self.call_sites = call_sites  # call sites recorded by CallGraphBuilder
+        self.call_events = call_events  # call events recorded by EnhancedCodeGraphBuilder
+
+
+class IncrementalPlan:
+    """Which modules an incremental run can reuse and which files it must parse."""
+    
+    def __init__(self, reused: Dict[str, ModuleRecord], files_to_parse: List[Path],
+                 changed_files: Set[str], file_hashes: Dict[str, str]):
+        self.reused = reused  # module path -> cached record
+        self.files_to_parse = files_to_parse
+        self.changed_files = changed_files
+        self.file_hashes = file_hashes  # current hashes, relative path -> hash
+
+
 class CacheManager:
-    """Manages file-based caching for analysis results."""
+    """Manages content-addressed caching of analysis results and module artifacts.
     
-    def __init__(self, cache_dir: Optional[Path] = None, max_cache_size_mb: int = 100):
+    Objects live in a ContentStore that evicts the least recently (or least
+    frequently) used objects once it exceeds its size limit. A small manifest
+    per project remembers the file hashes computed from (size, mtime), so
+    unchanged files are not read again, and which objects the project uses.
+    """
+    
+    def __init__(self, cache_dir: Optional[Path] = None, max_cache_size_mb: int = 100,
+                 eviction_policy: str = LRU, use_git: bool = True):
         """Initialize cache manager.
         
         Args:
             cache_dir: Directory to store cache files (default: ~/.codemindmap_cache)
             max_cache_size_mb: Maximum cache size in MB
+            eviction_policy: Eviction policy of the store ("lru" or "lfu")
+            use_git: Whether to take hashes of unmodified tracked files from git
         """
         if cache_dir is None:
             cache_dir = Path.home() / ".codemindmap_cache"
@@ -69,281 +150,414 @@ class CacheManager:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.max_cache_size_bytes = max_cache_size_mb * 1024 * 1024
         
-        # Cache metadata file
-        self.metadata_file = self.cache_dir / "cache_metadata.json"
-        self.metadata = self._load_metadata()
+        self._remove_legacy_files()
+        self.store = ContentStore(self.cache_dir, self.max_cache_size_bytes, eviction_policy)
+        
+        # Project manifests, loaded on first use
+        self.manifests_dir = self.cache_dir / "projects"
+        self.manifests_dir.mkdir(exist_ok=True)
+        self._manifests: Dict[str, Dict[str, Any]] = {}
+        
+        self.use_git = use_git
+        self._index_hashes: "weakref.WeakKeyDictionary[ProjectFileIndex, Dict[str, str]]" = weakref.WeakKeyDictionary()
+        self.last_change_detection: Dict[str, Any] = {}  # ChangeDetector.last_stats of the last hashing
+        self._recorded_misses: Dict[str, str] = {}  # project cache key -> result key of the last recorded miss
         
         logger.info(f"Cache manager initialized with directory: {self.cache_dir}")
     
-    def _load_metadata(self) -> Dict[str, Any]:
-        """Load cache metadata from file."""
-        if not self.metadata_file.exists():
-            return {"entries": {}, "total_size": 0, "last_cleanup": time.time()}
-        
-        try:
-            with open(self.metadata_file, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.warning(f"Failed to load cache metadata: {e}")
-            return {"entries": {}, "total_size": 0, "last_cleanup": time.time()}
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Index of the content store (object sizes and usage)."""
+        return self.store.index
     
-    def _save_metadata(self):
-        """Save cache metadata to file."""
-        try:
-            with open(self.metadata_file, 'w') as f:
-                json.dump(self.metadata, f, indent=2)
-        except Exception as e:
-            logger.error(f"Failed to save cache metadata: {e}")
+    def _remove_legacy_files(self):
+        """Remove files written by earlier cache formats."""
+        for name in os.listdir(self.cache_dir):
+            if LEGACY_CACHE_FILE.match(name):
+                try:
+                    (self.cache_dir / name).unlink()
+                except OSError as e:
+                    logger.warning(f"Failed to remove old cache file {name}: {e}")
     
     def _get_cache_key(self, project_path: Path) -> str:
         """Generate cache key for a project.
         
         Args:
             project_path: Path to the project
-            
+        
         Returns:
             Cache key string
         """
-        # Use project path and its modification time for cache key
         path_str = str(project_path.resolve())
         return hashlib.md5(path_str.encode()).hexdigest()
     
+    @staticmethod
+    def _object_key(*parts: str) -> str:
+        """Build a store key from the analyzer version and the given parts."""
+        content = "\0".join((ANALYZER_VERSION, str(MODULE_RECORDS_VERSION)) + parts)
+        return hashlib.sha256(content.encode()).hexdigest()
+    
+    def _get_result_key(self, project_path: Path, file_hashes: Dict[str, str]) -> str:
+        """Get the store key of a project's analysis result for the given file contents.
+        
+        Results contain absolute paths, so the project path is part of the key.
+        
+        Args:
+            project_path: Path to the project
+            file_hashes: Content hashes of the project files
+        
+        Returns:
+            Store key
+        """
+        files = "\n".join(f"{rel_path}:{file_hash}" for rel_path, file_hash in sorted(file_hashes.items()))
+        return self._object_key("result", str(project_path.resolve()), files)
+    
     def _get_file_hash(self, file_path: Path) -> str:
-        """Get hash of file content and modification time.
+        """Get hash of file content.
         
         Args:
             file_path: Path to the file
-            
+        
         Returns:
-            Hash string combining content and mtime
+            Git blob id of the content (see source_store.content_hash)
+        """
+        return hash_file(file_path)
+    
+    def _get_manifest(self, project_path: Path) -> Dict[str, Any]:
+        """Get the manifest of a project, loading it on first use.
+        
+        The manifest holds ``file_stats`` (relative path -> [size, mtime, hash]),
+        ``modules`` (relative path -> hash of the stored module artifact),
+        ``results`` (store keys of the project's analysis results),
+        ``last_result`` (key and file hashes of the result cached last) and
+        ``quarantine`` (relative path -> reason and time of files that
+        exceeded the per-file analysis limits, see file_guard).
+        """
+        cache_key = self._get_cache_key(project_path)
+        manifest = self._manifests.get(cache_key)
+        if manifest is not None:
+            return manifest
+        
+        manifest = {"version": MANIFEST_VERSION, "project_path": str(project_path),
+                    "file_stats": {}, "modules": {}, "results": []}
+        manifest_file = self.manifests_dir / f"{cache_key}.json"
+        if manifest_file.exists():
+            try:
+                with open(manifest_file, 'r') as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    manifest = data
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to load cache manifest for {project_path}: {e}")
+        
+        self._manifests[cache_key] = manifest
+        return manifest
+    
+    def _save_manifest(self, project_path: Path):
+        """Write a project's manifest.
+        
+        Results another process recorded for the project since the manifest
+        was loaded are kept (as is its last result, if we have none); file
+        stats, modules and the quarantine are replaced by ours, as they
+        describe the same project files. The file is replaced by rename.
         """
+        cache_key = self._get_cache_key(project_path)
+        manifest = self._manifests.get(cache_key)
+        if manifest is None:
+            return
+        
+        manifest_file = self.manifests_dir / f"{cache_key}.json"
         try:
-            stat = file_path.stat()
-            # Combine file size and modification time for quick hash
-            content = f"{stat.st_size}:{stat.st_mtime}"
-            return hashlib.md5(content.encode()).hexdigest()
-        except Exception as e:
-            logger.warning(f"Failed to hash file {file_path}: {e}")
-            return ""
+            with self.store.lock:
+                try:
+                    with open(manifest_file, 'r') as f:
+                        stored = json.load(f)
+                    stored_results = stored.get("results", [])
+                    stored_last_result = stored.get("last_result")
+                except (OSError, ValueError, AttributeError):
+                    stored_results = []
+                    stored_last_result = None
+                
+                if "last_result" not in manifest and stored_last_result is not None:
+                    manifest["last_result"] = stored_last_result
+                for result_key in stored_results:
+                    if result_key not in manifest["results"] and self.store.contains(result_key):
+                        manifest["results"].insert(0, result_key)
+                
+                atomic_write(manifest_file, json.dumps(manifest, separators=(',', ':')).encode())
+        except OSError as e:
+            logger.error(f"Failed to save cache manifest: {e}")
     
-    def _get_project_file_hashes(self, project_path: Path) -> Dict[str, str]:
-        """Get hashes for all relevant files in the project.
+    def _get_project_file_hashes(self, project_path: Path,
+                                 file_index: Optional[ProjectFileIndex] = None) -> Dict[str, str]:
+        """Get content hashes for all relevant files in the project.
+        
+        Hashes of unmodified files tracked by git come from the git index;
+        other files are only read if their size or modification time differ
+        from the project manifest (see ChangeDetector). Hashes are computed
+        once per ProjectFileIndex, i.e. once per analysis run.
         
         Args:
             project_path: Path to the project
-            
+            file_index: Optional shared ProjectFileIndex (built if not provided)
+        
         Returns:
             Dictionary mapping file paths to hashes
         """
         file_hashes = {}
         
         try:
-            # Hash Python files
-            for py_file in project_path.rglob("*.py"):
-                if any(part.startswith('.') or part in ['__pycache__', 'node_modules', 'venv', 'env'] 
-                       for part in py_file.parts):
-                    continue
-                
-                rel_path = str(py_file.relative_to(project_path))
-                file_hashes[rel_path] = self._get_file_hash(py_file)
+            file_index = get_file_index(project_path, file_index)
+            records = list(file_index.python_files())
+            records += [record for record in map(file_index.get, DEPENDENCY_FILES) if record is not None]
             
-            # Hash dependency files
-            dep_files = [
-                "requirements.txt", "pyproject.toml", "Pipfile", "setup.py",
-                "setup.cfg", "poetry.lock", "Pipfile.lock"
-            ]
+            hashed = self._index_hashes.get(file_index)
+            if hashed is not None:
+                return dict(hashed)
             
-            for dep_file in dep_files:
-                dep_path = project_path / dep_file
-                if dep_path.exists():
-                    file_hashes[dep_file] = self._get_file_hash(dep_path)
-                    
+            manifest = self._get_manifest(project_path)
+            detector = ChangeDetector(project_path, self.use_git)
+            file_hashes, file_stats = detector.get_file_hashes(records, manifest["file_stats"])
+            self.last_change_detection = detector.last_stats
+            
+            if file_stats != manifest["file_stats"]:
+                manifest["file_stats"] = file_stats
+                self._save_manifest(project_path)
+            self._index_hashes[file_index] = dict(file_hashes)
+        
         except Exception as e:
             logger.error(f"Failed to generate file hashes: {e}")
         
         return file_hashes
     
-    def _is_cache_valid(self, cache_entry: CacheEntry, current_hashes: Dict[str, str]) -> bool:
-        """Check if cache entry is still valid.
+    def _read_cached_result(self, project_path: Path, file_index: Optional[ProjectFileIndex],
+                            read: Callable[[PackReader], Any], record: bool = True) -> Optional[Any]:
+        """Open the cached result for the project's current files and read from it.
         
         Args:
-            cache_entry: Cached entry to validate
-            current_hashes: Current file hashes
-            
+            project_path: Path to the project
+            file_index: Optional shared ProjectFileIndex used for validation
+            read: Function decoding what is needed from the memory-mapped pack,
+                returning None if the result does not serve the lookup
+            record: Whether to record the lookup in the project's history
+        
         Returns:
-            True if cache is valid, False otherwise
+            Return value of read, or None if no valid result is cached
         """
-        # Check if any files have changed
-        for file_path, current_hash in current_hashes.items():
-            cached_hash = cache_entry.file_hashes.get(file_path)
-            if cached_hash != current_hash:
-                logger.debug(f"Cache invalid: file {file_path} changed")
-                return False
+        start_time = time.time()
+        current_hashes = self._get_project_file_hashes(project_path, file_index)
+        result_key = self._get_result_key(project_path, current_hashes)
         
-        # Check if any cached files were deleted
-        for file_path in cache_entry.file_hashes:
-            if file_path not in current_hashes:
-                logger.debug(f"Cache invalid: file {file_path} deleted")
-                return False
+        buffer = self.store.map(result_key)
+        if buffer is None:
+            logger.debug(f"No cached result for the current files of project: {project_path}")
+            if record:
+                self._record_miss(project_path, result_key, current_hashes, start_time)
+            return None
         
-        return True
+        try:
+            reader = PackReader(buffer)
+            if reader.meta.get("fingerprint") != result_key:
+                raise PackFormatError("cached result does not match its key")
+            data = read(reader)
+            analysis_time = reader.meta.get("analysis_time")
+        except (PackFormatError, KeyError, ValueError) as e:
+            logger.error(f"Failed to load cache entry: {e}")
+            self.store.remove(result_key)
+            self.store.flush()
+            if record:
+                self._record_lookup(project_path, result_key, INVALIDATED, start_time, reason=CORRUPT)
+            return None
+        finally:
+            if not isinstance(buffer, bytes):
+                buffer.close()
+        
+        # Appends the access to the journal; the index is not rewritten
+        self.store.flush()
+        if record and data is None:
+            self._record_lookup(project_path, result_key, MISS, start_time, reason=MISSING_SECTIONS)
+        elif record:
+            lookup_time = time.time() - start_time
+            time_saved = analysis_time - lookup_time if analysis_time is not None else None
+            self._record_lookup(project_path, result_key, HIT, start_time, time_saved=time_saved)
+        return data
+    
+    def _record_miss(self, project_path: Path, result_key: str, current_hashes: Dict[str, str],
+                     start_time: float) -> None:
+        """Record why no result is cached for the project's current files.
+        
+        A result cached for the same files before was evicted. Otherwise the
+        files that changed since the last cached result invalidated it.
+        """
+        manifest = self._get_manifest(project_path)
+        last_result = manifest.get("last_result")
+        if last_result is None:
+            self._record_lookup(project_path, result_key, MISS, start_time, reason=NO_RESULT)
+        elif result_key in manifest["results"] or last_result["key"] == result_key:
+            self._record_lookup(project_path, result_key, MISS, start_time, reason=EVICTED)
+        else:
+            changed_files = IncrementalAnalyzer._diff_file_hashes(current_hashes, last_result["file_hashes"])
+            self._record_lookup(project_path, result_key, INVALIDATED, start_time,
+                                reason=FILES_CHANGED, changed_files=changed_files)
+    
+    def _record_lookup(self, project_path: Path, result_key: str, outcome: str, start_time: float,
+                       **details: Any) -> None:
+        """Append a lookup record to the project's history.
+        
+        A miss repeated for the same files (e.g. the fast path and then the
+        analysis itself looking up the result) is recorded once.
+        """
+        cache_key = self._get_cache_key(project_path)
+        if outcome == HIT:
+            self._recorded_misses.pop(cache_key, None)
+        elif self._recorded_misses.get(cache_key) == result_key:
+            return
+        else:
+            self._recorded_misses[cache_key] = result_key
+        
+        record = lookup_record(outcome, start_time, time.time() - start_time, **details)
+        self._get_history(project_path).append(record)
+    
+    def _get_history(self, project_path: Path) -> LookupHistory:
+        """Get the lookup history of a project."""
+        cache_key = self._get_cache_key(project_path)
+        return LookupHistory(self.manifests_dir / f"{cache_key}.history.jsonl", self.store.lock)
     
-    def get_cached_result(self, project_path: Path) -> Optional[Any]:
+    def get_cached_result(self, project_path: Path, file_index: Optional[ProjectFileIndex] = None,
+                          sections: Optional[Iterable[str]] = None) -> Optional[Any]:
         """Get cached analysis result for a project.
         
+        Any result cached for the project's current file contents is found,
+        e.g. one analyzed on another branch before switching back. Only the
+        requested sections are decoded.
+        
         Args:
             project_path: Path to the project
-            
+            file_index: Optional shared ProjectFileIndex used for validation
+            sections: Output sections to load (None for the whole result)
+        
         Returns:
             Cached analysis result or None if not found/invalid
         """
-        cache_key = self._get_cache_key(project_path)
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        
-        if not cache_file.exists():
-            logger.debug(f"No cache file found for project: {project_path}")
-            return None
+        keys = None if sections is None else RESULT_BASE_KEYS + tuple(sections)
         
-        try:
-            # Load cache entry
-            with open(cache_file, 'r') as f:
-                cache_data = json.load(f)
-            
-            cache_entry = CacheEntry.from_dict(cache_data)
-            
-            # Get current file hashes
-            current_hashes = self._get_project_file_hashes(project_path)
-            
-            # Validate cache
-            if not self._is_cache_valid(cache_entry, current_hashes):
-                logger.info(f"Cache invalid for project: {project_path}")
-                self._remove_cache_entry(cache_key)
+        def load_result(reader: PackReader) -> Optional[Dict[str, Any]]:
+            data = reader.load(keys)
+            cached_sections = data.get("metadata", {}).get("sections", DEFAULT_SECTIONS)
+            if sections is not None and not set(sections).issubset(cached_sections):
                 return None
-            
-            # Update access statistics
-            cache_entry.access_count += 1
-            cache_entry.last_accessed = time.time()
-            
-            # Save updated metadata
-            self.metadata["entries"][cache_key] = {
-                "access_count": cache_entry.access_count,
-                "last_accessed": cache_entry.last_accessed,
-                "size": cache_file.stat().st_size
-            }
-            self._save_metadata()
-            
+            return data
+        
+        data = self._read_cached_result(project_path, file_index, load_result)
+        if data is not None:
             logger.info(f"Cache hit for project: {project_path}")
-            return cache_entry.data
-            
-        except Exception as e:
-            logger.error(f"Failed to load cache entry: {e}")
-            self._remove_cache_entry(cache_key)
-            return None
+        return data
+    
+    def write_cached_result(self, project_path: Path, write: Callable[[bytes], Any],
+                            file_index: Optional[ProjectFileIndex] = None,
+                            sections: Optional[Iterable[str]] = None,
+                            prepare: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None
+                            ) -> Optional[Dict[str, Any]]:
+        """Write the cached analysis result for a project as compact JSON without decoding it.
+        
+        Only the small base keys (RESULT_BASE_KEYS) are decoded; the sections
+        are copied from the cache as they are.
+        
+        Args:
+            project_path: Path to the project
+            write: Function receiving the JSON in chunks
+            file_index: Optional shared ProjectFileIndex used for validation
+            sections: Output sections to write (None for the whole result)
+            prepare: Function receiving the base keys and returning the values to
+                write instead of stored ones, or None to reject the cached result
+        
+        Returns:
+            Base keys as written, or None if nothing was written
+        """
+        keys = None if sections is None else RESULT_BASE_KEYS + tuple(sections)
+        
+        def write_result(reader: PackReader) -> Optional[Dict[str, Any]]:
+            base = reader.load(RESULT_BASE_KEYS)
+            replace = prepare(base) if prepare else {}
+            if replace is None:
+                return None
+            reader.write_json(write, keys, replace)
+            return dict(base, **replace)
+        
+        data = self._read_cached_result(project_path, file_index, write_result)
+        if data is not None:
+            logger.info(f"Cache hit for project: {project_path} (written without decoding)")
+        return data
+    
+    def get_cached_modules(self, project_path: Path, module_paths: Iterable[str],
+                           file_index: Optional[ProjectFileIndex] = None) -> Optional[Dict[str, Any]]:
+        """Get the cached code graph nodes of some modules without loading the whole result.
+        
+        Args:
+            project_path: Path to the project
+            module_paths: Absolute paths of the modules' files
+            file_index: Optional shared ProjectFileIndex used for validation
+        
+        Returns:
+            Dictionary mapping module paths to file nodes (modules not in the
+            result are left out), or None if no valid result is cached
+        """
+        return self._read_cached_result(project_path, file_index,
+                                        lambda reader: reader.get_modules(module_paths), record=False)
     
-    def cache_result(self, project_path: Path, result: Any) -> bool:
+    def cache_result(self, project_path: Path, result: Any,
+                     file_index: Optional[ProjectFileIndex] = None) -> bool:
         """Cache analysis result for a project.
         
         Args:
             project_path: Path to the project
             result: Analysis result to cache
-            
+            file_index: Optional shared ProjectFileIndex the result was computed from
+        
         Returns:
             True if caching succeeded, False otherwise
         """
         try:
-            cache_key = self._get_cache_key(project_path)
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            
-            # Get current file hashes
-            file_hashes = self._get_project_file_hashes(project_path)
+            file_hashes = self._get_project_file_hashes(project_path, file_index)
+            result_key = self._get_result_key(project_path, file_hashes)
             
-            # Create cache entry
-            cache_entry = CacheEntry(
-                data=result,
-                file_hashes=file_hashes,
-                timestamp=time.time()
-            )
+            meta = {"fingerprint": result_key, "timestamp": time.time()}
+            if isinstance(result, dict):
+                # Reported as the time a hit saves
+                meta["analysis_time"] = result.get("metadata", {}).get("analysis_time")
+            data = write_pack(result, meta=meta, default=self._json_serializer)
+            self.store.put(result_key, data, kind="result")
             
-            # Save cache entry
-            with open(cache_file, 'w') as f:
-                json.dump(cache_entry.to_dict(), f, indent=2, default=self._json_serializer)
+            # Remember the project's results (dropping evicted ones) for invalidation, and
+            # the files of this one to report which changes invalidate it
+            manifest = self._get_manifest(project_path)
+            results = [key for key in manifest["results"] if key != result_key and self.store.contains(key)]
+            manifest["results"] = results + [result_key]
+            manifest["last_result"] = {"key": result_key, "file_hashes": file_hashes}
+            self._save_manifest(project_path)
+            self._recorded_misses.pop(self._get_cache_key(project_path), None)
             
-            # Update metadata
-            file_size = cache_file.stat().st_size
-            self.metadata["entries"][cache_key] = {
-                "project_path": str(project_path),
-                "access_count": 0,
-                "last_accessed": cache_entry.timestamp,
-                "size": file_size
-            }
-            self.metadata["total_size"] = self.metadata.get("total_size", 0) + file_size
-            self._save_metadata()
-            
-            # Cleanup if cache is too large
-            self._cleanup_if_needed()
+            self.store.evict(protect=[result_key])
+            self.store.flush()
             
             logger.info(f"Cached result for project: {project_path}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Failed to cache result: {e}")
             return False
     
-    def _remove_cache_entry(self, cache_key: str):
-        """Remove a cache entry.
-        
-        Args:
-            cache_key: Cache key to remove
-        """
-        try:
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            if cache_file.exists():
-                file_size = cache_file.stat().st_size
-                cache_file.unlink()
-                
-                # Update metadata
-                if cache_key in self.metadata["entries"]:
-                    del self.metadata["entries"][cache_key]
-                    self.metadata["total_size"] = max(0, self.metadata.get("total_size", 0) - file_size)
-                    self._save_metadata()
-                    
-        except Exception as e:
-            logger.error(f"Failed to remove cache entry {cache_key}: {e}")
-    
-    def _cleanup_if_needed(self):
-        """Cleanup cache if it exceeds size limit."""
-        if self.metadata.get("total_size", 0) <= self.max_cache_size_bytes:
-            return
-        
-        logger.info("Cache size limit exceeded, performing cleanup...")
-        
-        # Sort entries by last accessed time (oldest first)
-        entries = list(self.metadata["entries"].items())
-        entries.sort(key=lambda x: x[1].get("last_accessed", 0))
-        
-        # Remove oldest entries until under limit
-        current_size = self.metadata.get("total_size", 0)
-        for cache_key, entry_meta in entries:
-            if current_size <= self.max_cache_size_bytes * 0.8:  # Leave some headroom
-                break
-            
-            self._remove_cache_entry(cache_key)
-            current_size -= entry_meta.get("size", 0)
-        
-        logger.info(f"Cache cleanup completed, new size: {current_size} bytes")
-    
     def clear_cache(self):
         """Clear all cache entries."""
         try:
-            for cache_file in self.cache_dir.glob("*.json"):
-                if cache_file.name != "cache_metadata.json":
-                    cache_file.unlink()
+            self.store.clear()
             
-            self.metadata = {"entries": {}, "total_size": 0, "last_cleanup": time.time()}
-            self._save_metadata()
+            for manifest_file in self.manifests_dir.glob("*.json"):
+                manifest_file.unlink()
+            self._manifests.clear()
             
             logger.info("Cache cleared successfully")
-            
+        
         except Exception as e:
             logger.error(f"Failed to clear cache: {e}")
     
@@ -353,31 +567,273 @@ class CacheManager:
         Returns:
             Dictionary with cache statistics
         """
-        entries = self.metadata.get("entries", {})
-        total_size = self.metadata.get("total_size", 0)
+        store_stats = self.store.get_stats()
+        total_size = store_stats["total_size_bytes"]
         
         return {
-            "total_entries": len(entries),
+            "total_entries": store_stats["total_entries"],
             "total_size_bytes": total_size,
             "total_size_mb": total_size / (1024 * 1024),
             "max_size_mb": self.max_cache_size_bytes / (1024 * 1024),
             "cache_dir": str(self.cache_dir),
-            "last_cleanup": self.metadata.get("last_cleanup", 0)
+            "last_cleanup": self.store.index.get("last_cleanup", 0),
+            "eviction_policy": store_stats["eviction_policy"],
+            "entries_by_kind": store_stats["by_kind"]
         }
     
+    def get_cache_report(self, project_path: Path) -> Dict[str, Any]:
+        """Summarize the recent cache lookups of a project.
+        
+        Args:
+            project_path: Path to the project
+        
+        Returns:
+            Lookup summary (see cache_history.summarize) with the cache statistics
+        """
+        report = {"project_path": str(project_path)}
+        report.update(summarize(self._get_history(project_path).read()))
+        report["cache"] = self.get_cache_stats()
+        return report
+    
+    def get_quarantined_files(self, project_path: Path) -> Dict[str, Dict[str, Any]]:
+        """Get the files of a project that exceeded the per-file analysis limits.
+        
+        Args:
+            project_path: Path to the project
+        
+        Returns:
+            Dictionary mapping relative file paths to their reason and time of quarantine
+        """
+        return dict(self._get_manifest(project_path).get("quarantine", {}))
+    
+    def set_quarantined_files(self, project_path: Path, quarantine: Dict[str, Dict[str, Any]]):
+        """Record the files of a project that later runs should not analyze in full.
+        
+        Args:
+            project_path: Path to the project
+            quarantine: Dictionary mapping relative file paths to their reason and time of quarantine
+        """
+        manifest = self._get_manifest(project_path)
+        if quarantine:
+            manifest["quarantine"] = quarantine
+        else:
+            manifest.pop("quarantine", None)
+        self._save_manifest(project_path)
+        if quarantine:
+            logger.info(f"Quarantined files of project {project_path}: {', '.join(sorted(quarantine))}")
+    
     def invalidate_project_cache(self, project_path: Path):
         """Invalidate cache for a specific project.
         
+        Removes the project's results and the module artifacts it uses (other
+        projects sharing those artifacts will re-create them).
+        
         Args:
             project_path: Path to the project
         """
+        manifest = self._get_manifest(project_path)
+        for result_key in manifest["results"]:
+            self.store.remove(result_key)
+        for rel_path, file_hash in manifest["modules"].items():
+            self.store.remove(self._get_module_key(rel_path, file_hash))
+        self.store.flush()
+        
         cache_key = self._get_cache_key(project_path)
-        self._remove_cache_entry(cache_key)
+        self._manifests.pop(cache_key, None)
+        try:
+            (self.manifests_dir / f"{cache_key}.json").unlink()
+        except FileNotFoundError:
+            pass  # Never cached, or invalidated by another process
+        
         logger.info(f"Invalidated cache for project: {project_path}")
     
+    def export_bundle(self, project_path: Path, bundle_path: Path) -> Dict[str, Any]:
+        """Write the module artifacts of a project's last analysis to a bundle file.
+        
+        The bundle is a zip file holding the stored artifacts, keyed by file
+        content hash, and a manifest with the analyzer version. Importing it
+        into another cache (e.g. a developer's, from a CI artifact) lets the
+        next analysis of any checkout with the same files skip parsing every
+        file whose content did not change.
+        
+        Args:
+            project_path: Path to the analyzed project
+            bundle_path: Bundle file to write (replaced if it exists)
+        
+        Returns:
+            Dictionary with the number of modules and the bundle size in bytes
+        
+        Raises:
+            BundleError: If the project has no cached module artifacts
+        """
+        bundle_path = Path(bundle_path)
+        modules = {}
+        temp_path = bundle_path.with_name(f"{bundle_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            # Artifacts are compressed already
+            with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_STORED) as bundle:
+                for rel_path, file_hash in sorted(self._get_manifest(project_path)["modules"].items()):
+                    key = self._get_module_key(rel_path, file_hash)
+                    data = self.store.get(key)
+                    if data is None:
+                        continue
+                    bundle.writestr(f"objects/{key}", data)
+                    modules[rel_path] = {
+                        "hash": file_hash,
+                        "kind": self.store.index["entries"].get(key, {}).get("kind", "module"),
+                        "sha256": hashlib.sha256(data).hexdigest()
+                    }
+                
+                if not modules:
+                    raise BundleError(f"No cached module artifacts for project: {project_path}")
+                bundle.writestr(BUNDLE_MANIFEST, json.dumps({
+                    "bundle_version": BUNDLE_VERSION,
+                    "analyzer_version": ANALYZER_VERSION,
+                    "module_records_version": MODULE_RECORDS_VERSION,
+                    "created": time.time(),
+                    "modules": modules
+                }, separators=(',', ':')))
+            os.replace(temp_path, bundle_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+        self.store.flush()
+        
+        size = bundle_path.stat().st_size
+        logger.info(f"Exported {len(modules)} cached modules of {project_path} to {bundle_path} ({size} bytes)")
+        return {"modules": len(modules), "size_bytes": size}
+    
+    def import_bundle(self, bundle_path: Path) -> Dict[str, Any]:
+        """Add the module artifacts of a bundle written by export_bundle to the cache.
+        
+        Artifacts already stored are kept unless the bundle completes a
+        partial one. Artifacts are unpickled when used, so only import
+        bundles from a trusted source (such as your own CI).
+        
+        Args:
+            bundle_path: Bundle file to read
+        
+        Returns:
+            Dictionary with the number of modules in the bundle, imported,
+            already cached and skipped because they were corrupt
+        
+        Raises:
+            BundleError: If the file is not a bundle or was written by another analyzer version
+        """
+        stats = {"modules": 0, "imported": 0, "cached": 0, "corrupt": 0}
+        imported_keys = []
+        try:
+            with zipfile.ZipFile(bundle_path) as bundle:
+                manifest = json.loads(bundle.read(BUNDLE_MANIFEST))
+                if manifest.get("bundle_version") != BUNDLE_VERSION:
+                    raise BundleError(f"Unsupported cache bundle version: {manifest.get('bundle_version')}")
+                versions = (manifest.get("analyzer_version"), manifest.get("module_records_version"))
+                if versions != (ANALYZER_VERSION, MODULE_RECORDS_VERSION):
+                    raise BundleError(f"Cache bundle was written by analyzer {versions[0]} "
+                                      f"(records v{versions[1]}), this is {ANALYZER_VERSION} "
+                                      f"(records v{MODULE_RECORDS_VERSION})")
+                
+                for rel_path, entry in manifest["modules"].items():
+                    stats["modules"] += 1
+                    key = self._get_module_key(rel_path, entry["hash"])
+                    stored = self.store.index["entries"].get(key)
+                    if stored is not None and (stored["kind"] == "module" or entry["kind"] != "module"):
+                        stats["cached"] += 1
+                        continue
+                    
+                    data = bundle.read(f"objects/{key}")
+                    if entry["kind"] not in MODULE_KINDS or hashlib.sha256(data).hexdigest() != entry["sha256"]:
+                        logger.warning(f"Skipping corrupt cache bundle entry: {rel_path}")
+                        stats["corrupt"] += 1
+                        continue
+                    
+                    self.store.put(key, data, kind=entry["kind"])
+                    imported_keys.append(key)
+                    stats["imported"] += 1
+        except (OSError, zipfile.BadZipFile, KeyError, TypeError, ValueError) as e:
+            raise BundleError(f"Failed to read cache bundle {bundle_path}: {e}")
+        finally:
+            self.store.evict(protect=imported_keys)
+            self.store.flush()
+        
+        logger.info(f"Imported cache bundle {bundle_path}: {stats}")
+        return stats
+    
+    def _get_module_key(self, rel_path: str, file_hash: str) -> str:
+        """Get the store key of a module artifact.
+        
+        Module artifacts carry the dotted module name derived from the file's
+        relative path, so the relative path is part of the key.
+        
+        Args:
+            rel_path: File path relative to the project
+            file_hash: Content hash of the file
+        
+        Returns:
+            Store key
+        """
+        return self._object_key("module", rel_path, file_hash)
+    
+    def get_file_analysis(self, file_path: Path, content: str, project_path: Optional[Path] = None) -> Optional[Any]:
+        """Get the cached current-file analysis of a file's content.
+        
+        Args:
+            file_path: Resolved path of the file
+            content: Content of the file
+            project_path: Project the file was analyzed in (None for no project)
+        
+        Returns:
+            Cached analysis result, or None if the content was not analyzed
+        """
+        key = self._get_file_analysis_key(file_path, content, project_path)
+        data = self.store.get(key)
+        if data is None:
+            return None
+        
+        try:
+            result = pickle.loads(zlib.decompress(data))
+        except Exception as e:
+            logger.warning(f"Failed to load cached analysis of {file_path}: {e}")
+            self.store.remove(key)
+            result = None
+        self.store.flush()
+        return result
+    
+    def cache_file_analysis(self, file_path: Path, content: str, result: Any,
+                            project_path: Optional[Path] = None) -> None:
+        """Cache the current-file analysis of a file's content.
+        
+        Args:
+            file_path: Resolved path of the file
+            content: Content of the file the result was computed from
+            result: Analysis result
+            project_path: Project the file was analyzed in (None for no project)
+        """
+        key = self._get_file_analysis_key(file_path, content, project_path)
+        try:
+            data = zlib.compress(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), COMPRESSION_LEVEL)
+            self.store.put(key, data, kind="file-analysis")
+            self.store.evict(protect=[key])
+            self.store.flush()
+        except Exception as e:
+            logger.error(f"Failed to cache analysis of {file_path}: {e}")
+    
+    def _get_file_analysis_key(self, file_path: Path, content: str, project_path: Optional[Path]) -> str:
+        """Get the store key of a current-file analysis.
+        
+        Results contain the absolute file path and depend on the project
+        (internal imports), so both paths are part of the key.
+        """
+        project = str(Path(project_path).resolve()) if project_path else ""
+        return self._object_key("file-analysis", project, str(file_path), content_hash(content.encode()))
+    
     @staticmethod
     def _json_serializer(obj):
         """Custom JSON serializer for non-serializable objects."""
+        if is_dataclass(obj):  # Also covers the slotted analysis model
+            return {field.name: getattr(obj, field.name) for field in fields(obj)}
+        if isinstance(obj, Enum):  # Enum members also have a __dict__
+            return obj.value
         if hasattr(obj, '__dict__'):
             return obj.__dict__
         elif hasattr(obj, 'value'):  # For Enum objects
@@ -393,17 +849,32 @@ class IncrementalAnalyzer:
     def __init__(self, cache_manager: CacheManager):
         self.cache_manager = cache_manager
     
-    def get_changed_files(self, project_path: Path, cached_hashes: Dict[str, str]) -> Set[str]:
+    def get_changed_files(self, project_path: Path, cached_hashes: Dict[str, str],
+                          file_index: Optional[ProjectFileIndex] = None) -> Set[str]:
         """Get list of files that have changed since last analysis.
         
         Args:
             project_path: Path to the project
             cached_hashes: Previously cached file hashes
-            
+            file_index: Optional shared ProjectFileIndex
+        
         Returns:
             Set of changed file paths (relative to project)
         """
-        current_hashes = self.cache_manager._get_project_file_hashes(project_path)
+        current_hashes = self.cache_manager._get_project_file_hashes(project_path, file_index)
+        return self._diff_file_hashes(current_hashes, cached_hashes)
+    
+    @staticmethod
+    def _diff_file_hashes(current_hashes: Dict[str, str], cached_hashes: Dict[str, str]) -> Set[str]:
+        """Get the files that differ between two sets of file hashes.
+        
+        Args:
+            current_hashes: Current file hashes
+            cached_hashes: Previously cached file hashes
+        
+        Returns:
+            Set of modified, new and deleted file paths
+        """
         changed_files = set()
         
         # Check for modified files
@@ -430,7 +901,7 @@ class IncrementalAnalyzer:
         Args:
             changed_files: Set of changed files
             total_files: Total number of files in project
-            
+        
         Returns:
             True if incremental analysis should be used
         """
@@ -439,4 +910,152 @@ class IncrementalAnalyzer:
         
         # Use incremental analysis if less than 20% of files changed
         change_ratio = len(changed_files) / max(total_files, 1)
-        return change_ratio < 0.2
\ No newline at end of file
+        return change_ratio < 0.2
+    
+    @staticmethod
+    def _record_kind(record: ModuleRecord) -> str:
+        """Get the store kind of a module record (partial if call data was not recorded)."""
+        if record.call_sites is None or record.call_events is None:
+            return "module-partial"
+        return "module"
+    
+    def _load_record(self, key: str) -> Optional[ModuleRecord]:
+        """Load a module record from the store (None if missing or unreadable)."""
+        data = self.cache_manager.store.get(key)
+        if data is None:
+            return None
+        
+        try:
+            return pickle.loads(zlib.decompress(data))
+        except Exception as e:
+            logger.warning(f"Failed to load module record {key}: {e}")
+            self.cache_manager.store.remove(key)
+            return None
+    
+    def load_module_records(self, project_path: Path) -> Dict[str, ModuleRecord]:
+        """Load the per-module records saved by the previous run.
+        
+        Args:
+            project_path: Path to the project
+        
+        Returns:
+            Dictionary mapping relative file paths to module records
+        """
+        manifest = self.cache_manager._get_manifest(project_path)
+        
+        records = {}
+        for rel_path, file_hash in manifest["modules"].items():
+            record = self._load_record(self.cache_manager._get_module_key(rel_path, file_hash))
+            if record is not None:
+                records[rel_path] = record
+        return records
+    
+    def save_module_records(self, project_path: Path, records: Dict[str, ModuleRecord]) -> bool:
+        """Save per-module records for later incremental runs.
+        
+        Records are stored by content, so a record already in the store is
+        only written again if it lacked call data that this run recorded.
+        
+        Args:
+            project_path: Path to the project
+            records: Dictionary mapping relative file paths to module records
+        
+        Returns:
+            True if saving succeeded, False otherwise
+        """
+        cache_manager = self.cache_manager
+        store = cache_manager.store
+        
+        try:
+            keys = []
+            written = 0
+            for rel_path, record in records.items():
+                key = cache_manager._get_module_key(rel_path, record.file_hash)
+                keys.append(key)
+                
+                kind = self._record_kind(record)
+                stored = store.index["entries"].get(key)
+                if stored is None or (stored["kind"] == "module-partial" and kind == "module"):
+                    data = zlib.compress(pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL), COMPRESSION_LEVEL)
+                    store.put(key, data, kind=kind)
+                    written += 1
+            
+            manifest = cache_manager._get_manifest(project_path)
+            manifest["modules"] = {rel_path: record.file_hash for rel_path, record in records.items()}
+            cache_manager._save_manifest(project_path)
+            
+            store.evict(protect=keys)
+            store.flush()
+            
+            logger.info(f"Saved {written} of {len(records)} module records for project: {project_path}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Failed to save module records: {e}")
+            return False
+    
+    def plan_incremental_run(self, project_path: Path, python_files: List[Path],
+                             file_index: Optional[ProjectFileIndex] = None) -> Optional[IncrementalPlan]:
+        """Decide which modules can be reused from the cache.
+        
+        A module is reused whenever the store holds an artifact for the file's
+        current content, whichever run, branch or project produced it.
+        
+        Args:
+            project_path: Path to the project
+            python_files: Python files to analyze in this run
+            file_index: Optional shared ProjectFileIndex
+        
+        Returns:
+            IncrementalPlan, or None if the project should be fully re-analyzed
+        """
+        cache_manager = self.cache_manager
+        file_hashes = cache_manager._get_project_file_hashes(project_path, file_index)
+        
+        stored_keys = {}
+        files_to_parse = []
+        for file_path in python_files:
+            try:
+                rel_path = Path(file_path).relative_to(project_path).as_posix()
+            except ValueError:
+                files_to_parse.append(file_path)
+                continue
+            
+            file_hash = file_hashes.get(rel_path)
+            key = cache_manager._get_module_key(rel_path, file_hash) if file_hash else None
+            if key is not None and cache_manager.store.contains(key):
+                stored_keys[file_path] = key
+            else:
+                files_to_parse.append(file_path)
+        
+        if not stored_keys:
+            return None
+        
+        if files_to_parse and not self.should_use_incremental_analysis(set(files_to_parse), len(python_files)):
+            logger.info(f"{len(files_to_parse)} files not in the cache, running full analysis")
+            return None
+        
+        # Dependency files do not affect parsed modules
+        previous_hashes = cache_manager._get_manifest(project_path)["modules"]
+        python_hashes = {rel_path: file_hash for rel_path, file_hash in file_hashes.items()
+                         if rel_path.endswith('.py')}
+        changed_files = self._diff_file_hashes(python_hashes, previous_hashes)
+        
+        reused = {}
+        for file_path in python_files:
+            key = stored_keys.get(file_path)
+            if key is None:
+                continue
+            
+            record = self._load_record(key)
+            if record is None:
+                files_to_parse.append(file_path)
+                continue
+            
+            # The artifact may have been built under another project root
+            record.module.path = str(file_path)
+            reused[record.module.path] = record
+        
+        logger.info(f"Incremental analysis: reusing {len(reused)} modules, "
+                    f"parsing {len(files_to_parse)} files")
+        return IncrementalPlan(reused, files_to_parse, changed_files, file_hashes)
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Cache Pack Format for CodeMindMap Analyzer
+
+This module defines the binary format cached analysis results are stored
+in. A pack holds each top-level key of a result dictionary as a separately
+compressed JSON segment, and every file node of ``code_graph_json`` as a
+segment of its own, followed by an index of segment offsets:
+
+    header   magic (4 bytes), format version (uint16), reserved (uint16),
+             index offset (uint64), index length (uint64)
+    segments zlib-compressed JSON documents
+    index    zlib-compressed JSON: top-level key order, key -> segment,
+             module path -> segment, metadata
+
+A PackReader decodes only the segments that are asked for, so a cache hit
+can load a few sections or modules of a large result from a memory-mapped
+file without reading the rest. It can also write the result as JSON by
+copying the decompressed segments, without decoding them at all.
+"""
+
+import json
+import logging
+import struct
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+PACK_MAGIC = b"DCLP"
+PACK_VERSION = 1
+HEADER = struct.Struct("<4sHHQQ")
+
+COMPRESSION_LEVEL = 6
+
+# Top-level key whose file nodes are stored as separate module segments
+CODE_GRAPH_KEY = "code_graph_json"
+
+# Placeholder of a module segment inside the code graph skeleton
+MODULE_REF = "$module"
+
+
+class PackFormatError(Exception):
+    """Raised when data is not a readable pack."""
+    pass
+
+
+def _dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize an object to compact JSON."""
+    return json.dumps(obj, separators=(',', ':'), default=default).encode()
+
+
+def _encode(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize an object to compressed compact JSON."""
+    return zlib.compress(_dumps(obj, default), COMPRESSION_LEVEL)
+
+
+def write_pack(result: Dict[str, Any], meta: Optional[Dict[str, Any]] = None,
+               default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize a result dictionary to a pack.
+    
+    Args:
+        result: Analysis result dictionary (AnalysisResult._to_dict())
+        meta: Small JSON-compatible metadata stored in the index
+        default: JSON serializer for objects json cannot encode
+    
+    Returns:
+        Pack bytes
+    """
+    chunks: List[bytes] = []
+    offset = HEADER.size
+    
+    def add_segment(obj: Any) -> Tuple[int, int]:
+        nonlocal offset
+        data = _encode(obj, default)
+        chunks.append(data)
+        segment = (offset, len(data))
+        offset += len(data)
+        return segment
+    
+    modules: Dict[str, Tuple[int, int]] = {}
+    
+    def split_modules(nodes: List[Any]) -> List[Any]:
+        # Replace file nodes by references to their own segments
+        skeleton = []
+        for node in nodes:
+            path = node.get("path") if isinstance(node, dict) and node.get("type") == "file" else None
+            if path is not None and path not in modules:
+                modules[path] = add_segment(node)
+                skeleton.append({MODULE_REF: path})
+            elif isinstance(node, dict) and node.get("children"):
+                skeleton.append(dict(node, children=split_modules(node["children"])))
+            else:
+                skeleton.append(node)
+        return skeleton
+    
+    segments = {}
+    for key, value in result.items():
+        if key == CODE_GRAPH_KEY and isinstance(value, list):
+            value = split_modules(value)
+        segments[key] = add_segment(value)
+    
+    index = _encode({"keys": list(result), "segments": segments, "modules": modules, "meta": meta or {}})
+    header = HEADER.pack(PACK_MAGIC, PACK_VERSION, 0, offset, len(index))
+    return b"".join([header, *chunks, index])
+
+
+class PackReader:
+    """Random-access reader of a pack held in bytes or a memory map."""
+    
+    def __init__(self, buffer: Union[bytes, memoryview, Any]):
+        """Read the pack header and index.
+        
+        Args:
+            buffer: Pack bytes or a read-only mmap of a pack file
+        
+        Raises:
+            PackFormatError: If the buffer is not a pack of a supported version
+        """
+        self.buffer = buffer
+        if len(buffer) < HEADER.size:
+            raise PackFormatError("Data is too short for a cache pack")
+        
+        magic, version, _, index_offset, index_length = HEADER.unpack_from(buffer, 0)
+        if magic != PACK_MAGIC:
+            raise PackFormatError("Data is not a cache pack")
+        if version != PACK_VERSION:
+            raise PackFormatError(f"Unsupported cache pack version: {version}")
+        if index_offset + index_length > len(buffer):
+            raise PackFormatError("Cache pack is truncated")
+        
+        try:
+            index = json.loads(zlib.decompress(buffer[index_offset:index_offset + index_length]))
+        except (zlib.error, ValueError) as e:
+            raise PackFormatError(f"Corrupt cache pack index: {e}")
+        
+        self.keys: List[str] = index["keys"]
+        self.meta: Dict[str, Any] = index["meta"]
+        self._segments: Dict[str, List[int]] = index["segments"]
+        self._modules: Dict[str, List[int]] = index["modules"]
+    
+    def read_raw(self, segment: Iterable[int]) -> bytes:
+        """Decompress one segment to its JSON text.
+        
+        Args:
+            segment: (offset, length) of the segment
+        
+        Returns:
+            UTF-8 encoded JSON
+        """
+        offset, length = segment
+        try:
+            return zlib.decompress(self.buffer[offset:offset + length])
+        except zlib.error as e:
+            raise PackFormatError(f"Corrupt cache pack segment at {offset}: {e}")
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Decode one top-level key of the result (module segments included)."""
+        segment = self._segments.get(key)
+        if segment is None:
+            return default
+        
+        value = json.loads(self.read_raw(segment))
+        if key == CODE_GRAPH_KEY and isinstance(value, list):
+            value = self._resolve_modules(value)
+        return value
+    
+    def load(self, keys: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Decode the result, or only some of its top-level keys.
+        
+        Args:
+            keys: Top-level keys to decode (None for all); missing keys are skipped
+        
+        Returns:
+            Result dictionary with the keys in their original order
+        """
+        wanted = set(self.keys if keys is None else keys)
+        return {key: self.get(key) for key in self.keys if key in wanted}
+    
+    def write_json(self, write: Callable[[bytes], Any], keys: Optional[Iterable[str]] = None,
+                   replace: Optional[Dict[str, Any]] = None) -> None:
+        """Write the result, or some of its top-level keys, as compact JSON.
+        
+        Segments are decompressed and copied as they are; only the values in
+        replace and the code graph skeleton around the module segments are
+        encoded.
+        
+        Args:
+            write: Function receiving the JSON in chunks (e.g. a binary stream's write)
+            keys: Top-level keys to write (None for all); missing keys are skipped
+            replace: Values written instead of the stored ones, by top-level key
+        """
+        wanted = set(self.keys if keys is None else keys)
+        replace = replace or {}
+        separator = b"{"
+        for key in self.keys:
+            if key not in wanted:
+                continue
+            write(separator + _dumps(key) + b":")
+            separator = b","
+            
+            if key in replace:
+                write(_dumps(replace[key]))
+            elif key == CODE_GRAPH_KEY and self._modules:
+                self._write_nodes(write, json.loads(self.read_raw(self._segments[key])))
+            else:
+                write(self.read_raw(self._segments[key]))
+        write(b"}" if separator == b"," else b"{}")
+    
+    def module_paths(self) -> List[str]:
+        """Get the paths of the modules stored as separate segments."""
+        return list(self._modules)
+    
+    def get_modules(self, paths: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Decode the code graph file nodes of some modules.
+        
+        Args:
+            paths: Module file paths (as stored in the file nodes)
+        
+        Returns:
+            Dictionary mapping each stored path to its file node
+        """
+        return {path: json.loads(self.read_raw(self._modules[path]))
+                for path in paths if path in self._modules}
+    
+    def _resolve_modules(self, nodes: List[Any]) -> List[Any]:
+        """Replace module references in a code graph skeleton by the module nodes."""
+        resolved = []
+        for node in nodes:
+            if isinstance(node, dict) and MODULE_REF in node:
+                node = json.loads(self.read_raw(self._modules[node[MODULE_REF]]))
+            elif isinstance(node, dict) and node.get("children"):
+                node["children"] = self._resolve_modules(node["children"])
+            resolved.append(node)
+        return resolved
+    
+    def _write_nodes(self, write: Callable[[bytes], Any], nodes: List[Any]) -> None:
+        """Write a code graph skeleton as JSON, copying the module segments it references."""
+        write(b"[")
+        for position, node in enumerate(nodes):
+            if position:
+                write(b",")
+            if isinstance(node, dict) and MODULE_REF in node:
+                write(self.read_raw(self._modules[node[MODULE_REF]]))
+            elif isinstance(node, dict) and node.get("children"):
+                # Keep the key order of the stored node
+                for field_position, (name, value) in enumerate(node.items()):
+                    write((b"," if field_position else b"{") + _dumps(name) + b":")
+                    if name == "children":
+                        self._write_nodes(write, value)
+                    else:
+                        write(_dumps(value))
+                write(b"}")
+            else:
+                write(_dumps(node))
+        write(b"]")
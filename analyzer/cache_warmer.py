@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Cache Warmer for CodeMindMap Analyzer
+
+This module pre-analyzes a project in the background when a workspace
+opens, so that the first explicit analysis is a cache hit instead of a cold
+run. The files the developer is most likely to look at first, i.e. the files
+open in the editor and the files recently changed according to git, get
+their current-file analysis precomputed before the whole project is
+analyzed. Warming runs at a lowered CPU priority with few workers so that it
+does not compete with the editor.
+"""
+
+import io
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from change_detector import ChangeDetector
+
+logger = logging.getLogger(__name__)
+
+# Niceness added to the warming process
+WARMUP_NICENESS = 10
+
+# Worker processes used for warming (analyses requested explicitly may use more)
+WARMUP_MAX_WORKERS = 2
+
+# Recently changed files are looked up in the last commits
+RECENT_COMMITS = 10
+
+# At most this many recently changed files are pre-analyzed (open files always are)
+MAX_RECENT_FILES = 20
+
+
+def lower_priority(niceness: int = WARMUP_NICENESS) -> None:
+    """Lower the CPU priority of the current process, where supported.
+    
+    Args:
+        niceness: Increment added to the process niceness
+    """
+    if not hasattr(os, "nice"):  # Windows
+        return
+    try:
+        os.nice(niceness)
+    except OSError as e:
+        logger.debug(f"Could not lower process priority: {e}")
+
+
+class CacheWarmer:
+    """Fills the cache with the results a workspace is likely to ask for first."""
+    
+    def __init__(self, analyzer: Any):
+        """Initialize the warmer.
+        
+        Args:
+            analyzer: ProjectAnalyzer with caching enabled, configured with
+                the workers warming may use
+        """
+        self.analyzer = analyzer
+        self.project_path = Path(analyzer.project_path).resolve()
+    
+    def get_recent_files(self, limit: int = MAX_RECENT_FILES) -> List[Path]:
+        """Get the Python files most recently worked on according to git.
+        
+        Args:
+            limit: Maximum number of files
+        
+        Returns:
+            Existing Python files, most recent first (empty outside git work trees)
+        """
+        rel_paths = ChangeDetector(self.project_path).get_recent_files(RECENT_COMMITS) or []
+        files = []
+        for rel_path in rel_paths:
+            path = self.project_path / rel_path
+            if path.suffix == ".py" and path.is_file():
+                files.append(path)
+                if len(files) == limit:
+                    break
+        return files
+    
+    def warm(self, sections: Optional[List[str]] = None,
+             open_files: Iterable[str] = ()) -> Dict[str, Any]:
+        """Precompute the current-file analyses and the project analysis.
+        
+        Files open in the editor come first, then recently changed files,
+        then the project analysis for the requested sections. Results that
+        are already cached are left alone.
+        
+        Args:
+            sections: Output sections of the project analysis (defaults to DEFAULT_SECTIONS)
+            open_files: Paths of the files open in the editor
+        
+        Returns:
+            Statistics of the warm-up run
+        """
+        from current_file_analyzer import CurrentFileAnalyzer
+        
+        start_time = time.time()
+        cache_manager = self.analyzer.cache_manager
+        if cache_manager is None:
+            raise ValueError("Cache warming requires caching to be enabled")
+        
+        files = [Path(path).resolve() for path in open_files]
+        files += self.get_recent_files()
+        files = list(dict.fromkeys(files))
+        
+        file_analyzer = CurrentFileAnalyzer(self.project_path, cache_manager)
+        failed = 0
+        for file_path in files:
+            if not file_analyzer.analyze_file(file_path).success:
+                failed += 1
+        
+        # A cached project result is only checked, not decoded
+        if self.analyzer.write_cached_json(io.BytesIO(), sections) is not None:
+            project = "cached"
+        else:
+            result = self.analyzer.analyze_project(sections=sections)
+            project = "analyzed" if result.success else "failed"
+        
+        stats = {
+            "project": project,
+            "files": len(files),
+            "files_cached": file_analyzer.cache_hits,
+            "files_failed": failed,
+            "time": round(time.time() - start_time, 3)
+        }
+        logger.info(f"Cache warm-up finished: {stats}")
+        return stats
@@ -15,25 +15,77 @@ from collections import defaultdict
 from analyzer import (
     FunctionNode, CallEdge, CallGraph, ModuleInfo, FunctionInfo, Parameter
 )
+from module_index import is_package, resolve_import_from
+from source_store import SourceStore, load_tree
 
 logger = logging.getLogger(__name__)
 
+# A call site recorded independently of the function registry:
+# (caller_id, candidate callee ids in priority order, line_number)
+CallSite = Tuple[str, Tuple[str, ...], int]
+
+
+def resolve_call_candidates(candidates: Tuple[str, ...],
+                            function_registry: Dict[str, Any]) -> Optional[str]:
+    """Pick the first candidate callee that is a known function.
+    
+    Args:
+        candidates: Candidate callee ids in priority order
+        function_registry: Registry of all known functions
+        
+    Returns:
+        Resolved callee id or None
+    """
+    for candidate in candidates:
+        if candidate in function_registry:
+            return candidate
+    return None
+
+
+def extract_call_sites(tree: ast.AST, module_name: str, is_package: bool = False) -> List[CallSite]:
+    """Record the call sites of a module, independently of the function registry.
+    
+    Args:
+        tree: Parsed AST of the module
+        module_name: Qualified name of the module
+        is_package: Whether the module is a package
+        
+    Returns:
+        Call sites found in the tree
+    """
+    visitor = CallExtractorVisitor(module_name, {}, is_package)
+    visitor.visit(tree)
+    return visitor.call_sites
+
 
 class CallGraphBuilder:
     """Builder for function call graphs from AST analysis."""
     
-    def __init__(self):
-        """Initialize the call graph builder."""
+    def __init__(self, source_store: Optional[SourceStore] = None):
+        """Initialize the call graph builder.
+        
+        Args:
+            source_store: Optional shared store used to read and parse files once per run
+        """
+        self.source_store = source_store
         self.function_registry: Dict[str, FunctionInfo] = {}
         self.call_relationships: List[Tuple[str, str, int]] = []  # (caller, callee, line_number)
+        self.module_call_sites: Dict[str, List[CallSite]] = {}  # module path -> call sites
         self.current_module = ""
         self.current_function = ""
     
-    def build_call_graph(self, modules: List[ModuleInfo]) -> CallGraph:
+    def build_call_graph(self, modules: List[ModuleInfo],
+                         cached_call_sites: Optional[Dict[str, List[CallSite]]] = None) -> CallGraph:
         """Build a complete call graph from analyzed modules.
         
+        Call sites are recorded per module in ``module_call_sites`` so that
+        an incremental run can pass them back for unchanged modules and skip
+        re-parsing those files.
+        
         Args:
             modules: List of analyzed modules
+            cached_call_sites: Optional call sites already recorded (while parsing, or by an
+                earlier run for unchanged modules), keyed by module path
             
         Returns:
             CallGraph object containing nodes and edges
@@ -43,12 +95,13 @@ class CallGraphBuilder:
         # Reset state
         self.function_registry.clear()
         self.call_relationships.clear()
+        self.module_call_sites.clear()
         
         # First pass: Register all functions
         self._register_functions(modules)
         
         # Second pass: Extract function calls
-        self._extract_function_calls(modules)
+        self._extract_function_calls(modules, cached_call_sites or {})
         
         # Build graph structure
         nodes = self._build_function_nodes()
@@ -77,40 +130,65 @@ class CallGraphBuilder:
                     method_id = f"{module.name}.{class_info.name}.{method.name}"
                     self.function_registry[method_id] = method
     
-    def _extract_function_calls(self, modules: List[ModuleInfo]) -> None:
+    def _extract_function_calls(self, modules: List[ModuleInfo],
+                                cached_call_sites: Optional[Dict[str, List[CallSite]]] = None) -> None:
         """Extract function calls from all modules.
         
         Args:
             modules: List of analyzed modules
+            cached_call_sites: Optional call sites already recorded (while parsing, or by an
+                earlier run for unchanged modules), keyed by module path
         """
+        cached_call_sites = cached_call_sites or {}
+        
         for module in modules:
             self.current_module = module.name
             
+            # Reuse recorded call sites, resolved against the current registry
+            call_sites = cached_call_sites.get(module.path)
+            if call_sites is not None:
+                self.module_call_sites[module.path] = call_sites
+                self._resolve_call_sites(call_sites)
+                continue
+            
             # Parse the module file to extract calls
             try:
                 module_path = Path(module.path)
                 if module_path.exists():
-                    with open(module_path, 'r', encoding='utf-8') as f:
-                        source_code = f.read()
-                    
-                    tree = ast.parse(source_code, filename=str(module_path))
-                    self._analyze_calls_in_tree(tree)
+                    tree = load_tree(module_path, self.source_store)
+                    self.module_call_sites[module.path] = self._analyze_calls_in_tree(tree, is_package(module))
                     
             except Exception as e:
                 logger.error(f"Failed to extract calls from {module.path}: {e}")
     
-    def _analyze_calls_in_tree(self, tree: ast.AST) -> None:
+    def _analyze_calls_in_tree(self, tree: ast.AST, is_package: bool = False) -> List[CallSite]:
         """Analyze function calls within an AST tree.
         
         Args:
             tree: AST tree to analyze
+            is_package: Whether the current module is a package
+            
+        Returns:
+            Call sites found in the tree
         """
         # Use a visitor pattern to traverse the AST
-        visitor = CallExtractorVisitor(self.current_module, self.function_registry)
+        visitor = CallExtractorVisitor(self.current_module, self.function_registry, is_package)
         visitor.visit(tree)
         
         # Collect the call relationships
         self.call_relationships.extend(visitor.call_relationships)
+        return visitor.call_sites
+    
+    def _resolve_call_sites(self, call_sites: List[CallSite]) -> None:
+        """Resolve recorded call sites against the function registry.
+        
+        Args:
+            call_sites: Call sites recorded by CallExtractorVisitor
+        """
+        for caller, candidates, line_number in call_sites:
+            callee = resolve_call_candidates(candidates, self.function_registry)
+            if callee:
+                self.call_relationships.append((caller, callee, line_number))
     
     def _build_function_nodes(self) -> List[FunctionNode]:
         """Build function nodes from registered functions.
@@ -161,16 +239,20 @@ class CallGraphBuilder:
 class CallExtractorVisitor(ast.NodeVisitor):
     """AST visitor to extract function calls."""
     
-    def __init__(self, current_module: str, function_registry: Dict[str, FunctionInfo]):
+    def __init__(self, current_module: str, function_registry: Dict[str, FunctionInfo],
+                 is_package: bool = False):
         """Initialize the call extractor visitor.
         
         Args:
             current_module: Name of the current module being analyzed
             function_registry: Registry of all known functions
+            is_package: Whether the module is a package (relative imports start from it)
         """
         self.current_module = current_module
+        self.is_package = is_package
         self.function_registry = function_registry
         self.call_relationships: List[Tuple[str, str, int]] = []
+        self.call_sites: List[CallSite] = []
         self.current_function_stack: List[str] = []
         self.current_class = ""
         self.imports: Dict[str, str] = {}  # alias -> module mapping
@@ -194,10 +276,11 @@ class CallExtractorVisitor(ast.NodeVisitor):
         Args:
             node: ImportFrom AST node
         """
-        if node.module:
+        module = resolve_import_from(node.module, node.level or 0, self.current_module, self.is_package)
+        if module:
             for alias in node.names:
                 imported_name = alias.asname if alias.asname else alias.name
-                self.imports[imported_name] = f"{node.module}.{alias.name}"
+                self.imports[imported_name] = f"{module}.{alias.name}"
         self.generic_visit(node)
     
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
@@ -255,10 +338,13 @@ class CallExtractorVisitor(ast.NodeVisitor):
             return
         
         caller = self.current_function_stack[-1]
-        callee = self._resolve_call_target(node.func)
+        candidates = self._call_target_candidates(node.func)
         
-        if callee and callee in self.function_registry:
-            self.call_relationships.append((caller, callee, node.lineno))
+        if candidates:
+            self.call_sites.append((caller, candidates, node.lineno))
+            callee = resolve_call_candidates(candidates, self.function_registry)
+            if callee:
+                self.call_relationships.append((caller, callee, node.lineno))
         
         self.generic_visit(node)
     
@@ -271,70 +357,80 @@ class CallExtractorVisitor(ast.NodeVisitor):
         Returns:
             Function identifier string or None if not resolvable
         """
+        return resolve_call_candidates(self._call_target_candidates(func_node), self.function_registry)
+    
+    def _resolve_attribute_call(self, attr_node: ast.Attribute) -> Optional[str]:
+        """Resolve attribute-based function calls.
+        
+        Args:
+            attr_node: Attribute AST node
+            
+        Returns:
+            Function identifier string or None if not resolvable
+        """
+        return resolve_call_candidates(self._attribute_call_candidates(attr_node), self.function_registry)
+    
+    def _call_target_candidates(self, func_node: ast.AST) -> Tuple[str, ...]:
+        """List the possible targets of a call expression in priority order.
+        
+        The candidates depend only on this module, so they can be cached and
+        resolved later against a registry that includes other modules.
+        
+        Args:
+            func_node: AST node representing the called function
+            
+        Returns:
+            Tuple of candidate function identifiers
+        """
         if isinstance(func_node, ast.Name):
             # Simple function call: func()
             func_name = func_node.id
             
             # Check if it's an imported function
             if func_name in self.imports:
-                return self.imports[func_name]
+                return (self.imports[func_name],)
             
-            # Check if it's a function in the current module
-            local_func_id = f"{self.current_module}.{func_name}"
-            if local_func_id in self.function_registry:
-                return local_func_id
-            
-            # Check if it's a method in the current class
+            # A function in the current module, then a method in the current class
+            candidates = (f"{self.current_module}.{func_name}",)
             if self.current_class:
-                method_id = f"{self.current_module}.{self.current_class}.{func_name}"
-                if method_id in self.function_registry:
-                    return method_id
+                candidates += (f"{self.current_module}.{self.current_class}.{func_name}",)
+            return candidates
         
         elif isinstance(func_node, ast.Attribute):
             # Method call: obj.method() or module.func()
-            return self._resolve_attribute_call(func_node)
+            return self._attribute_call_candidates(func_node)
         
-        return None
+        return ()
     
-    def _resolve_attribute_call(self, attr_node: ast.Attribute) -> Optional[str]:
-        """Resolve attribute-based function calls.
+    def _attribute_call_candidates(self, attr_node: ast.Attribute) -> Tuple[str, ...]:
+        """List the possible targets of an attribute-based call.
         
         Args:
             attr_node: Attribute AST node
             
         Returns:
-            Function identifier string or None if not resolvable
+            Tuple of candidate function identifiers
         """
         method_name = attr_node.attr
+        candidates: Tuple[str, ...] = ()
         
         if isinstance(attr_node.value, ast.Name):
             obj_name = attr_node.value.id
             
             # Check if it's a module.function call
             if obj_name in self.imports:
-                module_name = self.imports[obj_name]
-                potential_func_id = f"{module_name}.{method_name}"
-                if potential_func_id in self.function_registry:
-                    return potential_func_id
-            
-            # Check for self.method() calls
-            if obj_name == "self" and self.current_class:
-                method_id = f"{self.current_module}.{self.current_class}.{method_name}"
-                if method_id in self.function_registry:
-                    return method_id
+                candidates += (f"{self.imports[obj_name]}.{method_name}",)
             
-            # Check for cls.method() calls
-            if obj_name == "cls" and self.current_class:
-                method_id = f"{self.current_module}.{self.current_class}.{method_name}"
-                if method_id in self.function_registry:
-                    return method_id
+            # Check for self.method() and cls.method() calls
+            if obj_name in ("self", "cls") and self.current_class:
+                candidates += (f"{self.current_module}.{self.current_class}.{method_name}",)
         
         elif isinstance(attr_node.value, ast.Attribute):
             # Nested attribute access: module.submodule.func()
             # This is more complex and would require deeper analysis
             pass
         
-        return None
+        return candidates
 
 
 class CallHierarchyAnalyzer:
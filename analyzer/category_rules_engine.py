@@ -3,6 +3,7 @@ Category Rules Engine for technology classification.
 Handles exact matches, keyword patterns, and regex patterns.
 """
 
+import hashlib
 import re
 import logging
 from typing import Dict, List, Optional, Any
@@ -24,9 +25,22 @@ class CategoryRulesEngine:
         self.regex_patterns: List[Dict[str, Any]] = []
         self.category_metadata: Dict[MainCategory, Dict[str, Any]] = {}
         self.subcategory_metadata: Dict[SubcategoryType, Dict[str, Any]] = {}
+        self._fingerprint: Optional[str] = None
         
         self.load_rules(rules_file)
     
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the classification rules, identifying the rules version.
+        
+        Categorizations stored under one fingerprint are only reused while
+        the rules are unchanged.
+        """
+        if self._fingerprint is None:
+            # The rules are literal data (with enum keys) defined in a fixed order
+            self._fingerprint = hashlib.sha256(repr(CLASSIFICATION_RULES).encode()).hexdigest()
+        return self._fingerprint
+    
     def load_rules(self, rules_file: Optional[str] = None) -> None:
         """Load classification rules from configuration"""
         try:
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Change Detector for CodeMindMap Analyzer
+
+This module computes the content hashes the cache is keyed by while reading
+as few files as possible. Files whose size and modification time match the
+previous run keep their recorded hash. Hashes are git blob ids, so when many
+files changed their mtime (e.g. after switching branches), the ids of
+tracked files that ``git status --porcelain`` does not report as modified
+are taken from the git index (``git ls-files -s``). Only the remaining files
+are read and hashed, and since the hash covers the content alone, touching
+a file never changes it.
+"""
+
+import logging
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from file_index import FileRecord
+from source_store import content_hash
+
+logger = logging.getLogger(__name__)
+
+# Files modified this recently are re-hashed on every run, because a change
+# within the same timestamp tick would not alter their size or mtime
+RACY_WINDOW = 2.0  # seconds
+
+GIT_TIMEOUT = 10  # seconds
+
+# git status stats every tracked file, so it only pays off once a large share of
+# the files (or many bytes) changed their size or mtime, e.g. after a checkout
+GIT_MIN_SUSPECTS = 100
+GIT_MIN_SUSPECT_RATIO = 0.25
+GIT_MIN_SUSPECT_BYTES = 16 * 1024 * 1024
+
+# Index entries of these modes are not regular file contents (symlinks, submodules)
+GIT_SKIPPED_MODES = ("120000", "160000")
+
+
+def hash_file(path: Path) -> str:
+    """Hash a file's content.
+    
+    Args:
+        path: Path to the file
+    
+    Returns:
+        Git blob id of the content, or "" if the file cannot be read
+    """
+    try:
+        return content_hash(path.read_bytes())
+    except OSError as e:
+        logger.warning(f"Failed to hash file {path}: {e}")
+        return ""
+
+
+class ChangeDetector:
+    """Computes content hashes of project files, asking git before reading files."""
+    
+    def __init__(self, project_path: Path, use_git: bool = True):
+        """Initialize the detector.
+        
+        Args:
+            project_path: Path to the project
+            use_git: Whether to take hashes of unmodified tracked files from git
+        """
+        self.project_path = Path(project_path)
+        self.use_git = use_git
+        self.last_stats: Dict[str, Any] = {}  # How the last get_file_hashes call found its hashes
+    
+    def _run_git(self, *args: str) -> Optional[str]:
+        """Run a git command in the project directory.
+        
+        Returns:
+            Standard output, or None if git is unavailable or the command failed
+        """
+        try:
+            result = subprocess.run(
+                ["git", "--no-optional-locks", *args],
+                cwd=self.project_path,
+                capture_output=True,
+                text=True,
+                timeout=GIT_TIMEOUT
+            )
+        except (subprocess.TimeoutExpired, OSError) as e:
+            logger.debug(f"git {args[0]} failed: {e}")
+            return None
+        
+        if result.returncode != 0:
+            logger.debug(f"git {args[0]} failed: {result.stderr.strip()}")
+            return None
+        return result.stdout
+    
+    def get_git_hashes(self) -> Optional[Dict[str, str]]:
+        """Get the blob ids of tracked files whose working copy matches the index.
+        
+        Returns:
+            Dictionary mapping paths relative to the project to blob ids, or
+            None if the project is not in a git work tree
+        """
+        prefix = self._run_git("rev-parse", "--show-prefix")
+        if prefix is None:
+            return None
+        prefix = prefix.strip()
+        
+        # -v tags assume-unchanged entries in lower case and skip-worktree entries with S;
+        # git status does not report changes to either, so they are not trusted
+        listing = self._run_git("ls-files", "-s", "-v", "-z")
+        status = self._run_git("status", "--porcelain", "-z", "--untracked-files=no", "--no-renames", "--", ".")
+        if listing is None or status is None:
+            return None
+        
+        hashes = {}
+        for entry in listing.split("\0"):
+            if not entry:
+                continue
+            info, _, rel_path = entry.partition("\t")
+            tag, mode, blob_id, stage = info.split(" ")
+            if tag == "H" and stage == "0" and mode not in GIT_SKIPPED_MODES:
+                hashes[rel_path] = blob_id
+        
+        # Status paths are relative to the repository root; drop files modified in the work tree
+        for entry in status.split("\0"):
+            if len(entry) > 3 and entry[1] != " ":
+                rel_path = entry[3:]
+                if rel_path.startswith(prefix):
+                    hashes.pop(rel_path[len(prefix):], None)
+        
+        return hashes
+    
+    def get_recent_files(self, max_commits: int) -> Optional[List[str]]:
+        """Get the files most recently worked on, most recent first.
+        
+        Files modified in the work tree (including untracked ones) come first,
+        newest modification first, followed by the files changed by the last
+        commits.
+        
+        Args:
+            max_commits: Number of commits to look back
+        
+        Returns:
+            Paths relative to the project (possibly of deleted files), or None
+            if the project is not in a git work tree
+        """
+        prefix = self._run_git("rev-parse", "--show-prefix")
+        if prefix is None:
+            return None
+        prefix = prefix.strip()
+        
+        status = self._run_git("status", "--porcelain", "-z", "--untracked-files=all", "--no-renames", "--", ".")
+        log = self._run_git("log", f"-n{max_commits}", "--name-only", "--pretty=format:", "--relative", "-z", "--", ".")
+        if status is None or log is None:
+            return None
+        
+        # Status paths are relative to the repository root
+        modified = [entry[3 + len(prefix):] for entry in status.split("\0")
+                    if len(entry) > 3 and entry[3:].startswith(prefix)]
+        
+        def modified_time(rel_path: str) -> float:
+            try:
+                return (self.project_path / rel_path).stat().st_mtime
+            except OSError:
+                return 0.0
+        
+        modified.sort(key=modified_time, reverse=True)
+        committed = [rel_path.strip("\n") for rel_path in log.split("\0")]
+        return list(dict.fromkeys(rel_path for rel_path in modified + committed if rel_path))
+    
+    @staticmethod
+    def _worth_asking_git(suspects: List[FileRecord], total_files: int) -> bool:
+        """Check whether asking git is likely cheaper than reading the suspected files."""
+        if len(suspects) < GIT_MIN_SUSPECTS:
+            return False
+        return (len(suspects) >= total_files * GIT_MIN_SUSPECT_RATIO
+                or sum(record.size for record in suspects) >= GIT_MIN_SUSPECT_BYTES)
+    
+    def get_file_hashes(self, records: Iterable[FileRecord],
+                        file_stats: Dict[str, List[Any]]) -> Tuple[Dict[str, str], Dict[str, List[Any]]]:
+        """Get the content hashes of files.
+        
+        Files whose size and mtime match file_stats keep their recorded hash.
+        If many files do not (e.g. after a checkout), unmodified tracked files
+        take their blob id from git. Remaining files are read and hashed.
+        
+        Args:
+            records: Files to hash
+            file_stats: [size, mtime, hash] of files hashed before, by relative path
+        
+        Returns:
+            Tuple of (relative path -> hash, updated file_stats for the next call)
+        """
+        records = list(records)
+        hashes = {}
+        suspects = []
+        
+        for record in records:
+            stats = file_stats.get(record.rel_path)
+            if stats is not None and stats[0] == record.size and stats[1] == record.mtime:
+                hashes[record.rel_path] = stats[2]
+            else:
+                suspects.append(record)
+        
+        git_hashes = None
+        if self.use_git and self._worth_asking_git(suspects, len(records)):
+            git_hashes = self.get_git_hashes()
+        
+        from_git = 0
+        for record in suspects:
+            file_hash = git_hashes.get(record.rel_path) if git_hashes else None
+            if file_hash is not None:
+                from_git += 1
+            else:
+                # Size or mtime changed: the content decides whether the file changed
+                file_hash = hash_file(record.path)
+            hashes[record.rel_path] = file_hash
+        
+        new_stats = {}
+        settled_before = time.time() - RACY_WINDOW
+        for record in records:
+            file_hash = hashes[record.rel_path]
+            if file_hash and record.mtime < settled_before:
+                new_stats[record.rel_path] = [record.size, record.mtime, file_hash]
+        
+        self.last_stats = {
+            "method": "git" if git_hashes is not None else "stat",
+            "files": len(records),
+            "unchanged_stat": len(records) - len(suspects),
+            "from_git": from_git,
+            "hashed": len(suspects) - from_git
+        }
+        logger.debug(f"File hashes: {self.last_stats}")
+        return hashes, new_stats
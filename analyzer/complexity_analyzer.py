@@ -8,13 +8,12 @@ for cyclomatic complexity calculation and implements color-coding logic.
 
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from dataclasses import replace
+from typing import List, Dict, Any, Optional, Tuple
 
 try:
-    from radon.complexity import cc_visit
-    from radon.metrics import mi_visit, h_visit
+    from radon.metrics import h_visit_ast, mi_compute
     from radon.raw import analyze
+    from radon.visitors import ComplexityVisitor
     RADON_AVAILABLE = True
 except ImportError:
     RADON_AVAILABLE = False
@@ -23,6 +22,7 @@ except ImportError:
 from analyzer import (
     ModuleInfo, FunctionInfo, ComplexityScore, ComplexityLevel
 )
+from source_store import SourceStore, load_source, load_tree
 
 logger = logging.getLogger(__name__)
 
@@ -76,58 +76,141 @@ class ComplexityThresholds:
 class ComplexityAnalyzer:
     """Analyzer for code complexity using radon library."""
     
-    def __init__(self):
-        """Initialize the complexity analyzer."""
+    def __init__(self, source_store: Optional[SourceStore] = None):
+        """Initialize the complexity analyzer.
+        
+        Args:
+            source_store: Optional shared store used to read and parse files once per run
+        """
         self.radon_available = RADON_AVAILABLE
+        self.source_store = source_store
         if not self.radon_available:
             logger.debug("Using built-in complexity analysis (radon not available)")
     
     def enhance_module_complexity(self, module: ModuleInfo) -> ModuleInfo:
         """Enhance module with detailed complexity analysis using radon.
         
+        Radon's complexity visitor runs once on the module's already parsed
+        tree and provides the cyclomatic complexity; cognitive complexity is
+        the one ASTParser computed while extracting the module. The module
+        and its functions are updated in place, so methods shared with their
+        classes' method lists see the same scores.
+        
         Args:
             module: ModuleInfo object to enhance
             
         Returns:
-            Enhanced ModuleInfo with updated complexity scores
+            The module, with updated complexity scores
         """
         try:
             if not self.radon_available:
                 return self._enhance_module_basic(module)
             
-            # Read the source file
-            with open(module.path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
+            # Reuse the module's parsed tree
+            tree = load_tree(module.path, self.source_store)
             
             # Analyze complexity using radon
-            complexity_results = cc_visit(source_code)
+            complexity_results = ComplexityVisitor.from_ast(tree).blocks
             
             # Enhance functions with radon complexity data
-            enhanced_functions = []
-            for func in module.functions:
-                enhanced_func = self._enhance_function_complexity(func, complexity_results, source_code)
-                enhanced_functions.append(enhanced_func)
+            index = self._index_complexity_results(complexity_results)
+            for func, qualified_name in self._qualified_functions(module):
+                self._enhance_function_complexity(func, index.get((qualified_name, func.line_number)))
             
             # Calculate module-level complexity
-            module_complexity = self._calculate_module_complexity(enhanced_functions, source_code)
-            
-            # Create enhanced module
-            enhanced_module = replace(
-                module,
-                functions=enhanced_functions,
-                complexity=module_complexity
-            )
+            module.complexity = self._calculate_module_complexity(module.functions, complexity_results)
             
             logger.debug(f"Enhanced complexity for module {module.name}: "
-                        f"cyclomatic={module_complexity.cyclomatic}, "
-                        f"level={module_complexity.level.value}")
+                        f"cyclomatic={module.complexity.cyclomatic}, "
+                        f"level={module.complexity.level.value}")
             
-            return enhanced_module
+            return module
             
         except Exception as e:
             logger.error(f"Failed to enhance complexity for module {module.name}: {e}")
             return self._enhance_module_basic(module)
     
+    def calculate_maintainability(self, module: ModuleInfo) -> Dict[str, Any]:
+        """Calculate the maintainability index and Halstead metrics of a module.
+        
+        These metrics are not part of enhance_module_complexity; they are
+        computed only for callers that ask for them, from the module's shared
+        source and parsed tree (radon's mi_visit would parse the file again).
+        
+        Args:
+            module: Module to measure
+            
+        Returns:
+            Dictionary with 'maintainability_index' (0-100), its 'level' and
+            the module's 'halstead' metrics, or an empty dictionary when radon
+            is not available or the module cannot be read
+        """
+        if not self.radon_available:
+            return {}
+        
+        try:
+            source_code = load_source(module.path, self.source_store)
+            tree = load_tree(module.path, self.source_store, source_code)
+            
+            halstead = h_visit_ast(tree).total
+            raw = analyze(source_code)
+            comment_lines = raw.comments + raw.multi
+            comments = comment_lines / float(raw.sloc) * 100 if raw.sloc else 0
+            total_complexity = ComplexityVisitor.from_ast(tree).total_complexity
+            maintainability = mi_compute(halstead.volume, total_complexity, raw.lloc, comments)
+            
+            if maintainability >= ComplexityThresholds.HIGH_MAINTAINABILITY:
+                level = ComplexityLevel.LOW
+            elif maintainability >= ComplexityThresholds.MEDIUM_MAINTAINABILITY:
+                level = ComplexityLevel.MEDIUM
+            else:
+                level = ComplexityLevel.HIGH
+            
+            return {
+                'maintainability_index': round(maintainability, 2),
+                'level': level.value,
+                'halstead': {
+                    'vocabulary': halstead.vocabulary,
+                    'length': halstead.length,
+                    'volume': round(halstead.volume, 2),
+                    'difficulty': round(halstead.difficulty, 2),
+                    'effort': round(halstead.effort, 2),
+                    'bugs': round(halstead.bugs, 4)
+                }
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to calculate maintainability for module {module.name}: {e}")
+            return {}
+    
+    @staticmethod
+    def _index_complexity_results(complexity_results: List[Any]) -> Dict[Tuple[str, int], Any]:
+        """Index radon blocks and their nested functions by (qualified name, line).
+        
+        Args:
+            complexity_results: Radon blocks (functions, classes and methods)
+            
+        Returns:
+            Dictionary mapping (qualified name, line number) to radon functions
+        """
+        index = {}
+        pending = [result for result in complexity_results if hasattr(result, 'closures')]
+        while pending:
+            result = pending.pop()
+            index[(result.fullname, result.lineno)] = result
+            pending.extend(result.closures)
+        return index
+    
+    @staticmethod
+    def _qualified_functions(module: ModuleInfo) -> List[Tuple[FunctionInfo, str]]:
+        """Pair each function of a module with its radon-style qualified name.
+        
+        Methods are named "Class.method"; other functions keep their name.
+        """
+        class_names = {id(method): cls.name for cls in module.classes for method in cls.methods}
+        return [(func, f"{class_names[id(func)]}.{func.name}" if id(func) in class_names else func.name)
+                for func in module.functions]
+    
     def _enhance_module_basic(self, module: ModuleInfo) -> ModuleInfo:
         """Enhance module with basic complexity analysis (fallback).
         
@@ -135,135 +218,85 @@ class ComplexityAnalyzer:
             module: ModuleInfo object to enhance
             
         Returns:
-            Enhanced ModuleInfo with basic complexity scores
+            The module, with basic complexity scores (updated in place)
         """
         # Use existing complexity scores but ensure proper level calculation
-        enhanced_functions = []
         for func in module.functions:
-            level = ComplexityThresholds.get_complexity_level(func.complexity.cyclomatic)
-            enhanced_complexity = replace(func.complexity, level=level)
-            enhanced_func = replace(func, complexity=enhanced_complexity)
-            enhanced_functions.append(enhanced_func)
+            self._update_level(func)
         
         # Calculate module complexity as sum of function complexities
-        total_complexity = sum(func.complexity.cyclomatic for func in enhanced_functions)
-        module_level = ComplexityThresholds.get_complexity_level(total_complexity)
-        module_complexity = ComplexityScore(cyclomatic=total_complexity, level=module_level)
-        
-        return replace(
-            module,
-            functions=enhanced_functions,
-            complexity=module_complexity
-        )
+        module.complexity = self._calculate_module_complexity(module.functions)
+        return module
+    
+    @staticmethod
+    def _update_level(func: FunctionInfo) -> FunctionInfo:
+        """Set a function's complexity level from its cyclomatic complexity (in place)."""
+        func.complexity.level = ComplexityThresholds.get_complexity_level(func.complexity.cyclomatic)
+        return func
     
-    def _enhance_function_complexity(self, func: FunctionInfo, complexity_results: List[Any], 
-                                   source_code: str) -> FunctionInfo:
+    def _enhance_function_complexity(self, func: FunctionInfo, radon_complexity: Optional[Any]) -> FunctionInfo:
         """Enhance function with radon complexity data.
         
         Args:
             func: FunctionInfo object to enhance
-            complexity_results: Radon complexity analysis results
-            source_code: Source code of the module
+            radon_complexity: Radon result matching the function, or None
             
         Returns:
-            Enhanced FunctionInfo with updated complexity
+            The function, with updated complexity (in place)
         """
         try:
-            # Find matching complexity result from radon
-            radon_complexity = None
-            for result in complexity_results:
-                if (hasattr(result, 'name') and result.name == func.name and
-                    hasattr(result, 'lineno') and abs(result.lineno - func.line_number) <= 2):
-                    radon_complexity = result
-                    break
-            
-            if radon_complexity:
+            if radon_complexity is not None:
                 # Use radon's cyclomatic complexity
                 cyclomatic = radon_complexity.complexity
                 
-                # Calculate cognitive complexity (simplified approximation)
-                cognitive = self._estimate_cognitive_complexity(cyclomatic)
-                
                 # Determine complexity level
                 level = ComplexityThresholds.get_complexity_level(cyclomatic)
                 
-                enhanced_complexity = ComplexityScore(
-                    cyclomatic=cyclomatic,
-                    cognitive=cognitive,
-                    level=level
-                )
+                complexity = func.complexity
+                complexity.cyclomatic = cyclomatic
+                complexity.level = level
                 
                 logger.debug(f"Enhanced function {func.name}: "
-                           f"cyclomatic={cyclomatic}, cognitive={cognitive}, level={level.value}")
+                           f"cyclomatic={cyclomatic}, cognitive={complexity.cognitive}, level={level.value}")
                 
-                return replace(func, complexity=enhanced_complexity)
+                return func
             else:
                 # Fallback to existing complexity with proper level
-                level = ComplexityThresholds.get_complexity_level(func.complexity.cyclomatic)
-                enhanced_complexity = replace(func.complexity, level=level)
-                return replace(func, complexity=enhanced_complexity)
+                return self._update_level(func)
                 
         except Exception as e:
             logger.error(f"Failed to enhance function {func.name} complexity: {e}")
             # Return original function with proper level
-            level = ComplexityThresholds.get_complexity_level(func.complexity.cyclomatic)
-            enhanced_complexity = replace(func.complexity, level=level)
-            return replace(func, complexity=enhanced_complexity)
+            return self._update_level(func)
     
-    def _estimate_cognitive_complexity(self, cyclomatic: int) -> int:
-        """Estimate cognitive complexity based on cyclomatic complexity.
-        
-        This is a simplified approximation. True cognitive complexity
-        requires more detailed AST analysis.
-        
-        Args:
-            cyclomatic: Cyclomatic complexity value
-            
-        Returns:
-            Estimated cognitive complexity
-        """
-        # Cognitive complexity is typically higher than cyclomatic
-        # This is a rough approximation
-        return int(cyclomatic * 1.2)
-    
-    def _calculate_module_complexity(self, functions: List[FunctionInfo], source_code: str) -> ComplexityScore:
+    def _calculate_module_complexity(self, functions: List[FunctionInfo],
+                                     complexity_results: Optional[List[Any]] = None) -> ComplexityScore:
         """Calculate module-level complexity.
         
+        Cognitive complexity is the sum of the functions' scores, as the
+        cognitive complexity specification defines it for a file.
+        
         Args:
             functions: List of functions in the module
-            source_code: Source code of the module
+            complexity_results: Radon results computed for the module (optional)
             
         Returns:
             ComplexityScore for the module
         """
         try:
-            if self.radon_available:
+            if self.radon_available and complexity_results is not None:
                 # Use radon to get overall module metrics
-                complexity_results = cc_visit(source_code)
                 total_cyclomatic = sum(result.complexity for result in complexity_results)
-                
-                # Calculate maintainability index if available
-                try:
-                    mi_results = mi_visit(source_code, multi=True)
-                    maintainability = mi_results.mi if hasattr(mi_results, 'mi') else 0
-                except:
-                    maintainability = 0
-                
-                # Use maintainability index to adjust cognitive complexity
-                cognitive = int(total_cyclomatic * (1.5 - (maintainability / 100)))
-                cognitive = max(cognitive, total_cyclomatic)  # Ensure cognitive >= cyclomatic
-                
             else:
                 # Fallback calculation
                 total_cyclomatic = sum(func.complexity.cyclomatic for func in functions)
-                cognitive = int(total_cyclomatic * 1.3)
             
             # Determine complexity level
             level = ComplexityThresholds.get_complexity_level(total_cyclomatic)
             
             return ComplexityScore(
                 cyclomatic=total_cyclomatic,
-                cognitive=cognitive,
+                cognitive=sum(func.complexity.cognitive for func in functions),
                 level=level
             )
             
@@ -272,7 +305,11 @@ class ComplexityAnalyzer:
             # Fallback to sum of function complexities
             total_cyclomatic = sum(func.complexity.cyclomatic for func in functions)
             level = ComplexityThresholds.get_complexity_level(total_cyclomatic)
-            return ComplexityScore(cyclomatic=total_cyclomatic, level=level)
+            return ComplexityScore(
+                cyclomatic=total_cyclomatic,
+                cognitive=sum(func.complexity.cognitive for func in functions),
+                level=level
+            )
     
     def calculate_project_complexity_stats(self, modules: List[ModuleInfo]) -> Dict[str, Any]:
         """Calculate project-wide complexity statistics.
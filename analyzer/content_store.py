@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""
+Content Store for CodeMindMap Analyzer
+
+This module provides a content-addressed object store for cached analysis
+artifacts. Objects are immutable blobs stored under the hash key they are
+put with; an index records the size and usage of every object so that the
+store can keep its total size within a limit by evicting the least recently
+(LRU) or least frequently (LFU) used objects.
+
+Several processes can share one store. Objects and index snapshots are
+written to a temporary file and renamed into place, so readers never see a
+partially written file. Index changes are appended to a journal under an
+advisory lock and replayed by the other processes; the journal is folded
+into a new snapshot once it grows large, so recording an access never
+rewrites the whole index.
+"""
+
+import json
+import logging
+import mmap
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Union
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:  # Windows
+    HAS_FCNTL = False
+
+try:
+    import msvcrt
+    HAS_MSVCRT = True
+except ImportError:
+    HAS_MSVCRT = False
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+
+# Eviction policies
+LRU = "lru"
+LFU = "lfu"
+
+# Eviction frees space down to this fraction of the limit
+EVICTION_TARGET_RATIO = 0.8
+
+# The journal is folded into a new index snapshot once it grows beyond this size
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Write a file by renaming a completely written temporary file over it.
+    
+    Readers see either the old or the new content, and readers that opened
+    or mapped the old file keep reading it intact.
+    
+    Args:
+        path: File to write
+        data: New content
+    """
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+class StoreLock:
+    """Exclusive advisory lock on a file, shared by processes and threads.
+    
+    Uses flock on POSIX and msvcrt.locking on Windows; where neither exists
+    only the threads of one process are serialized. The lock is re-entrant
+    within a thread.
+    """
+    
+    def __init__(self, path: Path):
+        """Initialize the lock.
+        
+        Args:
+            path: Lock file, created on first use
+        """
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file: Optional[BinaryIO] = None
+    
+    def __enter__(self) -> 'StoreLock':
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._file = open(self.path, 'a+b')
+                if HAS_FCNTL:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+                elif HAS_MSVCRT:
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            try:
+                if HAS_FCNTL:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+                elif HAS_MSVCRT:
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            finally:
+                self._file.close()
+                self._file = None
+        self._thread_lock.release()
+
+
+class ContentStore:
+    """Content-addressed store of cache objects with size-bounded eviction."""
+    
+    def __init__(self, root: Path, max_size_bytes: int, eviction_policy: str = LRU):
+        """Initialize the store.
+        
+        Args:
+            root: Directory holding the index and the objects
+            max_size_bytes: Maximum total size of the stored objects
+            eviction_policy: LRU or LFU
+        """
+        if eviction_policy not in (LRU, LFU):
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
+        
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.index_file = self.root / "index.json"
+        self.journal_file = self.root / "journal.log"
+        self.max_size_bytes = max_size_bytes
+        self.eviction_policy = eviction_policy
+        
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.lock = StoreLock(self.root / "lock")
+        self._pending: List[Dict[str, Any]] = []  # Changes not yet appended to the journal
+        self._journal_offset = 0  # Journal bytes replayed so far
+        self._journal_state = None  # (inode, size) of the journal when last replayed
+        
+        with self.lock:
+            self._reload()
+    
+    @property
+    def total_size(self) -> int:
+        """Total size of the stored objects in bytes."""
+        return self._total_size
+    
+    def object_path(self, key: str) -> Path:
+        """Get the file an object is stored in."""
+        return self.objects_dir / key[:2] / key[2:]
+    
+    def contains(self, key: str) -> bool:
+        """Check whether an object is stored (possibly by another process)."""
+        if key not in self.index["entries"]:
+            self.refresh()
+        return key in self.index["entries"]
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """Read an object and record the access.
+        
+        Args:
+            key: Object key
+        
+        Returns:
+            Object bytes, or None if the object is not stored
+        """
+        if not self.contains(key):
+            return None
+        
+        try:
+            data = self.object_path(key).read_bytes()
+        except OSError as e:
+            logger.warning(f"Cache object {key} is missing: {e}")
+            self._record({"op": "remove", "key": key})
+            return None
+        
+        self._record({"op": "hit", "key": key, "time": time.time()})
+        return data
+    
+    def map(self, key: str) -> Optional[Union[mmap.mmap, bytes]]:
+        """Memory-map an object for random access and record the access.
+        
+        The map is read-only; close it when done. Objects that cannot be
+        mapped are returned as bytes.
+        
+        Args:
+            key: Object key
+        
+        Returns:
+            mmap or bytes of the object, or None if the object is not stored
+        """
+        if not self.contains(key):
+            return None
+        
+        try:
+            with open(self.object_path(key), 'rb') as f:
+                try:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:  # Empty files cannot be mapped
+                    data = f.read()
+        except OSError as e:
+            logger.warning(f"Cache object {key} is missing: {e}")
+            self._record({"op": "remove", "key": key})
+            return None
+        
+        self._record({"op": "hit", "key": key, "time": time.time()})
+        return data
+    
+    def put(self, key: str, data: bytes, kind: str = "object") -> None:
+        """Store an object, replacing any object stored under the same key.
+        
+        Args:
+            key: Object key (a hex digest)
+            data: Object bytes
+            kind: Kind of object, reported in statistics
+        """
+        path = self.object_path(key)
+        path.parent.mkdir(exist_ok=True)
+        atomic_write(path, data)
+        self._record({"op": "put", "key": key, "kind": kind, "size": len(data), "time": time.time()})
+    
+    def remove(self, key: str) -> bool:
+        """Remove an object.
+        
+        The object is looked up and deleted under the lock on the index, after
+        replaying the changes of other processes, so that a concurrent put or
+        eviction cannot leave the size accounting wrong.
+        
+        Args:
+            key: Object key
+        
+        Returns:
+            True if the object was stored
+        """
+        with self.lock:
+            self._sync()
+            if key not in self.index["entries"]:
+                return False
+            
+            try:
+                self.object_path(key).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Failed to remove cache object {key}: {e}")
+            
+            self._record({"op": "remove", "key": key})
+        return True
+    
+    def evict(self, protect: Iterable[str] = ()) -> int:
+        """Evict objects until the store is within its size limit.
+        
+        Nothing happens while the store is within the limit. Otherwise objects
+        are removed, least valuable first according to the eviction policy,
+        until the total size drops to EVICTION_TARGET_RATIO of the limit.
+        The decision is taken under the lock on the index all processes share.
+        
+        Args:
+            protect: Keys that must not be evicted (e.g. objects of the current run)
+        
+        Returns:
+            Number of bytes freed
+        """
+        with self.lock:
+            self._sync()
+            if self._total_size <= self.max_size_bytes:
+                return 0
+            
+            protected = set(protect)
+            if self.eviction_policy == LFU:
+                def order(item):
+                    return (item[1]["access_count"], item[1]["last_accessed"])
+            else:
+                def order(item):
+                    return item[1]["last_accessed"]
+            
+            target = self.max_size_bytes * EVICTION_TARGET_RATIO
+            freed = 0
+            for key, entry in sorted(self.index["entries"].items(), key=order):
+                if self._total_size <= target:
+                    break
+                if key not in protected:
+                    freed += entry["size"]
+                    self.remove(key)
+            
+            self._record({"op": "cleanup", "time": time.time()})
+            self._append_pending()
+        
+        logger.info(f"Cache eviction ({self.eviction_policy}) freed {freed} bytes, "
+                    f"new size: {self._total_size} bytes")
+        return freed
+    
+    def flush(self) -> None:
+        """Append pending index changes to the journal.
+        
+        Changes other processes journaled in the meantime are replayed first.
+        Once the journal grows beyond JOURNAL_COMPACT_BYTES it is folded into
+        a new index snapshot.
+        """
+        if not self._pending:
+            return
+        
+        try:
+            with self.lock:
+                self._sync()
+                self._append_pending()
+        except OSError as e:
+            logger.error(f"Failed to save cache index: {e}")
+    
+    def refresh(self) -> None:
+        """Replay index changes made by other processes, if there are any."""
+        if self._journal_changed():
+            with self.lock:
+                self._sync()
+    
+    def clear(self) -> None:
+        """Remove every object."""
+        with self.lock:
+            self._sync()
+            for key in list(self.index["entries"]):
+                self.remove(key)
+            self._pending.clear()
+            self.index["last_cleanup"] = time.time()
+            self._compact()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics.
+        
+        Returns:
+            Dictionary with the number and total size of objects, per kind
+        """
+        by_kind: Dict[str, Dict[str, int]] = {}
+        with self.lock:
+            for entry in self.index["entries"].values():
+                kind_stats = by_kind.setdefault(entry["kind"], {"entries": 0, "size_bytes": 0})
+                kind_stats["entries"] += 1
+                kind_stats["size_bytes"] += entry["size"]
+            
+            return {
+                "total_entries": len(self.index["entries"]),
+                "total_size_bytes": self._total_size,
+                "eviction_policy": self.eviction_policy,
+                "by_kind": by_kind
+            }
+    
+    def _record(self, record: Dict[str, Any]) -> None:
+        """Apply a change to the index and queue it for the journal.
+        
+        The store is shared by the threads of a run, so the index and the
+        pending changes only change under the lock.
+        """
+        with self.lock:
+            self._apply(record)
+            self._pending.append(record)
+    
+    # The methods below read or write the index files and expect the lock to be held
+    
+    def _apply(self, record: Dict[str, Any]) -> None:
+        """Apply one journal record to the in-memory index."""
+        entries = self.index["entries"]
+        op = record["op"]
+        
+        if op == "put":
+            previous = entries.get(record["key"])
+            if previous is not None:
+                self._total_size -= previous["size"]
+            entries[record["key"]] = {
+                "kind": record["kind"],
+                "size": record["size"],
+                "created": record["time"],
+                "last_accessed": record["time"],
+                "access_count": previous["access_count"] if previous else 0
+            }
+            self._total_size += record["size"]
+        elif op == "remove":
+            entry = entries.pop(record["key"], None)
+            if entry is not None:
+                self._total_size -= entry["size"]
+        elif op == "hit":
+            entry = entries.get(record["key"])
+            if entry is not None:
+                entry["access_count"] += 1
+                entry["last_accessed"] = max(entry["last_accessed"], record["time"])
+        elif op == "cleanup":
+            self.index["last_cleanup"] = record["time"]
+    
+    def _journal_changed(self) -> bool:
+        """Check cheaply whether the journal changed since it was last replayed."""
+        try:
+            stat = os.stat(self.journal_file)
+        except OSError:
+            return True
+        return (stat.st_ino, stat.st_size) != self._journal_state
+    
+    def _sync(self) -> None:
+        """Replay the journal records appended by other processes since the last replay."""
+        if not self._journal_changed():
+            return
+        
+        try:
+            with open(self.journal_file, 'rb') as f:
+                inode = os.fstat(f.fileno()).st_ino
+                if (self._journal_state is None or inode != self._journal_state[0]
+                        or self._read_generation(f) != self.index["generation"]):
+                    # Another process compacted the journal into a new snapshot
+                    self._reload()
+                    return
+                f.seek(self._journal_offset)
+                data = f.read()
+        except OSError:
+            self._reload()
+            return
+        
+        self._journal_offset += self._replay(data)
+        self._journal_state = (inode, self._journal_offset)
+        
+        # Pending changes come after the replayed ones in the journal; hits were counted already
+        for record in self._pending:
+            if record["op"] != "hit":
+                self._apply(record)
+    
+    def _replay(self, data: bytes) -> int:
+        """Apply the complete journal lines in data; returns the number of bytes used."""
+        used = 0
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # Still being appended by another process
+            used += len(line)
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Skipping corrupt cache journal record: {e}")
+        return used
+    
+    def _append_pending(self) -> None:
+        """Append the pending changes to the journal, compacting it when it is large."""
+        with self.lock:  # Held by the callers already; re-entered so that no record is lost
+            if not self._pending:
+                return
+            
+            data = b"".join(json.dumps(record, separators=(',', ':')).encode() + b"\n"
+                            for record in self._pending)
+            with open(self.journal_file, 'ab') as f:
+                f.write(data)
+            self._pending.clear()
+            
+            stat = os.stat(self.journal_file)
+            self._journal_offset = stat.st_size
+            self._journal_state = (stat.st_ino, stat.st_size)
+            
+            if stat.st_size > JOURNAL_COMPACT_BYTES:
+                self._compact()
+    
+    def _compact(self) -> None:
+        """Write the index as a new snapshot and start an empty journal for it."""
+        self.index["generation"] += 1
+        atomic_write(self.index_file, json.dumps(self.index, separators=(',', ':')).encode())
+        
+        header = json.dumps({"generation": self.index["generation"]}).encode() + b"\n"
+        atomic_write(self.journal_file, header)
+        self._journal_offset = len(header)
+        self._journal_state = (os.stat(self.journal_file).st_ino, len(header))
+    
+    @staticmethod
+    def _read_generation(f: BinaryIO) -> Optional[int]:
+        """Read the generation of the snapshot a journal belongs to from its first line."""
+        try:
+            return json.loads(f.readline()).get("generation")
+        except (ValueError, AttributeError):
+            return None
+    
+    def _reload(self) -> None:
+        """Load the index snapshot and replay its journal."""
+        self.index = self._load_index()
+        self._total_size = sum(entry["size"] for entry in self.index["entries"].values())
+        
+        replayed = False
+        try:
+            with open(self.journal_file, 'rb') as f:
+                if self._read_generation(f) == self.index["generation"]:
+                    offset = f.tell()
+                    self._journal_offset = offset + self._replay(f.read())
+                    self._journal_state = (os.fstat(f.fileno()).st_ino, self._journal_offset)
+                    replayed = True
+        except OSError:
+            pass
+        
+        if not replayed:
+            # No journal for this snapshot: first use, or a compaction was interrupted
+            self._compact()
+        
+        for record in self._pending:
+            self._apply(record)
+    
+    @staticmethod
+    def _empty_index() -> Dict[str, Any]:
+        """Create an empty index."""
+        return {"version": INDEX_VERSION, "generation": 0, "entries": {}, "last_cleanup": time.time()}
+    
+    def _load_index(self) -> Dict[str, Any]:
+        """Load the index snapshot, starting an empty one if it is unusable."""
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r') as f:
+                    index = json.load(f)
+                if index.get("version") == INDEX_VERSION:
+                    return index
+                logger.info("Cache index has an older format, resetting it")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to load cache index, resetting it: {e}")
+        
+        return self._reset_index()
+    
+    def _reset_index(self) -> Dict[str, Any]:
+        """Start an empty index, removing the objects found on disk.
+        
+        An object's kind (stage result, module record, partial module
+        record, ...) is only recorded in the index, and eviction, partial
+        record upgrades and bundle imports depend on it. Objects whose index
+        entry is lost are therefore recomputed rather than indexed under a
+        guessed kind.
+        """
+        removed = 0
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = self.objects_dir / prefix
+            if not prefix_dir.is_dir():
+                continue
+            for name in os.listdir(prefix_dir):
+                if name.endswith(".tmp"):
+                    continue  # Still being written
+                try:
+                    (prefix_dir / name).unlink()
+                    removed += 1
+                except OSError as e:
+                    logger.warning(f"Failed to remove cache object {prefix + name}: {e}")
+        
+        if removed:
+            logger.info(f"Removed {removed} cache objects without an index entry")
+        return self._empty_index()
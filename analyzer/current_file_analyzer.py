@@ -15,6 +15,7 @@ from typing import Dict, List, Optional, Set, Any
 from enum import Enum
 
 from analyzer import ComplexityScore, ComplexityLevel, FunctionInfo, ClassInfo, ImportInfo, Parameter
+from ast_parser import score_function
 from complexity_analyzer import ComplexityAnalyzer
 from framework_detector import FrameworkDetector
 from dependency_parser import Library, TechStack
@@ -182,13 +183,16 @@ class FileAnalysisResult:
 class CurrentFileAnalyzer:
     """Analyzer for individual Python files."""
     
-    def __init__(self, project_path: Optional[Path] = None):
+    def __init__(self, project_path: Optional[Path] = None, cache_manager: Optional[Any] = None):
         """Initialize the current file analyzer.
         
         Args:
             project_path: Optional project path for context (used for dependency resolution)
+            cache_manager: Optional CacheManager reusing the results of unchanged file contents
         """
         self.project_path = project_path
+        self.cache_manager = cache_manager
+        self.cache_hits = 0  # Results taken from the cache
         self.errors: List[Dict[str, Any]] = []
         self.warnings: List[Dict[str, Any]] = []
         
@@ -229,6 +233,13 @@ class CurrentFileAnalyzer:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
+            if self.cache_manager:
+                cached_result = self.cache_manager.get_file_analysis(file_path, content, self.project_path)
+                if cached_result is not None:
+                    self.cache_hits += 1
+                    logger.info(f"Using cached analysis of file: {file_path}")
+                    return cached_result
+            
             # Parse AST
             try:
                 tree = ast.parse(content, filename=str(file_path))
@@ -262,6 +273,9 @@ class CurrentFileAnalyzer:
                 warnings=self.warnings.copy()
             )
             
+            if self.cache_manager:
+                self.cache_manager.cache_file_analysis(file_path, content, result, self.project_path)
+            
             logger.info(f"File analysis completed successfully: {file_path}")
             return result
             
@@ -312,14 +326,17 @@ class CurrentFileAnalyzer:
             all_functions.extend(cls.methods)
         
         total_complexity = sum(func.complexity.cyclomatic for func in all_functions)
+        total_cognitive = sum(func.complexity.cognitive for func in all_functions)
         if all_functions:
             avg_complexity = total_complexity / len(all_functions)
+            avg_cognitive = total_cognitive / len(all_functions)
         else:
             avg_complexity = 0
+            avg_cognitive = 0
         
         overall_complexity = ComplexityScore(
             cyclomatic=int(avg_complexity),
-            cognitive=int(avg_complexity * 1.2)  # Rough estimate
+            cognitive=int(avg_cognitive)
         )
         
         # Calculate maintainability index (simplified version)
@@ -341,10 +358,11 @@ class CurrentFileAnalyzer:
             maintainability_index=maintainability_index
         )
     
-    def _extract_function_info(self, node: ast.FunctionDef, module_path: str) -> FunctionInfo:
+    def _extract_function_info(self, node: ast.FunctionDef, module_path: str,
+                               is_method: bool = False) -> FunctionInfo:
         """Extract function information from AST node."""
         # Calculate complexity
-        complexity = self._calculate_function_complexity(node)
+        complexity = self._calculate_function_complexity(node, is_method)
         
         # Extract parameters
         parameters = []
@@ -409,7 +427,7 @@ class CurrentFileAnalyzer:
             parameters=parameters,
             return_type=return_type,
             docstring=docstring,
-            is_method=False,  # Will be updated if inside a class
+            is_method=is_method,
             is_async=is_async
         )
     
@@ -433,12 +451,10 @@ class CurrentFileAnalyzer:
         methods = []
         for item in node.body:
             if isinstance(item, ast.FunctionDef):
-                method_info = self._extract_function_info(item, module_path)
-                method_info.is_method = True
+                method_info = self._extract_function_info(item, module_path, is_method=True)
                 methods.append(method_info)
             elif hasattr(ast, 'AsyncFunctionDef') and isinstance(item, ast.AsyncFunctionDef):
-                method_info = self._extract_function_info(item, module_path)
-                method_info.is_method = True
+                method_info = self._extract_function_info(item, module_path, is_method=True)
                 methods.append(method_info)
         
         # Extract docstring
@@ -457,8 +473,11 @@ class CurrentFileAnalyzer:
             docstring=docstring
         )
     
-    def _calculate_function_complexity(self, node: ast.FunctionDef) -> ComplexityScore:
-        """Calculate cyclomatic complexity for a function."""
+    def _calculate_function_complexity(self, node: ast.FunctionDef, is_method: bool = False) -> ComplexityScore:
+        """Calculate cyclomatic and cognitive complexity for a function.
+        
+        Cognitive complexity comes from the project analysis engine (score_function).
+        """
         complexity = 1  # Base complexity
         
         for child in ast.walk(node):
@@ -479,7 +498,7 @@ class CurrentFileAnalyzer:
             elif isinstance(child, (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
                 complexity += 1
         
-        return ComplexityScore(cyclomatic=complexity)
+        return ComplexityScore(cyclomatic=complexity, cognitive=score_function(node, is_method)[1])
     
     def _analyze_dependencies(self, tree: ast.AST, file_path: Path) -> FileDependencyInfo:
         """Analyze dependencies and imports in the file."""
@@ -786,6 +805,8 @@ def main():
     parser.add_argument('--no-complexity', action='store_true', help='Skip complexity analysis')
     parser.add_argument('--no-dependencies', action='store_true', help='Skip dependency analysis')
     parser.add_argument('--no-frameworks', action='store_true', help='Skip framework pattern detection')
+    parser.add_argument('--no-cache', action='store_true', help='Disable caching')
+    parser.add_argument('--cache-dir', type=Path, help='Cache directory (shared with the project analyzer)')
     
     try:
         args = parser.parse_args()
@@ -798,7 +819,13 @@ def main():
     file_path = Path(args.file_path)
     project_path = Path(args.project_path) if args.project_path else None
     
-    analyzer = CurrentFileAnalyzer(project_path)
+    # Results of unchanged files are reused, e.g. those precomputed by analyzer.py --warm
+    cache_manager = None
+    if not args.no_cache:
+        from cache_manager import CacheManager
+        cache_manager = CacheManager(args.cache_dir)
+    
+    analyzer = CurrentFileAnalyzer(project_path, cache_manager)
     result = analyzer.analyze_file(file_path)
     
     print(result.to_json())
@@ -17,6 +17,9 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime
 
+from file_index import ProjectFileIndex, get_file_index
+from source_store import SourceStore, load_source, load_tree
+
 
 @dataclass
 class TableColumn:
@@ -163,7 +166,8 @@ class SchemaAnalysisResult:
 class ModelRelationshipExtractor:
     """Extracts relationships from Django and SQLAlchemy models"""
     
-    def __init__(self):
+    def __init__(self, source_store: Optional[SourceStore] = None):
+        self.source_store = source_store
         self.django_field_types = {
             'CharField': 'VARCHAR',
             'TextField': 'TEXT',
@@ -209,10 +213,7 @@ class ModelRelationshipExtractor:
         tables = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            tree = ast.parse(content)
+            tree = load_tree(file_path, self.source_store)
             
             for node in ast.walk(tree):
                 if isinstance(node, ast.ClassDef):
@@ -232,10 +233,7 @@ class ModelRelationshipExtractor:
         tables = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            tree = ast.parse(content)
+            tree = load_tree(file_path, self.source_store)
             
             for node in ast.walk(tree):
                 if isinstance(node, ast.ClassDef):
@@ -785,12 +783,13 @@ class SQLSchemaParser:
         }
         self.organizer = SQLStatementOrganizer()
     
-    def parse_sql_files(self, project_path: str) -> Tuple[List[SQLTable], List[SQLStatement]]:
+    def parse_sql_files(self, project_path: str,
+                        file_index: Optional[ProjectFileIndex] = None) -> Tuple[List[SQLTable], List[SQLStatement]]:
         """Parse all SQL files in the project"""
         tables = []
         statements = []
         
-        sql_files = self._find_sql_files(project_path)
+        sql_files = self._find_sql_files(project_path, file_index)
         
         for file_path in sql_files:
             try:
@@ -806,9 +805,10 @@ class SQLSchemaParser:
         
         return tables, statements
     
-    def extract_raw_sql_organized(self, project_path: str) -> Dict[str, Any]:
+    def extract_raw_sql_organized(self, project_path: str,
+                                  file_index: Optional[ProjectFileIndex] = None) -> Dict[str, Any]:
         """Extract and organize raw SQL statements from project files"""
-        _, statements = self.parse_sql_files(project_path)
+        _, statements = self.parse_sql_files(project_path, file_index)
         
         # Organize statements
         organized_statements = self.organizer.organize_sql_statements(statements)
@@ -850,19 +850,11 @@ class SQLSchemaParser:
             }
         }
     
-    def _find_sql_files(self, project_path: str) -> List[str]:
+    def _find_sql_files(self, project_path: str,
+                        file_index: Optional[ProjectFileIndex] = None) -> List[str]:
         """Find all SQL files in the project"""
-        sql_files = []
-        
-        for root, dirs, files in os.walk(project_path):
-            # Skip common non-relevant directories
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__']]
-            
-            for file in files:
-                if file.endswith(('.sql', '.ddl', '.dml')):
-                    sql_files.append(os.path.join(root, file))
-        
-        return sql_files
+        file_index = get_file_index(project_path, file_index)
+        return [str(record.path) for record in file_index.files_with_suffix('.sql', '.ddl', '.dml')]
     
     def _parse_sql_file(self, file_path: str) -> Tuple[List[SQLTable], List[SQLStatement]]:
         """Parse a single SQL file"""
@@ -1246,19 +1238,28 @@ class SchemaGraphGenerator:
 class DatabaseSchemaAnalyzer:
     """Main database schema analyzer that orchestrates all analysis components"""
     
-    def __init__(self):
-        self.model_extractor = ModelRelationshipExtractor()
+    def __init__(self, source_store: Optional[SourceStore] = None):
+        self.source_store = source_store
+        self.model_extractor = ModelRelationshipExtractor(source_store)
         self.sql_parser = SQLSchemaParser()
         self.graph_generator = SchemaGraphGenerator()
     
-    def analyze_database_schema(self, project_path: str) -> SchemaAnalysisResult:
+    def analyze_database_schema(self, project_path: str,
+                                file_index: Optional[ProjectFileIndex] = None) -> SchemaAnalysisResult:
         """Perform comprehensive database schema analysis"""
+        # Walk the project once for both model and SQL file discovery
+        file_index = get_file_index(project_path, file_index)
+        
+        # Share one read/parse of each model file between the Django and SQLAlchemy passes
+        if self.source_store is None:
+            self.model_extractor.source_store = SourceStore()
+        
         result = SchemaAnalysisResult()
         result.metadata.project_path = project_path
         result.metadata.analysis_timestamp = datetime.now()
         
         # Find and analyze model files
-        model_files = self._find_model_files(project_path)
+        model_files = self._find_model_files(project_path, file_index)
         frameworks_detected = []
         
         for file_path in model_files:
@@ -1283,9 +1284,12 @@ class DatabaseSchemaAnalyzer:
             except Exception as e:
                 print(f"Error analyzing model file {file_path}: {e}")
         
+        # Release the per-run sources once model extraction is done
+        self.model_extractor.source_store = self.source_store
+        
         # Parse SQL files
         try:
-            sql_tables, sql_statements = self.sql_parser.parse_sql_files(project_path)
+            sql_tables, sql_statements = self.sql_parser.parse_sql_files(project_path, file_index)
             result.tables.extend(sql_tables)
             result.raw_sql = sql_statements
             result.metadata.sql_files_analyzed = len(set(stmt.file_path for stmt in sql_statements))
@@ -1294,7 +1298,7 @@ class DatabaseSchemaAnalyzer:
         
         # Extract organized raw SQL data
         try:
-            organized_sql_data = self.sql_parser.extract_raw_sql_organized(project_path)
+            organized_sql_data = self.sql_parser.extract_raw_sql_organized(project_path, file_index)
             # Store organized SQL data in metadata for later use
             result.metadata.organized_sql = organized_sql_data
         except Exception as e:
@@ -1326,20 +1330,16 @@ class DatabaseSchemaAnalyzer:
         
         return result
     
-    def _find_model_files(self, project_path: str) -> List[str]:
+    def _find_model_files(self, project_path: str,
+                          file_index: Optional[ProjectFileIndex] = None) -> List[str]:
         """Find Python files that might contain database models"""
         model_files = []
         
-        for root, dirs, files in os.walk(project_path):
-            # Skip common non-relevant directories
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__']]
-            
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    # Check if file might contain models
-                    if self._might_contain_models(file_path):
-                        model_files.append(file_path)
+        for record in get_file_index(project_path, file_index).python_files():
+            file_path = str(record.path)
+            # Check if file might contain models
+            if self._might_contain_models(file_path):
+                model_files.append(file_path)
         
         return model_files
     
@@ -1353,19 +1353,18 @@ class DatabaseSchemaAnalyzer:
         
         # Check file content for model indicators
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read(1000)  # Read first 1000 chars
-                content_lower = content.lower()
-                
-                model_indicators = [
-                    'models.model', 'class.*model', 'sqlalchemy',
-                    'declarative_base', '__tablename__', 'foreignkey',
-                    'relationship', 'column', 'table'
-                ]
-                
-                for indicator in model_indicators:
-                    if re.search(indicator, content_lower):
-                        return True
+            content = load_source(file_path, self.model_extractor.source_store)[:1000]  # First 1000 chars
+            content_lower = content.lower()
+            
+            model_indicators = [
+                'models.model', 'class.*model', 'sqlalchemy',
+                'declarative_base', '__tablename__', 'foreignkey',
+                'relationship', 'column', 'table'
+            ]
+            
+            for indicator in model_indicators:
+                if re.search(indicator, content_lower):
+                    return True
         
         except Exception:
             pass
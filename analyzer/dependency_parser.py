@@ -12,6 +12,15 @@ from pathlib import Path
 from typing import List, Dict, Optional, Union, Any
 from dataclasses import dataclass
 
+from file_index import ProjectFileIndex, get_file_index
+from source_store import SourceStore, load_source
+
+# Dependency files read from the project root
+DEPENDENCY_FILE_NAMES = ["requirements.txt", "pyproject.toml", "Pipfile"]
+
+# Number of Python files scanned for framework imports
+FRAMEWORK_SCAN_LIMIT = 20
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,13 +49,19 @@ class TechStack:
 class DependencyParser:
     """Main class for parsing various dependency file formats."""
     
-    def __init__(self, project_path: Union[str, Path]):
+    def __init__(self, project_path: Union[str, Path],
+                 file_index: Optional[ProjectFileIndex] = None,
+                 source_store: Optional[SourceStore] = None):
         """Initialize the dependency parser.
         
         Args:
             project_path: Path to the Python project
+            file_index: Optional shared index of project files
+            source_store: Optional shared store used to read files once per run
         """
         self.project_path = Path(project_path).resolve()
+        self.file_index = file_index
+        self.source_store = source_store
         self.libraries: List[Library] = []
         self.python_version: Optional[str] = None
         self.package_manager: str = "pip"
@@ -79,6 +94,20 @@ class DependencyParser:
         
         logger.info(f"Found {len(self.libraries)} dependencies and {len(frameworks)} frameworks")
         return tech_stack 
+    
+    def input_files(self) -> List[str]:
+        """Get the files parse_dependencies reads, relative to the project.
+        
+        Together with the interpreter version they determine the tech stack,
+        so a stored result can be reused while their contents are unchanged.
+        
+        Returns:
+            Relative paths of the dependency files (existing or not) and the
+            Python files scanned for framework imports
+        """
+        self.file_index = get_file_index(self.project_path, self.file_index)
+        code_files = [record.rel_path for record in self.file_index.python_files()[:FRAMEWORK_SCAN_LIMIT]]
+        return DEPENDENCY_FILE_NAMES + code_files
    
     def _parse_requirements_txt(self):
         """Parse requirements.txt file."""
@@ -461,7 +490,8 @@ class DependencyParser:
         
         try:
             # Look for common framework import patterns
-            python_files = list(self.project_path.glob('**/*.py'))
+            self.file_index = get_file_index(self.project_path, self.file_index)
+            python_files = [record.path for record in self.file_index.python_files()]
             
             framework_patterns = {
                 'Django': [
@@ -492,16 +522,15 @@ class DependencyParser:
                 ]
             }
             
-            for py_file in python_files[:20]:  # Limit to first 20 files for performance
+            for py_file in python_files[:FRAMEWORK_SCAN_LIMIT]:  # Limit the files read for performance
                 try:
-                    with open(py_file, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                        
-                        for framework, patterns in framework_patterns.items():
-                            if any(pattern in content for pattern in patterns):
-                                frameworks.append(framework)
-                                break  # Found one framework in this file, move to next file
-                                
+                    content = load_source(py_file, self.source_store, errors='ignore')
+                    
+                    for framework, patterns in framework_patterns.items():
+                        if any(pattern in content for pattern in patterns):
+                            frameworks.append(framework)
+                            break  # Found one framework in this file, move to next file
+                            
                 except Exception as e:
                     logger.debug(f"Could not read file {py_file}: {e}")
                     continue
@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""
+File Guard for CodeMindMap Analyzer
+
+This module times the analysis of every file (parsing with ASTParser and
+scoring with ComplexityAnalyzer) and keeps pathological files, such as
+generated modules with huge literal tables or deeply nested expressions,
+from stalling the pipeline or exhausting memory. Worker processes analyze
+files under resource limits: a file exceeding its CPU time or memory budget
+is abandoned and replaced by a cheap fallback module that is built from a
+line scan instead of a parse. Offending files are quarantined in the cache
+so that later runs give them the fallback treatment right away.
+
+The limits only apply to worker processes, i.e. to runs parsing enough
+files for a pool. Files analyzed by the analyzer process itself (small
+changes, or parallel processing disabled) are timed but not limited: a
+file over the time limit keeps its analysis and is quarantined from the
+next run on, and a file exhausting memory fails the run. The calls
+of each module can be recorded along with it, so that the call graph and
+the code graph are built without parsing the files again.
+"""
+
+import logging
+import math
+import multiprocessing
+import re
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows: files are timed, but not limited
+    resource = None
+
+from analyzer import ComplexityScore, EnhancedCallEvent, ImportInfo, ModuleInfo, extract_enhanced_call_events
+from call_graph import CallSite, extract_call_sites
+from module_index import is_package
+from performance_optimizer import worker_context
+from source_store import SourceStore, load_source, load_tree
+
+logger = logging.getLogger(__name__)
+
+# CPU seconds a worker may spend parsing and scoring one file
+FILE_TIME_LIMIT = 20
+
+# Memory (MB) a worker may allocate on top of its footprint when it started
+FILE_MEMORY_LIMIT_MB = 1024
+
+# Slowest files listed in the analysis metadata
+SLOWEST_FILES = 10
+
+# Quarantine reasons
+TIMEOUT = "timeout"
+MEMORY = "memory"
+CRASH = "crash"  # The worker died (hard CPU limit, OOM killer, crash in the parser)
+
+# Top-level imports found by the fallback line scan
+_FROM_IMPORT = re.compile(r"^from\s+([\w.]+)\s+import\s+\(?([^)#\n]*)", re.MULTILINE)
+_IMPORT = re.compile(r"^import\s+([^#\n;]+)", re.MULTILINE)
+
+
+class FileLimitExceeded(BaseException):
+    """Raised in a worker when a file exceeds its CPU time limit.
+    
+    Derived from BaseException so that the broad exception handlers of the
+    parser and the complexity analyzer do not swallow it.
+    """
+
+
+@dataclass
+class FileOutcome:
+    """Result and timing of analyzing one file."""
+    path: str
+    module: Optional[ModuleInfo]
+    parse_time: float = 0.0
+    complexity_time: float = 0.0
+    quarantine_reason: Optional[str] = None  # Set when the file exceeded a limit
+    call_sites: Optional[List[CallSite]] = None  # Set when calls are extracted
+    call_events: Optional[List[EnhancedCallEvent]] = None
+
+
+def extract_calls(module: ModuleInfo, source_store: Optional[SourceStore] = None
+                  ) -> Tuple[List[CallSite], List[EnhancedCallEvent]]:
+    """Record the calls of a module for the call graph and the code graph.
+    
+    Args:
+        module: Parsed module
+        source_store: Optional store holding the module's tree
+    
+    Returns:
+        Tuple of (call sites, call events)
+    """
+    tree = load_tree(module.path, source_store)
+    package = is_package(module)
+    return (extract_call_sites(tree, module.name, package),
+            extract_enhanced_call_events(tree, module.name, package))
+
+
+def analyze_file(parser: Any, complexity_analyzer: Any, file_path: Path,
+                 with_calls: bool = False) -> FileOutcome:
+    """Parse a file and enhance its complexity, timing both steps.
+    
+    Args:
+        parser: ASTParser
+        complexity_analyzer: ComplexityAnalyzer
+        file_path: Path to the Python file
+        with_calls: Also extract the module's calls (timed as parsing), so
+            that the graph stages need not parse the file again
+    
+    Returns:
+        FileOutcome with the complexity-enhanced module (None if parsing fails)
+    """
+    start = time.perf_counter()
+    module = parser.parse_file(file_path)
+    parse_time = time.perf_counter() - start
+    if module is None:
+        logger.warning(f"Failed to parse module: {file_path}")
+        return FileOutcome(str(file_path), None, parse_time)
+    
+    start = time.perf_counter()
+    module = complexity_analyzer.enhance_module_complexity(module)
+    outcome = FileOutcome(str(file_path), module, parse_time, time.perf_counter() - start)
+    
+    if with_calls:
+        start = time.perf_counter()
+        try:
+            outcome.call_sites, outcome.call_events = extract_calls(module, parser.source_store)
+        except Exception as e:  # The graph stages parse the file themselves
+            logger.warning(f"Failed to extract calls from {file_path}: {e}")
+        outcome.parse_time += time.perf_counter() - start
+    return outcome
+
+
+def fallback_module(file_path: Path, module_name: str) -> ModuleInfo:
+    """Build a module for a quarantined file without parsing it.
+    
+    Only the line count and the top-level imports (found by a line scan,
+    so that the file keeps its place in the module graph) are filled in.
+    
+    Args:
+        file_path: Path to the Python file
+        module_name: Module name, as the parser would name it
+    
+    Returns:
+        ModuleInfo without functions and classes
+    """
+    try:
+        source = load_source(file_path, errors='replace')
+    except OSError as e:
+        logger.warning(f"Failed to read quarantined file {file_path}: {e}")
+        source = ""
+    
+    imports = []
+    for match in _FROM_IMPORT.finditer(source):
+        names = [name.split()[0] for name in match.group(2).split(",") if name.strip()]
+        module = match.group(1).lstrip(".")
+        imports.append(ImportInfo(module=module, names=names, is_from_import=True,
+                                  line_number=source.count("\n", 0, match.start()) + 1,
+                                  level=len(match.group(1)) - len(module)))
+    for match in _IMPORT.finditer(source):
+        line_number = source.count("\n", 0, match.start()) + 1
+        for part in match.group(1).split(","):
+            tokens = part.split()
+            if not tokens:
+                continue
+            alias = tokens[2] if len(tokens) == 3 and tokens[1] == "as" else None
+            imports.append(ImportInfo(module=tokens[0], names=[tokens[0]], alias=alias,
+                                      line_number=line_number))
+    imports.sort(key=lambda import_info: import_info.line_number)
+    
+    return ModuleInfo(
+        name=module_name,
+        path=str(file_path),
+        functions=[],
+        classes=[],
+        imports=imports,
+        complexity=ComplexityScore(cyclomatic=0),
+        size_lines=len(source.splitlines())
+    )
+
+
+# Per-process state used by analyze_guarded_file
+_worker_parser = None
+_worker_complexity_analyzer = None
+_worker_time_limit: Optional[int] = None  # None when limits are not enforced
+_worker_with_calls = False
+_worker_cpu_limited = False
+_worker_cpu_soft_limit = None  # Soft CPU limit of the worker outside of file analyses
+
+
+def _address_space() -> int:
+    """Get the address space size of this process in bytes (0 if unknown)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _on_cpu_limit(signum: int, frame: Any) -> None:
+    """Abandon the current file once its CPU time limit is exceeded."""
+    global _worker_cpu_limited
+    # The signal repeats every second until the limit is lifted: raise only once per file
+    if _worker_cpu_limited:
+        _worker_cpu_limited = False
+        raise FileLimitExceeded()
+
+
+def init_guarded_worker(time_limit: int = FILE_TIME_LIMIT,
+                        memory_limit_mb: int = FILE_MEMORY_LIMIT_MB,
+                        project_path: Optional[Path] = None,
+                        with_calls: bool = False) -> None:
+    """Create the parser and complexity analyzer of a worker and set its limits.
+    
+    Limits are only set in the main thread of a child process, i.e. in a
+    pool worker; files analyzed by the analyzer process itself (projects too
+    small for a pool) are not limited.
+    
+    Args:
+        time_limit: CPU seconds per file (0 for no limit)
+        memory_limit_mb: Memory the worker may allocate on top of its current footprint
+            (0 for no limit)
+        project_path: Optional project root that qualified module names are relative to
+        with_calls: Extract the calls of each module along with it
+    """
+    global _worker_parser, _worker_complexity_analyzer, _worker_time_limit, _worker_cpu_soft_limit
+    global _worker_with_calls
+    from ast_parser import ASTParser
+    from complexity_analyzer import ComplexityAnalyzer
+    
+    # The store only lives for one file at a time (see analyze_guarded_file)
+    source_store = SourceStore()
+    _worker_parser = ASTParser(source_store, project_path)
+    _worker_complexity_analyzer = ComplexityAnalyzer(source_store)
+    _worker_with_calls = with_calls
+    
+    if (resource is None or multiprocessing.parent_process() is None
+            or threading.current_thread() is not threading.main_thread()):
+        return
+    
+    if time_limit:
+        signal.signal(signal.SIGXCPU, _on_cpu_limit)
+        _worker_time_limit = time_limit
+        _worker_cpu_soft_limit = resource.getrlimit(resource.RLIMIT_CPU)[0]
+    
+    footprint = _address_space()
+    if memory_limit_mb and footprint:
+        soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        limit = footprint + memory_limit_mb * 1024 * 1024
+        if hard == resource.RLIM_INFINITY or limit < hard:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _set_cpu_limit(enabled: bool) -> None:
+    """Start or stop the CPU time limit of the current file."""
+    global _worker_cpu_limited
+    hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+    soft = _worker_cpu_soft_limit
+    if enabled:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        soft = math.ceil(usage.ru_utime + usage.ru_stime + _worker_time_limit)
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+    _worker_cpu_limited = enabled
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def analyze_guarded_file(file_path: Path) -> FileOutcome:
+    """Parse and score a file in a worker process, within the worker's limits.
+    
+    Args:
+        file_path: Path to the Python file
+    
+    Returns:
+        FileOutcome; a file exceeding a limit has no module and a quarantine reason
+    """
+    if _worker_parser is None:
+        init_guarded_worker()
+    
+    limited = _worker_time_limit is not None
+    start = time.perf_counter()
+    try:
+        if limited:
+            _set_cpu_limit(True)
+        
+        # Parse through the store first: the parser's handlers would swallow a
+        # MemoryError, and pathological files exhaust memory while being parsed
+        try:
+            load_tree(file_path, _worker_parser.source_store)
+        except MemoryError:
+            logger.warning(f"Memory limit exceeded while parsing {file_path}")
+            return FileOutcome(str(file_path), None, time.perf_counter() - start, quarantine_reason=MEMORY)
+        except (OSError, SyntaxError, ValueError):
+            pass  # Reported by the parser below
+        tree_time = time.perf_counter() - start
+        
+        outcome = analyze_file(_worker_parser, _worker_complexity_analyzer, file_path, _worker_with_calls)
+        outcome.parse_time += tree_time
+        return outcome
+    
+    except FileLimitExceeded:
+        logger.warning(f"Time limit exceeded while analyzing {file_path}")
+        return FileOutcome(str(file_path), None, time.perf_counter() - start, quarantine_reason=TIMEOUT)
+    
+    finally:
+        if limited:
+            _set_cpu_limit(False)
+        _worker_parser.source_store.discard(file_path)
+
+
+class FileGuard:
+    """Analyzes the files of one run, timing them and enforcing the quarantine."""
+    
+    def __init__(self, project_path: Path, quarantine: Optional[Dict[str, Dict[str, Any]]] = None,
+                 time_limit: int = FILE_TIME_LIMIT, memory_limit_mb: int = FILE_MEMORY_LIMIT_MB,
+                 with_calls: bool = False):
+        """Initialize the guard.
+        
+        Args:
+            project_path: Path to the project root
+            quarantine: Files quarantined by previous runs (relative path -> entry)
+            time_limit: CPU seconds a file may take (wall-clock seconds in this process)
+            memory_limit_mb: Memory a worker may allocate per file
+            with_calls: Extract the calls of each module for the graph stages
+        """
+        self.project_path = Path(project_path)
+        self.quarantine = dict(quarantine or {})
+        self.time_limit = time_limit
+        self.memory_limit_mb = memory_limit_mb
+        self.with_calls = with_calls
+        self.call_sites: Dict[str, List[CallSite]] = {}  # Module path -> call sites
+        self.call_events: Dict[str, List[EnhancedCallEvent]] = {}  # Module path -> call events
+        self.timings: Dict[str, Tuple[float, float]] = {}  # Relative path -> (parse, complexity)
+        self.offenders: Dict[str, str] = {}  # Files exceeding a limit in this run -> reason
+        self.fallbacks: List[str] = []  # Files given the fallback treatment in this run
+    
+    def _rel_path(self, file_path: Path) -> str:
+        try:
+            return Path(file_path).relative_to(self.project_path).as_posix()
+        except ValueError:
+            return str(file_path)
+    
+    def analyze_files(self, files: List[Path], parser: Any, complexity_analyzer: Any,
+                      parallel_processor: Any = None,
+                      before_file: Optional[Callable[[int], None]] = None) -> List[ModuleInfo]:
+        """Analyze files, giving quarantined and offending files the fallback treatment.
+        
+        Files are analyzed in worker processes under the limits when the
+        parallel processor finds them worth a pool. Otherwise they are
+        analyzed in this process with the given parser and complexity
+        analyzer (sharing their source store with later stages), where they
+        are only timed: files over the time limit keep their full analysis
+        but are quarantined for later runs.
+        
+        Args:
+            files: Python files to analyze
+            parser: ASTParser used in this process
+            complexity_analyzer: ComplexityAnalyzer used in this process
+            parallel_processor: Optional ParallelProcessor running the workers
+            before_file: Optional function called with the index of each file analyzed
+                in this process (e.g. to check for cancellation)
+        
+        Returns:
+            Modules in the order of files (files that fail to parse are left out)
+        """
+        pending = [file_path for file_path in files if self._rel_path(file_path) not in self.quarantine]
+        
+        if parallel_processor is not None and parallel_processor.should_process_parallel(len(pending)):
+            outcomes = parallel_processor.process_files_parallel(
+                pending, analyze_guarded_file, initializer=init_guarded_worker,
+                initargs=self._worker_initargs(), retry_lost=self._retry_lost_chunks
+            )
+        else:
+            outcomes = []
+            for index, file_path in enumerate(pending):
+                if before_file:
+                    before_file(index)
+                outcomes.append(analyze_file(parser, complexity_analyzer, file_path, self.with_calls))
+        
+        analyzed = {}
+        for outcome in outcomes:
+            rel_path = self._rel_path(outcome.path)
+            self.timings[rel_path] = (outcome.parse_time, outcome.complexity_time)
+            if outcome.quarantine_reason:
+                self.offenders[rel_path] = outcome.quarantine_reason
+            elif self.time_limit and outcome.parse_time + outcome.complexity_time > self.time_limit:
+                logger.warning(f"Analyzing {outcome.path} took longer than {self.time_limit}s")
+                self.offenders[rel_path] = TIMEOUT
+            analyzed[outcome.path] = outcome.module
+            if outcome.call_sites is not None:
+                self.call_sites[outcome.module.path] = outcome.call_sites
+                self.call_events[outcome.module.path] = outcome.call_events
+        
+        modules = []
+        for file_path in files:
+            rel_path = self._rel_path(file_path)
+            module = analyzed.get(str(file_path))
+            if module is None:
+                if rel_path not in self.offenders and rel_path not in self.quarantine:
+                    continue  # Failed to parse
+                self.fallbacks.append(rel_path)
+                module = fallback_module(file_path, parser._path_to_module_name(Path(file_path)))
+                # Fallback modules have no calls: the graph stages must not parse them either
+                self.call_sites[module.path] = []
+                self.call_events[module.path] = []
+            modules.append(module)
+        return modules
+    
+    def is_quarantined(self, file_path: str) -> bool:
+        """Check whether a file is quarantined (by an earlier run or by this one).
+        
+        Args:
+            file_path: Path to the Python file
+        
+        Returns:
+            True if the file must not be parsed in this process
+        """
+        rel_path = self._rel_path(file_path)
+        return rel_path in self.quarantine or rel_path in self.offenders
+    
+    def _worker_initargs(self) -> Tuple[Any, ...]:
+        """Get the arguments of init_guarded_worker for this guard."""
+        return (self.time_limit, self.memory_limit_mb, self.project_path, self.with_calls)
+    
+    def _retry_lost_chunks(self, chunks: List[List[Path]]) -> List[List[FileOutcome]]:
+        """Analyze the files of chunks lost to a dead worker, one file at a time.
+        
+        The files are not analyzed in this process, which has no limits.
+        They run in a fresh single-worker pool instead, in order, so that a
+        file killing the worker is known: it gets a crash outcome (and so the
+        fallback treatment and the quarantine) and a new pool takes the rest.
+        
+        Args:
+            chunks: Chunks whose results were lost
+        
+        Returns:
+            Outcomes of each chunk
+        """
+        remaining = [file_path for chunk in chunks for file_path in chunk]
+        outcomes: Dict[str, FileOutcome] = {}
+        while remaining:
+            crashed = None
+            with ProcessPoolExecutor(max_workers=1, mp_context=worker_context(),
+                                     initializer=init_guarded_worker,
+                                     initargs=self._worker_initargs()) as executor:
+                futures = [executor.submit(analyze_guarded_file, file_path) for file_path in remaining]
+                for position, (file_path, future) in enumerate(zip(remaining, futures)):
+                    try:
+                        outcomes[str(file_path)] = future.result()
+                    except BrokenProcessPool:
+                        crashed = position
+                        break
+                    except Exception as e:
+                        logger.error(f"Failed to analyze {file_path}: {e}")
+                        outcomes[str(file_path)] = FileOutcome(str(file_path), None)
+            if crashed is None:
+                break
+            file_path = remaining[crashed]
+            logger.warning(f"Worker died while analyzing {file_path}")
+            outcomes[str(file_path)] = FileOutcome(str(file_path), None, quarantine_reason=CRASH)
+            remaining = remaining[crashed + 1:]
+        
+        return [[outcomes[str(file_path)] for file_path in chunk] for chunk in chunks]
+    
+    def get_quarantine(self, project_files: List[Path], retried: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Get the quarantine to record for later runs.
+        
+        Args:
+            project_files: The project's Python files (quarantined files that are gone are dropped)
+            retried: Whether quarantined files were analyzed again in this run
+                (then only this run's offenders stay quarantined)
+        
+        Returns:
+            Relative path -> entry with the reason and the time it was recorded
+        """
+        existing = {self._rel_path(file_path) for file_path in project_files}
+        quarantine = {} if retried else {rel_path: entry for rel_path, entry in self.quarantine.items()
+                                         if rel_path in existing}
+        now = time.time()
+        for rel_path, reason in self.offenders.items():
+            quarantine[rel_path] = {"reason": reason, "time": now}
+        return quarantine
+    
+    def get_stats(self, top: int = SLOWEST_FILES) -> Dict[str, Any]:
+        """Get timing statistics and the quarantined files of this run.
+        
+        Args:
+            top: Number of slowest files listed
+        
+        Returns:
+            Total and slowest file timings, limits and quarantined files
+        """
+        totals = sorted(self.timings.items(), key=lambda item: sum(item[1]), reverse=True)
+        reasons = {rel_path: entry.get("reason") for rel_path, entry in self.quarantine.items()}
+        reasons.update(self.offenders)
+        return {
+            "timed_files": len(self.timings),
+            "time": round(sum(sum(times) for _, times in totals), 3),
+            "slowest": [
+                {"path": rel_path, "parse_time": round(parse_time, 4),
+                 "complexity_time": round(complexity_time, 4),
+                 "time": round(parse_time + complexity_time, 4)}
+                for rel_path, (parse_time, complexity_time) in totals[:top]
+            ],
+            "limits": {"time": self.time_limit, "memory_mb": self.memory_limit_mb},
+            "quarantined": [{"path": rel_path, "reason": reasons[rel_path]}
+                            for rel_path in sorted(set(self.fallbacks) | set(self.offenders))]
+        }
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Project File Index for CodeMindMap Analyzer
+
+This module walks a project tree once with os.scandir and records every
+relevant file and folder, so that size analysis, file discovery, cache
+hashing, framework detection, dependency parsing, folder structure and
+database schema analysis all share a single directory traversal.
+"""
+
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Directory names that are never part of the analyzed project
+EXCLUDED_DIR_NAMES = frozenset({'__pycache__', 'node_modules', 'venv', 'env'})
+
+# Hidden directories kept in the folder tree (for the folder structure
+# analysis) whose files are left out of the indexed file lists
+TREE_ONLY_DIR_NAMES = frozenset({'.github', '.gitlab'})
+
+
+def is_excluded_name(name: str) -> bool:
+    """Check whether a file or directory name is excluded from the index.
+    
+    Hidden entries (starting with '.'), except the CI directories in
+    TREE_ONLY_DIR_NAMES, and common environment/build directories are
+    excluded.
+    
+    Args:
+        name: File or directory name
+    
+    Returns:
+        True if the entry should be skipped
+    """
+    return (name.startswith('.') and name.lower() not in TREE_ONLY_DIR_NAMES) or name in EXCLUDED_DIR_NAMES
+
+
+@dataclass
+class FileRecord:
+    """A file recorded by the project index."""
+    path: Path
+    rel_path: str
+    size: int
+    mtime: float
+    
+    @property
+    def name(self) -> str:
+        """File name including suffix."""
+        return self.path.name
+    
+    @property
+    def suffix(self) -> str:
+        """Lower-cased file suffix (e.g. '.py')."""
+        return self.path.suffix.lower()
+
+
+@dataclass
+class FolderRecord:
+    """A folder recorded by the project index."""
+    path: Path
+    rel_path: str
+    files: List[FileRecord] = field(default_factory=list)
+    subfolders: List['FolderRecord'] = field(default_factory=list)
+    
+    @property
+    def name(self) -> str:
+        """Folder name."""
+        return self.path.name
+
+
+class ProjectFileIndex:
+    """Index of all non-excluded files and folders in a project.
+    
+    The index is built with a single recursive os.scandir pass. Directory
+    entries are sorted by name so that every consumer sees files in a
+    deterministic order. Symlinked directories are not followed. Files
+    under the directories in TREE_ONLY_DIR_NAMES appear in their folder
+    records only.
+    """
+    
+    def __init__(self, project_path: Union[str, Path]):
+        """Initialize an empty index for a project.
+        
+        Args:
+            project_path: Root path of the project
+        """
+        self.project_path = Path(project_path)
+        self.root = FolderRecord(path=self.project_path, rel_path='.')
+        self._files: Dict[str, FileRecord] = {}
+        self._folders: Dict[str, FolderRecord] = {'.': self.root}
+        self.errors: List[str] = []
+    
+    @classmethod
+    def build(cls, project_path: Union[str, Path]) -> 'ProjectFileIndex':
+        """Build an index by walking the project tree once.
+        
+        Args:
+            project_path: Root path of the project
+        
+        Returns:
+            Populated ProjectFileIndex
+        """
+        index = cls(project_path)
+        index._scan(index.root)
+        logger.debug(f"Indexed {len(index._files)} files in {len(index._folders)} folders "
+                     f"under {index.project_path}")
+        return index
+    
+    def _scan(self, folder: FolderRecord, tree_only: bool = False) -> None:
+        """Recursively scan a folder and record its contents.
+        
+        Args:
+            folder: Folder record to populate
+            tree_only: Record the files in the folder tree only, not in the file lists
+        """
+        try:
+            with os.scandir(folder.path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            logger.warning(f"Failed to scan directory {folder.path}: {e}")
+            self.errors.append(f"{folder.path}: {e}")
+            return
+        
+        prefix = '' if folder.rel_path == '.' else folder.rel_path + '/'
+        
+        for entry in entries:
+            if is_excluded_name(entry.name):
+                continue
+            
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subfolder = FolderRecord(path=folder.path / entry.name,
+                                             rel_path=prefix + entry.name)
+                    folder.subfolders.append(subfolder)
+                    self._folders[subfolder.rel_path] = subfolder
+                    self._scan(subfolder, tree_only or entry.name.lower() in TREE_ONLY_DIR_NAMES)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    record = FileRecord(path=folder.path / entry.name,
+                                        rel_path=prefix + entry.name,
+                                        size=stat.st_size,
+                                        mtime=stat.st_mtime)
+                    folder.files.append(record)
+                    if not tree_only:
+                        self._files[record.rel_path] = record
+            except OSError as e:
+                logger.warning(f"Failed to index {entry.path}: {e}")
+                self.errors.append(f"{entry.path}: {e}")
+    
+    def __len__(self) -> int:
+        return len(self._files)
+    
+    def files(self) -> List[FileRecord]:
+        """Get all indexed files in traversal order.
+        
+        Returns:
+            List of file records
+        """
+        return list(self._files.values())
+    
+    def python_files(self) -> List[FileRecord]:
+        """Get all indexed Python files.
+        
+        Returns:
+            List of file records with a .py suffix
+        """
+        return self.files_with_suffix('.py')
+    
+    def files_with_suffix(self, *suffixes: str) -> List[FileRecord]:
+        """Get indexed files matching any of the given suffixes.
+        
+        Args:
+            suffixes: File suffixes including the dot (case-insensitive)
+        
+        Returns:
+            List of matching file records
+        """
+        wanted = {suffix.lower() for suffix in suffixes}
+        return [record for record in self._files.values() if record.suffix in wanted]
+    
+    def files_named(self, *names: str) -> List[FileRecord]:
+        """Get indexed files with any of the given names, at any depth.
+        
+        Args:
+            names: Exact file names
+        
+        Returns:
+            List of matching file records
+        """
+        wanted = set(names)
+        return [record for record in self._files.values() if record.name in wanted]
+    
+    def get(self, rel_path: str) -> Optional[FileRecord]:
+        """Look up a file by its project-relative POSIX path.
+        
+        Args:
+            rel_path: Path relative to the project root
+        
+        Returns:
+            FileRecord or None if the file is not indexed
+        """
+        return self._files.get(rel_path)
+    
+    def folder(self, rel_path: str = '.') -> Optional[FolderRecord]:
+        """Look up a folder by its project-relative POSIX path.
+        
+        Args:
+            rel_path: Folder path relative to the project root ('.' for the root)
+        
+        Returns:
+            FolderRecord or None if the folder is not indexed
+        """
+        return self._folders.get(rel_path)
+    
+    def iter_folders(self) -> Iterator[FolderRecord]:
+        """Iterate over all indexed folders, root first.
+        
+        Yields:
+            Folder records in traversal order
+        """
+        return iter(self._folders.values())
+
+
+def get_file_index(project_path: Union[str, Path],
+                   file_index: Optional[ProjectFileIndex] = None) -> ProjectFileIndex:
+    """Return the shared index, building one when none is provided.
+    
+    Args:
+        project_path: Root path of the project
+        file_index: Optional shared ProjectFileIndex
+    
+    Returns:
+        ProjectFileIndex for the project
+    """
+    if file_index is not None:
+        return file_index
+    return ProjectFileIndex.build(project_path)
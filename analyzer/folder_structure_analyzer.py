@@ -13,6 +13,8 @@ from pathlib import Path
 from typing import List, Dict, Optional, Set, Any
 from enum import Enum
 
+from file_index import TREE_ONLY_DIR_NAMES, FolderRecord, ProjectFileIndex, get_file_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -123,13 +125,15 @@ class FolderStructure:
 class FolderStructureAnalyzer:
     """Analyzer for project folder structure and organization."""
     
-    def __init__(self, project_path: Path):
+    def __init__(self, project_path: Path, file_index: Optional[ProjectFileIndex] = None):
         """Initialize the folder structure analyzer.
         
         Args:
             project_path: Path to the project root
+            file_index: Optional shared index of project files
         """
         self.project_path = Path(project_path).resolve()
+        self.file_index = file_index
         self.folder_patterns = self._initialize_folder_patterns()
         
     def _initialize_folder_patterns(self) -> Dict[FolderType, List[str]]:
@@ -208,6 +212,30 @@ class FolderStructureAnalyzer:
         logger.info(f"Analyzed {total_folders} folders with {total_python_files} Python files")
         return structure
     
+    def memo_inputs(self, modules: List[Any]) -> Dict[str, Any]:
+        """Describe everything analyze_folder_structure reads from the project and modules.
+        
+        Args:
+            modules: List of ModuleInfo objects
+        
+        Returns:
+            JSON-compatible folder tree (folders with their Python file names)
+            and the path, name and cyclomatic complexity of every module
+        """
+        self.file_index = get_file_index(self.project_path, self.file_index)
+        folders = []
+        pending = [self.file_index.root]
+        while pending:
+            folder = pending.pop()
+            folders.append([folder.rel_path, [record.name for record in folder.files if record.path.suffix == '.py']])
+            pending.extend(folder.subfolders)
+        
+        return {
+            "folders": sorted(folders),
+            "modules": [[module.path, module.name, getattr(module.complexity, "cyclomatic", None)]
+                        for module in modules]
+        }
+    
     def _build_folder_hierarchy(self) -> List[FolderNode]:
         """Build the folder hierarchy starting from project root.
         
@@ -217,10 +245,12 @@ class FolderStructureAnalyzer:
         root_folders = []
         
         try:
+            self.file_index = get_file_index(self.project_path, self.file_index)
+            
             # Get immediate subdirectories
-            for item in self.project_path.iterdir():
-                if item.is_dir() and not self._should_skip_folder(item):
-                    folder_node = self._create_folder_node(item)
+            for folder in self.file_index.root.subfolders:
+                if not self._should_skip_folder(folder.path):
+                    folder_node = self._create_folder_node(folder)
                     if folder_node:
                         root_folders.append(folder_node)
             
@@ -251,14 +281,14 @@ class FolderStructureAnalyzer:
         }
         
         folder_name = folder_path.name.lower()
-        return (folder_name.startswith('.') and folder_name not in {'.github', '.gitlab'}) or \
+        return (folder_name.startswith('.') and folder_name not in TREE_ONLY_DIR_NAMES) or \
                folder_name in skip_patterns
     
-    def _create_folder_node(self, folder_path: Path, parent: Optional[FolderNode] = None) -> Optional[FolderNode]:
+    def _create_folder_node(self, folder: FolderRecord, parent: Optional[FolderNode] = None) -> Optional[FolderNode]:
         """Create a folder node with its children.
         
         Args:
-            folder_path: Path to the folder
+            folder: Indexed folder record
             parent: Parent folder node (optional)
             
         Returns:
@@ -266,20 +296,13 @@ class FolderStructureAnalyzer:
         """
         try:
             # Find Python files in this folder
-            python_files = []
-            has_init = False
-            
-            for item in folder_path.iterdir():
-                if item.is_file() and item.suffix == '.py':
-                    python_files.append(item.name)
-                    if item.name == '__init__.py':
-                        has_init = True
+            python_files = [record.name for record in folder.files if record.path.suffix == '.py']
+            has_init = '__init__.py' in python_files
             
             # Create folder node
-            relative_path = folder_path.relative_to(self.project_path)
             folder_node = FolderNode(
-                path=str(relative_path),
-                name=folder_path.name,
+                path=str(Path(folder.rel_path)),
+                name=folder.name,
                 type=FolderType.UNKNOWN,  # Will be determined later
                 children=[],
                 module_count=len(python_files),
@@ -290,16 +313,16 @@ class FolderStructureAnalyzer:
             )
             
             # Recursively create child nodes
-            for item in folder_path.iterdir():
-                if item.is_dir() and not self._should_skip_folder(item):
-                    child_node = self._create_folder_node(item, folder_node)
+            for subfolder in folder.subfolders:
+                if not self._should_skip_folder(subfolder.path):
+                    child_node = self._create_folder_node(subfolder, folder_node)
                     if child_node:
                         folder_node.children.append(child_node)
             
             return folder_node
             
         except Exception as e:
-            logger.error(f"Failed to create folder node for {folder_path}: {e}")
+            logger.error(f"Failed to create folder node for {folder.path}: {e}")
             return None
     
     def _analyze_folder_types(self, folders: List[FolderNode]) -> None:
@@ -13,6 +13,9 @@ from pathlib import Path
 from typing import Dict, List, Optional, Union, Any, Set
 from dataclasses import dataclass
 
+from file_index import ProjectFileIndex, get_file_index
+from source_store import SourceStore, load_tree
+
 logger = logging.getLogger(__name__)
 
 
@@ -135,15 +138,21 @@ class FrameworkPatterns:
 class FrameworkDetector:
     """Main class for detecting framework-specific patterns."""
     
-    def __init__(self, project_path: Union[str, Path], detected_frameworks: List[str]):
+    def __init__(self, project_path: Union[str, Path], detected_frameworks: List[str],
+                 source_store: Optional[SourceStore] = None,
+                 file_index: Optional[ProjectFileIndex] = None):
         """Initialize the framework detector.
         
         Args:
             project_path: Path to the Python project
             detected_frameworks: List of frameworks detected from dependencies
+            source_store: Optional shared store used to read and parse files once per run
+            file_index: Optional shared index of project files
         """
         self.project_path = Path(project_path).resolve()
         self.detected_frameworks = detected_frameworks
+        self.source_store = source_store
+        self.file_index = file_index
         self.errors: List[Dict[str, Any]] = []
         self.warnings: List[Dict[str, Any]] = []
     
@@ -169,6 +178,23 @@ class FrameworkDetector:
         logger.info(f"Framework pattern detection completed")
         return patterns
     
+    def input_files(self) -> List[str]:
+        """Get the files detect_patterns reads, relative to the project.
+        
+        Together with the detected frameworks they determine the patterns, so
+        a stored result can be reused while their contents are unchanged.
+        
+        Returns:
+            Relative paths of the Python files searched for patterns
+        """
+        if 'flask' in self.detected_frameworks or 'fastapi' in self.detected_frameworks:
+            return [record.rel_path for record in self._get_file_index().python_files()]
+        if 'django' in self.detected_frameworks:
+            django_files = set(self._find_django_files())
+            return [record.rel_path for record in self._get_file_index().python_files()
+                    if record.path in django_files]
+        return []
+    
     def _detect_django_patterns(self) -> DjangoPatterns:
         """Detect Django-specific patterns."""
         logger.info("Detecting Django patterns...")
@@ -183,10 +209,7 @@ class FrameworkDetector:
         
         for file_path in django_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                tree = ast.parse(content)
+                tree = load_tree(file_path, self.source_store)
                 
                 # Detect URL patterns
                 if file_path.name == 'urls.py':
@@ -216,26 +239,20 @@ class FrameworkDetector:
     
     def _find_django_files(self) -> List[Path]:
         """Find Django-related files."""
-        django_files = []
-        
-        # Look for common Django file patterns
-        patterns = [
-            '**/urls.py',
-            '**/views.py',
-            '**/models.py',
-            '**/serializers.py',
-            '**/views/*.py',
-            '**/models/*.py',
-            '**/serializers/*.py'
+        # Look for common Django files (urls.py, views.py, ...) and Python
+        # files directly inside views/, models/ or serializers/ packages
+        django_names = {'urls.py', 'views.py', 'models.py', 'serializers.py'}
+        django_folders = {'views', 'models', 'serializers'}
+        
+        return [
+            record.path for record in self._get_file_index().python_files()
+            if record.name in django_names or record.path.parent.name in django_folders
         ]
-        
-        for pattern in patterns:
-            django_files.extend(self.project_path.glob(pattern))
-        
-        # Filter out __pycache__ and other unwanted directories
-        django_files = [f for f in django_files if '__pycache__' not in str(f)]
-        
-        return django_files
+    
+    def _get_file_index(self) -> ProjectFileIndex:
+        """Get the project file index, building it on first use."""
+        self.file_index = get_file_index(self.project_path, self.file_index)
+        return self.file_index
     
     def _extract_django_urls(self, tree: ast.AST, file_path: Path) -> List[URLPattern]:
         """Extract URL patterns from Django urls.py files."""
@@ -468,15 +485,11 @@ class FrameworkDetector:
         blueprints = []
         
         # Find Python files that might contain Flask code
-        python_files = list(self.project_path.rglob("*.py"))
-        python_files = [f for f in python_files if '__pycache__' not in str(f)]
+        python_files = [record.path for record in self._get_file_index().python_files()]
         
         for file_path in python_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                tree = ast.parse(content)
+                tree = load_tree(file_path, self.source_store)
                 
                 # Extract Flask routes and blueprints
                 routes.extend(self._extract_flask_routes(tree, file_path))
@@ -603,15 +616,11 @@ class FrameworkDetector:
         dependencies = []
         
         # Find Python files that might contain FastAPI code
-        python_files = list(self.project_path.rglob("*.py"))
-        python_files = [f for f in python_files if '__pycache__' not in str(f)]
+        python_files = [record.path for record in self._get_file_index().python_files()]
         
         for file_path in python_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                tree = ast.parse(content)
+                tree = load_tree(file_path, self.source_store)
                 
                 # Extract FastAPI routes and dependencies
                 routes.extend(self._extract_fastapi_routes(tree, file_path))
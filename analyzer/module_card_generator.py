@@ -365,7 +365,7 @@ class ModuleCardGenerator:
             cards: List of ModuleCard objects without positioning
             
         Returns:
-            List of ModuleCard objects with positioning applied
+            The cards in folder order, with their positions set (in place)
         """
         positioned_cards = []
         
@@ -398,20 +398,8 @@ class ModuleCardGenerator:
                 x = col * card_spacing_x
                 y = current_y + (row * card_spacing_y)
                 
-                # Create positioned card
-                positioned_card = ModuleCard(
-                    id=card.id,
-                    name=card.name,
-                    display_name=card.display_name,
-                    folder_path=card.folder_path,
-                    complexity=card.complexity,
-                    dependencies=card.dependencies,
-                    styling=card.styling,
-                    position=Position(x=x, y=y),
-                    metadata=card.metadata
-                )
-                
-                positioned_cards.append(positioned_card)
+                card.position = Position(x=x, y=y)
+                positioned_cards.append(card)
             
             # Move to next folder group
             current_y += (rows * card_spacing_y) + folder_spacing
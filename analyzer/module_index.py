@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Module Index for CodeMindMap Analyzer
+
+This module names project modules by their fully qualified dotted names
+(``pkg/sub/mod.py`` is ``pkg.sub.mod``, ``pkg/__init__.py`` is ``pkg`` and
+``src/`` layouts drop the ``src`` directory) and indexes them so that every
+import statement, absolute or relative, is resolved to the project modules
+it loads with a constant number of dictionary lookups.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+from analyzer import ImportInfo, ModuleInfo
+
+logger = logging.getLogger(__name__)
+
+# Layout directories holding the project's packages, not part of module names
+SOURCE_DIRS = ("src",)
+
+PACKAGE_FILE = "__init__"
+
+
+def module_name_for_path(file_path: Path, project_path: Optional[Path] = None) -> str:
+    """Get the fully qualified module name of a file.
+    
+    The name only depends on the file's path relative to the project, so
+    that cached modules keep their names wherever the project is checked out.
+    
+    Args:
+        file_path: Path to the Python file
+        project_path: Path to the project root (None to name the file by its stem)
+    
+    Returns:
+        Dotted module name (the file stem for files outside the project)
+    """
+    file_path = Path(file_path)
+    if project_path is None:
+        return file_path.stem
+    
+    try:
+        rel_path = file_path.relative_to(project_path)
+    except ValueError:
+        try:
+            rel_path = file_path.resolve().relative_to(Path(project_path).resolve())
+        except (OSError, ValueError):
+            return file_path.stem
+    
+    parts = list(rel_path.with_suffix("").parts)
+    if len(parts) > 1 and parts[0] in SOURCE_DIRS:
+        parts = parts[1:]
+    if len(parts) > 1 and parts[-1] == PACKAGE_FILE:
+        parts.pop()
+    return ".".join(parts) if parts else file_path.stem
+
+
+def relative_import_package(importer: str, level: int, importer_is_package: bool = False) -> Optional[str]:
+    """Get the package a relative import with the given level starts from.
+    
+    Args:
+        importer: Qualified name of the importing module
+        level: Number of leading dots of the import (at least 1)
+        importer_is_package: Whether the importer is a package (``__init__.py``)
+    
+    Returns:
+        Dotted package name ('' for the project root), or None for an import
+        reaching above the top-level package
+    """
+    package = importer if importer_is_package else importer.rpartition(".")[0]
+    for _ in range(level - 1):
+        if not package:
+            return None
+        package = package.rpartition(".")[0]
+    return package
+
+
+def resolve_import_from(module: Optional[str], level: int, importer: str,
+                        importer_is_package: bool = False) -> Optional[str]:
+    """Get the absolute dotted name of a from-import's module.
+    
+    Args:
+        module: Module of the statement (None for ``from . import name``)
+        level: Number of leading dots of the import (0 for absolute imports)
+        importer: Qualified name of the importing module
+        importer_is_package: Whether the importer is a package (``__init__.py``)
+    
+    Returns:
+        Dotted name, or None when it cannot be resolved
+    """
+    if not level:
+        return module or None
+    package = relative_import_package(importer, level, importer_is_package)
+    if package is None:
+        return None
+    return ".".join(part for part in (package, module) if part) or None
+
+
+def is_package(module: ModuleInfo) -> bool:
+    """Check whether a module is a package (an ``__init__.py`` file)."""
+    return Path(module.path).stem == PACKAGE_FILE
+
+
+class ModuleIndex:
+    """Resolves import statements to project modules in constant time.
+    
+    Modules are indexed by their qualified names and, for modules outside
+    of a package hierarchy rooted at the project (e.g. ``scripts/tool.py``
+    run with ``scripts`` on ``sys.path``), by their import names relative
+    to the nearest directory that is not a package. Import names shared by
+    several source roots are resolved to the module in the importer's root.
+    """
+    
+    def __init__(self, modules: Iterable[ModuleInfo]):
+        """Index modules.
+        
+        Args:
+            modules: Parsed modules named by module_name_for_path
+        """
+        self.paths: Dict[str, str] = {}  # Qualified name -> file path
+        self.packages: Set[str] = set()
+        self.roots: Dict[str, str] = {}  # Qualified name -> source root prefix ('' for the project)
+        self.aliases: Dict[str, Dict[str, str]] = {}  # Import name -> source root prefix -> qualified name
+        
+        for module in modules:
+            self.paths[module.name] = module.path
+            if is_package(module):
+                self.packages.add(module.name)
+        
+        for name in self.paths:
+            parts = name.split(".")
+            # Climb while the parent is a package: the first non-package is the source root
+            root_length = len(parts) - 1
+            while root_length > 0 and ".".join(parts[:root_length]) in self.packages:
+                root_length -= 1
+            root = ".".join(parts[:root_length])
+            self.roots[name] = root
+            if root:
+                self.aliases.setdefault(".".join(parts[root_length:]), {})[root] = name
+        logger.debug(f"Indexed {len(self.paths)} modules ({len(self.packages)} packages)")
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.paths
+    
+    def __len__(self) -> int:
+        return len(self.paths)
+    
+    def lookup(self, name: str, importer: Optional[str] = None) -> Optional[str]:
+        """Find the project module imported under a name.
+        
+        Args:
+            name: Dotted name as written in an absolute import
+            importer: Qualified name of the importing module (to pick between
+                modules with the same import name)
+        
+        Returns:
+            Qualified module name or None if the name is not a project module
+        """
+        if name in self.paths:
+            return name
+        candidates = self.aliases.get(name)
+        if not candidates:
+            return None
+        root = self.roots.get(importer) if importer is not None else None
+        if root in candidates:
+            return candidates[root]
+        if len(candidates) == 1:
+            return next(iter(candidates.values()))
+        return None  # Ambiguous: never merge unrelated modules
+    
+    def _lookup_prefix(self, name: str, importer: str) -> Optional[str]:
+        """Find the project module of a dotted name or of its longest prefix.
+        
+        Importing ``pkg.mod.Class`` or ``pkg.mod.missing`` still loads ``pkg.mod``.
+        """
+        while name:
+            target = self.lookup(name, importer)
+            if target is not None:
+                return target
+            name = name.rpartition(".")[0]
+        return None
+    
+    def resolve_base(self, import_info: ImportInfo, importer: str) -> Optional[str]:
+        """Get the absolute dotted name an import statement refers to.
+        
+        Args:
+            import_info: Import statement
+            importer: Qualified name of the importing module
+        
+        Returns:
+            Dotted name ('' for the project root when it is a package), or None
+            for a relative import reaching above the top-level package
+        """
+        level = import_info.level
+        if not level:
+            return import_info.module
+        
+        # Relative imports are relative to the importer's package
+        package = relative_import_package(importer, level, importer in self.packages)
+        if package is None:
+            return None
+        if not package and PACKAGE_FILE not in self.paths:
+            return None  # The project root is only a package with an __init__.py of its own
+        return ".".join(part for part in (package, import_info.module) if part)
+    
+    def resolve_import(self, import_info: ImportInfo, importer: str) -> Set[str]:
+        """Get the project modules an import statement loads.
+        
+        Args:
+            import_info: Import statement
+            importer: Qualified name of the importing module
+        
+        Returns:
+            Qualified names of the imported project modules
+        """
+        base = self.resolve_base(import_info, importer)
+        if base is None:
+            return set()
+        
+        if not import_info.is_from_import:
+            target = self._lookup_prefix(base, importer)
+            return {target} if target is not None else set()
+        
+        targets = set()
+        base_target = None
+        for name in import_info.names:
+            # from pkg import mod imports a submodule, from mod import name a module member
+            target = self.lookup(f"{base}.{name}" if base else name, importer) if name != "*" else None
+            if target is None:
+                if base_target is None:
+                    base_target = self._lookup_prefix(base, importer) or ""
+                target = base_target
+            if target:
+                targets.add(target)
+        return targets
+    
+    def resolve_module(self, module: ModuleInfo) -> Set[str]:
+        """Get the project modules a module imports (excluding itself).
+        
+        Args:
+            module: Parsed module
+        
+        Returns:
+            Qualified names of the imported project modules
+        """
+        dependencies = set()
+        for import_info in module.imports:
+            dependencies.update(self.resolve_import(import_info, module.name))
+        dependencies.discard(module.name)
+        return dependencies
@@ -28,6 +28,26 @@ from queue import Queue
 
 logger = logging.getLogger(__name__)
 
+# Worker processes are not forked from the analyzer: pools are created from
+# threads of the analyzer server, and a child forked while another thread
+# holds a lock (logging, the server's write lock) can deadlock on it
+WORKER_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Modules the fork server imports once, so that each worker starts warm
+WORKER_PRELOAD = ["file_guard", "ast_parser", "complexity_analyzer"]
+
+
+def worker_context() -> Any:
+    """Get the multiprocessing context that process pools create their workers with.
+    
+    Returns:
+        Multiprocessing context of WORKER_START_METHOD
+    """
+    context = multiprocessing.get_context(WORKER_START_METHOD)
+    if WORKER_START_METHOD == "forkserver":
+        context.set_forkserver_preload(WORKER_PRELOAD)
+    return context
+
 
 @dataclass
 class ProjectSizeInfo:
@@ -48,6 +68,8 @@ class PerformanceConfig:
     max_file_size_mb: int = 10  # Skip files larger than this
     max_project_files: int = 10000  # Warn for projects with more files
     chunk_size: int = 50  # Files per processing chunk
+    file_time_limit: int = 20  # CPU seconds a worker may spend on one file (0 = no limit)
+    file_memory_limit_mb: int = 1024  # Memory a worker may allocate for one file (0 = no limit)
     enable_parallel: bool = True
     enable_memory_monitoring: bool = True
     progress_callback: Optional[Callable[[str, float], None]] = None
@@ -126,15 +148,23 @@ class MemoryMonitor:
             return {"current_mb": 0, "peak_mb": 0, "limit_mb": 0}
 
 
+class AnalysisCancelledError(Exception):
+    """Raised when a running analysis is cancelled by its caller."""
+    pass
+
+
 class ProgressReporter:
     """Reports progress during long-running analysis."""
     
-    def __init__(self, callback: Optional[Callable[[str, float], None]] = None):
+    def __init__(self, callback: Optional[Callable[[str, float], None]] = None,
+                 cancel_event: Optional[threading.Event] = None):
         self.callback = callback
+        self.cancel_event = cancel_event
         self.start_time = time.time()
         self.last_report_time = self.start_time
         self.total_steps = 0
         self.completed_steps = 0
+        self._lock = threading.Lock()  # Analysis stages report from several threads
     
     def set_total_steps(self, total: int):
         """Set total number of steps for progress calculation."""
@@ -144,28 +174,39 @@ class ProgressReporter:
         self.last_report_time = self.start_time
         logger.info(f"Progress tracking started: {total} total steps")
     
+    def check_cancelled(self):
+        """Raise AnalysisCancelledError if cancellation has been requested."""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise AnalysisCancelledError("Analysis cancelled")
+    
     def update_progress(self, step_name: str, increment: int = 1):
-        """Update progress with step completion."""
-        self.completed_steps += increment
-        progress = self.completed_steps / max(self.total_steps, 1)
+        """Update progress with step completion.
         
-        current_time = time.time()
-        elapsed = current_time - self.start_time
-        
-        # Report every 2 seconds or on significant progress
-        if (current_time - self.last_report_time > 2.0 or 
-            progress >= 1.0 or 
-            self.completed_steps % max(self.total_steps // 20, 1) == 0):
-            
-            eta = (elapsed / max(progress, 0.01)) - elapsed if progress > 0 else 0
-            
-            logger.info(f"Progress: {step_name} ({self.completed_steps}/{self.total_steps}, "
-                       f"{progress * 100:.1f}%, ETA: {eta:.1f}s)")
+        Raises:
+            AnalysisCancelledError: If cancellation has been requested
+        """
+        self.check_cancelled()
+        with self._lock:
+            self.completed_steps += increment
+            progress = self.completed_steps / max(self.total_steps, 1)
             
-            if self.callback:
-                self.callback(step_name, progress)
+            current_time = time.time()
+            elapsed = current_time - self.start_time
             
-            self.last_report_time = current_time
+            # Report every 2 seconds or on significant progress
+            if (current_time - self.last_report_time > 2.0 or 
+                progress >= 1.0 or 
+                self.completed_steps % max(self.total_steps // 20, 1) == 0):
+                
+                eta = (elapsed / max(progress, 0.01)) - elapsed if progress > 0 else 0
+                
+                logger.info(f"Progress: {step_name} ({self.completed_steps}/{self.total_steps}, "
+                           f"{progress * 100:.1f}%, ETA: {eta:.1f}s)")
+                
+                if self.callback:
+                    self.callback(step_name, progress)
+                
+                self.last_report_time = current_time
     
     def finish(self):
         """Mark progress as complete."""
@@ -179,11 +220,14 @@ class ProgressReporter:
 class ProjectSizeAnalyzer:
     """Analyzes project size and provides recommendations."""
     
-    def __init__(self, project_path: Path):
+    def __init__(self, project_path: Path, file_index=None):
         self.project_path = project_path
+        self.file_index = file_index
     
     def analyze_project_size(self) -> ProjectSizeInfo:
         """Analyze project size and complexity."""
+        from file_index import get_file_index
+        
         total_files = 0
         total_lines = 0
         total_size_bytes = 0
@@ -191,28 +235,25 @@ class ProjectSizeAnalyzer:
         largest_file_path = ""
         
         try:
-            for py_file in self.project_path.rglob("*.py"):
-                # Skip common directories
-                if any(part.startswith('.') or part in ['__pycache__', 'node_modules', 'venv', 'env'] 
-                       for part in py_file.parts):
-                    continue
-                
+            self.file_index = get_file_index(self.project_path, self.file_index)
+            
+            for record in self.file_index.python_files():
                 try:
-                    file_size = py_file.stat().st_size
-                    total_size_bytes += file_size
+                    total_size_bytes += record.size
                     total_files += 1
                     
-                    # Count lines
-                    with open(py_file, 'r', encoding='utf-8', errors='ignore') as f:
+                    # Count lines without keeping the file around: the size
+                    # comes from the index and the sources are read by the stages
+                    with open(record.path, 'rb') as f:
                         lines = sum(1 for _ in f)
-                        total_lines += lines
-                        
-                        if lines > largest_file_lines:
-                            largest_file_lines = lines
-                            largest_file_path = str(py_file.relative_to(self.project_path))
+                    total_lines += lines
+                    
+                    if lines > largest_file_lines:
+                        largest_file_lines = lines
+                        largest_file_path = record.rel_path
                 
                 except Exception as e:
-                    logger.warning(f"Failed to analyze file {py_file}: {e}")
+                    logger.warning(f"Failed to analyze file {record.path}: {e}")
         
         except Exception as e:
             logger.error(f"Failed to analyze project size: {e}")
@@ -268,54 +309,98 @@ class ParallelProcessor:
         self.max_workers = config.max_workers or min(multiprocessing.cpu_count(), 8)
         logger.info(f"Parallel processor initialized with {self.max_workers} workers")
     
+    def should_process_parallel(self, file_count: int) -> bool:
+        """Check whether a batch of files is worth a process pool.
+        
+        Args:
+            file_count: Number of files to process
+            
+        Returns:
+            True if files should be processed in worker processes
+        """
+        return self.config.enable_parallel and self.max_workers > 1 and file_count >= 10
+    
     def process_files_parallel(self, files: List[Path], process_func: Callable, 
-                             progress_reporter: Optional[ProgressReporter] = None) -> List[Any]:
+                             progress_reporter: Optional[ProgressReporter] = None,
+                             initializer: Optional[Callable] = None,
+                             initargs: Tuple = (),
+                             retry_lost: Optional[Callable[[List[List[Path]]], List[List[Any]]]] = None
+                             ) -> List[Any]:
         """Process files in parallel using multiprocessing.
         
+        ``process_func`` (and ``initializer``) must be picklable module-level
+        callables. They are sent to each worker once, when the worker starts,
+        rather than with every chunk. Results are returned in the order of
+        ``files`` regardless of which worker finishes first.
+        
+        Chunks lost to a worker failure (a worker that dies breaks the pool,
+        losing every unfinished chunk) are processed again in this process,
+        or passed to ``retry_lost`` when the files must not run here.
+        
         Args:
             files: List of files to process
             process_func: Function to process each file
             progress_reporter: Optional progress reporter
+            initializer: Optional function run once in each worker process
+            initargs: Arguments for the initializer
+            retry_lost: Optional function given the lost chunks and returning
+                their results (one list per chunk)
             
         Returns:
             List of processing results
         """
-        if not self.config.enable_parallel or len(files) < 10:
+        if not self.should_process_parallel(len(files)):
             # Use sequential processing for small numbers of files
+            if initializer is not None:
+                initializer(*initargs)
             return self._process_files_sequential(files, process_func, progress_reporter)
         
-        results = []
         chunks = self._chunk_files(files, self.config.chunk_size)
+        chunk_results: List[Optional[List[Any]]] = [None] * len(chunks)
         
         if progress_reporter:
             progress_reporter.set_total_steps(len(chunks))
         
         try:
-            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(chunks)),
+                                     mp_context=worker_context(), initializer=_init_worker,
+                                     initargs=(process_func, initializer, initargs)) as executor:
                 # Submit all chunks
-                future_to_chunk = {
-                    executor.submit(self._process_chunk, chunk, process_func): chunk 
-                    for chunk in chunks
+                future_to_index = {
+                    executor.submit(_process_worker_chunk, chunk): index
+                    for index, chunk in enumerate(chunks)
                 }
                 
                 # Collect results as they complete
-                for future in as_completed(future_to_chunk):
-                    chunk = future_to_chunk[future]
+                for future in as_completed(future_to_index):
+                    index = future_to_index[future]
                     try:
-                        chunk_results = future.result()
-                        results.extend(chunk_results)
+                        chunk_results[index] = future.result()
                         
                         if progress_reporter:
-                            progress_reporter.update_progress(f"Processed {len(chunk)} files")
+                            progress_reporter.update_progress(f"Processed {len(chunks[index])} files")
                         
                     except Exception as e:
                         logger.error(f"Failed to process chunk: {e}")
-                        # Continue with other chunks
+                        # Retried in this process below
         
         except Exception as e:
             logger.error(f"Parallel processing failed: {e}")
-            # Fall back to sequential processing
-            return self._process_files_sequential(files, process_func, progress_reporter)
+        
+        # Merge in input order; chunks lost to a worker failure run here (or through retry_lost)
+        lost = [index for index, chunk_result in enumerate(chunk_results) if chunk_result is None]
+        if lost and retry_lost is not None:
+            for index, chunk_result in zip(lost, retry_lost([chunks[index] for index in lost])):
+                chunk_results[index] = chunk_result
+        
+        results = []
+        for index, chunk in enumerate(chunks):
+            if chunk_results[index] is None:
+                if initializer is not None:
+                    initializer(*initargs)
+                    initializer = None
+                chunk_results[index] = self._process_chunk(chunk, process_func)
+            results.extend(chunk_results[index])
         
         return results
     
@@ -362,6 +447,23 @@ class ParallelProcessor:
         return results
 
 
+# Per-process function installed by the pool initializer
+_worker_process_func: Optional[Callable] = None
+
+
+def _init_worker(process_func: Callable, initializer: Optional[Callable], initargs: Tuple):
+    """Install the processing function in a worker process."""
+    global _worker_process_func
+    _worker_process_func = process_func
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _process_worker_chunk(chunk: List[Path]) -> List[Any]:
+    """Process a chunk of files with the worker's installed function."""
+    return ParallelProcessor._process_chunk(chunk, _worker_process_func)
+
+
 class PerformanceOptimizer:
     """Main performance optimizer class."""
     
@@ -372,16 +474,17 @@ class PerformanceOptimizer:
         self.parallel_processor = ParallelProcessor(self.config)
         self.size_analyzer = None
     
-    def optimize_for_project(self, project_path: Path) -> Tuple[ProjectSizeInfo, List[str]]:
+    def optimize_for_project(self, project_path: Path, file_index=None) -> Tuple[ProjectSizeInfo, List[str]]:
         """Analyze project and provide optimization recommendations.
         
         Args:
             project_path: Path to the project
+            file_index: Optional shared ProjectFileIndex
             
         Returns:
             Tuple of (size_info, recommendations)
         """
-        self.size_analyzer = ProjectSizeAnalyzer(project_path)
+        self.size_analyzer = ProjectSizeAnalyzer(project_path, file_index)
         size_info = self.size_analyzer.analyze_project_size()
         recommendations = self.size_analyzer.get_size_recommendations(size_info, self.config)
         
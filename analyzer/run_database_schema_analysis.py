@@ -30,6 +30,152 @@ except ImportError as e:
     sys.exit(1)
 
 
+def schema_result_to_dict(result) -> dict:
+    """Convert a database schema analysis result to the JSON output format.
+    
+    Args:
+        result: DatabaseSchemaAnalysisResult returned by DatabaseSchemaAnalyzer
+        
+    Returns:
+        JSON-serializable dictionary with success, data, errors and warnings
+    """
+    return {
+        "success": True,
+        "data": {
+            "tables": [
+                {
+                    "name": table.name,
+                    "schema": table.schema,
+                    "columns": [
+                        {
+                            "name": col.name,
+                            "data_type": col.data_type,
+                            "nullable": col.nullable,
+                            "default_value": col.default_value,
+                            "max_length": col.max_length,
+                            "is_primary_key": col.is_primary_key,
+                            "is_foreign_key": col.is_foreign_key,
+                            "foreign_key_table": col.foreign_key_table,
+                            "foreign_key_column": col.foreign_key_column
+                        }
+                        for col in table.columns
+                    ],
+                    "primary_keys": table.primary_keys,
+                    "foreign_keys": [
+                        {
+                            "column": fk.column,
+                            "referenced_table": fk.referenced_table,
+                            "referenced_column": fk.referenced_column,
+                            "on_delete": fk.on_delete,
+                            "on_update": fk.on_update
+                        }
+                        for fk in table.foreign_keys
+                    ],
+                    "indexes": table.indexes,
+                    "constraints": table.constraints,
+                    "estimated_rows": table.estimated_rows,
+                    "model_file": table.model_file,
+                    "model_class": table.model_class
+                }
+                for table in result.tables
+            ],
+            "relationships": [
+                {
+                    "from_table": rel.from_table,
+                    "to_table": rel.to_table,
+                    "relationship_type": rel.relationship_type,
+                    "foreign_key_column": rel.foreign_key_column,
+                    "referenced_column": rel.referenced_column,
+                    "relationship_name": rel.relationship_name
+                }
+                for rel in result.relationships
+            ],
+            "indexes": [
+                {
+                    "name": idx.name,
+                    "table": idx.table,
+                    "columns": idx.columns,
+                    "unique": idx.unique,
+                    "index_type": idx.index_type
+                }
+                for idx in result.indexes
+            ],
+            "constraints": [
+                {
+                    "name": const.name,
+                    "table": const.table,
+                    "constraint_type": const.constraint_type,
+                    "columns": const.columns,
+                    "definition": const.definition
+                }
+                for const in result.constraints
+            ],
+            "raw_sql": [
+                {
+                    "statement_type": stmt.statement_type,
+                    "content": stmt.content,
+                    "file_path": stmt.file_path,
+                    "line_number": stmt.line_number,
+                    "table_references": stmt.table_references,
+                    "normalized_content": stmt.normalized_content
+                }
+                for stmt in result.raw_sql
+            ],
+            "graph_data": {
+                "nodes": [
+                    {
+                        "id": node.id,
+                        "label": node.label,
+                        "table_name": node.table_name,
+                        "columns": [
+                            {
+                                "name": col.name,
+                                "data_type": col.data_type,
+                                "nullable": col.nullable,
+                                "default_value": col.default_value,
+                                "max_length": col.max_length,
+                                "is_primary_key": col.is_primary_key,
+                                "is_foreign_key": col.is_foreign_key,
+                                "foreign_key_table": col.foreign_key_table,
+                                "foreign_key_column": col.foreign_key_column
+                            }
+                            for col in node.columns
+                        ],
+                        "position": node.position,
+                        "styling": node.styling
+                    }
+                    for node in result.graph_data.nodes
+                ],
+                "edges": [
+                    {
+                        "id": edge.id,
+                        "source": edge.source,
+                        "target": edge.target,
+                        "relationship_type": edge.relationship_type,
+                        "label": edge.label,
+                        "styling": edge.styling
+                    }
+                    for edge in result.graph_data.edges
+                ],
+                "layout": result.graph_data.layout,
+                "metadata": result.graph_data.metadata
+            },
+            "metadata": {
+                "analysis_timestamp": result.metadata.analysis_timestamp.isoformat(),
+                "project_path": result.metadata.project_path,
+                "total_tables": result.metadata.total_tables,
+                "total_relationships": result.metadata.total_relationships,
+                "frameworks_detected": result.metadata.frameworks_detected,
+                "sql_files_analyzed": result.metadata.sql_files_analyzed,
+                "model_files_analyzed": result.metadata.model_files_analyzed,
+                "organized_sql": result.metadata.organized_sql
+            }
+        },
+        "errors": [],
+        "warnings": []
+    }
+
+
 def main():
     """Main entry point for database schema analysis"""
     if len(sys.argv) != 2:
@@ -80,141 +226,7 @@ def main():
         print("Generating graph data...", file=sys.stderr)
         
         # Convert the result to a JSON-serializable format
-        output = {
-            "success": True,
-            "data": {
-                "tables": [
-                    {
-                        "name": table.name,
-                        "schema": table.schema,
-                        "columns": [
-                            {
-                                "name": col.name,
-                                "data_type": col.data_type,
-                                "nullable": col.nullable,
-                                "default_value": col.default_value,
-                                "max_length": col.max_length,
-                                "is_primary_key": col.is_primary_key,
-                                "is_foreign_key": col.is_foreign_key,
-                                "foreign_key_table": col.foreign_key_table,
-                                "foreign_key_column": col.foreign_key_column
-                            }
-                            for col in table.columns
-                        ],
-                        "primary_keys": table.primary_keys,
-                        "foreign_keys": [
-                            {
-                                "column": fk.column,
-                                "referenced_table": fk.referenced_table,
-                                "referenced_column": fk.referenced_column,
-                                "on_delete": fk.on_delete,
-                                "on_update": fk.on_update
-                            }
-                            for fk in table.foreign_keys
-                        ],
-                        "indexes": table.indexes,
-                        "constraints": table.constraints,
-                        "estimated_rows": table.estimated_rows,
-                        "model_file": table.model_file,
-                        "model_class": table.model_class
-                    }
-                    for table in result.tables
-                ],
-                "relationships": [
-                    {
-                        "from_table": rel.from_table,
-                        "to_table": rel.to_table,
-                        "relationship_type": rel.relationship_type,
-                        "foreign_key_column": rel.foreign_key_column,
-                        "referenced_column": rel.referenced_column,
-                        "relationship_name": rel.relationship_name
-                    }
-                    for rel in result.relationships
-                ],
-                "indexes": [
-                    {
-                        "name": idx.name,
-                        "table": idx.table,
-                        "columns": idx.columns,
-                        "unique": idx.unique,
-                        "index_type": idx.index_type
-                    }
-                    for idx in result.indexes
-                ],
-                "constraints": [
-                    {
-                        "name": const.name,
-                        "table": const.table,
-                        "constraint_type": const.constraint_type,
-                        "columns": const.columns,
-                        "definition": const.definition
-                    }
-                    for const in result.constraints
-                ],
-                "raw_sql": [
-                    {
-                        "statement_type": stmt.statement_type,
-                        "content": stmt.content,
-                        "file_path": stmt.file_path,
-                        "line_number": stmt.line_number,
-                        "table_references": stmt.table_references,
-                        "normalized_content": stmt.normalized_content
-                    }
-                    for stmt in result.raw_sql
-                ],
-                "graph_data": {
-                    "nodes": [
-                        {
-                            "id": node.id,
-                            "label": node.label,
-                            "table_name": node.table_name,
-                            "columns": [
-                                {
-                                    "name": col.name,
-                                    "data_type": col.data_type,
-                                    "nullable": col.nullable,
-                                    "default_value": col.default_value,
-                                    "max_length": col.max_length,
-                                    "is_primary_key": col.is_primary_key,
-                                    "is_foreign_key": col.is_foreign_key,
-                                    "foreign_key_table": col.foreign_key_table,
-                                    "foreign_key_column": col.foreign_key_column
-                                }
-                                for col in node.columns
-                            ],
-                            "position": node.position,
-                            "styling": node.styling
-                        }
-                        for node in result.graph_data.nodes
-                    ],
-                    "edges": [
-                        {
-                            "id": edge.id,
-                            "source": edge.source,
-                            "target": edge.target,
-                            "relationship_type": edge.relationship_type,
-                            "label": edge.label,
-                            "styling": edge.styling
-                        }
-                        for edge in result.graph_data.edges
-                    ],
-                    "layout": result.graph_data.layout,
-                    "metadata": result.graph_data.metadata
-                },
-                "metadata": {
-                    "analysis_timestamp": result.metadata.analysis_timestamp.isoformat(),
-                    "project_path": result.metadata.project_path,
-                    "total_tables": result.metadata.total_tables,
-                    "total_relationships": result.metadata.total_relationships,
-                    "frameworks_detected": result.metadata.frameworks_detected,
-                    "sql_files_analyzed": result.metadata.sql_files_analyzed,
-                    "model_files_analyzed": result.metadata.model_files_analyzed,
-                    "organized_sql": result.metadata.organized_sql
-                }
-            },
-            "errors": [],
-            "warnings": []
-        }
+        output = schema_result_to_dict(result)
         
         # Output the result as JSON
         print(json.dumps(output, indent=2))
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Source Store for CodeMindMap Analyzer
+
+This module provides a per-run store of source text and parsed ASTs so that
+every analysis stage reads and parses each file at most once.
+"""
+
+import ast
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Optional, Union, Any
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(data: bytes) -> str:
+    """Compute the content hash of a file's raw bytes.
+    
+    The hash uses git's blob object format so that it can be compared
+    directly with object ids reported by git.
+    
+    Args:
+        data: Raw file content
+    
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha1()
+    digest.update(b"blob %d\0" % len(data))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+@dataclass
+class SourceStoreStats:
+    """Counters describing the work done by a SourceStore."""
+    files_read: int = 0
+    bytes_read: int = 0
+    parses: int = 0
+    parse_errors: int = 0
+    source_hits: int = 0
+    tree_hits: int = 0
+
+
+class SourceEntry:
+    """Source text and content hash of a single file."""
+    
+    __slots__ = ("path", "digest", "size", "source", "decode_error")
+    
+    def __init__(self, path: str, digest: str, size: int, source: str,
+                 decode_error: Optional[UnicodeDecodeError] = None):
+        self.path = path
+        self.digest = digest
+        self.size = size
+        self.source = source
+        self.decode_error = decode_error
+
+
+class SourceStore:
+    """Per-run store of source text and ASTs keyed by path and content hash.
+    
+    Files are read once per run and parsed once per distinct content hash,
+    so identical files (for example empty ``__init__.py`` modules) share a
+    single tree. Stages must treat the returned trees as read-only.
+    """
+    
+    def __init__(self):
+        """Initialize an empty source store."""
+        self._lock = threading.RLock()
+        self._entries: Dict[str, SourceEntry] = {}
+        self._trees: Dict[str, ast.AST] = {}
+        self._syntax_errors: Dict[str, SyntaxError] = {}
+        self.stats = SourceStoreStats()
+    
+    def get_entry(self, file_path: Union[str, Path]) -> SourceEntry:
+        """Get the source entry for a file, reading it on first access.
+        
+        Args:
+            file_path: Path to the file
+        
+        Returns:
+            SourceEntry for the file
+        
+        Raises:
+            OSError: If the file cannot be read
+        """
+        key = str(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.stats.source_hits += 1
+                return entry
+            
+            with open(key, 'rb') as f:
+                data = f.read()
+            
+            decode_error = None
+            try:
+                source = data.decode('utf-8')
+            except UnicodeDecodeError as e:
+                decode_error = e
+                source = data.decode('utf-8', errors='ignore')
+            
+            # Match the universal newline handling of text-mode reads
+            if '\r' in source:
+                source = source.replace('\r\n', '\n').replace('\r', '\n')
+            
+            entry = SourceEntry(key, content_hash(data), len(data), source, decode_error)
+            self._entries[key] = entry
+            self.stats.files_read += 1
+            self.stats.bytes_read += len(data)
+            return entry
+    
+    def get_source(self, file_path: Union[str, Path], errors: str = 'strict') -> str:
+        """Get the decoded source text of a file.
+        
+        Args:
+            file_path: Path to the file
+            errors: 'strict' to raise on invalid UTF-8, 'ignore' to drop bad bytes
+        
+        Returns:
+            Source text
+        
+        Raises:
+            OSError: If the file cannot be read
+            UnicodeDecodeError: If the file is not valid UTF-8 and errors is 'strict'
+        """
+        entry = self.get_entry(file_path)
+        if entry.decode_error is not None and errors == 'strict':
+            raise entry.decode_error
+        return entry.source
+    
+    def get_digest(self, file_path: Union[str, Path]) -> str:
+        """Get the content hash of a file.
+        
+        Args:
+            file_path: Path to the file
+        
+        Returns:
+            Content hash string
+        """
+        return self.get_entry(file_path).digest
+    
+    def get_tree(self, file_path: Union[str, Path]) -> ast.AST:
+        """Get the parsed AST of a file, parsing it on first access.
+        
+        Args:
+            file_path: Path to the file
+        
+        Returns:
+            Parsed AST module node
+        
+        Raises:
+            OSError: If the file cannot be read
+            UnicodeDecodeError: If the file is not valid UTF-8
+            SyntaxError: If the file cannot be parsed
+        """
+        with self._lock:
+            entry = self.get_entry(file_path)
+            if entry.decode_error is not None:
+                raise entry.decode_error
+            
+            tree = self._trees.get(entry.digest)
+            if tree is not None:
+                self.stats.tree_hits += 1
+                return tree
+            
+            error = self._syntax_errors.get(entry.digest)
+            if error is not None:
+                raise error
+            
+            try:
+                tree = ast.parse(entry.source, filename=entry.path)
+            except SyntaxError as e:
+                self.stats.parse_errors += 1
+                self._syntax_errors[entry.digest] = e
+                raise
+            finally:
+                self.stats.parses += 1
+            
+            self._trees[entry.digest] = tree
+            return tree
+    
+    def discard(self, file_path: Union[str, Path]) -> None:
+        """Forget a file so that the next access re-reads it.
+        
+        Args:
+            file_path: Path to the file
+        """
+        with self._lock:
+            entry = self._entries.pop(str(file_path), None)
+            if entry is None:
+                return
+            if not any(e.digest == entry.digest for e in self._entries.values()):
+                self._trees.pop(entry.digest, None)
+                self._syntax_errors.pop(entry.digest, None)
+    
+    def clear(self) -> None:
+        """Release all cached sources and trees (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._trees.clear()
+            self._syntax_errors.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get source store statistics.
+        
+        Returns:
+            Dictionary with read and parse counters
+        """
+        with self._lock:
+            stats = asdict(self.stats)
+            stats["cached_files"] = len(self._entries)
+            stats["cached_trees"] = len(self._trees)
+            return stats
+
+
+def load_source(file_path: Union[str, Path], source_store: Optional[SourceStore] = None,
+                errors: str = 'strict') -> str:
+    """Read a file's source, through the store when one is provided.
+    
+    Args:
+        file_path: Path to the file
+        source_store: Optional shared SourceStore
+        errors: Decoding error handling ('strict' or 'ignore')
+    
+    Returns:
+        Source text
+    """
+    if source_store is not None:
+        return source_store.get_source(file_path, errors=errors)
+    
+    with open(file_path, 'r', encoding='utf-8', errors=errors) as f:
+        return f.read()
+
+
+def load_tree(file_path: Union[str, Path], source_store: Optional[SourceStore] = None,
+              source: Optional[str] = None) -> ast.AST:
+    """Parse a file, through the store when one is provided.
+    
+    Args:
+        file_path: Path to the file
+        source_store: Optional shared SourceStore
+        source: Source text already read by the caller (used without a store)
+    
+    Returns:
+        Parsed AST module node
+    """
+    if source_store is not None:
+        return source_store.get_tree(file_path)
+    
+    if source is None:
+        source = load_source(file_path)
+    return ast.parse(source, filename=str(file_path))
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Stage Memo for CodeMindMap Analyzer
+
+This module memoizes analysis stages that do not work module by module
+(dependency parsing, framework pattern detection, tech stack
+categorization and folder structure analysis). Each result is stored in
+the cache's content store under a hash of the inputs the stage actually
+reads, e.g. the content hashes of the dependency files rather than of the
+whole project, so that edits touching none of a stage's inputs reuse its
+previous result instead of running it again.
+"""
+
+import json
+import logging
+import pickle
+import zlib
+from pathlib import Path
+from typing import Any, Callable, List, Tuple, TypeVar
+
+from cache_pack import COMPRESSION_LEVEL
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Kind of the stage results in the content store
+STAGE_KIND = "stage"
+
+
+class StageMemo:
+    """Memo of stage results persisted in the cache directory."""
+    
+    def __init__(self, cache_manager: Any, project_path: Path, refresh: bool = False):
+        """Initialize the memo for one analysis run.
+        
+        Args:
+            cache_manager: CacheManager whose content store holds the results
+            project_path: Path to the analyzed project (results contain absolute paths)
+            refresh: Recompute every stage, replacing the stored results
+        """
+        self.cache_manager = cache_manager
+        self.project_path = Path(project_path)
+        self.refresh = refresh
+        self.hits: List[str] = []
+        self.misses: List[str] = []
+    
+    def key(self, stage: str, inputs: Any) -> str:
+        """Get the store key of a stage result.
+        
+        Args:
+            stage: Stage name
+            inputs: JSON-compatible description of everything the stage reads
+        
+        Returns:
+            Store key
+        """
+        encoded = json.dumps(inputs, sort_keys=True, separators=(',', ':'), default=str)
+        return self.cache_manager._object_key("stage", stage, str(self.project_path.resolve()), encoded)
+    
+    def lookup(self, stage: str, inputs: Any) -> Tuple[str, bool, Any]:
+        """Look up a stage result.
+        
+        Args:
+            stage: Stage name
+            inputs: JSON-compatible description of everything the stage reads
+        
+        Returns:
+            Tuple of (store key, whether a result was found, the result)
+        """
+        key = self.key(stage, inputs)
+        data = None if self.refresh else self.cache_manager.store.get(key)
+        if data is not None:
+            try:
+                value = pickle.loads(zlib.decompress(data))
+                self.hits.append(stage)
+                logger.info(f"Reusing memoized result of stage {stage}")
+                return key, True, value
+            except Exception as e:
+                logger.warning(f"Failed to load memoized result of stage {stage}: {e}")
+                self.cache_manager.store.remove(key)
+        
+        self.misses.append(stage)
+        return key, False, None
+    
+    def store(self, key: str, value: Any) -> None:
+        """Store a stage result under the key returned by lookup."""
+        try:
+            data = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), COMPRESSION_LEVEL)
+        except Exception as e:
+            logger.warning(f"Failed to memoize stage result: {e}")
+            return
+        self.cache_manager.store.put(key, data, kind=STAGE_KIND)
+    
+    def memoize(self, stage: str, inputs: Any, compute: Callable[[], T]) -> T:
+        """Get a stage result from the memo, or compute and store it.
+        
+        Args:
+            stage: Stage name
+            inputs: JSON-compatible description of everything compute reads
+            compute: Function running the stage
+        
+        Returns:
+            Stage result
+        """
+        key, found, value = self.lookup(stage, inputs)
+        if found:
+            return value
+        
+        value = compute()
+        self.store(key, value)
+        return value
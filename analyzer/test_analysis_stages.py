@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Unit tests for analysis stage declarations and demand-driven analysis.
+"""
+
+import json
+import os
+import pstats
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from analysis_stages import (
+    DEFAULT_SECTIONS, OUTPUT_SECTIONS, PROCESS_STAGE, STAGE_DEPENDENCIES, THREAD_STAGE,
+    StageExecutor, required_stages, resolve_sections, stage_order
+)
+from analyzer import ProjectAnalyzer
+from performance_optimizer import PerformanceConfig
+
+
+def _worker_pid(value):
+    """Process stage used by the tests (must be a picklable module-level function)."""
+    return value, os.getpid()
+
+
+class TestStageGraph(unittest.TestCase):
+    """Test section resolution and stage dependencies."""
+    
+    def test_resolve_sections(self):
+        """Test section names are validated and ordered canonically."""
+        self.assertEqual(resolve_sections(), DEFAULT_SECTIONS)
+        self.assertEqual(resolve_sections("all"), OUTPUT_SECTIONS)
+        self.assertEqual(resolve_sections("call_graph, tech_stack"), ("tech_stack", "call_graph"))
+        self.assertEqual(resolve_sections(["module_graph"]), ("module_graph",))
+        
+        with self.assertRaises(ValueError):
+            resolve_sections(["tech_stack", "bogus"])
+    
+    def test_required_stages(self):
+        """Test stages are expanded with their transitive dependencies."""
+        self.assertEqual(required_stages(["tech_stack"]), {"tech_stack"})
+        self.assertEqual(required_stages(["module_graph"]), {"modules", "dependencies", "module_graph"})
+        self.assertEqual(required_stages(["categorized_tech_stack"]),
+                         {"tech_stack", "complexity_stats", "modules", "categorized_tech_stack"})
+        
+        # The default output does not need the discarded whole-project passes
+        default_stages = required_stages(DEFAULT_SECTIONS)
+        for stage in ("call_graph", "module_cards", "folder_structure", "framework_patterns", "module_graph"):
+            self.assertNotIn(stage, default_stages)
+    
+    def test_stage_order(self):
+        """Test every stage comes after its dependencies."""
+        order = stage_order(required_stages(OUTPUT_SECTIONS))
+        
+        self.assertEqual(set(order), set(STAGE_DEPENDENCIES))
+        for stage in order:
+            for dependency in STAGE_DEPENDENCIES[stage]:
+                self.assertLess(order.index(dependency), order.index(stage))
+
+
+class TestStageExecutor(unittest.TestCase):
+    """Test StageExecutor class."""
+    
+    def test_dependencies_run_first(self):
+        """Test stages see the results of the stages they depend on."""
+        executor = StageExecutor()
+        results = executor.results
+        executor.add_stage("total", lambda: results["a"] + results["b"], ("a", "b"))
+        executor.add_stage("a", lambda: 1)
+        executor.add_stage("b", lambda: results["a"] * 10, ("a",))
+        
+        self.assertEqual(executor.run(), {"a": 1, "b": 10, "total": 11})
+    
+    def test_independent_stages_overlap(self):
+        """Test independent stages run concurrently, so the run takes about the slowest one."""
+        barrier = threading.Barrier(3, timeout=5)
+        executor = StageExecutor(max_threads=3)
+        for name in ("a", "b", "c"):
+            # Each stage waits for the others: this only completes if all three run at once
+            executor.add_stage(name, barrier.wait)
+        executor.run()
+        
+        self.assertEqual(set(executor.results), {"a", "b", "c"})
+    
+    def test_critical_path(self):
+        """Test the critical path is the longest chain of dependent stages."""
+        executor = StageExecutor(max_threads=3)
+        executor.add_stage("parse", time.sleep, args=(0.05,))
+        executor.add_stage("quick", time.sleep, ("parse",), args=(0.01,))
+        executor.add_stage("slow", time.sleep, ("parse",), args=(0.1,))
+        executor.add_stage("side", time.sleep, args=(0.02,))
+        executor.run()
+        
+        stats = executor.get_stats()
+        self.assertEqual(stats["critical_path"], ["parse", "slow"])
+        self.assertGreaterEqual(stats["critical_path_time"], 0.15)
+        self.assertLess(stats["wall_time"], 0.15 + 0.1)
+        self.assertGreaterEqual(stats["stages"]["slow"]["start"], stats["stages"]["parse"]["duration"])
+    
+    def test_stage_measurements(self):
+        """Test CPU time, files processed and throughput are recorded per stage."""
+        def busy(files):
+            deadline = time.thread_time() + 0.05
+            while time.thread_time() < deadline:
+                pass
+            return files
+        
+        executor = StageExecutor()
+        executor.add_stage("busy", busy, args=(["a.py", "b.py"],), count_files=len)
+        executor.add_stage("idle", time.sleep, args=(0.05,))
+        executor.run()
+        
+        stats = executor.get_stats()["stages"]
+        self.assertGreaterEqual(stats["busy"]["cpu_time"], 0.05)
+        self.assertEqual(stats["busy"]["files_processed"], 2)
+        self.assertGreater(stats["busy"]["files_per_second"], 0)
+        self.assertLess(stats["idle"]["cpu_time"], 0.04)
+        self.assertNotIn("files_processed", stats["idle"])
+        self.assertIn("peak_rss_delta_mb", stats["idle"])
+    
+    def test_profile_dir(self):
+        """Test a cProfile stats file is written for each stage."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            executor = StageExecutor(max_threads=4, profile_dir=Path(temp_dir) / "profile")
+            executor.add_stage("parse", sorted, args=([3, 1, 2],))
+            executor.add_stage("report", str, ("parse",), args=(42,))
+            executor.run()
+            
+            self.assertEqual(executor.max_threads, 1)
+            for name in ("parse", "report"):
+                profile_path = executor.get_stats()["stages"][name]["profile"]
+                self.assertEqual(Path(profile_path).name, f"{name}.pstats")
+                self.assertGreater(pstats.Stats(profile_path).total_calls, 0)
+    
+    def test_stage_error_stops_run(self):
+        """Test a failing stage is re-raised and its dependents are not started."""
+        def fail():
+            raise RuntimeError("stage failed")
+        
+        executor = StageExecutor()
+        executor.add_stage("fail", fail)
+        executor.add_stage("after", lambda: "ran", ("fail",))
+        
+        with self.assertRaises(RuntimeError):
+            executor.run()
+        self.assertNotIn("after", executor.results)
+    
+    def test_invalid_graph(self):
+        """Test unknown dependencies and cycles are rejected."""
+        executor = StageExecutor()
+        executor.add_stage("a", lambda: 1, ("missing",))
+        with self.assertRaises(ValueError):
+            executor.run()
+        
+        executor = StageExecutor()
+        executor.add_stage("a", lambda: 1, ("b",))
+        executor.add_stage("b", lambda: 1, ("a",))
+        with self.assertRaises(ValueError):
+            executor.run()
+    
+    def test_process_stage(self):
+        """Test process stages run in a worker process, or on a thread without a pool."""
+        executor = StageExecutor(max_processes=1)
+        executor.add_stage("work", _worker_pid, kind=PROCESS_STAGE, args=("value",))
+        value, pid = executor.run()["work"]
+        self.assertEqual(value, "value")
+        self.assertNotEqual(pid, os.getpid())
+        
+        executor = StageExecutor(max_processes=0)
+        executor.add_stage("work", _worker_pid, kind=PROCESS_STAGE, args=("value",))
+        self.assertEqual(executor.run()["work"], ("value", os.getpid()))
+        self.assertEqual(executor.get_stats()["stages"]["work"]["kind"], THREAD_STAGE)
+
+
+class TestDemandDrivenAnalysis(unittest.TestCase):
+    """Test ProjectAnalyzer only runs stages for requested sections."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.project_path = Path(self.temp_dir.name)
+        self.cache_dir = self.project_path / ".cache"
+        
+        (self.project_path / "requirements.txt").write_text("flask==2.0\n")
+        (self.project_path / "app.py").write_text(
+            "from flask import Flask\n"
+            "from utils import helper\n"
+            "\n"
+            "app = Flask(__name__)\n"
+            "\n"
+            "@app.route('/')\n"
+            "def index():\n"
+            "    return helper()\n"
+        )
+        (self.project_path / "utils.py").write_text(
+            "def helper():\n"
+            "    return 'ok'\n"
+        )
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+    
+    def test_default_sections_skip_unused_stages(self):
+        """Test the default output does not build discarded structures."""
+        with patch("call_graph.CallGraphBuilder.build_call_graph") as build_call_graph, \
+                patch("module_card_generator.ModuleCardGenerator.generate_module_cards") as generate_cards, \
+                patch("framework_detector.FrameworkDetector.detect_patterns") as detect_patterns:
+            result = ProjectAnalyzer(self.project_path, use_cache=False).analyze_project()
+        
+        build_call_graph.assert_not_called()
+        generate_cards.assert_not_called()
+        detect_patterns.assert_not_called()
+        
+        output = result._to_dict()
+        self.assertTrue(output["code_graph_json"])
+        self.assertIn("tech_stack", output)
+        self.assertNotIn("call_graph", output)
+        self.assertEqual(output["metadata"]["sections"], list(DEFAULT_SECTIONS))
+    
+    def test_tech_stack_only_skips_parsing(self):
+        """Test a tech-stack-only request does not parse modules."""
+        with patch("ast_parser.ModuleDiscovery.discover_modules") as discover_modules:
+            result = ProjectAnalyzer(self.project_path, use_cache=False).analyze_project(
+                sections=["tech_stack"]
+            )
+        
+        discover_modules.assert_not_called()
+        output = json.loads(result.to_json())
+        self.assertIn("flask", [lib["name"].lower() for lib in output["tech_stack"]["libraries"]])
+        self.assertNotIn("code_graph_json", output)
+    
+    def test_extra_sections_in_output(self):
+        """Test previously discarded structures are returned when requested."""
+        result = ProjectAnalyzer(self.project_path, use_cache=False).analyze_project(
+            sections=["module_graph", "call_graph", "module_cards", "folder_structure", "framework_patterns"]
+        )
+        output = json.loads(result.to_json())
+        
+        self.assertEqual(sorted(node["name"] for node in output["module_graph"]["nodes"]), ["app", "utils"])
+        self.assertTrue(any(edge["callee"].endswith("helper") for edge in output["call_graph"]["edges"]))
+        self.assertEqual(len(output["module_cards"]), 2)
+        self.assertIn("framework_patterns", output)
+        self.assertNotIn("tech_stack", output)
+    
+    def test_cached_result_must_cover_sections(self):
+        """Test a cached result is reused only when it has the requested sections."""
+        ProjectAnalyzer(self.project_path, cache_dir=self.cache_dir).analyze_project(sections=["tech_stack"])
+        
+        with patch("dependency_parser.DependencyParser.parse_dependencies") as parse_dependencies:
+            ProjectAnalyzer(self.project_path, cache_dir=self.cache_dir).analyze_project(sections=["tech_stack"])
+        parse_dependencies.assert_not_called()
+        
+        result = ProjectAnalyzer(self.project_path, cache_dir=self.cache_dir).analyze_project(
+            sections=["tech_stack", "call_graph"]
+        )
+        self.assertIn("call_graph", result._to_dict())
+        
+        cached = ProjectAnalyzer(self.project_path, cache_dir=self.cache_dir).analyze_project(
+            sections=["call_graph"]
+        )
+        self.assertEqual(cached._to_dict()["call_graph"], result._to_dict()["call_graph"])
+        self.assertNotIn("tech_stack", cached._to_dict())
+    
+    def test_stage_stats_in_metadata(self):
+        """Test stage timings and the critical path are reported with the result."""
+        result = ProjectAnalyzer(self.project_path, use_cache=False).analyze_project(sections="all")
+        stats = result._to_dict()["metadata"]["stages"]
+        
+        self.assertEqual(set(stats["stages"]), set(STAGE_DEPENDENCIES))
+        self.assertTrue(stats["critical_path"])
+        self.assertTrue(set(stats["critical_path"]).issubset(stats["stages"]))
+        self.assertLessEqual(stats["critical_path_time"], stats["wall_time"] + 0.01)
+        self.assertEqual(stats["stages"]["modules"]["files_processed"], 2)
+        self.assertEqual(stats["stages"]["call_graph"]["files_processed"], 2)
+        self.assertIsNotNone(stats["stages"]["categorized_tech_stack"]["cpu_time"])
+    
+    def test_profile_bypasses_cache(self):
+        """Test profiling runs and profiles every stage even when a cached result exists."""
+        ProjectAnalyzer(self.project_path, cache_dir=self.cache_dir).analyze_project()
+        profile_dir = self.project_path / "profile"
+        
+        result = ProjectAnalyzer(self.project_path, cache_dir=self.cache_dir).analyze_project(
+            profile_dir=profile_dir
+        )
+        
+        stages = result._to_dict()["metadata"]["stages"]["stages"]
+        self.assertEqual(sorted(path.stem for path in profile_dir.glob("*.pstats")), sorted(stages))
+    
+    def test_tech_stack_in_process_stage(self):
+        """Test the tech stack is parsed in a worker process when parallel parsing is enabled."""
+        for i in range(10):
+            (self.project_path / f"extra_{i}.py").write_text(f"VALUE = {i}\n")
+        config = PerformanceConfig(max_workers=2)
+        
+        result = ProjectAnalyzer(self.project_path, use_cache=False,
+                                 performance_config=config).analyze_project()
+        output = result._to_dict()
+        
+        self.assertEqual(output["metadata"]["stages"]["stages"]["tech_stack"]["kind"], PROCESS_STAGE)
+        self.assertIn("flask", [lib["name"].lower() for lib in output["tech_stack"]["libraries"]])
+        self.assertEqual(len(output["code_graph_json"][0]["children"]), 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ Unit tests for the CodeMindMap analyzer core functionality.
 """
 
 import json
+import pickle
 import tempfile
 import unittest
 from pathlib import Path
@@ -86,6 +87,171 @@ class TestClass:
         self.assertIsNotNone(result.call_graph)
         self.assertIsNotNone(result.metadata)
     
+    def test_incremental_analysis_matches_full(self):
+        """Test a run after editing one file re-parses only that file."""
+        import time
+        for i in range(9):
+            (self.project_path / f"helper_{i}.py").write_text(
+                f"from test_module import simple_function\n\ndef helper_{i}():\n    return simple_function()\n"
+            )
+        cache_dir = self.project_path / ".cache"
+        
+        ProjectAnalyzer(self.project_path, cache_dir=cache_dir).analyze_project()
+        
+        time.sleep(0.1)  # Ensure different timestamp
+        (self.project_path / "helper_0.py").write_text("def helper_0():\n    return helper_0()\n")
+        
+        incremental = ProjectAnalyzer(self.project_path, cache_dir=cache_dir).analyze_project()
+        full = ProjectAnalyzer(self.project_path, use_cache=False).analyze_project()
+        
+        self.assertEqual(incremental.metadata.incremental_stats["parsed_files"], 1)
+        self.assertEqual(incremental.metadata.incremental_stats["changed_files"], ["helper_0.py"])
+        self.assertEqual(incremental.metadata.source_stats["parses"], 1)
+        self.assertEqual(incremental.code_graph_json, full.code_graph_json)
+    
+    def test_stage_memo_reuses_unaffected_stages(self):
+        """Test stages whose inputs are unchanged reuse their memoized results."""
+        import time
+        (self.project_path / "requirements.txt").write_text("requests==2.31.0\n")
+        for i in range(20):  # The dependency parser scans the first 20 files only
+            (self.project_path / f"a_{i:02}.py").write_text(f"def helper_{i}():\n    return {i}\n")
+        cache_dir = self.project_path / ".cache"
+        sections = ["tech_stack", "categorized_tech_stack", "folder_structure"]
+        
+        first = ProjectAnalyzer(self.project_path, cache_dir=cache_dir).analyze_project(sections=sections)
+        self.assertEqual(first.metadata.stage_stats["memoized"], [])
+        
+        time.sleep(0.1)  # Ensure different timestamp
+        (self.project_path / "test_module.py").write_text("def simple_function():\n    return 'changed'\n")
+        edited = ProjectAnalyzer(self.project_path, cache_dir=cache_dir).analyze_project(sections=sections)
+        full = ProjectAnalyzer(self.project_path, use_cache=False).analyze_project(sections=sections)
+        
+        self.assertEqual(edited.metadata.stage_stats["memoized"], ["categorized_tech_stack", "tech_stack"])
+        self.assertEqual(edited.tech_stack, full.tech_stack)
+        self.assertEqual(edited.extra_sections, full.extra_sections)
+        
+        # Editing a dependency file re-parses the tech stack
+        (self.project_path / "requirements.txt").write_text("requests==2.32.0\n")
+        updated = ProjectAnalyzer(self.project_path, cache_dir=cache_dir).analyze_project(sections=sections)
+        self.assertNotIn("tech_stack", updated.metadata.stage_stats["memoized"])
+        self.assertEqual(updated.tech_stack.libraries[0].version, "==2.32.0")
+    
+    def test_cache_report(self):
+        """Test a run looking up the cache twice (fast path, then analysis) is recorded once."""
+        import io
+        analyzer = ProjectAnalyzer(self.project_path, cache_dir=self.project_path / ".cache")
+        for _ in range(2):
+            if analyzer.write_cached_json(io.BytesIO()) is None:
+                analyzer.analyze_project()
+        
+        report = analyzer.get_cache_report()
+        self.assertEqual([record["outcome"] for record in report["recent"]], ["hit", "miss"])
+        self.assertEqual(report["reasons"], {"no_result": 1})
+        self.assertGreater(report["recent"][0]["time_saved"], 0)
+        self.assertIsNone(ProjectAnalyzer(self.project_path, use_cache=False).get_cache_report())
+    
+    def test_cache_hit_reads_no_sources(self):
+        """Test a run served from the cache neither sizes the project nor reads its sources."""
+        from unittest.mock import patch
+        cache_dir = self.project_path / ".cache"
+        first = ProjectAnalyzer(self.project_path, cache_dir=cache_dir).analyze_project()
+        self.assertGreater(first.metadata.source_stats["files_read"], 0)
+        
+        with patch("performance_optimizer.ProjectSizeAnalyzer.analyze_project_size",
+                   side_effect=AssertionError("project sized")), \
+                patch("source_store.SourceStore.get_entry", side_effect=AssertionError("source read")):
+            cached = ProjectAnalyzer(self.project_path, cache_dir=cache_dir).analyze_project()
+        self.assertEqual(cached.code_graph_json, first.code_graph_json)
+    
+    def test_quarantined_files_get_fallback(self):
+        """Test files quarantined by an earlier run are not analyzed in full until refreshed."""
+        cache_dir = self.project_path / ".cache"
+        analyzer = ProjectAnalyzer(self.project_path, cache_dir=cache_dir)
+        result = analyzer.analyze_project()
+        self.assertEqual(result.metadata.file_stats["slowest"][0]["path"], "test_module.py")
+        self.assertEqual(result.metadata.file_stats["quarantined"], [])
+        
+        analyzer.cache_manager.set_quarantined_files(self.project_path,
+                                                     {"test_module.py": {"reason": "timeout", "time": 0}})
+        with open(self.project_path / "test_module.py", "a") as f:
+            f.write("\nVALUE = 1\n")
+        analyzer = ProjectAnalyzer(self.project_path, cache_dir=cache_dir)
+        result = analyzer.analyze_project()
+        self.assertEqual(result.metadata.file_stats["quarantined"], [{"path": "test_module.py", "reason": "timeout"}])
+        file_node = result.code_graph_json[0].children[0]
+        self.assertEqual(file_node.children, [])
+        self.assertEqual(result.metadata.source_stats["parses"], 0)  # Not even by the graph stages
+        
+        # The fallback module reused from the cache is not parsed either
+        result = ProjectAnalyzer(self.project_path, cache_dir=cache_dir).analyze_project(
+            sections=["code_graph_json", "call_graph"])
+        self.assertEqual(result.metadata.incremental_stats["parsed_files"], 0)
+        self.assertEqual(result.metadata.source_stats["parses"], 0)
+        
+        result = analyzer.analyze_project(force_refresh=True)
+        self.assertEqual(result.metadata.file_stats["quarantined"], [])
+        self.assertEqual(analyzer.cache_manager.get_quarantined_files(self.project_path), {})
+    
+    def test_cached_json_fast_path(self):
+        """Test a cached result is written as stored and matches the rebuilt result."""
+        import io
+        (self.project_path / "pkg").mkdir()
+        (self.project_path / "pkg" / "service.py").write_text(
+            "from test_module import simple_function\n\ndef serve():\n    return simple_function()\n"
+        )
+        cache_dir = self.project_path / ".cache"
+        analyzer = ProjectAnalyzer(self.project_path, cache_dir=cache_dir)
+        
+        output = io.BytesIO()
+        self.assertIsNone(analyzer.write_cached_json(output))
+        self.assertEqual(output.getvalue(), b"")
+        
+        analyzer.analyze_project(sections=["tech_stack", "categorized_tech_stack", "code_graph_json", "module_graph"])
+        written = analyzer.write_cached_json(output)
+        rebuilt = json.loads(analyzer.analyze_project().to_json())
+        
+        fast = json.loads(output.getvalue())
+        self.assertTrue(written["success"])
+        self.assertEqual(list(fast), list(rebuilt))
+        for data in (fast, rebuilt):
+            data["metadata"].pop("timestamp")
+        self.assertEqual(fast, rebuilt)
+        
+        # Sections the cached result lacks are not served from it
+        self.assertIsNone(analyzer.write_cached_json(io.BytesIO(), ["call_graph"]))
+    
+    def test_streamed_events_rebuild_result(self):
+        """Test streamed events arrive in order and rebuild the full result."""
+        (self.project_path / "pkg").mkdir()
+        (self.project_path / "pkg" / "service.py").write_text(
+            "from test_module import simple_function\n\ndef serve():\n    return simple_function()\n"
+        )
+        cache_dir = self.project_path / ".cache"
+        
+        for _ in range(2):  # second run streams the cached result
+            events = []
+            result = ProjectAnalyzer(self.project_path, cache_dir=cache_dir).analyze_project(
+                event_callback=lambda event, data: events.append((event, data))
+            )
+            expected = json.loads(result.to_json())
+            
+            names = [event for event, _ in events]
+            self.assertEqual(names[0], "metadata")
+            self.assertEqual(names[-2:], ["tech_stack", "summary"])
+            
+            folders = {}
+            for event, data in events:
+                if event == "module":
+                    folders.setdefault(data["folder"], []).append(data["node"])
+                elif event == "folder":
+                    node = dict(data, children=folders.pop(data["name"]))
+                    self.assertEqual(node.pop("modules"), len(node["children"]))
+                    folders.setdefault("__done__", []).append(node)
+            
+            self.assertEqual(folders["__done__"], expected["code_graph_json"])
+            self.assertEqual(events[-2][1]["tech_stack"], expected["tech_stack"])
+            self.assertEqual(events[-1][1]["success"], expected["success"])
+    
     def test_analysis_result_json_serialization(self):
         """Test JSON serialization of analysis results."""
         analyzer = ProjectAnalyzer(self.project_path)
@@ -176,6 +342,31 @@ class TestDataModels(unittest.TestCase):
         self.assertFalse(func_info.is_method)
         self.assertFalse(func_info.is_async)
 
+    def test_models_are_slotted_and_interned(self):
+        """Test model instances have no __dict__ and share interned strings, also when unpickled."""
+        def function(module):
+            # Build the strings at runtime so that they are distinct objects
+            return FunctionInfo(name="".join(["f", "n"]), module=module, line_number=1,
+                                complexity=ComplexityScore(cyclomatic=2),
+                                parameters=[Parameter(name="x", type_hint="".join(["Dict[str, ", "int]"]))])
+        
+        first, second = function("".join(["pkg.", "mod"])), function("".join(["pkg.", "mod"]))
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertFalse(hasattr(first.complexity, "__dict__"))
+        self.assertIs(first.module, second.module)
+        self.assertIs(first.parameters[0].type_hint, second.parameters[0].type_hint)
+        
+        restored = pickle.loads(pickle.dumps(first, protocol=pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(restored, first)
+        self.assertIs(restored.name, first.name)
+        self.assertIs(restored.parameters[0].type_hint, first.parameters[0].type_hint)
+        
+        module = ModuleInfo(name="mod", path="mod.py", functions=[first], classes=[], imports=[],
+                            complexity=ComplexityScore(cyclomatic=2), size_lines=3)
+        serialized = json.loads(json.dumps(module, default=AnalysisResult._json_serializer))
+        self.assertEqual(serialized["functions"][0]["parameters"][0]["type_hint"], "Dict[str, int]")
+        self.assertEqual(serialized["complexity"]["level"], "low")
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the analyzer JSON-RPC server and its client.
+"""
+
+import io
+import json
+import subprocess
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from analyzer_server import (
+    AnalyzerServer, ActiveRequest, RawJSON, RequestError,
+    METHOD_NOT_FOUND, PARSE_ERROR, INVALID_PARAMS, REQUEST_CANCELLED
+)
+from analyzer_client import AnalyzerClient, AnalyzerClientError
+from performance_optimizer import AnalysisCancelledError
+
+
+class TestAnalyzerServer(unittest.TestCase):
+    """Test AnalyzerServer class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.project_path = Path(self.temp_dir.name) / "project"
+        self.project_path.mkdir()
+        self.cache_dir = Path(self.temp_dir.name) / "cache"
+        
+        (self.project_path / "main.py").write_text(
+            "from utils import helper\n"
+            "\n"
+            "def main():\n"
+            "    return helper()\n"
+        )
+        (self.project_path / "utils.py").write_text(
+            "def helper():\n"
+            "    return 1\n"
+        )
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+    
+    def _serve(self, *messages):
+        """Run a server over the given messages, then shut it down, and return responses by id."""
+        messages += ({"jsonrpc": "2.0", "id": "shutdown", "method": "shutdown"},)
+        lines = [m if isinstance(m, str) else json.dumps(m) for m in messages]
+        output = io.StringIO()
+        server = AnalyzerServer(io.StringIO("\n".join(lines) + "\n"), output, cache_dir=self.cache_dir)
+        server.serve_forever()
+        
+        responses = [json.loads(line) for line in output.getvalue().splitlines()]
+        return server, {response.get("id"): response for response in responses}
+    
+    def test_protocol_errors(self):
+        """Test malformed input and unknown methods produce JSON-RPC errors."""
+        _, responses = self._serve(
+            "{not json",
+            {"jsonrpc": "2.0", "id": 1, "method": "noSuchMethod"},
+            {"jsonrpc": "2.0", "id": 2, "method": "analyzeProject", "params": {}},
+            {"jsonrpc": "2.0", "id": 3, "method": "ping"},
+        )
+        
+        self.assertEqual(responses[None]["error"]["code"], PARSE_ERROR)
+        self.assertEqual(responses[1]["error"]["code"], METHOD_NOT_FOUND)
+        self.assertEqual(responses[2]["error"]["code"], INVALID_PARAMS)
+        self.assertEqual(responses[3]["result"], "pong")
+    
+    def test_analyzers_share_warm_state(self):
+        """Test repeated project analyses reuse one analyzer and categorizer."""
+        params = {"project_path": str(self.project_path)}
+        server, responses = self._serve(
+            {"jsonrpc": "2.0", "id": 1, "method": "analyzeProject", "params": params},
+            {"jsonrpc": "2.0", "id": 2, "method": "analyzeProject", "params": params},
+            {"jsonrpc": "2.0", "id": 3, "method": "analyzeCurrentFile",
+             "params": {"file_path": str(self.project_path / "main.py")}},
+        )
+        
+        self.assertTrue(responses[1]["result"]["success"])
+        self.assertTrue(responses[2]["result"]["success"])
+        # The second response copies the cached result into the message as stored
+        self.assertEqual(responses[2]["result"]["code_graph_json"], responses[1]["result"]["code_graph_json"])
+        self.assertEqual(responses[3]["result"]["file_name"], "main.py")
+        
+        self.assertEqual(len(server._project_analyzers), 1)
+        analyzer = next(iter(server._project_analyzers.values()))
+        self.assertEqual(analyzer.errors, [])
+    
+    def test_warm_project(self):
+        """Test a warm-up runs in the background and the next analysis waits for it."""
+        server = AnalyzerServer(io.StringIO(), io.StringIO(), cache_dir=self.cache_dir)
+        params = {"project_path": str(self.project_path), "open_files": [str(self.project_path / "main.py")]}
+        
+        started = server._handle_warm_project(params, ActiveRequest(id=1, method="warmProject"))
+        again = server._handle_warm_project(params, ActiveRequest(id=2, method="warmProject"))
+        self.assertTrue(started["started"])
+        self.assertEqual(again, {"started": False, "pid": started["pid"]})
+        self.assertEqual(server._handle_status({}, None)["warming_projects"], [str(self.project_path.resolve())])
+        
+        result = server._handle_analyze_project({"project_path": str(self.project_path)},
+                                                ActiveRequest(id=3, method="analyzeProject"))
+        process = server._warmups[str(self.project_path.resolve())]
+        self.assertEqual(process.returncode, 0)
+        # Served from the result the warm-up cached
+        self.assertIsInstance(result, RawJSON)
+        self.assertTrue(json.loads(result.text)["success"])
+        
+        with self.assertRaises(RequestError) as context:
+            server._handle_warm_project({"project_path": str(self.project_path), "open_files": "main.py"}, None)
+        self.assertEqual(context.exception.code, INVALID_PARAMS)
+    
+    def test_streamed_project_analysis(self):
+        """Test streamed analysis sends events as notifications before the response."""
+        params = {"project_path": str(self.project_path), "stream": True}
+        output = io.StringIO()
+        server = AnalyzerServer(io.StringIO(), output, cache_dir=self.cache_dir)
+        server.handle_message(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "analyzeProject",
+                                          "params": params}))
+        server._executor.shutdown(wait=True)
+        
+        messages = [json.loads(line) for line in output.getvalue().splitlines()]
+        events = [m["params"]["event"] for m in messages if m.get("method") == "analysisEvent"]
+        
+        self.assertEqual(events, ["metadata", "module", "module", "folder", "tech_stack", "summary"])
+        self.assertEqual(messages[-1]["result"], {"success": True, "streamed": True})
+    
+    def test_cancelled_project_analysis(self):
+        """Test cancellation stops a project analysis and leaves the analyzer reusable."""
+        server = AnalyzerServer(io.StringIO(), io.StringIO(), cache_dir=self.cache_dir)
+        params = {"project_path": str(self.project_path), "use_cache": False}
+        
+        request = ActiveRequest(id=1, method="analyzeProject")
+        request.cancel_event.set()
+        with self.assertRaises(AnalysisCancelledError):
+            server._handle_analyze_project(params, request)
+        
+        result = server._handle_analyze_project(params, ActiveRequest(id=2, method="analyzeProject"))
+        self.assertTrue(result["success"])
+    
+    def test_cancel_running_request(self):
+        """Test a running request can be cancelled while other requests are served."""
+        output = io.StringIO()
+        server = AnalyzerServer(io.StringIO(), output, max_concurrent_requests=1)
+        started = threading.Event()
+        
+        def blocking_handler(params, request):
+            started.set()
+            request.cancel_event.wait(10)
+            raise RequestError(REQUEST_CANCELLED, "Request cancelled")
+        
+        server._methods["block"] = (blocking_handler, True)
+        server.handle_message(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "block"}))
+        server.handle_message(json.dumps({"jsonrpc": "2.0", "id": 2, "method": "ping"}))
+        server.handle_message(json.dumps({"jsonrpc": "2.0", "id": 3, "method": "status"}))
+        self.assertTrue(started.wait(10))
+        
+        server.handle_message(json.dumps({"jsonrpc": "2.0", "method": "$/cancelRequest", "params": {"id": 1}}))
+        server._executor.shutdown(wait=True)
+        
+        responses = {r["id"]: r for r in map(json.loads, output.getvalue().splitlines())}
+        self.assertEqual(responses[1]["error"]["code"], REQUEST_CANCELLED)
+        self.assertEqual(responses[2]["result"], "pong")
+        self.assertEqual([r["method"] for r in responses[3]["result"]["active_requests"]], ["block"])
+    
+    def test_cancel_request_during_shutdown(self):
+        """Test requests are still cancelled while a shutdown waits for them."""
+        output = io.StringIO()
+        server = AnalyzerServer(io.StringIO(), output, max_concurrent_requests=1)
+        started = threading.Event()
+        
+        def blocking_handler(params, request):
+            started.set()
+            if request.cancel_event.wait(5):
+                raise RequestError(REQUEST_CANCELLED, "Request cancelled")
+            return "finished"
+        
+        server._methods["block"] = (blocking_handler, True)
+        server.handle_message(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "block"}))
+        self.assertTrue(started.wait(10))
+        server.handle_message(json.dumps({"jsonrpc": "2.0", "id": 2, "method": "shutdown"}))
+        server.handle_message(json.dumps({"jsonrpc": "2.0", "id": 3, "method": "block"}))
+        server.handle_message(json.dumps({"jsonrpc": "2.0", "id": 4, "method": "cancelRequest", "params": {"id": 1}}))
+        server._shutdown_thread.join(10)
+        
+        responses = {r["id"]: r for r in map(json.loads, output.getvalue().splitlines())}
+        self.assertEqual(responses[1]["error"]["code"], REQUEST_CANCELLED)
+        self.assertIsNone(responses[2]["result"])
+        self.assertEqual(responses[3]["error"]["message"], "Server is shutting down")
+        self.assertEqual(responses[4]["result"], {"cancelled": True})
+        self.assertFalse(server._running)
+
+
+class TestAnalyzerClient(unittest.TestCase):
+    """Test AnalyzerClient against a server subprocess."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.project_path = Path(self.temp_dir.name) / "project"
+        self.project_path.mkdir()
+        (self.project_path / "app.py").write_text(
+            "def handler(value):\n"
+            "    if value:\n"
+            "        return value\n"
+            "    return None\n"
+        )
+        cache_dir = str(Path(self.temp_dir.name) / "cache")
+        self.client = AnalyzerClient(["--cache-dir", cache_dir], stderr=subprocess.DEVNULL).start()
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.client.close()
+        self.temp_dir.cleanup()
+    
+    def test_concurrent_requests(self):
+        """Test several requests can be in flight at once."""
+        project = self.client.send_request("analyzeProject", {"project_path": str(self.project_path)})
+        current_file = self.client.send_request("analyzeCurrentFile",
+                                                {"file_path": str(self.project_path / "app.py")})
+        
+        self.assertTrue(project.result(60)["success"])
+        self.assertEqual(current_file.result(60)["file_name"], "app.py")
+        self.assertEqual(self.client.request("status", timeout=10)["warm_projects"],
+                         [str(self.project_path.resolve())])
+    
+    def test_error_response(self):
+        """Test server errors are raised as AnalyzerClientError."""
+        with self.assertRaises(AnalyzerClientError) as context:
+            self.client.request("analyzeProject", {"project_path": str(self.project_path / "missing")},
+                                timeout=10)
+        self.assertEqual(context.exception.code, INVALID_PARAMS)
+    
+    def test_shutdown(self):
+        """Test the server exits cleanly on shutdown."""
+        self.assertEqual(self.client.request("ping", timeout=10), "pong")
+        self.assertEqual(self.client.close(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -164,6 +164,10 @@ def dummy():
         pathlib_import = next(imp for imp in module_info.imports if imp.module == "pathlib")
         self.assertTrue(pathlib_import.is_from_import)
         self.assertIn("Path", pathlib_import.names)
+        
+        # Check relative imports
+        relative = [(imp.level, imp.module, imp.names) for imp in module_info.imports if imp.level]
+        self.assertEqual(relative, [(1, "", ["local_module"]), (2, "parent", ["parent_module"])])
     
     def test_parse_function_parameters(self):
         """Test parsing various function parameter types."""
@@ -239,6 +243,126 @@ def broken_function(
         # Should return None for files with syntax errors
         self.assertIsNone(module_info)
 
+    def _parse(self, test_code):
+        test_file = self.project_path / "test.py"
+        test_file.write_text(test_code)
+        return self.parser.parse_file(test_file)
+    
+    def test_structure_in_source_order(self):
+        """Test methods are parsed once and every definition is found in source order."""
+        module_info = self._parse('''
+import os
+
+class Outer:
+    @staticmethod
+    def build():
+        import json
+        def helper(self):
+            return json
+        return helper
+    
+    class Inner:
+        def method(self):
+            pass
+
+def top():
+    pass
+''')
+        
+        self.assertEqual([f.name for f in module_info.functions], ["build", "helper", "method", "top"])
+        self.assertEqual([f.is_method for f in module_info.functions], [True, False, True, False])
+        self.assertEqual([c.name for c in module_info.classes], ["Outer", "Inner"])
+        self.assertIs(module_info.classes[0].methods[0], module_info.functions[0])
+        self.assertEqual([m.name for m in module_info.classes[1].methods], ["method"])
+        self.assertEqual([i.module for i in module_info.imports], ["os", "json"])
+    
+    def test_complexity_nesting(self):
+        """Test cognitive complexity grows with nesting but not for elif chains or try blocks."""
+        module_info = self._parse('''
+def sum_of_primes(limit):
+    total = 0
+    for i in range(1, limit):
+        for j in range(2, i):
+            if i % j == 0:
+                continue
+        total += i
+    return total
+
+def branches(a, b, c):
+    if a:
+        return 1
+    elif b:
+        return 2
+    else:
+        if c:
+            return 3
+    try:
+        if a and b and (c and a):
+            pass
+    except ValueError:
+        return [x for x in c if x]
+    finally:
+        pass
+    return a or b and c
+
+def outer(items):
+    def inner(item):
+        return item if item else None
+    return list(map(lambda item: item if item else 0, items))
+''')
+        
+        scores = {f.name: (f.complexity.cyclomatic, f.complexity.cognitive) for f in module_info.functions}
+        self.assertEqual(scores["sum_of_primes"], (4, 6))
+        # if/elif/else +3, nested if +2, if in try +1, one and-sequence +1, except +1,
+        # comprehension +2, and the final or/and +2
+        self.assertEqual(scores["branches"], (13, 12))
+        self.assertEqual(scores["inner"], (2, 1))
+        self.assertEqual(scores["outer"], (2, 2))  # The conditional expression nests in the lambda
+    
+    def test_complexity_recursion(self):
+        """Test direct recursive calls add to cognitive complexity and straight code scores zero."""
+        module_info = self._parse('''
+def factorial(n):
+    if n <= 1:
+        return 1
+    return n * factorial(n - 1)
+
+class Tree:
+    def size(self, node):
+        return 1 + sum(self.size(child) for child in node.children)
+    
+    def factorial(self, n):
+        return factorial(n)
+
+def straight(x):
+    return x + 1
+''')
+        
+        scores = {f.name: f.complexity.cognitive for f in module_info.functions}
+        self.assertEqual(scores["size"], 2)  # Comprehension +1, recursion +1
+        self.assertEqual(module_info.functions[0].complexity.cognitive, 2)  # if +1, recursion +1
+        self.assertEqual(module_info.functions[2].complexity.cognitive, 0)  # Calls the function, not itself
+        self.assertEqual(scores["straight"], 0)
+        self.assertEqual(module_info.complexity.cognitive, 4)
+    
+    def test_score_function(self):
+        """Test a single function is scored like in a parsed module."""
+        import ast
+        from ast_parser import score_function
+        
+        tree = ast.parse("def walk(node, seen):\n"
+                         "    if node in seen or not node:\n"
+                         "        return\n"
+                         "    for child in node:\n"
+                         "        walk(child, seen)\n")
+        self.assertEqual(score_function(tree.body[0]), (4, 4))
+        self.assertEqual(score_function(tree.body[0], is_method=True), (4, 3))
+    
+    def test_deeply_nested_expressions(self):
+        """Test deeply nested expressions do not exhaust the recursion limit."""
+        module_info = self._parse("def total():\n    return " + " + ".join(["1"] * 2000) + "\n")
+        self.assertEqual(module_info.functions[0].complexity.cyclomatic, 1)
+
 
 class TestModuleDiscovery(unittest.TestCase):
     """Test cases for module discovery functionality."""
@@ -311,9 +435,61 @@ def func2():
         self.assertEqual(len(dependencies["module1"]), 0)  # No dependencies
         self.assertIn("module1", dependencies["module2"])  # Depends on module1
     
+    def test_analyze_modules_parallel(self):
+        """Test worker processes match serial parsing and keep file order."""
+        from complexity_analyzer import ComplexityAnalyzer
+        from performance_optimizer import PerformanceConfig, ParallelProcessor
+        
+        python_files = []
+        for i in range(12):
+            python_files.append(self._create_test_file(f"module{i:02d}.py", f'''
+def func{i}(x):
+    if x > {i}:
+        return x
+    return 0
+'''))
+        # A file that fails to parse is dropped, as in the serial path
+        python_files.insert(5, self._create_test_file("broken.py", "def broken(:\n"))
+        
+        processor = ParallelProcessor(PerformanceConfig(max_workers=2, chunk_size=3))
+        self.assertTrue(processor.should_process_parallel(len(python_files)))
+        modules = self.discovery.analyze_modules_parallel(python_files, processor)
+        
+        complexity_analyzer = ComplexityAnalyzer()
+        expected = [complexity_analyzer.enhance_module_complexity(m)
+                    for m in self.discovery.discover_modules(python_files)]
+        
+        self.assertEqual([m.name for m in modules], [f"module{i:02d}" for i in range(12)])
+        self.assertEqual(modules, expected)
+    
+    def test_qualified_names_and_relative_dependencies(self):
+        """Test same-named files keep distinct names and relative imports are resolved."""
+        python_files = [
+            self._create_test_file("blog/__init__.py", "from . import views\n"),
+            self._create_test_file("blog/models.py", "class Post:\n    pass\n"),
+            self._create_test_file("blog/views.py", "from .models import Post\nfrom shop import models\n"),
+            self._create_test_file("shop/__init__.py", ""),
+            self._create_test_file("shop/models.py", "from ..blog import models\n"),
+            self._create_test_file("src/core/__init__.py", ""),
+            self._create_test_file("src/core/engine.py", "import blog.models\nfrom core import __version__\n"),
+        ]
+        
+        modules = self.discovery.discover_modules(python_files)
+        self.assertEqual([m.name for m in modules], [
+            "blog", "blog.models", "blog.views", "shop", "shop.models", "core", "core.engine"
+        ])
+        
+        dependencies = self.discovery.resolve_dependencies(modules)
+        self.assertEqual(dependencies["blog"], {"blog.views"})
+        self.assertEqual(dependencies["blog.models"], set())
+        self.assertEqual(dependencies["blog.views"], {"blog.models", "shop.models"})
+        self.assertEqual(dependencies["shop.models"], set())  # Reaches above the project
+        self.assertEqual(dependencies["core.engine"], {"blog.models", "core"})
+    
     def _create_test_file(self, filename: str, content: str) -> Path:
         """Create a test file with given content."""
         file_path = self.project_path / filename
+        file_path.parent.mkdir(parents=True, exist_ok=True)
         file_path.write_text(content)
         return file_path
 
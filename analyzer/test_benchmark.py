@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the benchmark harness and synthetic project generator.
+"""
+
+import ast
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmark import (
+    SyntheticProjectConfig, SyntheticProjectGenerator, best_of, check_regressions,
+    generate_large_module, make_baseline, model_size, run_analysis, run_memory_benchmark,
+    run_parser_benchmark
+)
+
+
+def _tree_digest(root: Path) -> str:
+    """Hash the names and contents of every file under root."""
+    digest = hashlib.sha256()
+    for path in sorted(root.rglob("*")):
+        if path.is_file():
+            digest.update(str(path.relative_to(root)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class TestSyntheticProjectGenerator(unittest.TestCase):
+    """Test SyntheticProjectGenerator class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.config = SyntheticProjectConfig(modules=30, modules_per_package=10, seed=7)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+    
+    def test_generation_is_deterministic(self):
+        """Test the same configuration produces identical projects and a new seed does not."""
+        SyntheticProjectGenerator(self.config).generate(self.root / "a")
+        SyntheticProjectGenerator(self.config).generate(self.root / "b")
+        self.config.seed = 8
+        SyntheticProjectGenerator(self.config).generate(self.root / "c")
+        
+        self.assertEqual(_tree_digest(self.root / "a"), _tree_digest(self.root / "b"))
+        self.assertNotEqual(_tree_digest(self.root / "a"), _tree_digest(self.root / "c"))
+    
+    def test_generated_project_shape(self):
+        """Test modules are valid Python with the configured shape and acyclic imports."""
+        paths = SyntheticProjectGenerator(self.config).generate(self.root)
+        
+        self.assertEqual(len(paths), 30)
+        self.assertEqual(len(list(self.root.glob("pkg_*/__init__.py"))), 3)
+        self.assertTrue((self.root / "requirements.txt").exists())
+        
+        for index, path in enumerate(paths):
+            tree = ast.parse(path.read_text())
+            classes = [node for node in tree.body if isinstance(node, ast.ClassDef)]
+            functions = [node for node in tree.body if isinstance(node, ast.FunctionDef)]
+            self.assertEqual(len(classes), self.config.classes_per_module)
+            self.assertEqual(len(functions), self.config.functions_per_module)
+            
+            for node in tree.body:
+                if isinstance(node, ast.ImportFrom):
+                    imported_index = int(node.names[0].name.split("_")[1])
+                    self.assertLess(imported_index, index)
+    
+    def test_analyze_generated_project(self):
+        """Test the harness records per-stage timings for a generated project."""
+        SyntheticProjectGenerator(SyntheticProjectConfig(modules=12)).generate(self.root)
+        
+        result = run_analysis(self.root, max_workers=1)
+        
+        self.assertTrue(result["success"])
+        self.assertEqual(result["analyzed_files"], 13)  # Modules plus the package __init__
+        self.assertIn("modules", result["stages"])
+        self.assertIsNotNone(result["stages"]["call_graph"]["cpu_time"])
+        self.assertGreater(result["wall_time"], 0)
+
+    def test_parser_benchmark(self):
+        """Test the parser benchmark times parsing and extraction of a large module apart."""
+        module_path = generate_large_module(self.root / "large.py", "1k")
+        
+        result = run_parser_benchmark(module_path, repeat=1)
+        
+        self.assertTrue(result["success"])
+        self.assertEqual(result["functions"], 1000)
+        self.assertEqual(set(result["stages"]), {"parse", "extract"})
+        self.assertGreater(result["stages"]["extract"]["cpu_time"], 0)
+        self.assertEqual(check_regressions({"parser-1k": result}, make_baseline({"parser-1k": result})), [])
+    
+    def test_memory_benchmark(self):
+        """Test the memory benchmark measures the model of every module."""
+        SyntheticProjectGenerator(SyntheticProjectConfig(modules=12)).generate(self.root)
+        
+        result = run_memory_benchmark(self.root)
+        
+        self.assertTrue(result["success"])
+        self.assertEqual(result["analyzed_files"], 13)
+        self.assertEqual(result["functions"], 12 * (5 + 2 * 4))  # Methods include __init__
+        self.assertGreater(result["model_mb"], 0)
+        self.assertGreater(result["pickle_mb"], 0)
+        self.assertEqual(check_regressions({"memory-12": result}, make_baseline({"memory-12": result})), [])
+    
+    def test_model_size_counts_shared_objects_once(self):
+        """Test objects reachable twice are counted once."""
+        shared = ["x" * 1000]
+        self.assertEqual(model_size([shared, shared]), model_size([shared]) + 8)
+
+
+class TestRegressionCheck(unittest.TestCase):
+    """Test baseline comparison."""
+    
+    def _result(self, wall_time, parse_cpu, peak=100.0):
+        return {"wall_time": wall_time, "peak_rss_mb": peak,
+                "stages": {"modules": {"duration": parse_cpu, "cpu_time": parse_cpu, "peak_rss_delta_mb": 1.0}}}
+    
+    def test_regressions(self):
+        """Test regressions beyond the tolerance and noise floor are reported."""
+        baseline = make_baseline({"synthetic-100": self._result(2.0, 1.5)})
+        
+        self.assertEqual(check_regressions({"synthetic-100": self._result(2.2, 1.6)}, baseline), [])
+        self.assertEqual(check_regressions({"other": self._result(9.0, 9.0)}, baseline), [])
+        
+        regressions = check_regressions({"synthetic-100": self._result(3.0, 2.5, peak=200.0)}, baseline)
+        self.assertEqual(len(regressions), 3)
+        self.assertTrue(regressions[0].startswith("synthetic-100 wall time"))
+    
+    def test_noise_floor(self):
+        """Test large relative changes of tiny figures are ignored."""
+        baseline = make_baseline({"tiny": self._result(0.01, 0.001)})
+        self.assertEqual(check_regressions({"tiny": self._result(0.03, 0.01)}, baseline), [])
+    
+    def test_best_of(self):
+        """Test repeated runs keep the fastest run and the lowest stage times."""
+        best = best_of([self._result(2.0, 1.0, peak=120.0), self._result(1.5, 1.2, peak=110.0)])
+        
+        self.assertEqual(best["wall_time"], 1.5)
+        self.assertEqual(best["stages"]["modules"]["cpu_time"], 1.0)
+        self.assertEqual(best["peak_rss_mb"], 110.0)
+        self.assertEqual(best["runs"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
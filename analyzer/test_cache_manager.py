@@ -10,7 +10,9 @@ import unittest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from cache_manager import CacheManager, CacheEntry, IncrementalAnalyzer
+import cache_history as cache_manager_history
+import cache_manager
+from cache_manager import BundleError, CacheManager, CacheEntry, IncrementalAnalyzer, ModuleRecord
 
 
 class TestCacheEntry(unittest.TestCase):
@@ -102,7 +104,7 @@ class TestCacheManager(unittest.TestCase):
         
         # Same file should generate same hash
         self.assertEqual(hash1, hash2)
-        self.assertEqual(len(hash1), 32)  # MD5 hash length
+        self.assertEqual(len(hash1), 40)  # Git blob id (SHA-1) length
         
         # Modify file and check hash changes
         test_file.write_text("print('modified')")
@@ -121,7 +123,7 @@ class TestCacheManager(unittest.TestCase):
         # All hashes should be non-empty
         for file_path, file_hash in hashes.items():
             self.assertTrue(file_hash)
-            self.assertEqual(len(file_hash), 32)
+            self.assertEqual(len(file_hash), 40)
     
     def test_cache_and_retrieve_result(self):
         """Test caching and retrieving analysis results."""
@@ -248,6 +250,128 @@ class TestCacheManager(unittest.TestCase):
         # Verify cache is invalidated
         cached_result = self.cache_manager.get_cached_result(self.project_dir)
         self.assertIsNone(cached_result)
+    
+    def test_load_requested_sections_and_modules(self):
+        """Test a cache hit can load only some sections or modules of the result."""
+        module_path = str(self.project_dir / "main.py")
+        result = {
+            "success": True, "errors": [], "warnings": [], "metadata": {"sections": ["tech_stack"]},
+            "tech_stack": {"frameworks": []}, "module_cards": [{"id": "main"}],
+            "code_graph_json": [{"name": "root", "type": "folder", "calls": [], "children": [
+                {"name": "main.py", "type": "file", "path": module_path, "calls": [], "children": []}
+            ]}]
+        }
+        self.cache_manager.cache_result(self.project_dir, result)
+        
+        cached = self.cache_manager.get_cached_result(self.project_dir, sections=["tech_stack"])
+        self.assertEqual(sorted(cached), ["errors", "metadata", "success", "tech_stack", "warnings"])
+        
+        modules = self.cache_manager.get_cached_modules(self.project_dir, [module_path])
+        self.assertEqual(modules[module_path]["name"], "main.py")
+        
+        (self.project_dir / "main.py").write_text("print('changed')")
+        self.assertIsNone(self.cache_manager.get_cached_modules(self.project_dir, [module_path]))
+    
+    def test_branch_switch_reuses_result(self):
+        """Test a result cached for earlier file contents is found again after switching back."""
+        self.cache_manager.cache_result(self.project_dir, {"branch": "main"})
+        
+        (self.project_dir / "utils.py").write_text("def helper(): return 'feature'")
+        self.assertIsNone(self.cache_manager.get_cached_result(self.project_dir))
+        self.cache_manager.cache_result(self.project_dir, {"branch": "feature"})
+        
+        (self.project_dir / "utils.py").write_text("def helper(): pass")
+        self.assertEqual(self.cache_manager.get_cached_result(self.project_dir), {"branch": "main"})
+        self.assertEqual(self.cache_manager.get_cache_stats()["total_entries"], 2)
+    
+    def test_concurrent_managers_share_cache(self):
+        """Test managers of parallel runs see each other's results and keep them for invalidation."""
+        other = CacheManager(self.cache_dir)
+        self.cache_manager.cache_result(self.project_dir, {"branch": "main"})
+        self.assertEqual(other.get_cached_result(self.project_dir), {"branch": "main"})
+        
+        (self.project_dir / "utils.py").write_text("def helper(): return 'feature'")
+        other.cache_result(self.project_dir, {"branch": "feature"})
+        (self.project_dir / "utils.py").write_text("def helper(): pass")
+        self.cache_manager.cache_result(self.project_dir, {"branch": "main"})
+        
+        CacheManager(self.cache_dir).invalidate_project_cache(self.project_dir)
+        other.store.refresh()
+        self.assertEqual(other.get_cache_stats()["total_entries"], 0)
+    
+    def test_cache_report(self):
+        """Test lookups are recorded with the reasons of misses and the files invalidating results."""
+        self.assertIsNone(self.cache_manager.get_cached_result(self.project_dir))
+        self.assertIsNone(self.cache_manager.get_cached_result(self.project_dir))  # Recorded once
+        self.cache_manager.cache_result(self.project_dir, {"metadata": {"analysis_time": 5.0}})
+        self.assertIsNotNone(self.cache_manager.get_cached_result(self.project_dir))
+        
+        (self.project_dir / "utils.py").write_text("def helper(): return 1")
+        self.assertIsNone(self.cache_manager.get_cached_result(self.project_dir))
+        self.cache_manager.cache_result(self.project_dir, {"metadata": {"analysis_time": 2.0, "sections": ["tech_stack"]}})
+        self.assertIsNone(self.cache_manager.get_cached_result(self.project_dir, sections=["call_graph"]))
+        
+        for key in list(self.cache_manager.metadata["entries"]):
+            self.cache_manager.store.remove(key)
+        self.cache_manager.store.flush()
+        self.assertIsNone(CacheManager(self.cache_dir).get_cached_result(self.project_dir))
+        
+        report = CacheManager(self.cache_dir).get_cache_report(self.project_dir)
+        self.assertEqual((report["lookups"], report["hits"], report["misses"], report["invalidated"]), (5, 1, 3, 1))
+        self.assertEqual(report["hit_rate"], 0.2)
+        self.assertEqual(report["reasons"], {"no_result": 1, "files_changed": 1, "missing_sections": 1, "evicted": 1})
+        self.assertEqual(report["top_invalidating_files"], [["utils.py", 1]])
+        self.assertGreater(report["time_saved"], 4.0)
+        self.assertEqual([record["outcome"] for record in report["recent"]], ["miss", "miss", "invalidated", "hit", "miss"])
+        self.assertEqual(report["recent"][2]["changed_count"], 1)
+        self.assertIn("total_size_mb", report["cache"])
+    
+    def test_cache_history_is_trimmed(self):
+        """Test the lookup history keeps the most recent records."""
+        with patch.multiple(cache_manager_history, HISTORY_SIZE=10, HISTORY_MAX_BYTES=1000):
+            for i in range(30):
+                self.cache_manager._record_lookup(self.project_dir, "key", "hit", float(i))
+            
+            history = self.cache_manager._get_history(self.project_dir)
+            self.assertLessEqual(history.path.stat().st_size, 1000)
+            records = history.read()
+        
+        self.assertEqual(len(records), 10)
+        self.assertEqual(records[-1]["time"], 29.0)
+    
+    def test_quarantined_files(self):
+        """Test the quarantine is kept in the project manifest and cleared with the project."""
+        self.assertEqual(self.cache_manager.get_quarantined_files(self.project_dir), {})
+        quarantine = {"utils.py": {"reason": "timeout", "time": 1.0}}
+        self.cache_manager.set_quarantined_files(self.project_dir, quarantine)
+        self.assertEqual(CacheManager(self.cache_dir).get_quarantined_files(self.project_dir), quarantine)
+        
+        CacheManager(self.cache_dir).invalidate_project_cache(self.project_dir)
+        self.assertEqual(CacheManager(self.cache_dir).get_quarantined_files(self.project_dir), {})
+    
+    def test_cache_hit_does_not_rewrite_index(self):
+        """Test cache hits do not rewrite the index."""
+        self.cache_manager.cache_result(self.project_dir, {"test": "data"})
+        index_file = self.cache_dir / "index.json"
+        written = index_file.read_bytes()
+        index_file.touch()
+        mtime = index_file.stat().st_mtime_ns
+        
+        for _ in range(3):
+            self.assertIsNotNone(self.cache_manager.get_cached_result(self.project_dir))
+        
+        self.assertEqual(index_file.stat().st_mtime_ns, mtime)
+        self.assertEqual(index_file.read_bytes(), written)
+    
+    def test_removes_legacy_cache_files(self):
+        """Test files of the previous cache format are removed."""
+        (self.cache_dir / "cache_metadata.json").write_text("{}")
+        (self.cache_dir / ("a" * 32 + ".json")).write_text("{}")
+        (self.cache_dir / ("b" * 32 + ".modules.pkl")).write_bytes(b"")
+        
+        CacheManager(self.cache_dir)
+        
+        self.assertEqual(sorted(path.name for path in self.cache_dir.iterdir()), ["index.json", "journal.log", "lock", "objects", "projects"])
 
 
 class TestIncrementalAnalyzer(unittest.TestCase):
@@ -345,6 +469,164 @@ class TestIncrementalAnalyzer(unittest.TestCase):
         
         should_use = self.incremental_analyzer.should_use_incremental_analysis(changed_files, total_files)
         self.assertFalse(should_use)
+    
+    def test_module_records_roundtrip(self):
+        """Test saving and loading per-module records."""
+        records = {"main.py": ModuleRecord("hash1", {"name": "main"}, [("main.f", ("main.g",), 3)], [])}
+        
+        self.assertEqual(self.incremental_analyzer.load_module_records(self.project_dir), {})
+        self.assertTrue(self.incremental_analyzer.save_module_records(self.project_dir, records))
+        
+        loaded = self.incremental_analyzer.load_module_records(self.project_dir)
+        self.assertEqual(loaded["main.py"].file_hash, "hash1")
+        self.assertEqual(loaded["main.py"].module, {"name": "main"})
+        self.assertEqual(loaded["main.py"].call_sites, [("main.f", ("main.g",), 3)])
+        
+        # Invalidation and clearing remove the records
+        self.cache_manager.invalidate_project_cache(self.project_dir)
+        self.assertEqual(self.incremental_analyzer.load_module_records(self.project_dir), {})
+    
+    def test_plan_incremental_run(self):
+        """Test only changed files are scheduled for parsing."""
+        python_files = [self.project_dir / "main.py", self.project_dir / "utils.py"]
+        
+        # Nothing to reuse before the first run
+        self.assertIsNone(self.incremental_analyzer.plan_incremental_run(self.project_dir, python_files))
+        
+        hashes = self.cache_manager._get_project_file_hashes(self.project_dir)
+        records = {
+            rel_path: ModuleRecord(hashes[rel_path], _PathModule(str(self.project_dir / rel_path)), [], [])
+            for rel_path in ("main.py", "utils.py")
+        }
+        self.incremental_analyzer.save_module_records(self.project_dir, records)
+        
+        time.sleep(0.1)  # Ensure different timestamp
+        (self.project_dir / "utils.py").write_text("def helper(): return 1")
+        
+        # One of two files changed is above the 20% threshold
+        self.assertIsNone(self.incremental_analyzer.plan_incremental_run(self.project_dir, python_files))
+        
+        for i in range(10):
+            extra = self.project_dir / f"extra_{i}.py"
+            extra.write_text("x = 1")
+            python_files.append(extra)
+            records[extra.name] = ModuleRecord(
+                self.cache_manager._get_file_hash(extra), _PathModule(str(extra)), [], []
+            )
+        self.incremental_analyzer.save_module_records(self.project_dir, records)
+        
+        plan = self.incremental_analyzer.plan_incremental_run(self.project_dir, python_files)
+        self.assertEqual(plan.changed_files, {"utils.py"})
+        self.assertEqual(plan.files_to_parse, [self.project_dir / "utils.py"])
+        self.assertEqual(len(plan.reused), 11)
+        self.assertNotIn(str(self.project_dir / "utils.py"), plan.reused)
+    
+    def test_plan_reuses_modules_of_other_branches_and_projects(self):
+        """Test module artifacts are found by content, whichever run stored them."""
+        python_files = [self.project_dir / "main.py", self.project_dir / "utils.py"]
+        hashes = self.cache_manager._get_project_file_hashes(self.project_dir)
+        self.incremental_analyzer.save_module_records(self.project_dir, {
+            rel_path: ModuleRecord(hashes[rel_path], _PathModule(str(self.project_dir / rel_path)), [], [])
+            for rel_path in ("main.py", "utils.py")
+        })
+        
+        # Another branch changes utils.py, analyzed in full
+        (self.project_dir / "utils.py").write_text("def helper(): return 2")
+        self.assertIsNone(self.incremental_analyzer.plan_incremental_run(self.project_dir, python_files))
+        
+        # Switching back reuses every module
+        (self.project_dir / "utils.py").write_text("def helper(): pass")
+        plan = self.incremental_analyzer.plan_incremental_run(self.project_dir, python_files)
+        self.assertEqual(plan.files_to_parse, [])
+        self.assertEqual(len(plan.reused), 2)
+        
+        # A checkout of the same files elsewhere reuses them with its own paths
+        other_dir = Path(self.temp_dir) / "other_checkout"
+        other_dir.mkdir()
+        for rel_path in ("main.py", "utils.py"):
+            (other_dir / rel_path).write_bytes((self.project_dir / rel_path).read_bytes())
+        other_files = [other_dir / "main.py", other_dir / "utils.py"]
+        
+        plan = self.incremental_analyzer.plan_incremental_run(other_dir, other_files)
+        self.assertEqual(plan.files_to_parse, [])
+        self.assertEqual(sorted(plan.reused), sorted(str(path) for path in other_files))
+        self.assertEqual(plan.reused[str(other_dir / "main.py")].module.path, str(other_dir / "main.py"))
+    
+    def test_bundle_seeds_another_cache(self):
+        """Test a bundle exported from one cache lets another checkout reuse the modules."""
+        python_files = [self.project_dir / "main.py", self.project_dir / "utils.py"]
+        hashes = self.cache_manager._get_project_file_hashes(self.project_dir)
+        self.incremental_analyzer.save_module_records(self.project_dir, {
+            rel_path: ModuleRecord(hashes[rel_path], _PathModule(str(self.project_dir / rel_path)), [], [])
+            for rel_path in ("main.py", "utils.py")
+        })
+        bundle_path = Path(self.temp_dir) / "ci.bundle"
+        self.assertEqual(self.cache_manager.export_bundle(self.project_dir, bundle_path)["modules"], 2)
+        
+        # A developer's clone with one file changed, and an empty cache
+        clone_dir = Path(self.temp_dir) / "clone"
+        clone_dir.mkdir()
+        (clone_dir / "main.py").write_bytes((self.project_dir / "main.py").read_bytes())
+        (clone_dir / "utils.py").write_text("def helper(): return 2")
+        local = CacheManager(Path(self.temp_dir) / "local_cache")
+        
+        stats = local.import_bundle(bundle_path)
+        self.assertEqual(stats, {"modules": 2, "imported": 2, "cached": 0, "corrupt": 0})
+        self.assertEqual(local.import_bundle(bundle_path)["cached"], 2)
+        
+        with patch.object(IncrementalAnalyzer, "should_use_incremental_analysis", return_value=True):
+            plan = IncrementalAnalyzer(local).plan_incremental_run(
+                clone_dir, [clone_dir / "main.py", clone_dir / "utils.py"])
+        self.assertEqual(plan.files_to_parse, [clone_dir / "utils.py"])
+        self.assertEqual(list(plan.reused), [str(clone_dir / "main.py")])
+    
+    def test_bundle_checks(self):
+        """Test bundles of other analyzer versions, corrupt entries and empty exports are rejected."""
+        hashes = self.cache_manager._get_project_file_hashes(self.project_dir)
+        self.incremental_analyzer.save_module_records(
+            self.project_dir, {"main.py": ModuleRecord(hashes["main.py"], {"name": "main"}, [], [])}
+        )
+        bundle_path = Path(self.temp_dir) / "ci.bundle"
+        self.cache_manager.export_bundle(self.project_dir, bundle_path)
+        
+        with patch.object(cache_manager, "ANALYZER_VERSION", "9.9.9"):
+            with self.assertRaises(BundleError):
+                CacheManager(Path(self.temp_dir) / "other").import_bundle(bundle_path)
+        with self.assertRaises(BundleError):
+            self.cache_manager.import_bundle(self.project_dir / "main.py")
+        with self.assertRaises(BundleError):
+            self.cache_manager.export_bundle(Path(self.temp_dir), Path(self.temp_dir) / "empty.bundle")
+        self.assertFalse((Path(self.temp_dir) / "empty.bundle").exists())
+        
+        import zipfile
+        tampered_path = Path(self.temp_dir) / "tampered.bundle"
+        with zipfile.ZipFile(bundle_path) as bundle, zipfile.ZipFile(tampered_path, "w") as tampered:
+            for name in bundle.namelist():
+                data = bundle.read(name)
+                tampered.writestr(name, data if name == "manifest.json" else data[:-1] + b"x")
+        stats = CacheManager(Path(self.temp_dir) / "fresh").import_bundle(tampered_path)
+        self.assertEqual((stats["imported"], stats["corrupt"]), (0, 1))
+    
+    def test_partial_records_are_completed(self):
+        """Test a stored record without call data is replaced once a run records it."""
+        store = self.cache_manager.store
+        self.incremental_analyzer.save_module_records(
+            self.project_dir, {"main.py": ModuleRecord("hash1", {"name": "main"}, None, None)}
+        )
+        self.incremental_analyzer.save_module_records(
+            self.project_dir, {"main.py": ModuleRecord("hash1", {"name": "main"}, [], [])}
+        )
+        
+        key = self.cache_manager._get_module_key("main.py", "hash1")
+        self.assertEqual(store.index["entries"][key]["kind"], "module")
+        self.assertEqual(self.incremental_analyzer.load_module_records(self.project_dir)["main.py"].call_sites, [])
+
+
+class _PathModule:
+    """Picklable stand-in for ModuleInfo."""
+    
+    def __init__(self, path):
+        self.path = path
 
 
 if __name__ == "__main__":
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the binary cache pack format.
+"""
+
+import unittest
+import zlib
+from unittest.mock import patch
+
+import cache_pack
+from cache_pack import HEADER, PACK_MAGIC, PackFormatError, PackReader, write_pack
+
+
+def _file_node(path: str) -> dict:
+    return {"name": path.rsplit("/", 1)[-1], "type": "file", "path": path, "calls": [],
+            "children": [{"name": "f", "type": "function", "children": [], "calls": []}]}
+
+
+RESULT = {
+    "success": True,
+    "errors": [],
+    "metadata": {"project_path": "/p", "sections": ["tech_stack", "code_graph_json"]},
+    "tech_stack": {"libraries": [], "frameworks": ["flask"]},
+    "code_graph_json": [{
+        "name": "root", "type": "folder", "calls": [],
+        "children": [_file_node("/p/a.py"), {"name": "pkg", "type": "folder", "calls": [],
+                                             "children": [_file_node("/p/pkg/b.py")]}]
+    }],
+    "schema_version": "1.0"
+}
+
+
+class TestCachePack(unittest.TestCase):
+    """Test write_pack and PackReader."""
+    
+    def test_roundtrip(self):
+        """Test a packed result decodes to the original dictionary in key order."""
+        reader = PackReader(write_pack(RESULT, meta={"fingerprint": "abc"}))
+        
+        self.assertEqual(reader.load(), RESULT)
+        self.assertEqual(list(reader.load()), list(RESULT))
+        self.assertEqual(reader.meta, {"fingerprint": "abc"})
+    
+    def test_load_decodes_only_requested_keys(self):
+        """Test loading some keys leaves the other segments compressed."""
+        reader = PackReader(write_pack(RESULT))
+        
+        with patch.object(cache_pack.zlib, "decompress", wraps=zlib.decompress) as decompress:
+            partial = reader.load(["success", "tech_stack", "missing"])
+        
+        self.assertEqual(partial, {"success": True, "tech_stack": RESULT["tech_stack"]})
+        self.assertEqual(decompress.call_count, 2)
+    
+    def test_get_modules(self):
+        """Test single modules are decoded from their own segments."""
+        reader = PackReader(write_pack(RESULT))
+        
+        self.assertEqual(sorted(reader.module_paths()), ["/p/a.py", "/p/pkg/b.py"])
+        with patch.object(cache_pack.zlib, "decompress", wraps=zlib.decompress) as decompress:
+            modules = reader.get_modules(["/p/pkg/b.py", "/p/unknown.py"])
+        
+        self.assertEqual(modules, {"/p/pkg/b.py": _file_node("/p/pkg/b.py")})
+        self.assertEqual(decompress.call_count, 1)
+    
+    def test_write_json(self):
+        """Test segments are written as JSON without being decoded."""
+        import json
+        reader = PackReader(write_pack(RESULT))
+        chunks = []
+        
+        with patch.object(cache_pack.json, "loads", wraps=json.loads) as loads:
+            reader.write_json(chunks.append, ["success", "metadata", "code_graph_json"], {"metadata": {"x": 1}})
+        
+        self.assertEqual(json.loads(b"".join(chunks)),
+                         {"success": True, "metadata": {"x": 1}, "code_graph_json": RESULT["code_graph_json"]})
+        self.assertEqual(loads.call_count, 1)  # Only the code graph skeleton
+        
+        chunks.clear()
+        reader.write_json(chunks.append)
+        self.assertEqual(b"".join(chunks), json.dumps(RESULT, separators=(',', ':')).encode())
+    
+    def test_invalid_data(self):
+        """Test data that is not a readable pack is rejected."""
+        data = write_pack(RESULT)
+        
+        with self.assertRaises(PackFormatError):
+            PackReader(b'{"data": {}}')
+        with self.assertRaises(PackFormatError):
+            PackReader(data[:len(data) // 2])
+        with self.assertRaises(PackFormatError):
+            PackReader(HEADER.pack(PACK_MAGIC, 99, 0, HEADER.size, 0))
+        
+        corrupt = bytearray(data)
+        corrupt[HEADER.size:HEADER.size + 4] = b"\0\0\0\0"
+        with self.assertRaises(PackFormatError):
+            PackReader(bytes(corrupt)).get("success")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit tests for background cache warming.
+"""
+
+import io
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from analyzer import ProjectAnalyzer
+from cache_warmer import CacheWarmer
+from current_file_analyzer import CurrentFileAnalyzer
+
+HAS_GIT = shutil.which("git") is not None
+
+
+class TestCacheWarmer(unittest.TestCase):
+    """Test CacheWarmer class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.project_path = Path(self.temp_dir.name) / "project"
+        self.project_path.mkdir()
+        self.cache_dir = Path(self.temp_dir.name) / "cache"
+        
+        (self.project_path / "main.py").write_text("from utils import helper\n\ndef main():\n    return helper()\n")
+        (self.project_path / "utils.py").write_text("def helper():\n    return 1\n")
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+    
+    def _analyzer(self):
+        return ProjectAnalyzer(self.project_path, cache_dir=self.cache_dir)
+    
+    def test_warm_makes_first_analysis_a_cache_hit(self):
+        """Test the project and open files are analyzed once and then served from the cache."""
+        open_file = self.project_path / "main.py"
+        stats = self._analyzer().warm_cache(open_files=[str(open_file)])
+        
+        self.assertEqual(stats["project"], "analyzed")
+        self.assertEqual(stats["files"], 1)
+        self.assertEqual(stats["files_cached"], 0)
+        
+        analyzer = self._analyzer()
+        self.assertIsNotNone(analyzer.write_cached_json(io.BytesIO()))
+        file_analyzer = CurrentFileAnalyzer(self.project_path, analyzer.cache_manager)
+        self.assertTrue(file_analyzer.analyze_file(open_file).success)
+        self.assertEqual(file_analyzer.cache_hits, 1)
+        
+        again = self._analyzer().warm_cache(open_files=[str(open_file)])
+        self.assertEqual(again["project"], "cached")
+        self.assertEqual(again["files_cached"], 1)
+    
+    @unittest.skipUnless(HAS_GIT, "git is not installed")
+    def test_recently_changed_files(self):
+        """Test files changed in the work tree and recent commits are warmed too."""
+        git = ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com"]
+        subprocess.run(git + ["init", "-q"], cwd=self.project_path, check=True)
+        subprocess.run(git + ["add", "."], cwd=self.project_path, check=True)
+        subprocess.run(git + ["commit", "-q", "-m", "initial"], cwd=self.project_path, check=True)
+        (self.project_path / "notes.txt").write_text("not python\n")
+        (self.project_path / "new.py").write_text("x = 1\n")
+        
+        warmer = CacheWarmer(self._analyzer())
+        self.assertEqual([path.name for path in warmer.get_recent_files()], ["new.py", "main.py", "utils.py"])
+        self.assertEqual([path.name for path in warmer.get_recent_files(limit=1)], ["new.py"])
+        
+        stats = warmer.warm(open_files=[str(self.project_path / "main.py")])
+        self.assertEqual(stats["files"], 3)
+    
+    def test_warm_requires_cache(self):
+        """Test warming is refused without a cache."""
+        analyzer = ProjectAnalyzer(self.project_path, use_cache=False)
+        self.assertIsNone(analyzer.warm_cache())
+        with self.assertRaises(ValueError):
+            CacheWarmer(analyzer).warm()
+    
+    def test_lower_priority(self):
+        """Test the warm-up lowers its priority where the platform allows it."""
+        from cache_warmer import WARMUP_NICENESS, lower_priority
+        with patch("os.nice", create=True) as nice:
+            lower_priority()
+        nice.assert_called_once_with(WARMUP_NICENESS)
+        with patch("os.nice", create=True, side_effect=PermissionError):
+            lower_priority()
+
+
+if __name__ == '__main__':
+    unittest.main()
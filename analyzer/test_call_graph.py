@@ -194,6 +194,36 @@ class TestCallExtractorVisitor:
         assert "P" in self.visitor.imports
         assert self.visitor.imports["P"] == "pathlib.Path"
     
+    def test_visit_relative_import_from(self):
+        """Test relative imports are keyed by the absolute module they name."""
+        from analyzer import EnhancedCallExtractorVisitor
+        from ast_parser import CallExtractorVisitor as GraphCallExtractorVisitor
+        
+        code = "from .util import helper\nfrom .. import sibling\nfrom . import api"
+        for visitor_class in (CallExtractorVisitor, GraphCallExtractorVisitor, EnhancedCallExtractorVisitor):
+            module_visitor = visitor_class("pkg.sub.main", self.function_registry)
+            module_visitor.visit(ast.parse(code))
+            assert module_visitor.imports == {"helper": "pkg.sub.util.helper", "sibling": "pkg.sibling",
+                                              "api": "pkg.sub.api"}
+            
+            package_visitor = visitor_class("pkg.sub", self.function_registry, is_package=True)
+            package_visitor.visit(ast.parse(code))
+            assert package_visitor.imports["helper"] == "pkg.sub.util.helper"
+    
+    def test_relative_import_call_targets(self):
+        """Test calls to names imported relatively in a nested package keep the function name."""
+        from analyzer import EnhancedCallExtractorVisitor
+        from ast_parser import CallExtractorVisitor as GraphCallExtractorVisitor
+        
+        tree = ast.parse("from ..util import helper\n\ndef main():\n    helper()\n")
+        for visitor_class in (GraphCallExtractorVisitor, EnhancedCallExtractorVisitor):
+            visitor = visitor_class("pkg.sub.main", self.function_registry)
+            visitor.visit(tree)
+            call = visitor.function_calls["pkg.sub.main.main"][0]
+            target = call["target"] if isinstance(call, dict) else call.target
+            assert list(target) == ["", "pkg.util", "", "helper"]
+            assert ".".join(part for part in target if part) == "pkg.util.helper"
+    
     def test_function_context_tracking(self):
         """Test function context tracking during traversal."""
         code = """
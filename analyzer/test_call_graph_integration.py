@@ -9,6 +9,8 @@ import shutil
 from pathlib import Path
 
 from analyzer import ProjectAnalyzer
+from ast_parser import ASTParser
+from call_graph import CallGraphBuilder
 
 
 class TestCallGraphIntegration:
@@ -218,6 +220,30 @@ def main():
         )
         assert process_to_log
     
+    def test_relative_import_calls(self):
+        """Test calls through relative imports resolve to the package's modules."""
+        files = {
+            "pkg/__init__.py": "from .util import helper\n\ndef init():\n    helper()\n",
+            "pkg/util.py": "def helper():\n    return 1\n",
+            "pkg/main.py": """from .util import helper
+from pkg.util import helper as h2
+
+def main():
+    helper()
+    h2()
+""",
+        }
+        
+        project_path = self.create_test_project(files)
+        parser = ASTParser(project_path=project_path)
+        modules = [parser.parse_file(path) for path in sorted(project_path.rglob("*.py"))]
+        
+        call_graph = CallGraphBuilder().build_call_graph(modules)
+        
+        edges = {(edge.caller, edge.callee): edge.line_numbers for edge in call_graph.edges}
+        assert edges[("pkg.main.main", "pkg.util.helper")] == [5, 6]
+        assert ("pkg.init", "pkg.util.helper") in edges
+    
     def test_call_graph_with_complexity(self):
         """Test that call graph includes complexity information."""
         files = {
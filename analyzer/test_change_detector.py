@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Unit tests for git- and stat-based change detection.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import change_detector
+from change_detector import ChangeDetector
+from file_index import ProjectFileIndex
+from source_store import content_hash
+
+HAS_GIT = shutil.which("git") is not None
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+                   cwd=repo, check=True, capture_output=True)
+
+
+class TestChangeDetector(unittest.TestCase):
+    """Test ChangeDetector class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.repo = Path(self.temp_dir.name)
+        self.project = self.repo / "app"
+        self.project.mkdir()
+        (self.project / "main.py").write_text("print('hello')\n")
+        (self.project / "utils.py").write_text("def helper():\n    pass\n")
+        (self.repo / "outside.py").write_text("x = 1\n")
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+    
+    def _records(self):
+        return list(ProjectFileIndex.build(self.project).python_files())
+    
+    def _expected(self):
+        return {record.rel_path: content_hash(record.path.read_bytes()) for record in self._records()}
+    
+    @unittest.skipUnless(HAS_GIT, "git is not installed")
+    def test_git_hashes_match_content_hashes(self):
+        """Test clean tracked files are hashed by git without being read."""
+        _git(self.repo, "init", "-q")
+        _git(self.repo, "add", ".")
+        _git(self.repo, "commit", "-q", "-m", "initial")
+        (self.project / "new.py").write_text("y = 2\n")
+        
+        detector = ChangeDetector(self.project)
+        with patch("change_detector.GIT_MIN_SUSPECTS", 1), \
+                patch("change_detector.hash_file", wraps=change_detector.hash_file) as hash_file:
+            hashes, _ = detector.get_file_hashes(self._records(), {})
+        
+        self.assertEqual(hashes, self._expected())
+        self.assertEqual(detector.last_stats["method"], "git")
+        self.assertEqual(detector.last_stats["from_git"], 2)
+        hash_file.assert_called_once_with(self.project / "new.py")
+    
+    @unittest.skipUnless(HAS_GIT, "git is not installed")
+    def test_modified_tracked_files_are_read(self):
+        """Test files modified in the work tree are hashed from their content."""
+        _git(self.repo, "init", "-q")
+        _git(self.repo, "add", ".")
+        _git(self.repo, "commit", "-q", "-m", "initial")
+        (self.project / "utils.py").write_text("def helper():\n    return 1\n")
+        
+        detector = ChangeDetector(self.project)
+        with patch("change_detector.GIT_MIN_SUSPECTS", 1):
+            hashes, _ = detector.get_file_hashes(self._records(), {})
+        
+        self.assertEqual(hashes, self._expected())
+        self.assertEqual(detector.last_stats["from_git"], 1)
+        self.assertEqual(detector.last_stats["hashed"], 1)
+    
+    def test_stat_fallback_outside_git(self):
+        """Test files are re-read only when their size or mtime changed, and touching keeps the hash."""
+        detector = ChangeDetector(self.project, use_git=False)
+        old = time.time() - 60
+        for record in self._records():
+            os.utime(record.path, (old, old))
+        
+        hashes, stats = detector.get_file_hashes(self._records(), {})
+        self.assertEqual(detector.last_stats["hashed"], 2)
+        
+        hashes_again, _ = detector.get_file_hashes(self._records(), stats)
+        self.assertEqual(hashes_again, hashes)
+        self.assertEqual(detector.last_stats["method"], "stat")
+        self.assertEqual(detector.last_stats["hashed"], 0)
+        
+        # A checkout rewriting identical content only changes the mtime
+        os.utime(self.project / "main.py", (old + 10, old + 10))
+        touched, _ = detector.get_file_hashes(self._records(), stats)
+        self.assertEqual(touched, hashes)
+        self.assertEqual(detector.last_stats["hashed"], 1)
+    
+    @unittest.skipUnless(HAS_GIT, "git is not installed")
+    def test_git_only_asked_for_many_changes(self):
+        """Test a few changed files are read rather than asking git."""
+        _git(self.repo, "init", "-q")
+        _git(self.repo, "add", ".")
+        _git(self.repo, "commit", "-q", "-m", "initial")
+        
+        detector = ChangeDetector(self.project)
+        with patch.object(detector, "get_git_hashes", side_effect=AssertionError("git asked")):
+            hashes, _ = detector.get_file_hashes(self._records(), {})
+        
+        self.assertEqual(hashes, self._expected())
+        self.assertEqual(detector.last_stats["method"], "stat")
+    
+    @unittest.skipUnless(HAS_GIT, "git is not installed")
+    def test_recent_files(self):
+        """Test work tree changes come first, then files of recent commits."""
+        self.assertIsNone(ChangeDetector(self.project).get_recent_files(10))
+        _git(self.repo, "init", "-q")
+        _git(self.repo, "add", "app/utils.py")
+        _git(self.repo, "commit", "-q", "-m", "utils")
+        _git(self.repo, "add", ".")
+        _git(self.repo, "commit", "-q", "-m", "rest")
+        
+        detector = ChangeDetector(self.project)
+        self.assertEqual(detector.get_recent_files(1), ["main.py"])
+        self.assertEqual(detector.get_recent_files(10), ["main.py", "utils.py"])
+        
+        (self.project / "utils.py").write_text("def helper():\n    return 1\n")
+        (self.project / "new.py").write_text("x = 2\n")
+        os.utime(self.project / "utils.py", (time.time() - 60, time.time() - 60))
+        self.assertEqual(detector.get_recent_files(10), ["new.py", "utils.py", "main.py"])
+    
+    def test_recently_modified_files_are_not_memoized(self):
+        """Test files modified within the racy window are hashed again next time."""
+        _, stats = ChangeDetector(self.project, use_git=False).get_file_hashes(self._records(), {})
+        self.assertEqual(stats, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -160,10 +160,99 @@ def complex_function(x):
         finally:
             os.unlink(temp_path)
     
-    def test_estimate_cognitive_complexity(self):
-        """Test cognitive complexity estimation."""
-        assert self.analyzer._estimate_cognitive_complexity(5) == 6  # 5 * 1.2 = 6
-        assert self.analyzer._estimate_cognitive_complexity(10) == 12  # 10 * 1.2 = 12
+    def test_enhance_module_in_place(self):
+        """Test methods shared with their classes see the enhanced scores."""
+        from ast_parser import ASTParser
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "shared.py"
+            path.write_text("class Service:\n"
+                            "    def run(self, items):\n"
+                            + "".join(f"        if items[{i}]:\n            return {i}\n" for i in range(12))
+                            + "        return None\n")
+            module = ASTParser().parse_file(path)
+            method = module.classes[0].methods[0]
+            
+            enhanced = self.analyzer.enhance_module_complexity(module)
+            
+            assert enhanced is module
+            assert enhanced.functions[0] is method
+            assert method.complexity.cyclomatic == 13
+            assert method.complexity.level == ComplexityLevel.HIGH
+    
+    @pytest.mark.skipif(not RADON_AVAILABLE, reason="Radon not available")
+    def test_enhance_module_matches_by_qualified_name(self):
+        """Test same-named methods and nested functions get their own radon scores."""
+        from ast_parser import ASTParser
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "same_names.py"
+            path.write_text("class Simple:\n"
+                            "    def run(self):\n"
+                            "        return 1\n"
+                            "\n"
+                            "class Branchy:\n"
+                            "    def run(self, x):\n"
+                            "        if x:\n"
+                            "            return 1\n"
+                            "        elif x is None:\n"
+                            "            return 2\n"
+                            "        return 3\n"
+                            "\n"
+                            "def outer(items):\n"
+                            "    def inner(item):\n"
+                            "        return item if item else None\n"
+                            "    return [inner(item) for item in items]\n")
+            module = ASTParser().parse_file(path)
+            
+            self.analyzer.enhance_module_complexity(module)
+            
+            scores = {(func.name, func.line_number): func.complexity.cyclomatic for func in module.functions}
+            assert scores[("run", 2)] == 1
+            assert scores[("run", 6)] == 3
+            assert scores[("inner", 14)] == 2
+            assert module.complexity.cognitive == sum(func.complexity.cognitive for func in module.functions)
+    
+    @pytest.mark.skipif(not RADON_AVAILABLE, reason="Radon not available")
+    def test_calculate_maintainability(self):
+        """Test the maintainability index and Halstead metrics are computed on request."""
+        from radon.metrics import mi_visit
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "metrics.py"
+            source = ("# Scale values\n"
+                      "def scale(values, factor):\n"
+                      "    return [value * factor for value in values if value > 0]\n")
+            path.write_text(source)
+            module = ModuleInfo(name="metrics", path=str(path), functions=[], classes=[], imports=[],
+                                complexity=ComplexityScore(cyclomatic=1), size_lines=3)
+            
+            metrics = self.analyzer.calculate_maintainability(module)
+            
+            assert metrics["maintainability_index"] == round(mi_visit(source, True), 2)
+            assert metrics["level"] == "low"
+            assert metrics["halstead"]["volume"] > 0
+    
+    def test_enhance_module_keeps_parsed_cognitive_complexity(self):
+        """Test cognitive complexity comes from the parser, not from the cyclomatic score."""
+        from ast_parser import ASTParser
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "nested.py"
+            path.write_text("def nested(rows):\n"
+                            "    for row in rows:\n"
+                            "        if row:\n"
+                            "            return row\n"
+                            "\n"
+                            "def flat():\n"
+                            "    return 1\n")
+            module = ASTParser().parse_file(path)
+            
+            self.analyzer.enhance_module_complexity(module)
+            
+            scores = {func.name: func.complexity.cognitive for func in module.functions}
+            assert scores == {"nested": 3, "flat": 0}
+            assert module.complexity.cognitive == 3
     
     def test_calculate_module_complexity_basic(self):
         """Test module complexity calculation without radon."""
@@ -185,10 +274,10 @@ def complex_function(x):
         ]
         
         with patch.object(self.analyzer, 'radon_available', False):
-            complexity = self.analyzer._calculate_module_complexity(functions, "")
+            complexity = self.analyzer._calculate_module_complexity(functions)
             
             assert complexity.cyclomatic == 10  # 3 + 7
-            assert complexity.cognitive == 13  # 10 * 1.3
+            assert complexity.cognitive == sum(func.complexity.cognitive for func in functions)
             assert complexity.level == ComplexityLevel.MEDIUM
     
     def test_calculate_project_complexity_stats_empty(self):
@@ -307,14 +396,6 @@ def complex_function(x):
         assert ComplexityThresholds.get_complexity_level(6) == ComplexityLevel.MEDIUM
         assert ComplexityThresholds.get_complexity_level(10) == ComplexityLevel.MEDIUM
         assert ComplexityThresholds.get_complexity_level(11) == ComplexityLevel.HIGH
-    
-    def test_cognitive_complexity_calculation(self):
-        """Test cognitive complexity calculation edge cases."""
-        # Test with zero cyclomatic complexity
-        assert self.analyzer._estimate_cognitive_complexity(0) == 0
-        
-        # Test with large values
-        assert self.analyzer._estimate_cognitive_complexity(100) == 120
 
 
 if __name__ == "__main__":
@@ -221,20 +221,6 @@ def complex(x):
             func_key = f"function:{enhanced_module.name}.{func.name}"
             self.assertIn(func_key, color_map)
             self.assertIn(color_map[func_key], ["green", "orange", "red"])
-    
-    def test_cognitive_complexity_estimation(self):
-        """Test cognitive complexity estimation."""
-        # Test various cyclomatic complexity values
-        test_cases = [
-            (1, 1),    # 1 * 1.2 = 1.2 -> 1
-            (5, 6),    # 5 * 1.2 = 6
-            (10, 12),  # 10 * 1.2 = 12
-            (0, 0),    # Edge case: 0
-        ]
-        
-        for cyclomatic, expected_cognitive in test_cases:
-            cognitive = self.analyzer._estimate_cognitive_complexity(cyclomatic)
-            self.assertEqual(cognitive, expected_cognitive)
 
 
 if __name__ == '__main__':
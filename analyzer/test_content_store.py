@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the content-addressed cache object store.
+"""
+
+import multiprocessing
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import content_store
+from content_store import LFU, LRU, ContentStore
+
+
+def _put_objects(root: str, worker: int, count: int):
+    """Put objects from a separate process (module level so it can be pickled)."""
+    store = ContentStore(Path(root), max_size_bytes=10 ** 9)
+    for i in range(count):
+        store.put(f"{worker:02x}{i:038x}", b"x" * (worker + 1))
+        store.get("0" * 40)
+        store.flush()
+
+
+class TestContentStore(unittest.TestCase):
+    """Test ContentStore class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+    
+    def _key(self, name: str) -> str:
+        return name * 40
+    
+    def test_put_get_and_size_accounting(self):
+        """Test the total size follows additions, replacements and removals."""
+        store = ContentStore(self.root, max_size_bytes=1000)
+        
+        store.put(self._key("a"), b"x" * 100)
+        store.put(self._key("b"), b"y" * 50)
+        self.assertEqual(store.total_size, 150)
+        
+        store.put(self._key("a"), b"z" * 10)
+        self.assertEqual(store.total_size, 60)
+        self.assertEqual(store.get(self._key("a")), b"z" * 10)
+        
+        self.assertTrue(store.remove(self._key("b")))
+        self.assertFalse(store.remove(self._key("b")))
+        self.assertEqual(store.total_size, 10)
+        self.assertIsNone(store.get(self._key("b")))
+        
+        store.flush()
+        reopened = ContentStore(self.root, max_size_bytes=1000)
+        self.assertEqual(reopened.total_size, 10)
+        self.assertEqual(reopened.get_stats()["total_entries"], 1)
+    
+    def test_lru_eviction(self):
+        """Test LRU eviction removes the least recently used objects first."""
+        store = ContentStore(self.root, max_size_bytes=250, eviction_policy=LRU)
+        for name in "abc":
+            store.put(self._key(name), b"x" * 100)
+            time.sleep(0.01)
+        store.get(self._key("a"))
+        
+        freed = store.evict(protect=[self._key("c")])
+        
+        self.assertEqual(freed, 100)
+        self.assertFalse(store.contains(self._key("b")))
+        self.assertTrue(store.contains(self._key("a")))
+        self.assertEqual(store.total_size, 200)
+    
+    def test_lfu_eviction(self):
+        """Test LFU eviction removes the least frequently used objects first."""
+        store = ContentStore(self.root, max_size_bytes=250, eviction_policy=LFU)
+        for name in "abc":
+            store.put(self._key(name), b"x" * 100)
+        for _ in range(3):
+            store.get(self._key("a"))
+            store.get(self._key("c"))
+        store.get(self._key("b"))
+        store.get(self._key("b"))
+        
+        store.evict()
+        
+        self.assertFalse(store.contains(self._key("b")))
+        self.assertEqual(store.total_size, 200)
+    
+    def test_accesses_are_journaled(self):
+        """Test reads append to the journal instead of rewriting the index."""
+        store = ContentStore(self.root, max_size_bytes=1000)
+        store.put(self._key("a"), b"data")
+        store.flush()
+        index_bytes = (self.root / "index.json").read_bytes()
+        
+        store.get(self._key("a"))
+        store.flush()
+        
+        self.assertEqual((self.root / "index.json").read_bytes(), index_bytes)
+        reopened = ContentStore(self.root, max_size_bytes=1000)
+        self.assertEqual(reopened.index["entries"][self._key("a")]["access_count"], 1)
+    
+    def test_journal_compaction(self):
+        """Test a large journal is folded into a new index snapshot."""
+        store = ContentStore(self.root, max_size_bytes=1000)
+        store.put(self._key("a"), b"data")
+        with patch.object(content_store, "JOURNAL_COMPACT_BYTES", 500):
+            for _ in range(20):
+                store.get(self._key("a"))
+                store.flush()
+        
+        self.assertLess((self.root / "journal.log").stat().st_size, 500)
+        reopened = ContentStore(self.root, max_size_bytes=1000)
+        self.assertEqual(reopened.index["entries"][self._key("a")]["access_count"], 20)
+        self.assertEqual(reopened.total_size, 4)
+    
+    def test_stores_sharing_a_directory(self):
+        """Test stores see each other's objects, removals and compactions."""
+        first = ContentStore(self.root, max_size_bytes=1000)
+        second = ContentStore(self.root, max_size_bytes=1000)
+        
+        first.put(self._key("a"), b"x" * 10)
+        first.flush()
+        self.assertEqual(second.get(self._key("a")), b"x" * 10)
+        second.put(self._key("b"), b"y" * 20)
+        second.flush()
+        
+        first.refresh()
+        self.assertEqual(first.total_size, 30)
+        
+        first.clear()
+        second.refresh()
+        self.assertFalse(second.contains(self._key("a")))
+        self.assertEqual(second.total_size, 0)
+        
+        second.put(self._key("c"), b"z" * 5)
+        second.flush()
+        self.assertTrue(first.contains(self._key("c")))
+    
+    def test_remove_sees_other_stores(self):
+        """Test remove replays the changes of other processes before looking the object up."""
+        first = ContentStore(self.root, max_size_bytes=1000)
+        second = ContentStore(self.root, max_size_bytes=1000)
+        first.put(self._key("a"), b"x" * 10)
+        first.flush()
+        
+        self.assertTrue(second.remove(self._key("a")))
+        self.assertFalse(second.remove(self._key("a")))
+        second.flush()
+        
+        self.assertFalse(first.object_path(self._key("a")).exists())
+        first.refresh()
+        self.assertEqual((first.total_size, second.total_size), (0, 0))
+    
+    def test_partial_journal_line_is_ignored(self):
+        """Test a record still being appended by another process is not replayed."""
+        store = ContentStore(self.root, max_size_bytes=1000)
+        store.put(self._key("a"), b"data")
+        store.flush()
+        with open(self.root / "journal.log", "ab") as f:
+            f.write(b'{"op":"remove","ke')
+        
+        reopened = ContentStore(self.root, max_size_bytes=1000)
+        self.assertTrue(reopened.contains(self._key("a")))
+    
+    def test_concurrent_processes(self):
+        """Test processes writing to one store concurrently keep a consistent index."""
+        shared = ContentStore(self.root, max_size_bytes=10 ** 9)
+        shared.put("0" * 40, b"")
+        shared.flush()
+        workers = [multiprocessing.Process(target=_put_objects, args=(str(self.root), worker, 30))
+                   for worker in range(1, 4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+            self.assertEqual(worker.exitcode, 0)
+        
+        store = ContentStore(self.root, max_size_bytes=10 ** 9)
+        self.assertEqual(store.get_stats()["total_entries"], 91)
+        self.assertEqual(store.index["entries"]["0" * 40]["access_count"], 90)
+        self.assertEqual(store.total_size, 30 * (2 + 3 + 4))
+        self.assertEqual(list(self.root.rglob("*.tmp")), [])
+    
+    def test_concurrent_threads(self):
+        """Test threads sharing one store lose no journal records while another flushes."""
+        store = ContentStore(self.root, max_size_bytes=10 ** 9)
+        done = threading.Event()
+        
+        def put_objects(worker):
+            for i in range(200):
+                store.put(f"{worker:02x}{i:038x}", b"x" * (worker + 1))
+        
+        def flush_until_done():
+            while not done.is_set():
+                store.flush()
+                store.get_stats()
+        
+        flusher = threading.Thread(target=flush_until_done)
+        flusher.start()
+        workers = [threading.Thread(target=put_objects, args=(worker,)) for worker in range(1, 5)]
+        with patch.object(content_store, "JOURNAL_COMPACT_BYTES", 20000):
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            done.set()
+            flusher.join()
+            store.flush()
+        
+        reopened = ContentStore(self.root, max_size_bytes=10 ** 9)
+        self.assertEqual(reopened.get_stats()["total_entries"], 800)
+        self.assertEqual(reopened.total_size, 200 * (2 + 3 + 4 + 5))
+    
+    def test_objects_of_lost_index_are_dropped(self):
+        """Test objects are removed rather than indexed without their kind when the index is corrupt."""
+        store = ContentStore(self.root, max_size_bytes=1000)
+        store.put(self._key("a"), b"x" * 30, kind="stage")
+        store.put(self._key("b"), b"y" * 20, kind="module-partial")
+        store.flush()
+        (self.root / "index.json").write_text("{not json")
+        
+        reset = ContentStore(self.root, max_size_bytes=1000)
+        
+        self.assertEqual(reset.total_size, 0)
+        self.assertIsNone(reset.get(self._key("b")))
+        self.assertFalse(reset.object_path(self._key("a")).exists())
+        
+        reset.put(self._key("b"), b"y" * 20, kind="module")
+        self.assertEqual(reset.get_stats()["by_kind"], {"module": {"entries": 1, "size_bytes": 20}})
+    
+    def test_clear(self):
+        """Test clearing removes every object."""
+        store = ContentStore(self.root, max_size_bytes=1000)
+        store.put(self._key("a"), b"data")
+        store.clear()
+        
+        self.assertEqual(store.total_size, 0)
+        self.assertFalse(store.object_path(self._key("a")).exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
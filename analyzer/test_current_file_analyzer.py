@@ -96,6 +96,25 @@ def complex_function(x, y, z=None):
         self.assertGreater(func.complexity.cyclomatic, 5)  # Should have high complexity
         self.assertEqual(func.complexity.level, ComplexityLevel.HIGH)
     
+    def test_cognitive_complexity_matches_project_analysis(self):
+        """Test function cognitive complexity comes from the shared engine."""
+        content = '''
+def nested(rows):
+    for row in rows:
+        if row and row.valid:
+            return row
+
+def flat(x):
+    return x
+'''
+        file_path = self.create_test_file(content)
+        result = self.analyzer.analyze_file(file_path)
+        
+        self.assertTrue(result.success)
+        scores = {func.name: func.complexity.cognitive for func in result.complexity_metrics.function_complexities}
+        self.assertEqual(scores, {"nested": 4, "flat": 0})  # for +1, nested if +2, and +1
+        self.assertEqual(result.complexity_metrics.overall_complexity.cognitive, 2)  # Average
+    
     def test_analyze_class_with_methods(self):
         """Test analysis of a class with methods."""
         content = '''
@@ -450,6 +469,29 @@ def main():
         self.assertIn("os", result.dependency_info.standard_library_imports)
 
 
+    def test_cached_analysis(self):
+        """Test unchanged file contents reuse the cached result."""
+        from cache_manager import CacheManager
+        cache_manager = CacheManager(self.temp_dir / "cache")
+        file_path = self.create_test_file("def f(x):\n    return x\n")
+        
+        analyzer = CurrentFileAnalyzer(cache_manager=cache_manager)
+        first = analyzer.analyze_file(file_path)
+        again = CurrentFileAnalyzer(cache_manager=cache_manager).analyze_file(file_path)
+        self.assertEqual(analyzer.cache_hits, 0)
+        self.assertEqual(again.to_dict(), first.to_dict())
+        
+        file_path.write_text("def f(x):\n    return x + 1\n")
+        changed_analyzer = CurrentFileAnalyzer(cache_manager=cache_manager)
+        changed_analyzer.analyze_file(file_path)
+        self.assertEqual(changed_analyzer.cache_hits, 0)
+        
+        # Results depend on the project context
+        in_project = CurrentFileAnalyzer(self.temp_dir, cache_manager)
+        in_project.analyze_file(file_path)
+        self.assertEqual(in_project.cache_hits, 0)
+
+
 class TestFileAnalysisResultSerialization(unittest.TestCase):
     """Test serialization of FileAnalysisResult."""
     
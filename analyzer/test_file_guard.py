@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Unit tests for per-file timing, limits and quarantine.
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import file_guard
+from analyzer import CallRelationship, EnhancedCodeGraphBuilder
+from ast_parser import ASTParser
+from call_graph import CallGraphBuilder
+from complexity_analyzer import ComplexityAnalyzer
+from file_guard import (CRASH, MEMORY, TIMEOUT, FileGuard, analyze_guarded_file, fallback_module,
+                        init_guarded_worker)
+from performance_optimizer import ParallelProcessor, PerformanceConfig
+
+
+def _analyze_or_die(file_path):
+    """Worker function killing its process on files named crash*.py (never run in the test process)."""
+    if multiprocessing.parent_process() is None:
+        raise AssertionError(f"{file_path} analyzed in the analyzer process")
+    if Path(file_path).name.startswith("crash"):
+        os._exit(1)
+    return _analyze_guarded_file(file_path)
+
+
+_analyze_guarded_file = analyze_guarded_file
+
+
+class TestFileGuard(unittest.TestCase):
+    """Test FileGuard class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.project_path = Path(self.temp_dir.name)
+        
+        self.small = self.project_path / "small.py"
+        self.small.write_text("def small():\n    return 1\n")
+        self.large = self.project_path / "large.py"
+        self.large.write_text("".join(f"def f{i}(x):\n    return x if x > {i} else {i}\n\n" for i in range(200)))
+        self.generated = self.project_path / "generated.py"
+        self.generated.write_text("import os, sys as system\nfrom pkg.tables import (a, b as c)\n"
+                                  "TABLE = [1, 2, 3]\n")
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+    
+    def _analyze(self, guard, files):
+        return guard.analyze_files(files, ASTParser(), ComplexityAnalyzer())
+    
+    def test_files_are_timed(self):
+        """Test every file is timed and the slowest files are listed first."""
+        guard = FileGuard(self.project_path)
+        modules = self._analyze(guard, [self.small, self.large])
+        
+        self.assertEqual([module.name for module in modules], ["small", "large"])
+        self.assertEqual(len(modules[1].functions), 200)
+        
+        stats = guard.get_stats(top=1)
+        self.assertEqual(stats["timed_files"], 2)
+        self.assertEqual([entry["path"] for entry in stats["slowest"]], ["large.py"])
+        self.assertGreater(stats["slowest"][0]["complexity_time"], 0)
+        self.assertEqual(stats["quarantined"], [])
+    
+    def test_slow_files_are_quarantined_for_later_runs(self):
+        """Test files over the time limit keep their analysis but are quarantined."""
+        analyze_file = file_guard.analyze_file
+        
+        def slow_analyze_file(parser, complexity_analyzer, file_path, with_calls=False):
+            outcome = analyze_file(parser, complexity_analyzer, file_path, with_calls)
+            if file_path == self.large:
+                outcome.complexity_time += 30
+            return outcome
+        
+        guard = FileGuard(self.project_path, time_limit=20)
+        with patch("file_guard.analyze_file", side_effect=slow_analyze_file):
+            modules = self._analyze(guard, [self.small, self.large])
+        
+        self.assertEqual(len(modules[1].functions), 200)
+        self.assertEqual(guard.offenders, {"large.py": TIMEOUT})
+        self.assertEqual(guard.get_stats()["quarantined"], [{"path": "large.py", "reason": TIMEOUT}])
+        self.assertEqual(list(guard.get_quarantine([self.small, self.large])), ["large.py"])
+    
+    def test_quarantined_files_get_fallback(self):
+        """Test quarantined files are not parsed and keep their top-level imports."""
+        guard = FileGuard(self.project_path, {"generated.py": {"reason": MEMORY, "time": 0}})
+        parser = ASTParser()
+        complexity_analyzer = MagicMock()
+        with patch.object(parser, "parse_file", wraps=parser.parse_file) as parse_file:
+            modules = guard.analyze_files([self.small, self.generated], parser, complexity_analyzer)
+        parse_file.assert_called_once_with(self.small)
+        
+        module = modules[1]
+        self.assertEqual((module.name, module.size_lines, module.functions), ("generated", 3, []))
+        self.assertEqual([(i.module, i.names, i.alias, i.line_number) for i in module.imports], [
+            ("os", ["os"], None, 1), ("sys", ["sys"], "system", 1), ("pkg.tables", ["a", "b"], None, 2)
+        ])
+        self.assertEqual(guard.get_stats()["quarantined"], [{"path": "generated.py", "reason": MEMORY}])
+    
+    def test_fallback_modules_are_not_parsed_for_calls(self):
+        """Test the graph builders do not parse quarantined files to extract their calls."""
+        guard = FileGuard(self.project_path, {"generated.py": {"reason": MEMORY, "time": 0}}, with_calls=True)
+        modules = self._analyze(guard, [self.small, self.generated])
+        
+        self.assertTrue(guard.is_quarantined(str(self.generated)))
+        self.assertFalse(guard.is_quarantined(str(self.small)))
+        with patch("call_graph.load_tree") as call_graph_load_tree, \
+                patch("analyzer.load_tree") as code_graph_load_tree:
+            CallGraphBuilder().build_call_graph(modules, guard.call_sites)
+            EnhancedCodeGraphBuilder(self.project_path).build_code_graph(modules, guard.call_events)
+        call_graph_load_tree.assert_not_called()
+        code_graph_load_tree.assert_not_called()
+    
+    def test_get_quarantine(self):
+        """Test deleted files leave the quarantine and retried files only stay if they offend again."""
+        quarantine = {"generated.py": {"reason": MEMORY, "time": 0}, "gone.py": {"reason": TIMEOUT, "time": 0}}
+        guard = FileGuard(self.project_path, quarantine)
+        files = [self.small, self.generated]
+        
+        self.assertEqual(guard.get_quarantine(files), {"generated.py": quarantine["generated.py"]})
+        self.assertEqual(guard.get_quarantine(files, retried=True), {})
+    
+    def test_fallback_of_unreadable_file(self):
+        """Test a fallback module is built for a file that cannot be read."""
+        module = fallback_module(self.project_path / "missing.py", "missing")
+        self.assertEqual((module.name, module.size_lines, module.imports), ("missing", 0, []))
+    
+    @unittest.skipUnless(sys.platform.startswith("linux"), "memory limits are enforced on Linux")
+    def test_worker_memory_limit(self):
+        """Test a worker abandons a file exceeding its memory limit and keeps working."""
+        huge = self.project_path / "huge.py"
+        huge.write_text("TABLE = [" + "1, " * 1000000 + "]\n")
+        
+        with ProcessPoolExecutor(max_workers=1, initializer=init_guarded_worker, initargs=(20, 50)) as executor:
+            outcome = executor.submit(analyze_guarded_file, huge).result()
+            self.assertIsNone(outcome.module)
+            self.assertEqual(outcome.quarantine_reason, MEMORY)
+            
+            outcome = executor.submit(analyze_guarded_file, self.small).result()
+            self.assertEqual(outcome.module.name, "small")
+            self.assertIsNone(outcome.quarantine_reason)
+    
+    def test_dead_worker_files_are_quarantined(self):
+        """Test a file killing its worker is quarantined as a crash and never analyzed here."""
+        files = [self.project_path / f"mod{i}.py" for i in range(12)]
+        for file_path in files:
+            file_path.write_text("def f():\n    return 1\n")
+        crash = self.project_path / "crash.py"
+        crash.write_text("def boom():\n    return 1\n")
+        files.insert(5, crash)
+        processor = ParallelProcessor(PerformanceConfig(max_workers=2, chunk_size=4))
+        
+        guard = FileGuard(self.project_path)
+        with patch.object(file_guard, "analyze_guarded_file", _analyze_or_die):
+            modules = guard.analyze_files(files, ASTParser(), ComplexityAnalyzer(), processor)
+        
+        self.assertEqual([module.name for module in modules], [file_path.stem for file_path in files])
+        self.assertEqual(modules[5].functions, [])
+        self.assertTrue(all(len(module.functions) == 1 for module in modules[:5] + modules[6:]))
+        self.assertEqual(guard.offenders, {"crash.py": CRASH})
+        self.assertEqual(guard.get_stats()["quarantined"], [{"path": "crash.py", "reason": CRASH}])
+    
+    def test_workers_record_calls(self):
+        """Test workers return the calls of each module, so the graphs are built without a parse here."""
+        files = [self.project_path / f"mod{i}.py" for i in range(12)]
+        for i, file_path in enumerate(files):
+            file_path.write_text(f"from mod0 import f0\n\ndef f{i}():\n    return f0()\n")
+        processor = ParallelProcessor(PerformanceConfig(max_workers=2, chunk_size=4))
+        
+        guard = FileGuard(self.project_path, with_calls=True)
+        modules = guard.analyze_files(files, ASTParser(), ComplexityAnalyzer(), processor)
+        
+        self.assertEqual(guard.call_sites[str(files[3])], [("mod3.f3", ("mod0.f0",), 4)])
+        with patch("call_graph.load_tree", side_effect=AssertionError("parsed again")), \
+                patch("analyzer.load_tree", side_effect=AssertionError("parsed again")):
+            call_graph = CallGraphBuilder().build_call_graph(modules, guard.call_sites)
+            code_graph_builder = EnhancedCodeGraphBuilder(self.project_path)
+            code_graph_builder.build_code_graph(modules, guard.call_events)
+        
+        self.assertEqual(len(call_graph.edges), 12)
+        self.assertEqual(code_graph_builder.call_relationships["mod3.f3"],
+                         [CallRelationship(target=["", "mod0", "", "f0"], label="calls")])
+    
+    def test_limits_are_not_set_in_this_process(self):
+        """Test the analyzer process itself is never limited."""
+        with patch("resource.setrlimit") as setrlimit, patch("signal.signal") as set_handler:
+            init_guarded_worker(1, 1)
+            outcome = analyze_guarded_file(self.small)
+        setrlimit.assert_not_called()
+        set_handler.assert_not_called()
+        self.assertEqual(outcome.module.name, "small")
+
+
+if __name__ == '__main__':
+    unittest.main()
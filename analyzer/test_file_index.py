@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared project file index.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from file_index import ProjectFileIndex, get_file_index, is_excluded_name
+from cache_manager import CacheManager
+from performance_optimizer import ProjectSizeAnalyzer
+from framework_detector import FrameworkDetector
+from folder_structure_analyzer import FolderStructureAnalyzer
+from database_schema_analyzer import DatabaseSchemaAnalyzer
+
+
+class TestProjectFileIndex(unittest.TestCase):
+    """Test ProjectFileIndex class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.project_path = Path(self.temp_dir.name)
+        
+        files = {
+            "main.py": "print('main')\n",
+            "requirements.txt": "django==4.2\n",
+            "app/__init__.py": "",
+            "app/models.py": "from django.db import models\n",
+            "app/views/__init__.py": "",
+            "app/views/home.py": "def home(request):\n    return None\n",
+            "db/schema.sql": "CREATE TABLE users (id INTEGER);\n",
+            ".hidden/secret.py": "x = 1\n",
+            "venv/lib/site.py": "x = 1\n",
+            "node_modules/pkg/index.py": "x = 1\n",
+            "app/__pycache__/models.cpython-311.pyc": "",
+        }
+        for rel_path, content in files.items():
+            path = self.project_path / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+    
+    def test_exclusion_rules(self):
+        """Test hidden and environment directories are excluded."""
+        self.assertTrue(is_excluded_name(".git"))
+        self.assertTrue(is_excluded_name("__pycache__"))
+        self.assertTrue(is_excluded_name("venv"))
+        self.assertFalse(is_excluded_name("app"))
+        
+        index = ProjectFileIndex.build(self.project_path)
+        rel_paths = [record.rel_path for record in index.python_files()]
+        
+        self.assertEqual(rel_paths, [
+            "app/__init__.py",
+            "app/models.py",
+            "app/views/__init__.py",
+            "app/views/home.py",
+            "main.py",
+        ])
+        self.assertIsNone(index.folder("venv"))
+        self.assertIsNone(index.folder(".hidden"))
+    
+    def test_records(self):
+        """Test file records carry size, mtime and suffix."""
+        index = ProjectFileIndex.build(self.project_path)
+        record = index.get("main.py")
+        stat = (self.project_path / "main.py").stat()
+        
+        self.assertEqual(record.size, stat.st_size)
+        self.assertEqual(record.mtime, stat.st_mtime)
+        self.assertEqual(record.suffix, ".py")
+        self.assertEqual(len(index.files_with_suffix(".sql")), 1)
+        self.assertEqual(len(index.files_named("models.py")), 1)
+    
+    def test_folder_tree(self):
+        """Test folder records mirror the directory tree."""
+        index = ProjectFileIndex.build(self.project_path)
+        
+        self.assertEqual([f.name for f in index.root.subfolders], ["app", "db"])
+        views = index.folder("app/views")
+        self.assertEqual([f.name for f in views.files], ["__init__.py", "home.py"])
+        self.assertIn(views, index.folder("app").subfolders)
+    
+    def test_ci_directories_in_folder_tree_only(self):
+        """Test .github and .gitlab reach the folder tree but not the file lists."""
+        for rel_path in (".github/workflows/ci.yml", ".github/scripts/check.py", ".gitlab/ci.py"):
+            path = self.project_path / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("x = 1\n")
+        
+        index = ProjectFileIndex.build(self.project_path)
+        
+        self.assertFalse(is_excluded_name(".github"))
+        self.assertEqual([f.name for f in index.folder(".github/scripts").files], ["check.py"])
+        self.assertIsNone(index.get(".github/scripts/check.py"))
+        self.assertNotIn("ci.py", [record.name for record in index.python_files()])
+        
+        structure = FolderStructureAnalyzer(self.project_path, index).analyze_folder_structure([])
+        self.assertEqual(structure.total_python_files, 6)
+        self.assertEqual(ProjectSizeAnalyzer(self.project_path, index).analyze_project_size().total_files, 5)
+    
+    def test_missing_root(self):
+        """Test a missing project directory yields an empty index."""
+        index = ProjectFileIndex.build(self.project_path / "missing")
+        self.assertEqual(len(index), 0)
+        self.assertEqual(len(index.errors), 1)
+    
+    def test_get_file_index_reuses_index(self):
+        """Test a provided index is returned unchanged."""
+        index = ProjectFileIndex.build(self.project_path)
+        self.assertIs(get_file_index(self.project_path, index), index)
+    
+    def test_stages_share_one_walk(self):
+        """Test all file-discovering stages can run from one index."""
+        index = ProjectFileIndex.build(self.project_path)
+        
+        with patch("os.scandir", side_effect=AssertionError("tree walked again")):
+            size_info = ProjectSizeAnalyzer(self.project_path, index).analyze_project_size()
+            hashes = CacheManager(self.project_path / ".cache")._get_project_file_hashes(
+                self.project_path, index
+            )
+            detector = FrameworkDetector(self.project_path, ["django"], file_index=index)
+            django_files = detector._find_django_files()
+            structure = FolderStructureAnalyzer(self.project_path, index).analyze_folder_structure([])
+            schema_analyzer = DatabaseSchemaAnalyzer()
+            sql_files = schema_analyzer.sql_parser._find_sql_files(str(self.project_path), index)
+        
+        self.assertEqual(size_info.total_files, 5)
+        self.assertIn("requirements.txt", hashes)
+        self.assertNotIn("venv/lib/site.py", hashes)
+        self.assertEqual(sorted(f.name for f in django_files), ["__init__.py", "home.py", "models.py"])
+        self.assertEqual(structure.total_python_files, 4)  # root-level files are not in a folder
+        self.assertEqual(len(sql_files), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
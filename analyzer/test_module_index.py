@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Unit tests for qualified module names and import resolution.
+"""
+
+import unittest
+from pathlib import Path
+
+from analyzer import ComplexityScore, ImportInfo, ModuleInfo
+from module_index import ModuleIndex, module_name_for_path
+
+
+def make_module(rel_path: str, *imports: ImportInfo) -> ModuleInfo:
+    """Create a module named the way the parser names it in /project."""
+    path = Path("/project") / rel_path
+    return ModuleInfo(
+        name=module_name_for_path(path, Path("/project")),
+        path=str(path),
+        functions=[],
+        classes=[],
+        imports=list(imports),
+        complexity=ComplexityScore(cyclomatic=0),
+        size_lines=0
+    )
+
+
+def import_(module: str) -> ImportInfo:
+    return ImportInfo(module=module, names=[module])
+
+
+def from_import(module: str, *names: str, level: int = 0) -> ImportInfo:
+    return ImportInfo(module=module, names=list(names), is_from_import=True, level=level)
+
+
+class TestModuleNameForPath(unittest.TestCase):
+    """Test module_name_for_path function."""
+    
+    def test_names(self):
+        """Test package, __init__ and src layout names."""
+        project = Path("/project")
+        cases = {
+            "setup.py": "setup",
+            "pkg/__init__.py": "pkg",
+            "pkg/sub/models.py": "pkg.sub.models",
+            "src/pkg/__init__.py": "pkg",
+            "src/pkg/views.py": "pkg.views",
+            "src.py": "src",
+            "__init__.py": "__init__",
+        }
+        for rel_path, name in cases.items():
+            self.assertEqual(module_name_for_path(project / rel_path, project), name)
+    
+    def test_files_outside_the_project(self):
+        """Test files outside the project or without a project are named by their stem."""
+        self.assertEqual(module_name_for_path(Path("/elsewhere/pkg/views.py"), Path("/project")), "views")
+        self.assertEqual(module_name_for_path(Path("/project/pkg/views.py")), "views")
+
+
+class TestModuleIndex(unittest.TestCase):
+    """Test ModuleIndex class."""
+    
+    def resolve(self, modules):
+        index = ModuleIndex(modules)
+        return {module.name: index.resolve_module(module) for module in modules}
+    
+    def test_absolute_imports(self):
+        """Test submodules, module members and missing names resolve to the module loaded."""
+        modules = [
+            make_module("app/__init__.py"),
+            make_module("app/models.py"),
+            make_module("app/api/__init__.py"),
+            make_module("app/api/views.py",
+                        import_("app.models"),
+                        import_("app.api.missing"),
+                        from_import("app", "models", "settings"),
+                        from_import("app.models", "User", "*"),
+                        import_("os.path")),
+        ]
+        self.assertEqual(self.resolve(modules)["app.api.views"],
+                         {"app.models", "app.api", "app"})
+    
+    def test_relative_imports(self):
+        """Test relative imports resolve against the importer's package."""
+        modules = [
+            make_module("pkg/__init__.py", from_import("", "helpers", level=1)),
+            make_module("pkg/helpers.py"),
+            make_module("pkg/sub/__init__.py"),
+            make_module("pkg/sub/mod.py",
+                        from_import("", "sibling", level=1),
+                        from_import("helpers", "run", level=2),
+                        from_import("", "x", level=3)),
+            make_module("pkg/sub/sibling.py", from_import("mod", "thing", level=1)),
+        ]
+        dependencies = self.resolve(modules)
+        self.assertEqual(dependencies["pkg"], {"pkg.helpers"})
+        self.assertEqual(dependencies["pkg.sub.mod"], {"pkg.sub.sibling", "pkg.helpers"})
+        self.assertEqual(dependencies["pkg.sub.sibling"], {"pkg.sub.mod"})
+    
+    def test_project_root_package(self):
+        """Test relative imports may reach the project root when it has an __init__.py."""
+        modules = [make_module("__init__.py"), make_module("a.py"), make_module("b.py", from_import("", "a", level=1))]
+        self.assertEqual(self.resolve(modules)["b"], {"a"})
+        self.assertEqual(self.resolve(modules[1:])["b"], set())
+    
+    def test_source_roots(self):
+        """Test modules outside packages resolve by import name, preferring the importer's root."""
+        modules = [
+            make_module("scripts/utils.py"),
+            make_module("scripts/run.py", import_("utils"), import_("config")),
+            make_module("tools/utils.py"),
+            make_module("tools/config.py"),
+            make_module("lib/app.py", import_("utils")),
+        ]
+        dependencies = self.resolve(modules)
+        self.assertEqual(dependencies["scripts.run"], {"scripts.utils", "tools.config"})
+        self.assertEqual(dependencies["lib.app"], set())  # Ambiguous
+    
+    def test_same_named_modules_stay_distinct(self):
+        """Test modules sharing a file name are not merged."""
+        modules = [
+            make_module("blog/__init__.py"),
+            make_module("blog/models.py"),
+            make_module("shop/__init__.py"),
+            make_module("shop/models.py"),
+            make_module("shop/views.py", from_import("shop", "models"), import_("models")),
+        ]
+        index = ModuleIndex(modules)
+        self.assertEqual(len(index), 5)
+        self.assertEqual(index.resolve_module(modules[-1]), {"shop.models"})
+        self.assertIsNone(index.lookup("models"))
+
+
+if __name__ == '__main__':
+    unittest.main()
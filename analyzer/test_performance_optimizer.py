@@ -4,6 +4,7 @@ Unit tests for performance optimizer functionality.
 """
 
 import tempfile
+import threading
 import time
 import unittest
 from pathlib import Path
@@ -15,6 +16,32 @@ from performance_optimizer import (
 )
 
 
+# Module-level so that worker processes can unpickle them
+_worker_prefix = None
+
+
+def _set_worker_prefix(prefix):
+    global _worker_prefix
+    _worker_prefix = prefix
+
+
+def _prefixed_name(file_path):
+    if file_path.name == "test_3.py":
+        return None
+    return f"{_worker_prefix}_{file_path.name}"
+
+
+# Held by the test process while its workers start
+_held_lock = threading.Lock()
+
+
+def _lock_is_free(file_path):
+    if _held_lock.acquire(timeout=1):
+        _held_lock.release()
+        return True
+    return False
+
+
 class TestPerformanceConfig(unittest.TestCase):
     """Test PerformanceConfig class."""
     
@@ -211,6 +238,32 @@ class TestParallelProcessor(unittest.TestCase):
         self.assertEqual(len(results), 5)
         self.assertTrue(all("processed_test_" in result for result in results))
     
+    def test_process_files_parallel_with_initializer(self):
+        """Test worker initializer and deterministic result order."""
+        files = self.test_files * 3  # 15 files, enough for the process pool
+        
+        self.assertTrue(self.processor.should_process_parallel(len(files)))
+        results = self.processor.process_files_parallel(
+            files, _prefixed_name, initializer=_set_worker_prefix, initargs=("worker",)
+        )
+        
+        expected = [f"worker_{f.name}" for f in files if f.name != "test_3.py"]
+        self.assertEqual(results, expected)
+    
+    def test_workers_do_not_inherit_held_locks(self):
+        """Test workers are not forked from the analyzer, whose threads may hold locks."""
+        files = self.test_files * 3
+        with _held_lock:
+            results = self.processor.process_files_parallel(files, _lock_is_free)
+        
+        self.assertEqual(results, [True] * len(files))
+    
+    def test_should_process_parallel(self):
+        """Test small batches and disabled parallelism stay sequential."""
+        self.assertFalse(self.processor.should_process_parallel(5))
+        disabled = ParallelProcessor(PerformanceConfig(enable_parallel=False))
+        self.assertFalse(disabled.should_process_parallel(100))
+    
     def test_process_chunk(self):
         """Test chunk processing."""
         def mock_process_func(file_path):
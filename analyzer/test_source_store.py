@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared source/AST store.
+"""
+
+import ast
+import tempfile
+import unittest
+from pathlib import Path
+
+from source_store import SourceStore, content_hash, load_source, load_tree
+from ast_parser import ModuleDiscovery
+from complexity_analyzer import ComplexityAnalyzer
+from call_graph import CallGraphBuilder
+from analyzer import EnhancedCodeGraphBuilder
+
+
+class TestSourceStore(unittest.TestCase):
+    """Test SourceStore class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.project_path = Path(self.temp_dir.name)
+        
+        self.module_a = self.project_path / "module_a.py"
+        self.module_a.write_text(
+            "def helper():\n"
+            "    return 1\n"
+            "\n"
+            "def main():\n"
+            "    if helper():\n"
+            "        return helper()\n"
+            "    return 0\n"
+        )
+        self.module_b = self.project_path / "module_b.py"
+        self.module_b.write_text(
+            "from module_a import helper\n"
+            "\n"
+            "class Service:\n"
+            "    def run(self):\n"
+            "        return helper()\n"
+        )
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+    
+    def test_content_hash_matches_git_blob_id(self):
+        """Test content hash uses git's blob object format."""
+        # `git hash-object` of an empty file
+        self.assertEqual(content_hash(b""), "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391")
+    
+    def test_file_read_and_parsed_once(self):
+        """Test repeated access reuses source and tree."""
+        store = SourceStore()
+        
+        source = store.get_source(self.module_a)
+        tree = store.get_tree(self.module_a)
+        
+        self.assertIn("def helper", source)
+        self.assertIsInstance(tree, ast.Module)
+        self.assertIs(store.get_tree(self.module_a), tree)
+        self.assertEqual(store.get_source(str(self.module_a)), source)
+        
+        stats = store.get_stats()
+        self.assertEqual(stats["files_read"], 1)
+        self.assertEqual(stats["parses"], 1)
+        self.assertEqual(stats["bytes_read"], self.module_a.stat().st_size)
+        self.assertEqual(stats["tree_hits"], 1)
+    
+    def test_identical_content_shares_tree(self):
+        """Test files with identical content are parsed once."""
+        init_a = self.project_path / "pkg_a" / "__init__.py"
+        init_b = self.project_path / "pkg_b" / "__init__.py"
+        for init_file in (init_a, init_b):
+            init_file.parent.mkdir()
+            init_file.write_text("")
+        
+        store = SourceStore()
+        self.assertIs(store.get_tree(init_a), store.get_tree(init_b))
+        self.assertEqual(store.get_stats()["files_read"], 2)
+        self.assertEqual(store.get_stats()["parses"], 1)
+    
+    def test_syntax_error_cached(self):
+        """Test syntax errors are raised without re-parsing."""
+        broken = self.project_path / "broken.py"
+        broken.write_text("def broken(:\n")
+        
+        store = SourceStore()
+        with self.assertRaises(SyntaxError):
+            store.get_tree(broken)
+        with self.assertRaises(SyntaxError):
+            store.get_tree(broken)
+        
+        self.assertEqual(store.get_stats()["parses"], 1)
+        self.assertEqual(store.get_stats()["parse_errors"], 1)
+    
+    def test_invalid_utf8(self):
+        """Test strict and lenient decoding of invalid UTF-8."""
+        binary = self.project_path / "latin.py"
+        binary.write_bytes(b"name = '\xe9'\n")
+        
+        store = SourceStore()
+        with self.assertRaises(UnicodeDecodeError):
+            store.get_source(binary)
+        self.assertEqual(store.get_source(binary, errors='ignore'), "name = ''\n")
+    
+    def test_crlf_normalized(self):
+        """Test Windows line endings are normalized like text-mode reads."""
+        crlf = self.project_path / "crlf.py"
+        crlf.write_bytes(b"a = 1\r\nb = 2\r\n")
+        
+        store = SourceStore()
+        self.assertEqual(store.get_source(crlf), "a = 1\nb = 2\n")
+    
+    def test_discard_and_clear(self):
+        """Test entries can be released."""
+        store = SourceStore()
+        store.get_tree(self.module_a)
+        store.discard(self.module_a)
+        self.assertEqual(store.get_stats()["cached_trees"], 0)
+        
+        store.get_tree(self.module_a)
+        store.clear()
+        stats = store.get_stats()
+        self.assertEqual(stats["cached_files"], 0)
+        self.assertEqual(stats["parses"], 2)
+    
+    def test_load_helpers_without_store(self):
+        """Test helpers fall back to direct file reads."""
+        self.assertIn("class Service", load_source(self.module_b))
+        self.assertIsInstance(load_tree(self.module_b), ast.Module)
+    
+    def test_pipeline_parses_each_file_once(self):
+        """Test parsing, complexity and call extraction share one parse per file."""
+        store = SourceStore()
+        files = [self.module_a, self.module_b]
+        
+        modules = ModuleDiscovery(self.project_path, store).discover_modules(files)
+        complexity_analyzer = ComplexityAnalyzer(store)
+        modules = [complexity_analyzer.enhance_module_complexity(m) for m in modules]
+        CallGraphBuilder(store).build_call_graph(modules)
+        code_graph = EnhancedCodeGraphBuilder(self.project_path, store).build_code_graph(modules)
+        
+        self.assertEqual(len(modules), 2)
+        self.assertTrue(code_graph)
+        
+        stats = store.get_stats()
+        self.assertEqual(stats["files_read"], 2)
+        self.assertEqual(stats["parses"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
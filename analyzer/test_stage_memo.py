@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Unit tests for stage memoization.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from cache_manager import CacheManager
+from stage_memo import STAGE_KIND, StageMemo
+
+
+class TestStageMemo(unittest.TestCase):
+    """Test StageMemo class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.project_path = Path(self.temp_dir) / "project"
+        self.project_path.mkdir()
+        self.cache_manager = CacheManager(Path(self.temp_dir) / "cache")
+        self.calls = 0
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def compute(self):
+        self.calls += 1
+        return {"frameworks": ["flask"], "calls": self.calls}
+    
+    def test_memoize_by_inputs(self):
+        """Test results are reused for the same inputs only."""
+        memo = StageMemo(self.cache_manager, self.project_path)
+        inputs = [["requirements.txt", "abc"]]
+        
+        first = memo.memoize("tech_stack", inputs, self.compute)
+        self.assertEqual(memo.memoize("tech_stack", [["requirements.txt", "abc"]], self.compute), first)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(memo.hits, ["tech_stack"])
+        
+        memo.memoize("tech_stack", [["requirements.txt", "def"]], self.compute)
+        memo.memoize("folder_structure", inputs, self.compute)
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(memo.misses, ["tech_stack", "tech_stack", "folder_structure"])
+        self.assertEqual(self.cache_manager.store.get_stats()["by_kind"][STAGE_KIND]["entries"], 3)
+    
+    def test_memo_persists_across_runs(self):
+        """Test a later run with another cache manager reuses the stored result."""
+        StageMemo(self.cache_manager, self.project_path).memoize("tech_stack", [], self.compute)
+        self.cache_manager.store.flush()
+        
+        other = CacheManager(self.cache_manager.cache_dir)
+        memo = StageMemo(other, self.project_path)
+        self.assertEqual(memo.memoize("tech_stack", [], self.compute)["calls"], 1)
+        self.assertEqual(self.calls, 1)
+        
+        # Results of another project are not shared
+        other_project = StageMemo(other, Path(self.temp_dir))
+        other_project.memoize("tech_stack", [], self.compute)
+        self.assertEqual(self.calls, 2)
+    
+    def test_refresh_and_corrupt_results(self):
+        """Test refresh recomputes results and corrupt results are dropped."""
+        memo = StageMemo(self.cache_manager, self.project_path)
+        memo.memoize("tech_stack", [], self.compute)
+        
+        refreshed = StageMemo(self.cache_manager, self.project_path, refresh=True)
+        self.assertEqual(refreshed.memoize("tech_stack", [], self.compute)["calls"], 2)
+        self.assertEqual(memo.memoize("tech_stack", [], self.compute)["calls"], 2)
+        
+        key = memo.key("tech_stack", [])
+        self.cache_manager.store.put(key, b"not a pickle", kind=STAGE_KIND)
+        self.assertEqual(memo.memoize("tech_stack", [], self.compute)["calls"], 3)
+        self.assertEqual(self.calls, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()